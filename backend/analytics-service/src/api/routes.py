@@ -1,11 +1,15 @@
 import logging
 from typing import Optional, Dict
-from fastapi import APIRouter, HTTPException, Query, Header, Depends
+from fastapi import APIRouter, HTTPException, Query, Header, Depends, Request
+from fastapi.responses import StreamingResponse
 
-from src.validators.meal_entry import MealEntryCreate, MealEntryUpdate, MealEntryResponse
+from src.validators.meal_entry import MealEntryCreate, MealEntryUpdate, MealEntryResponse, MealImportResult
 from src.validators.daily_log import DailyLogResponse, DailyGoalsUpdate, DailySummary
-from src.services.analytics_service import DailyLogService, MealEntryService
+from src.validators.rollup import NutritionRollupResponse
+from src.models.rollup import RollupPeriod
+from src.services.analytics_service import DailyLogService, MealEntryService, RollupService, count_periods
 from src.validators import validate_date_format, validate_date_range
+from src.core.config import settings
 
 from common.auth_guard import require_auth
 
@@ -64,17 +68,17 @@ async def get_daily_logs_range(
     validate_date_range(date_from, date_to)
 
     logs = await DailyLogService.get_daily_logs_range(user_id, date_from, date_to)
+    meal_counts = await MealEntryService.count_meals_by_date(user_id, date_from, date_to)
 
-    summaries = []
-    for log in logs:
-        meals = await MealEntryService.get_meals_for_date(user_id, log.date)
-        summaries.append(DailySummary(
+    return [
+        DailySummary(
             date=log.date,
             total_macros=log.total_macros,
             calorie_goal=log.calorie_goal,
-            meals_count=len(meals),
-        ))
-    return summaries
+            meals_count=meal_counts.get(log.date, 0),
+        )
+        for log in logs
+    ]
 
 
 
@@ -99,6 +103,79 @@ async def update_daily_goals(
     return log_dict
 
 
+@router.post("/daily/{date}/recalculate", response_model=DailyLogResponse)
+async def recalculate_daily_totals(
+    date: str,
+    x_user_id: str = Header(None, alias="X-User-Id"),
+    token_payload: Dict = Depends(require_auth),
+):
+    """Rebuild daily totals from all meal entries (repair path for drifted totals)."""
+    user_id = get_user_id(x_user_id, token_payload)
+    validate_date_format(date)
+
+    daily_log = await DailyLogService.get_daily_log(user_id, date)
+    if not daily_log:
+        raise HTTPException(status_code=404, detail="Daily log not found")
+
+    await DailyLogService.recalculate_daily_totals(user_id, date)
+    daily_log = await DailyLogService.get_daily_log(user_id, date)
+    meals = await MealEntryService.get_meals_for_date(user_id, date)
+
+    log_dict = daily_log.model_dump(by_alias=True)
+    log_dict["meals"] = [m.model_dump(by_alias=True) for m in meals]
+    return log_dict
+
+
+# ============ ROLLUP ENDPOINTS ============
+
+async def _get_rollups(
+    period: RollupPeriod,
+    date_from: str,
+    date_to: str,
+    x_user_id: Optional[str],
+    token_payload: Dict,
+):
+    user_id = get_user_id(x_user_id, token_payload)
+    validate_date_format(date_from)
+    validate_date_format(date_to)
+    validate_date_range(date_from, date_to)
+
+    if count_periods(period, date_from, date_to) > settings.ROLLUP_MAX_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range spans more than {settings.ROLLUP_MAX_PERIODS} {period.value}s"
+        )
+
+    try:
+        rollups = await RollupService.get_rollups(user_id, period, date_from, date_to)
+    except Exception as e:
+        logger.error(f"Error getting {period.value} rollups: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to get nutrition rollups")
+    return [r.model_dump() for r in rollups]
+
+
+@router.get("/weekly", response_model=list[NutritionRollupResponse])
+async def get_weekly_rollups(
+    date_from: str = Query(..., description="Start date YYYY-MM-DD"),
+    date_to: str = Query(..., description="End date YYYY-MM-DD"),
+    x_user_id: str = Header(None, alias="X-User-Id"),
+    token_payload: Dict = Depends(require_auth),
+):
+    """Get weekly (Monday–Sunday) nutrition rollups overlapping a date range."""
+    return await _get_rollups(RollupPeriod.WEEK, date_from, date_to, x_user_id, token_payload)
+
+
+@router.get("/monthly", response_model=list[NutritionRollupResponse])
+async def get_monthly_rollups(
+    date_from: str = Query(..., description="Start date YYYY-MM-DD"),
+    date_to: str = Query(..., description="End date YYYY-MM-DD"),
+    x_user_id: str = Header(None, alias="X-User-Id"),
+    token_payload: Dict = Depends(require_auth),
+):
+    """Get monthly nutrition rollups overlapping a date range."""
+    return await _get_rollups(RollupPeriod.MONTH, date_from, date_to, x_user_id, token_payload)
+
+
 # ============ MEAL ENTRY ENDPOINTS ============
 
 @router.post("/meals", response_model=MealEntryResponse, status_code=201)
@@ -121,6 +198,49 @@ async def create_meal_entry(
         raise HTTPException(status_code=500, detail="Failed to create meal entry")
 
 
+@router.post("/meals/import", response_model=MealImportResult)
+async def import_meal_entries(
+    request: Request,
+    x_user_id: str = Header(None, alias="X-User-Id"),
+    token_payload: Dict = Depends(require_auth),
+):
+    """Bulk import meal entries from a streamed NDJSON body (one MealEntryCreate per line)."""
+    user_id = get_user_id(x_user_id, token_payload)
+
+    try:
+        result = await MealEntryService.import_meal_entries(user_id, request.stream())
+        return result.model_dump()
+    except Exception as e:
+        logger.error(f"Error importing meal entries: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to import meal entries")
+
+
+@router.get("/meals/export")
+async def export_meal_entries(
+    date_from: Optional[str] = Query(None, description="Start date YYYY-MM-DD"),
+    date_to: Optional[str] = Query(None, description="End date YYYY-MM-DD"),
+    x_user_id: str = Header(None, alias="X-User-Id"),
+    token_payload: Dict = Depends(require_auth),
+):
+    """Stream the user's meal history as NDJSON, oldest entries first.
+
+    Registered before ``/meals/{date}`` so ``export`` is not taken for a date.
+    """
+    user_id = get_user_id(x_user_id, token_payload)
+    if date_from:
+        validate_date_format(date_from)
+    if date_to:
+        validate_date_format(date_to)
+    if date_from and date_to:
+        validate_date_range(date_from, date_to)
+
+    return StreamingResponse(
+        MealEntryService.export_meal_entries(user_id, date_from, date_to),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="meal_entries.ndjson"'},
+    )
+
+
 @router.get("/meals/{date}", response_model=list[MealEntryResponse])
 async def get_meals_for_date(
     date: str,
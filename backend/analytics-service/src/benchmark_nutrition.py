@@ -0,0 +1,126 @@
+"""
+Benchmark of the vectorized nutrition engine against per-ingredient Python loops.
+
+Builds a synthetic meal history (days x meals x ingredients), then computes
+ingredient macros, meal totals and day totals once with the scalar helpers
+and once with ``nutrition_engine``, and prints the timings and speedup.
+
+Usage:
+    python -m src.benchmark_nutrition --days 365 --meals-per-day 4 --ingredients-per-meal 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.models.meal_entry import MacroNutrients, MealIngredient
+from src.services import nutrition_engine
+from common.units import UNIT_TO_GRAMS, convert_to_grams
+
+
+def compute_macros_for_quantity(macro_per_hundred: dict, quantity_grams: float) -> MacroNutrients:
+    """Scalar reference: scale macro_per_hundred to the quantity in grams, one ingredient at a time."""
+    factor = quantity_grams / 100.0
+    return MacroNutrients(
+        calories=round(macro_per_hundred.get("calories", 0) * factor, 2),
+        proteins=round(macro_per_hundred.get("proteins", 0) * factor, 2),
+        carbs=round(macro_per_hundred.get("carbs", 0) * factor, 2),
+        fats=round(macro_per_hundred.get("fats", 0) * factor, 2),
+    )
+
+
+def generate_history(days: int, meals_per_day: int, ingredients_per_meal: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    rows = days * meals_per_day * ingredients_per_meal
+    units = list(UNIT_TO_GRAMS)
+    return {
+        "dates": [f"day-{day:04d}" for day in range(days) for _ in range(meals_per_day * ingredients_per_meal)],
+        "meals": [
+            f"meal-{meal:06d}"
+            for meal in range(days * meals_per_day)
+            for _ in range(ingredients_per_meal)
+        ],
+        "quantities": rng.uniform(0.5, 300, size=rows).round(2).tolist(),
+        "units": [units[i] for i in rng.integers(0, len(units), size=rows)],
+        "per_hundred": [
+            {"calories": c, "proteins": p, "carbs": cb, "fats": f}
+            for c, p, cb, f in rng.uniform(0, 100, size=(rows, 4)).round(1).tolist()
+        ],
+    }
+
+
+def run_loops(history: dict) -> dict:
+    """Scalar path: one MacroNutrients per ingredient, Python sums per meal and day."""
+    meals: dict = {}
+    for meal, quantity, unit, per_hundred in zip(
+        history["meals"], history["quantities"], history["units"], history["per_hundred"]
+    ):
+        grams = convert_to_grams(quantity, unit)
+        meals.setdefault(meal, []).append(MealIngredient(
+            ingredient_id=meal, name="x", quantity=grams,
+            macros=compute_macros_for_quantity(per_hundred, grams),
+        ))
+
+    meal_dates = dict(zip(history["meals"], history["dates"]))
+    days: dict = {}
+    for meal, ingredients in meals.items():
+        meal_total = MacroNutrients()
+        for ing in ingredients:
+            meal_total.calories += ing.macros.calories
+            meal_total.proteins += ing.macros.proteins
+            meal_total.carbs += ing.macros.carbs
+            meal_total.fats += ing.macros.fats
+        day_total = days.setdefault(meal_dates[meal], MacroNutrients())
+        day_total.calories += meal_total.calories
+        day_total.proteins += meal_total.proteins
+        day_total.carbs += meal_total.carbs
+        day_total.fats += meal_total.fats
+    return days
+
+
+def run_vectorized(history: dict) -> dict:
+    """Vectorized path: one matrix for the whole history, grouped sums per day."""
+    grams = nutrition_engine.to_grams(history["quantities"], nutrition_engine.unit_factors(history["units"]))
+    macros = nutrition_engine.scale_per_hundred(grams, nutrition_engine.macros_matrix(history["per_hundred"]))
+    return nutrition_engine.group_totals(history["dates"], macros)
+
+
+def timed(fn, history: dict, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(history)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vectorized vs loop-based nutrition computation")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--meals-per-day", type=int, default=4)
+    parser.add_argument("--ingredients-per-meal", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    history = generate_history(args.days, args.meals_per_day, args.ingredients_per_meal, args.seed)
+    rows = len(history["quantities"])
+
+    loop_seconds, loop_days = timed(run_loops, history, args.repeat)
+    vector_seconds, vector_days = timed(run_vectorized, history, args.repeat)
+
+    max_diff = max(
+        abs(getattr(loop_days[day], field) - vector_days[day][i])
+        for day in loop_days
+        for i, field in enumerate(nutrition_engine.MACRO_FIELDS)
+    )
+
+    print(f"{rows} ingredient rows, {len(loop_days)} days")
+    print(f"{'python loops':<14} {loop_seconds * 1000:9.1f} ms")
+    print(f"{'vectorized':<14} {vector_seconds * 1000:9.1f} ms")
+    print(f"speedup {loop_seconds / vector_seconds:.1f}x, max abs difference {max_diff:.4f}")
+
+
+if __name__ == "__main__":
+    main()
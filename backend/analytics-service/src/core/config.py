@@ -22,11 +22,29 @@ class Settings(BaseSettings):
     # MongoDB Collections
     DAILY_LOG_COLLECTION: str = "daily_logs"
     MEAL_ENTRIES_COLLECTION: str = "meal_entries"
+    ROLLUPS_COLLECTION: str = "nutrition_rollups"
+
+    # Maximum number of weeks / months served by one rollup request
+    ROLLUP_MAX_PERIODS: int = 120
+
+    # Bulk meal import / export
+    MEAL_IMPORT_BATCH_SIZE: int = 500
+    MEAL_IMPORT_MAX_ENTRIES: int = 10000
+    MEAL_EXPORT_BATCH_SIZE: int = 500
 
     # Inter-service communication
     RECIPE_SERVICE_URL: str
     INTERNAL_SERVICE_TOKEN: str = "mealup-internal-dev-token"
 
+    # Recipe-service response cache, edits are picked up once an entry expires
+    RECIPE_CACHE_SIZE: int = 1024
+    RECIPE_CACHE_TTL_SECONDS: float = 300.0
+    INGREDIENT_CACHE_SIZE: int = 4096
+    INGREDIENT_CACHE_TTL_SECONDS: float = 3600.0
+    INGREDIENT_BULK_BATCH_SIZE: int = 100
+    # Recipe-service has no bulk recipe endpoint, imports fetch recipes with bounded concurrency
+    RECIPE_FETCH_CONCURRENCY: int = 8
+
     # Auth0
     AUTH0_DOMAIN: str
     AUTH0_AUDIENCE: Optional[str] = None
@@ -61,6 +61,13 @@ async def _create_indexes():
         await meal_entries.create_index("date")
         await meal_entries.create_index([("user_id", 1), ("date", -1)])
 
+        # Nutrition rollups: one document per user, period and period start
+        rollups = _database[settings.ROLLUPS_COLLECTION]
+        await rollups.create_index(
+            [("user_id", 1), ("period", 1), ("period_start", 1)],
+            unique=True
+        )
+
         logger.info("✓ Database indexes created")
     except Exception as e:
         logger.error(f"✗ Failed to create indexes: {e}")
@@ -0,0 +1,216 @@
+"""
+Seed synthetic meal history for load tests.
+
+Every synthetic user (``system-seed|load-{n}``, the users seeded by
+user-service ``init_users``) gets ``--days`` days of meals ending at ``--end-date`` (today by default),
+generated deterministically from ``--seed`` and the user number, so a fixed
+``--end-date`` reproduces the same history on any day. Meals go
+through ``MealEntryService.import_meal_entries``, the same batched path as
+``POST /analytics/meals/import``, so daily logs and totals are built exactly
+as for real imports. Ingredients carry their name and macros, so the import
+does not depend on recipe-service data being present.
+
+Work is tracked per (user, date): dates that already hold all their generated
+meals are skipped, dates left partially seeded by an interrupted run are
+cleared and imported again, so re-running completes any missing history.
+
+Run from the service root:
+    python -m src.init_meal_entries --users 1000 --days 365 --end-date 2026-06-30
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from typing import AsyncIterator, List, Optional, Set
+
+from src.core.config import settings
+from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
+from src.models.meal_entry import MealType
+from src.services.analytics_service import MealEntryService
+from src.services.recipe_client import close_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Deterministic ingredient IDs — MUST match recipe-service init_ingredients.py
+INGREDIENT_NS = uuid.UUID("a3bb189e-8bf9-3888-9912-ace4e6543002")
+
+# (name, calories, carbs, proteins, fats) per 100 g, from the recipe-service catalogue
+FOODS = {
+    MealType.BREAKFAST: [
+        ("Oats", 389, 66.3, 16.9, 6.9),
+        ("Whole Milk", 61, 4.8, 3.2, 3.3),
+        ("Egg", 155, 1.1, 13.0, 11.0),
+        ("Greek Yogurt", 97, 3.6, 9.0, 5.0),
+        ("Banana", 89, 22.8, 1.1, 0.3),
+        ("Whole Wheat Bread", 247, 41.3, 13.0, 3.4),
+        ("Peanut Butter", 588, 20.0, 25.0, 50.4),
+    ],
+    MealType.LUNCH: [
+        ("Chicken Breast", 165, 0, 31.0, 3.6),
+        ("White Rice", 130, 28.2, 2.7, 0.3),
+        ("Broccoli", 34, 6.6, 2.8, 0.4),
+        ("Spaghetti", 131, 25.0, 5.0, 1.1),
+        ("Tomato", 18, 3.9, 0.9, 0.2),
+        ("Olive Oil", 884, 0, 0, 100.0),
+        ("Cheddar Cheese", 403, 1.3, 24.9, 33.1),
+    ],
+    MealType.DINNER: [
+        ("Salmon", 208, 0, 20.4, 13.4),
+        ("Brown Rice", 111, 23.0, 2.6, 0.9),
+        ("Sweet Potato", 86, 20.1, 1.6, 0.1),
+        ("Potato", 77, 17.5, 2.0, 0.1),
+        ("Spinach", 23, 3.6, 2.9, 0.4),
+        ("Avocado", 160, 8.5, 2.0, 14.7),
+        ("Chicken Breast", 165, 0, 31.0, 3.6),
+    ],
+    MealType.SNACK: [
+        ("Apple", 52, 13.8, 0.3, 0.2),
+        ("Banana", 89, 22.8, 1.1, 0.3),
+        ("Almonds", 579, 21.6, 21.2, 49.9),
+        ("Greek Yogurt", 97, 3.6, 9.0, 5.0),
+    ],
+}
+
+# Chance that a user logs a given meal on a given day
+MEAL_PROBABILITY = {
+    MealType.BREAKFAST: 0.9,
+    MealType.LUNCH: 0.85,
+    MealType.DINNER: 0.9,
+    MealType.SNACK: 0.5,
+}
+
+
+def load_user_id(n: int) -> str:
+    return f"system-seed|load-{n}"
+
+
+def make_ingredient_id(name: str) -> str:
+    return str(uuid.uuid5(INGREDIENT_NS, name.lower().strip()))
+
+
+def generate_meals(user: int, days: int, seed: int = 42, end: Optional[date] = None) -> List[dict]:
+    """``MealEntryCreate`` payloads of one user, oldest day first"""
+    rng = random.Random(f"{seed}:{user}")
+    end = end or date.today()
+    appetite = rng.uniform(0.7, 1.4)
+
+    meals = []
+    for offset in range(days - 1, -1, -1):
+        day = (end - timedelta(days=offset)).isoformat()
+        for meal_type, foods in FOODS.items():
+            if rng.random() > MEAL_PROBABILITY[meal_type]:
+                continue
+            ingredients = []
+            for name, calories, carbs, proteins, fats in rng.sample(foods, rng.randint(1, 3)):
+                grams = round(rng.uniform(30, 250) * appetite, 1)
+                factor = grams / 100.0
+                ingredients.append({
+                    "ingredient_id": make_ingredient_id(name),
+                    "name": name,
+                    "quantity": grams,
+                    "macros": {
+                        "calories": round(calories * factor, 2),
+                        "carbs": round(carbs * factor, 2),
+                        "proteins": round(proteins * factor, 2),
+                        "fats": round(fats * factor, 2),
+                    },
+                })
+            meals.append({"date": day, "meal_type": meal_type.value, "ingredients": ingredients})
+    return meals
+
+
+async def _ndjson(meals: List[dict]) -> AsyncIterator[bytes]:
+    for meal in meals:
+        yield (json.dumps(meal) + "\n").encode()
+
+
+async def _seeded_dates(user_id: str, meals: List[dict]) -> Set[str]:
+    """
+    Dates already holding all their generated meals. Entries of partially seeded
+    dates (an interrupted run) are deleted so the date is imported again as a whole.
+    """
+    expected = Counter(meal["date"] for meal in meals)
+    if not expected:
+        return set()
+
+    collection = get_database()[settings.MEAL_ENTRIES_COLLECTION]
+    cursor = collection.aggregate([
+        {"$match": {"user_id": user_id, "date": {"$in": list(expected)}}},
+        {"$group": {"_id": "$date", "count": {"$sum": 1}}},
+    ])
+    counts = {row["_id"]: row["count"] async for row in cursor}
+
+    seeded = {day for day, count in counts.items() if count >= expected[day]}
+    partial = [day for day in counts if day not in seeded]
+    if partial:
+        await collection.delete_many({"user_id": user_id, "date": {"$in": partial}})
+        logger.info(f"Re-seeding {len(partial)} partially seeded dates of {user_id}")
+    return seeded
+
+
+async def seed_user(user: int, args: argparse.Namespace) -> int:
+    """Import the missing meal history of one user, returns number of imported entries"""
+    user_id = load_user_id(user)
+    meals = generate_meals(user, args.days, args.seed, args.end_date)
+    seeded = await _seeded_dates(user_id, meals)
+    meals = [meal for meal in meals if meal["date"] not in seeded]
+
+    imported = 0
+    # Keep every request within the import limit, like a client would
+    for start in range(0, len(meals), settings.MEAL_IMPORT_MAX_ENTRIES):
+        result = await MealEntryService.import_meal_entries(
+            user_id, _ndjson(meals[start:start + settings.MEAL_IMPORT_MAX_ENTRIES])
+        )
+        imported += result.imported
+        if result.failed:
+            logger.warning(f"{result.failed} meal entries of {user_id} failed: {result.errors[0].detail}")
+    return imported
+
+
+async def seed_meal_entries(args: argparse.Namespace) -> int:
+    """Seed all users, ``--concurrency`` users at a time"""
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    total = 0
+
+    async def run(user: int) -> None:
+        nonlocal total
+        async with semaphore:
+            total += await seed_user(user, args)
+
+    users = range(args.users)
+    for start in range(0, len(users), 100):
+        await asyncio.gather(*(run(user) for user in users[start:start + 100]))
+        logger.info(f"Seeded meals of {min(start + 100, len(users))}/{len(users)} users ({total} entries)")
+    return total
+
+
+async def init_meal_entries(args: argparse.Namespace) -> None:
+    try:
+        await connect_to_mongodb()
+        total = await seed_meal_entries(args)
+        logger.info(f"Successfully imported {total} meal entries")
+    finally:
+        await close_client()
+        await disconnect_from_mongodb()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed synthetic meal history for load tests")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--concurrency", type=int, default=4, help="Users imported at the same time")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the meal generator")
+    parser.add_argument(
+        "--end-date", type=date.fromisoformat, default=date.today(),
+        help="Last day of the generated history (YYYY-MM-DD), defaults to today"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(init_meal_entries(parse_args()))
@@ -1,5 +1,6 @@
 from src.models.meal_entry import MealType, MacroNutrients, MealIngredient, MealEntry
 from src.models.daily_log import DailyLog
+from src.models.rollup import RollupPeriod, GoalAdherence, NutritionRollup
 
 __all__ = [
     "MealType",
@@ -7,4 +8,7 @@ __all__ = [
     "MealIngredient",
     "MealEntry",
     "DailyLog",
+    "RollupPeriod",
+    "GoalAdherence",
+    "NutritionRollup",
 ]
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from enum import Enum
+from datetime import datetime
+import uuid
+
+from src.models.meal_entry import MacroNutrients
+
+
+class RollupPeriod(str, Enum):
+    """Enum for rollup granularity"""
+    WEEK = "week"
+    MONTH = "month"
+
+
+class GoalAdherence(BaseModel):
+    """Average percentage of the daily goal reached, over logged days that had a goal set"""
+    calories: Optional[float] = Field(None, ge=0, description="Calorie goal adherence (%)")
+    proteins: Optional[float] = Field(None, ge=0, description="Protein goal adherence (%)")
+    carbs: Optional[float] = Field(None, ge=0, description="Carbs goal adherence (%)")
+    fats: Optional[float] = Field(None, ge=0, description="Fats goal adherence (%)")
+
+
+class NutritionRollup(BaseModel):
+    """DB document – pre-aggregated nutrition for a user over a week or a month.
+    Stored in the ``nutrition_rollups`` MongoDB collection, marked stale by meal
+    and goal writes and recomputed from daily logs on the next read.
+    """
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id", description="Unique rollup ID")
+    user_id: str = Field(..., description="User ID (auth0 sub)")
+    period: RollupPeriod = Field(..., description="Rollup granularity")
+    period_start: str = Field(..., description="First day of the period YYYY-MM-DD")
+    period_end: str = Field(..., description="Last day of the period YYYY-MM-DD")
+    total_macros: MacroNutrients = Field(default_factory=MacroNutrients, description="Sum over the period")
+    average_macros: MacroNutrients = Field(default_factory=MacroNutrients, description="Average per logged day")
+    days_logged: int = Field(0, ge=0, description="Days with at least one meal entry")
+    meals_count: int = Field(0, ge=0, description="Meal entries in the period")
+    goal_adherence: GoalAdherence = Field(default_factory=GoalAdherence)
+    stale: bool = Field(False, description="Set by writes in the period, cleared on recomputation")
+    revision: int = Field(0, ge=0, description="Bumped by every stale mark, guards saving a recomputation")
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = ConfigDict(populate_by_name=True)
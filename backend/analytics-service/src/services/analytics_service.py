@@ -1,19 +1,26 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from datetime import date as date_type, datetime, timedelta
+import asyncio
+import calendar
 import logging
+import uuid
+import numpy as np
+from pydantic import ValidationError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from src.db.mongodb import get_database
 from src.models.meal_entry import MealEntry, MacroNutrients, MealIngredient
 from src.models.daily_log import DailyLog
-from src.validators.meal_entry import MealEntryCreate, MealEntryUpdate
+from src.models.rollup import GoalAdherence, NutritionRollup, RollupPeriod
+from src.validators.meal_entry import MealEntryCreate, MealEntryUpdate, MealImportError, MealImportResult
 from src.validators.daily_log import DailyGoalsUpdate
 
 from src.services.recipe_client import (
     fetch_recipe,
-    fetch_ingredient,
     fetch_ingredients_bulk,
-    convert_to_grams,
 )
+from src.services import nutrition_engine
 
 from src.core.config import settings
 
@@ -22,31 +29,42 @@ logger = logging.getLogger(__name__)
 
 # ── Macro helpers ──────────────────────────────────────────────────────
 
-def _compute_macros_for_quantity(macro_per_hundred: dict, quantity_grams: float) -> MacroNutrients:
-    """Scale macro_per_hundred (recipe-service format) to actual quantity in grams."""
-    factor = quantity_grams / 100.0
-    return MacroNutrients(
-        calories=round(macro_per_hundred.get("calories", 0) * factor, 2),
-        proteins=round(macro_per_hundred.get("proteins", 0) * factor, 2),
-        carbs=round(macro_per_hundred.get("carbs", 0) * factor, 2),
-        fats=round(macro_per_hundred.get("fats", 0) * factor, 2),
-    )
+def _macro_delta(new: dict, old: Optional[dict] = None) -> dict:
+    """Per-field difference between two ``total_macros`` dicts, rounded like stored totals."""
+    old = old or {}
+    return {
+        field: round(new.get(field, 0) - old.get(field, 0), 2)
+        for field in MacroNutrients.model_fields
+    }
 
 
 def _compute_meal_macros(ingredients: list) -> MacroNutrients:
     """Sum macros across all ingredients of a meal."""
-    total = MacroNutrients()
-    for ing in ingredients:
-        macros = ing.macros if isinstance(ing, MealIngredient) else MacroNutrients(**ing.macros.model_dump())
-        total.calories += macros.calories
-        total.proteins += macros.proteins
-        total.carbs += macros.carbs
-        total.fats += macros.fats
-    total.calories = round(total.calories, 2)
-    total.proteins = round(total.proteins, 2)
-    total.carbs = round(total.carbs, 2)
-    total.fats = round(total.fats, 2)
-    return total
+    matrix = nutrition_engine.macros_matrix(ing.macros.model_dump() for ing in ingredients)
+    return nutrition_engine.to_macro_nutrients(nutrition_engine.total(matrix))
+
+
+def _build_meal_ingredients(
+    ingredient_ids: List[str],
+    names: List[str],
+    grams,
+    macros_per_hundred: List[Optional[dict]],
+) -> List[MealIngredient]:
+    """Scale per-100g macros of all ingredients in one vectorized pass."""
+    for ing_id, name, per_hundred in zip(ingredient_ids, names, macros_per_hundred):
+        if not per_hundred:
+            logger.warning("Ingredient %s (%s) has no macro data", ing_id, name)
+
+    macros = nutrition_engine.scale_per_hundred(grams, nutrition_engine.macros_matrix(macros_per_hundred))
+    return [
+        MealIngredient(
+            ingredient_id=ing_id,
+            name=name,
+            quantity=float(quantity),
+            macros=nutrition_engine.to_macro_nutrients(row),
+        )
+        for ing_id, name, quantity, row in zip(ingredient_ids, names, grams, macros)
+    ]
 
 
 # ── Recipe resolution ──────────────────────────────────────────────────
@@ -54,6 +72,8 @@ def _compute_meal_macros(ingredients: list) -> MacroNutrients:
 async def _resolve_ingredients_from_recipe(recipe_id: str) -> tuple[List[MealIngredient], str]:
     """Fetch a recipe from recipe-service, resolve every ingredient's macros.
 
+    Uses the recipe's pre-computed ``nutrition`` when available and falls back
+    to resolving ingredients one by one for recipes that predate it.
     Returns (list_of_MealIngredient, recipe_name).
     Raises ValueError when recipe or critical ingredient data is missing.
     """
@@ -62,6 +82,20 @@ async def _resolve_ingredients_from_recipe(recipe_id: str) -> tuple[List[MealIng
         raise ValueError(f"Recipe {recipe_id} not found in recipe-service")
 
     recipe_name = recipe_data.get("name", "Unknown recipe")
+
+    # recipe-service keeps resolved macros on the recipe document, use them when present
+    nutrition = recipe_data.get("nutrition")
+    if nutrition and nutrition.get("ingredients"):
+        return [
+            MealIngredient(
+                ingredient_id=item["ingredient_id"],
+                name=item["name"],
+                quantity=item["quantity"],
+                macros=MacroNutrients(**item["macros"]),
+            )
+            for item in nutrition["ingredients"]
+        ], recipe_name
+
     weighted_ingredients = recipe_data.get("ingredients", [])
 
     if not weighted_ingredients:
@@ -71,35 +105,25 @@ async def _resolve_ingredients_from_recipe(recipe_id: str) -> tuple[List[MealIng
     ing_ids = [wi["ingredient_id"] for wi in weighted_ingredients]
     ingredients_map = await fetch_ingredients_bulk(ing_ids)
 
-    resolved: List[MealIngredient] = []
+    found = []
     for wi in weighted_ingredients:
-        ing_id = wi["ingredient_id"]
-        quantity_raw = wi.get("quantity", 0)
-        unit = wi.get("capacity", "g")
-
-        quantity_grams = convert_to_grams(quantity_raw, unit)
-
-        ing_data = ingredients_map.get(ing_id)
-        if not ing_data:
-            logger.warning("Ingredient %s not found, skipping", ing_id)
+        if wi["ingredient_id"] not in ingredients_map:
+            logger.warning("Ingredient %s not found, skipping", wi["ingredient_id"])
             continue
+        found.append(wi)
 
-        name = ing_data.get("name", "Unknown")
-        macro_per_hundred = ing_data.get("macro_per_hundred")
-
-        if macro_per_hundred:
-            macros = _compute_macros_for_quantity(macro_per_hundred, quantity_grams)
-        else:
-            macros = MacroNutrients()
-            logger.warning("Ingredient %s (%s) has no macro data", ing_id, name)
-
-        resolved.append(MealIngredient(
-            ingredient_id=ing_id,
-            name=name,
-            quantity=quantity_grams,
-            macros=macros,
-        ))
+    grams = nutrition_engine.to_grams(
+        [wi.get("quantity", 0) for wi in found],
+        nutrition_engine.unit_factors([wi.get("capacity", "g") for wi in found]),
+    )
+    ing_data = [ingredients_map[wi["ingredient_id"]] for wi in found]
 
+    resolved = _build_meal_ingredients(
+        [wi["ingredient_id"] for wi in found],
+        [data.get("name", "Unknown") for data in ing_data],
+        grams,
+        [data.get("macro_per_hundred") for data in ing_data],
+    )
     return resolved, recipe_name
 
 
@@ -115,7 +139,8 @@ async def _resolve_manual_ingredients(
     ing_ids = [ing.ingredient_id for ing in raw_ingredients]
     ingredients_map = await fetch_ingredients_bulk(ing_ids)
 
-    resolved: List[MealIngredient] = []
+    resolved: List[Optional[MealIngredient]] = []
+    pending = []
     for ing in raw_ingredients:
         # If client sent pre-computed macros AND name, trust them
         if ing.macros is not None and ing.name is not None:
@@ -128,48 +153,138 @@ async def _resolve_manual_ingredients(
             continue
 
         # Otherwise resolve from recipe-service
-        ing_data = ingredients_map.get(ing.ingredient_id)
-        if not ing_data:
+        if ing.ingredient_id not in ingredients_map:
             logger.warning("Ingredient %s not found, skipping", ing.ingredient_id)
             continue
 
-        name = ing.name or ing_data.get("name", "Unknown")
-        macro_per_hundred = ing_data.get("macro_per_hundred")
-
-        if macro_per_hundred:
-            macros = _compute_macros_for_quantity(macro_per_hundred, ing.quantity)
-        else:
-            macros = MacroNutrients()
-            logger.warning("Ingredient %s (%s) has no macro data", ing.ingredient_id, name)
+        pending.append((len(resolved), ing, ingredients_map[ing.ingredient_id]))
+        resolved.append(None)
 
-        resolved.append(MealIngredient(
-            ingredient_id=ing.ingredient_id,
-            name=name,
-            quantity=ing.quantity,
-            macros=macros,
-        ))
+    computed = _build_meal_ingredients(
+        [ing.ingredient_id for _, ing, _ in pending],
+        [ing.name or data.get("name", "Unknown") for _, ing, data in pending],
+        nutrition_engine.to_grams([ing.quantity for _, ing, _ in pending]),
+        [data.get("macro_per_hundred") for _, _, data in pending],
+    )
+    for (position, _, _), item in zip(pending, computed):
+        resolved[position] = item
 
     return resolved
 
 
+async def _resolve_meal_ingredients(data: MealEntryCreate) -> Tuple[List[MealIngredient], Optional[str]]:
+    """Resolve ingredients and recipe name of a new meal entry (recipe or manual mode)."""
+    if data.recipe_id:
+        ingredients, resolved_name = await _resolve_ingredients_from_recipe(data.recipe_id)
+        return ingredients, data.recipe_name or resolved_name
+    return await _resolve_manual_ingredients(data.ingredients), data.recipe_name
+
+
+async def _fetch_recipes(recipe_ids: List[str]) -> Dict[str, Optional[Dict]]:
+    """Fetch recipes concurrently, at most RECIPE_FETCH_CONCURRENCY requests at a time."""
+    semaphore = asyncio.Semaphore(settings.RECIPE_FETCH_CONCURRENCY)
+
+    async def fetch(recipe_id: str) -> Optional[Dict]:
+        async with semaphore:
+            return await fetch_recipe(recipe_id)
+
+    return dict(zip(recipe_ids, await asyncio.gather(*[fetch(rid) for rid in recipe_ids])))
+
+
+# ── NDJSON helpers ─────────────────────────────────────────────────────
+
+def _is_valid_date(value: str) -> bool:
+    """True for a real calendar date written as YYYY-MM-DD."""
+    try:
+        return date_type.fromisoformat(value).isoformat() == value
+    except ValueError:
+        return False
+
+
+async def _iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a streamed body into (line_number, line) pairs, skipping blank lines."""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line.decode("utf-8", errors="replace")
+    if buffer.strip():
+        yield line_number + 1, buffer.decode("utf-8", errors="replace")
+
+
+def _daily_log_insert_defaults(user_id: str, date: str, exclude: set = frozenset()) -> dict:
+    """Fields of a fresh daily log for ``$setOnInsert``, minus those set elsewhere in the update."""
+    defaults = DailyLog(user_id=user_id, date=date).model_dump(by_alias=True)
+    return {
+        key: value for key, value in defaults.items()
+        if key not in {"user_id", "date", *exclude}
+    }
+
+
 class DailyLogService:
     """Service for daily nutrition log operations"""
 
+    @staticmethod
+    async def _upsert_daily_log(user_id: str, date: str, set_fields: Optional[dict] = None) -> DailyLog:
+        """Single find_one_and_update upsert on the unique (user_id, date) index."""
+        db = get_database()
+        collection = db[settings.DAILY_LOG_COLLECTION]
+
+        set_fields = set_fields or {}
+        update = {"$setOnInsert": _daily_log_insert_defaults(user_id, date, set(set_fields))}
+        if set_fields:
+            update["$set"] = set_fields
+
+        query = {"user_id": user_id, "date": date}
+        try:
+            log_data = await collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert inserted the log first, the retry matches it
+            log_data = await collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        return DailyLog(**log_data)
+
     @staticmethod
     async def get_or_create_daily_log(user_id: str, date: str) -> DailyLog:
         """Get existing daily log or create a new one for the given date."""
+        return await DailyLogService._upsert_daily_log(user_id, date)
+
+    @staticmethod
+    async def ensure_daily_logs(user_id: str, dates: List[str]) -> Dict[str, str]:
+        """Upsert daily logs for many dates in one bulk write, returns date → daily log ID."""
+        if not dates:
+            return {}
+
         db = get_database()
         collection = db[settings.DAILY_LOG_COLLECTION]
 
-        existing = await collection.find_one({"user_id": user_id, "date": date})
-        if existing:
-            return DailyLog(**existing)
-
-        daily_log = DailyLog(user_id=user_id, date=date)
-        log_dict = daily_log.model_dump(by_alias=True)
-        await collection.insert_one(log_dict)
-        logger.info(f"Created daily log {daily_log.id} for user {user_id} on {date}")
-        return daily_log
+        operations = [
+            UpdateOne(
+                {"user_id": user_id, "date": date},
+                {"$setOnInsert": _daily_log_insert_defaults(user_id, date)},
+                upsert=True,
+            )
+            for date in dates
+        ]
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Duplicate keys mean a concurrent upsert created the log first
+            logger.warning(f"Some daily log upserts failed for user {user_id}: {e.details.get('writeErrors')}")
+
+        cursor = collection.find(
+            {"user_id": user_id, "date": {"$in": list(dates)}},
+            {"_id": 1, "date": 1}
+        )
+        logs = await cursor.to_list(length=None)
+        return {log["date"]: log["_id"] for log in logs}
 
     @staticmethod
     async def get_daily_log(user_id: str, date: str) -> Optional[DailyLog]:
@@ -202,48 +317,71 @@ class DailyLogService:
 
     @staticmethod
     async def update_goals(user_id: str, date: str, goals: DailyGoalsUpdate) -> Optional[DailyLog]:
-        """Update daily nutrition goals."""
+        """Update daily nutrition goals, creating the log if it does not exist yet."""
+        update_data = goals.model_dump(exclude_unset=True)
+        if update_data:
+            update_data["_updated_at"] = datetime.utcnow()
+        daily_log = await DailyLogService._upsert_daily_log(user_id, date, update_data)
+        if update_data:
+            await RollupService.mark_stale(user_id, date)
+        return daily_log
+
+    @staticmethod
+    async def apply_macro_delta(user_id: str, date: str, delta: dict) -> None:
+        """Atomically add a macro delta to the daily totals in a single update.
+
+        Uses an update pipeline instead of a plain ``$inc`` so the stored totals
+        stay rounded. A total that goes negative means the incremental totals had
+        already drifted, so the day is repaired with ``recalculate_daily_totals``.
+        """
+        if not any(delta.values()):
+            return
+
         db = get_database()
         collection = db[settings.DAILY_LOG_COLLECTION]
 
-        # Ensure log exists
-        await DailyLogService.get_or_create_daily_log(user_id, date)
+        totals = {
+            f"total_macros.{field}": {"$round": [
+                {"$add": [{"$ifNull": [f"$total_macros.{field}", 0]}, value]},
+                2
+            ]}
+            for field, value in delta.items()
+        }
+        updated = await collection.find_one_and_update(
+            {"user_id": user_id, "date": date},
+            [{"$set": {**totals, "_updated_at": datetime.utcnow()}}],
+            projection={"total_macros": 1},
+            return_document=ReturnDocument.AFTER
+        )
 
-        update_data = goals.model_dump(exclude_unset=True)
-        if update_data:
-            update_data["_updated_at"] = datetime.utcnow()
-            await collection.update_one(
-                {"user_id": user_id, "date": date},
-                {"$set": update_data}
+        negative = [
+            field for field, value in ((updated or {}).get("total_macros") or {}).items()
+            if value < 0
+        ]
+        if negative:
+            logger.warning(
+                f"Daily totals of user {user_id} on {date} went negative ({', '.join(negative)}), recalculating"
             )
-
-        updated = await collection.find_one({"user_id": user_id, "date": date})
-        if updated:
-            return DailyLog(**updated)
-        return None
+            await DailyLogService.recalculate_daily_totals(user_id, date)
+            return
+        await RollupService.mark_stale(user_id, date)
 
     @staticmethod
     async def recalculate_daily_totals(user_id: str, date: str) -> None:
-        """Recalculate totals in the daily log based on all meal entries."""
+        """Recalculate totals in the daily log based on all meal entries.
+
+        Meal writes keep totals up to date with ``apply_macro_delta``; this full
+        recalculation is only a repair path for logs that drifted.
+        """
         db = get_database()
         daily_col = db[settings.DAILY_LOG_COLLECTION]
         meals_col = db[settings.MEAL_ENTRIES_COLLECTION]
 
-        cursor = meals_col.find({"user_id": user_id, "date": date})
-        meals = await cursor.to_list(length=100)
-
-        total = MacroNutrients()
-        for meal in meals:
-            m = meal.get("total_macros", {})
-            total.calories += m.get("calories", 0)
-            total.proteins += m.get("proteins", 0)
-            total.carbs += m.get("carbs", 0)
-            total.fats += m.get("fats", 0)
+        cursor = meals_col.find({"user_id": user_id, "date": date}, {"total_macros": 1})
+        meals = await cursor.to_list(length=None)
 
-        total.calories = round(total.calories, 2)
-        total.proteins = round(total.proteins, 2)
-        total.carbs = round(total.carbs, 2)
-        total.fats = round(total.fats, 2)
+        matrix = nutrition_engine.macros_matrix(meal.get("total_macros") for meal in meals)
+        total = nutrition_engine.to_macro_nutrients(nutrition_engine.total(matrix))
 
         await daily_col.update_one(
             {"user_id": user_id, "date": date},
@@ -252,6 +390,7 @@ class DailyLogService:
                 "_updated_at": datetime.utcnow()
             }}
         )
+        await RollupService.mark_stale(user_id, date)
         logger.info(f"Recalculated daily totals for user {user_id} on {date}")
 
 
@@ -276,17 +415,7 @@ class MealEntryService:
         # Ensure daily log exists
         daily_log = await DailyLogService.get_or_create_daily_log(user_id, data.date)
 
-        recipe_name = data.recipe_name
-
-        # ── Resolve ingredients ───────────────────────────────────
-        if data.recipe_id:
-            # Mode 1: recipe-based — auto-resolve from recipe-service
-            ingredients, resolved_name = await _resolve_ingredients_from_recipe(data.recipe_id)
-            if not recipe_name:
-                recipe_name = resolved_name
-        else:
-            # Mode 2: manual ingredients — resolve macros from recipe-service
-            ingredients = await _resolve_manual_ingredients(data.ingredients)
+        ingredients, recipe_name = await _resolve_meal_ingredients(data)
 
         total_macros = _compute_meal_macros(ingredients)
 
@@ -305,12 +434,179 @@ class MealEntryService:
         entry_dict = entry.model_dump(by_alias=True)
         await collection.insert_one(entry_dict)
 
-        # Recalculate daily totals
-        await DailyLogService.recalculate_daily_totals(user_id, data.date)
+        await DailyLogService.apply_macro_delta(user_id, data.date, _macro_delta(total_macros.model_dump()))
 
         logger.info(f"Created meal entry {entry.id} ({data.meal_type}) for user {user_id}")
         return entry
 
+    @staticmethod
+    async def import_meal_entries(user_id: str, chunks: AsyncIterable[bytes]) -> MealImportResult:
+        """Bulk-create meal entries from an NDJSON stream, one ``MealEntryCreate`` per line.
+
+        Lines are handled in batches of ``MEAL_IMPORT_BATCH_SIZE``: referenced
+        recipes and ingredients are resolved with one round of recipe-service
+        calls, daily logs are upserted once per date and entries are written
+        with ``insert_many``. Totals of every affected day are recalculated
+        once at the end instead of once per entry.
+        Invalid lines are reported in the result and do not stop the import.
+        """
+        result = MealImportResult()
+        affected_dates: set = set()
+        batch: List[Tuple[int, MealEntryCreate]] = []
+        accepted = 0
+
+        def reject(line: int, detail: str) -> None:
+            result.failed += 1
+            result.errors.append(MealImportError(line=line, detail=detail))
+
+        try:
+            async for line_number, line in _iter_ndjson(chunks):
+                if accepted >= settings.MEAL_IMPORT_MAX_ENTRIES:
+                    reject(line_number, f"Import is limited to {settings.MEAL_IMPORT_MAX_ENTRIES} entries per request")
+                    break
+
+                try:
+                    data = MealEntryCreate.model_validate_json(line)
+                except ValidationError as e:
+                    reject(line_number, e.errors()[0]["msg"])
+                    continue
+                if not _is_valid_date(data.date):
+                    reject(line_number, "Invalid date format. Expected YYYY-MM-DD")
+                    continue
+                if not data.recipe_id and not data.ingredients:
+                    reject(line_number, "Either recipe_id or ingredients must be provided")
+                    continue
+
+                accepted += 1
+                batch.append((line_number, data))
+                if len(batch) >= settings.MEAL_IMPORT_BATCH_SIZE:
+                    inserted = await MealEntryService._import_batch(user_id, batch, reject)
+                    result.imported += len(inserted)
+                    affected_dates.update(inserted)
+                    batch = []
+
+            if batch:
+                inserted = await MealEntryService._import_batch(user_id, batch, reject)
+                result.imported += len(inserted)
+                affected_dates.update(inserted)
+        finally:
+            # Runs for partial imports too, so already inserted entries are counted
+            for date in sorted(affected_dates):
+                await DailyLogService.recalculate_daily_totals(user_id, date)
+
+        result.days_updated = len(affected_dates)
+        logger.info(
+            f"Imported {result.imported} meal entries for user {user_id} "
+            f"({result.failed} failed, {result.days_updated} days updated)"
+        )
+        return result
+
+    @staticmethod
+    async def _import_batch(
+        user_id: str,
+        batch: List[Tuple[int, MealEntryCreate]],
+        reject: Callable[[int, str], None],
+    ) -> List[str]:
+        """Resolve and insert one import batch, returns the date of every inserted entry."""
+        db = get_database()
+        collection = db[settings.MEAL_ENTRIES_COLLECTION]
+
+        # One round of recipe-service calls for the whole batch; the per-entry
+        # resolvers below are then served from the recipe client caches
+        recipe_ids = list(dict.fromkeys(data.recipe_id for _, data in batch if data.recipe_id))
+        recipes = await _fetch_recipes(recipe_ids)
+
+        ingredient_ids = [
+            ing.ingredient_id
+            for _, data in batch if not data.recipe_id
+            for ing in data.ingredients
+        ]
+        for recipe in recipes.values():
+            if recipe and not (recipe.get("nutrition") or {}).get("ingredients"):
+                ingredient_ids.extend(wi["ingredient_id"] for wi in recipe.get("ingredients", []))
+        if ingredient_ids:
+            await fetch_ingredients_bulk(ingredient_ids)
+
+        resolved = []
+        for line_number, data in batch:
+            if data.recipe_id and not recipes.get(data.recipe_id):
+                reject(line_number, f"Recipe {data.recipe_id} not found in recipe-service")
+                continue
+            try:
+                ingredients, recipe_name = await _resolve_meal_ingredients(data)
+            except ValueError as e:
+                reject(line_number, str(e))
+                continue
+            resolved.append((line_number, data, ingredients, recipe_name))
+
+        log_ids = await DailyLogService.ensure_daily_logs(
+            user_id, list(dict.fromkeys(data.date for _, data, _, _ in resolved))
+        )
+
+        entries: List[Tuple[int, MealEntry]] = []
+        for line_number, data, ingredients, recipe_name in resolved:
+            if data.date not in log_ids:
+                reject(line_number, f"Daily log for {data.date} could not be created")
+                continue
+            entries.append((line_number, MealEntry(
+                user_id=user_id,
+                daily_log_id=log_ids[data.date],
+                date=data.date,
+                meal_type=data.meal_type,
+                ingredients=ingredients,
+                recipe_id=data.recipe_id,
+                recipe_name=recipe_name,
+                total_macros=_compute_meal_macros(ingredients),
+                note=data.note,
+            )))
+
+        if not entries:
+            return []
+
+        failed_indexes = set()
+        try:
+            await collection.insert_many(
+                [entry.model_dump(by_alias=True) for _, entry in entries],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed_indexes.add(error["index"])
+                reject(entries[error["index"]][0], error.get("errmsg", "Failed to insert meal entry"))
+
+        return [
+            entry.date for index, (_, entry) in enumerate(entries)
+            if index not in failed_indexes
+        ]
+
+    @staticmethod
+    async def export_meal_entries(
+        user_id: str,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream a user's meal entries as NDJSON lines, oldest first.
+
+        Documents are read through a single cursor in batches of
+        ``MEAL_EXPORT_BATCH_SIZE`` so the history is never held in memory.
+        """
+        db = get_database()
+        collection = db[settings.MEAL_ENTRIES_COLLECTION]
+
+        query: dict = {"user_id": user_id}
+        date_range = {}
+        if date_from:
+            date_range["$gte"] = date_from
+        if date_to:
+            date_range["$lte"] = date_to
+        if date_range:
+            query["date"] = date_range
+
+        cursor = collection.find(query).sort([("date", 1), ("_created_at", 1)])
+        cursor = cursor.batch_size(settings.MEAL_EXPORT_BATCH_SIZE)
+        async for meal in cursor:
+            yield MealEntry(**meal).model_dump_json(by_alias=True) + "\n"
+
     @staticmethod
     async def get_meal_entry(entry_id: str, user_id: str) -> Optional[MealEntry]:
         """Get a meal entry by ID (only if it belongs to this user)."""
@@ -332,13 +628,34 @@ class MealEntryService:
         meals = await cursor.to_list(length=50)
         return [MealEntry(**meal) for meal in meals]
 
+    @staticmethod
+    async def count_meals_by_date(
+        user_id: str,
+        date_from: str,
+        date_to: str
+    ) -> Dict[str, int]:
+        """Count meal entries per date within a range using a single aggregation."""
+        db = get_database()
+        collection = db[settings.MEAL_ENTRIES_COLLECTION]
+
+        pipeline = [
+            {"$match": {
+                "user_id": user_id,
+                "date": {"$gte": date_from, "$lte": date_to}
+            }},
+            {"$group": {"_id": "$date", "count": {"$sum": 1}}},
+        ]
+        cursor = collection.aggregate(pipeline)
+        counts = await cursor.to_list(length=None)
+        return {item["_id"]: item["count"] for item in counts}
+
     @staticmethod
     async def update_meal_entry(
         entry_id: str,
         update_data: MealEntryUpdate,
         user_id: str
     ) -> Optional[MealEntry]:
-        """Update a meal entry and recalculate totals.
+        """Update a meal entry and apply the macro change to the daily totals.
 
         If a new recipe_id is provided, re-resolves ingredients from recipe-service.
         If new ingredients are provided, re-resolves their macros.
@@ -368,32 +685,237 @@ class MealEntryService:
             updates["total_macros"] = _compute_meal_macros(resolved).model_dump()
             updates["ingredients"] = [ing.model_dump() for ing in resolved]
 
-        if updates:
-            updates["_updated_at"] = datetime.utcnow()
-            await collection.update_one({"_id": entry_id}, {"$set": updates})
+        if not updates:
+            return MealEntry(**existing)
 
-            # Recalculate daily totals
-            await DailyLogService.recalculate_daily_totals(user_id, existing["date"])
+        updates["_updated_at"] = datetime.utcnow()
+        # The pre-image holds the macros actually replaced, even under concurrent updates
+        previous = await collection.find_one_and_update(
+            {"_id": entry_id, "user_id": user_id},
+            {"$set": updates},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not previous:
+            return None
 
-            updated = await collection.find_one({"_id": entry_id})
-            if updated:
-                return MealEntry(**updated)
+        if "total_macros" in updates:
+            delta = _macro_delta(updates["total_macros"], previous.get("total_macros"))
+            await DailyLogService.apply_macro_delta(user_id, previous["date"], delta)
 
-        return MealEntry(**existing)
+        return MealEntry(**{**previous, **updates})
 
     @staticmethod
     async def delete_meal_entry(entry_id: str, user_id: str) -> bool:
-        """Delete a meal entry and recalculate daily totals."""
+        """Delete a meal entry and subtract its macros from the daily totals."""
         db = get_database()
         collection = db[settings.MEAL_ENTRIES_COLLECTION]
 
-        existing = await collection.find_one({"_id": entry_id, "user_id": user_id})
-        if not existing:
+        deleted = await collection.find_one_and_delete({"_id": entry_id, "user_id": user_id})
+        if not deleted:
             return False
 
-        result = await collection.delete_one({"_id": entry_id, "user_id": user_id})
-        if result.deleted_count > 0:
-            await DailyLogService.recalculate_daily_totals(user_id, existing["date"])
-            logger.info(f"Deleted meal entry {entry_id}")
-            return True
-        return False
+        delta = _macro_delta({}, deleted.get("total_macros"))
+        await DailyLogService.apply_macro_delta(user_id, deleted["date"], delta)
+        logger.info(f"Deleted meal entry {entry_id}")
+        return True
+
+
+# ── Rollups ────────────────────────────────────────────────────────────
+
+GOAL_FIELDS = ("calorie_goal", "protein_goal", "carbs_goal", "fats_goal")
+
+
+def period_bounds(period: RollupPeriod, day: str) -> Tuple[str, str]:
+    """First and last day (YYYY-MM-DD) of the ISO week or calendar month containing ``day``."""
+    current = date_type.fromisoformat(day)
+    if period == RollupPeriod.WEEK:
+        start = current - timedelta(days=current.weekday())
+        # The last week of year 9999 is cut short at date.max
+        end = start + min(timedelta(days=6), date_type.max - start)
+    else:
+        start = current.replace(day=1)
+        end = current.replace(day=calendar.monthrange(current.year, current.month)[1])
+    return start.isoformat(), end.isoformat()
+
+
+def count_periods(period: RollupPeriod, date_from: str, date_to: str) -> int:
+    """Number of periods overlapping [date_from, date_to], without building them."""
+    start, end = date_type.fromisoformat(date_from), date_type.fromisoformat(date_to)
+    if period == RollupPeriod.WEEK:
+        first_monday = start - timedelta(days=start.weekday())
+        last_monday = end - timedelta(days=end.weekday())
+        return (last_monday - first_monday).days // 7 + 1
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def periods_in_range(period: RollupPeriod, date_from: str, date_to: str) -> List[Tuple[str, str]]:
+    """All periods overlapping [date_from, date_to], oldest first."""
+    periods = []
+    start, end = period_bounds(period, date_from)
+    while start <= date_to:
+        periods.append((start, end))
+        if end == date_type.max.isoformat():
+            break
+        next_day = (date_type.fromisoformat(end) + timedelta(days=1)).isoformat()
+        start, end = period_bounds(period, next_day)
+    return periods
+
+
+class RollupService:
+    """Service for weekly / monthly nutrition rollups.
+
+    Rollups are maintained lazily: meal and goal writes only flag the week and
+    month of the affected day as stale (one bulk write), reads recompute stale
+    or missing periods from daily logs in a single pass and persist them.
+
+    Every stale mark bumps the document ``revision``. A recomputation is only
+    saved if the revision it read is unchanged, so a write landing while the
+    rollup is being computed keeps it stale instead of being overwritten.
+    """
+
+    @staticmethod
+    async def mark_stale(user_id: str, date: str) -> None:
+        """Flag the week and month containing ``date`` for recomputation."""
+        try:
+            db = get_database()
+            collection = db[settings.ROLLUPS_COLLECTION]
+            # Upsert, so a period that is being computed for the first time is invalidated too
+            await collection.bulk_write([
+                UpdateOne(
+                    {"user_id": user_id, "period": period.value, "period_start": period_bounds(period, date)[0]},
+                    {
+                        "$set": {"stale": True},
+                        "$inc": {"revision": 1},
+                        "$setOnInsert": {"_id": str(uuid.uuid4())},
+                    },
+                    upsert=True
+                )
+                for period in RollupPeriod
+            ], ordered=False)
+        except Exception as e:
+            logger.error(f"Error marking rollups stale for user {user_id} on {date}: {str(e)}")
+
+    @staticmethod
+    async def get_rollups(
+        user_id: str,
+        period: RollupPeriod,
+        date_from: str,
+        date_to: str
+    ) -> List[NutritionRollup]:
+        """Rollups of all periods overlapping the range, newest first."""
+        db = get_database()
+        collection = db[settings.ROLLUPS_COLLECTION]
+
+        periods = periods_in_range(period, date_from, date_to)
+        cursor = collection.find({
+            "user_id": user_id,
+            "period": period.value,
+            "period_start": {"$in": [start for start, _ in periods]},
+        })
+        docs = await cursor.to_list(length=len(periods))
+        revisions = {doc["period_start"]: doc.get("revision", 0) for doc in docs}
+        rollups = {doc["period_start"]: NutritionRollup(**doc) for doc in docs if not doc.get("stale")}
+
+        missing = [bounds for bounds in periods if bounds[0] not in rollups]
+        if missing:
+            computed = await RollupService.compute_rollups(user_id, period, missing)
+            for rollup in computed:
+                rollup.revision = revisions.get(rollup.period_start, 0)
+            await RollupService._save(computed)
+            rollups.update({rollup.period_start: rollup for rollup in computed})
+
+        return [rollups[start] for start, _ in reversed(periods)]
+
+    @staticmethod
+    async def compute_rollups(
+        user_id: str,
+        period: RollupPeriod,
+        periods: List[Tuple[str, str]]
+    ) -> List[NutritionRollup]:
+        """Aggregate daily logs of the given periods in one vectorized pass."""
+        db = get_database()
+        collection = db[settings.DAILY_LOG_COLLECTION]
+
+        date_from, date_to = periods[0][0], periods[-1][1]
+        cursor = collection.find(
+            {"user_id": user_id, "date": {"$gte": date_from, "$lte": date_to}},
+            {"date": 1, "total_macros": 1, **{field: 1 for field in GOAL_FIELDS}}
+        )
+        logs = await cursor.to_list(length=None)
+        meal_counts = await MealEntryService.count_meals_by_date(user_id, date_from, date_to)
+
+        wanted = {start for start, _ in periods}
+        logs = [log for log in logs if period_bounds(period, log["date"])[0] in wanted]
+        keys = [period_bounds(period, log["date"])[0] for log in logs]
+
+        macros = nutrition_engine.macros_matrix(log.get("total_macros") for log in logs)
+        meals = np.array([meal_counts.get(log["date"], 0) for log in logs], dtype=np.float64).reshape(-1, 1)
+        logged = (meals > 0).astype(np.float64)
+        goals = np.array(
+            [[log.get(field) or np.nan for field in GOAL_FIELDS] for log in logs],
+            dtype=np.float64
+        ).reshape(-1, len(GOAL_FIELDS))
+
+        # Adherence only counts days that have meals and a goal for that macro
+        with np.errstate(invalid="ignore", divide="ignore"):
+            adherence = np.where(logged > 0, macros / goals * 100.0, np.nan)
+
+        totals = nutrition_engine.group_totals(keys, macros)
+        counts = nutrition_engine.group_totals(keys, np.hstack([logged, meals]))
+        adherence_means = nutrition_engine.group_nanmean(keys, adherence)
+
+        rollups = []
+        for start, end in periods:
+            total = totals.get(start, np.zeros(len(nutrition_engine.MACRO_FIELDS)))
+            days_logged, meals_count = counts.get(start, np.zeros(2))
+            average = np.round(total / days_logged, 2) if days_logged else np.zeros_like(total)
+            adherence_row = adherence_means.get(start, np.full(len(GOAL_FIELDS), np.nan))
+
+            rollups.append(NutritionRollup(
+                user_id=user_id,
+                period=period,
+                period_start=start,
+                period_end=end,
+                total_macros=nutrition_engine.to_macro_nutrients(total),
+                average_macros=nutrition_engine.to_macro_nutrients(average),
+                days_logged=int(days_logged),
+                meals_count=int(meals_count),
+                goal_adherence=GoalAdherence(**{
+                    field: None if np.isnan(value) else round(float(value), 1)
+                    for field, value in zip(nutrition_engine.MACRO_FIELDS, adherence_row)
+                }),
+            ))
+        return rollups
+
+    @staticmethod
+    async def _save(rollups: List[NutritionRollup]) -> None:
+        """Upsert recomputed rollups whose revision is unchanged, failures are only logged."""
+        if not rollups:
+            return
+        try:
+            db = get_database()
+            collection = db[settings.ROLLUPS_COLLECTION]
+            operations = []
+            for rollup in rollups:
+                doc = rollup.model_dump(by_alias=True, mode="python")
+                rollup_id = doc.pop("_id")
+                operations.append(UpdateOne(
+                    {
+                        "user_id": rollup.user_id,
+                        "period": rollup.period.value,
+                        "period_start": rollup.period_start,
+                        # Documents written before revisions existed have no field
+                        "revision": rollup.revision or {"$in": [0, None]},
+                    },
+                    {"$set": doc, "$setOnInsert": {"_id": rollup_id}},
+                    upsert=True
+                ))
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # A duplicate key means the revision moved on: the period was marked stale
+            # again during the computation and stays stale for the next read
+            errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != 11000]
+            if errors:
+                logger.error(f"Error saving nutrition rollups: {errors}")
+        except Exception as e:
+            logger.error(f"Error saving nutrition rollups: {str(e)}")
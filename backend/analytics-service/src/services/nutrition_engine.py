@@ -0,0 +1,79 @@
+"""
+Vectorized nutrition computation.
+
+Macro math works on NumPy arrays instead of per-ingredient Python loops:
+ingredients are rows of a ``(n, 4)`` matrix whose columns follow
+``MACRO_FIELDS``, so a meal, a day or a whole history is summed in one pass.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.meal_entry import MacroNutrients
+from common.units import UNIT_TO_GRAMS
+
+MACRO_FIELDS: Tuple[str, ...] = ("calories", "proteins", "carbs", "fats")
+
+
+def macros_matrix(macros: Iterable[Optional[dict]]) -> np.ndarray:
+    """Stack macro dicts (or None for unknown macros) into an ``(n, 4)`` float matrix."""
+    rows = [
+        [(item or {}).get(field, 0) or 0 for field in MACRO_FIELDS]
+        for item in macros
+    ]
+    return np.array(rows, dtype=np.float64).reshape(-1, len(MACRO_FIELDS))
+
+
+def unit_factors(units: Sequence[str]) -> np.ndarray:
+    """Grams per unit for each entry, unknown units count as grams."""
+    return np.array([UNIT_TO_GRAMS.get(unit, 1.0) for unit in units], dtype=np.float64)
+
+
+def to_grams(quantities: Sequence[float], factors: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert quantities to grams, rounded like ``convert_to_grams``."""
+    grams = np.asarray(quantities, dtype=np.float64)
+    if factors is not None:
+        grams = grams * factors
+    return np.round(grams, 2)
+
+
+def scale_per_hundred(grams: np.ndarray, per_hundred: np.ndarray) -> np.ndarray:
+    """Macros of each ingredient for its quantity, from macros per 100 g."""
+    return np.round(per_hundred * (grams / 100.0)[:, None], 2)
+
+
+def total(matrix: np.ndarray) -> np.ndarray:
+    """Column totals of a macro matrix."""
+    return np.round(matrix.sum(axis=0), 2)
+
+
+def group_totals(keys: Sequence[str], matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Totals per key (e.g. per date or per meal) in one pass over the matrix."""
+    if len(keys) == 0:
+        return {}
+    unique, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    sums = np.zeros((len(unique), matrix.shape[1]), dtype=np.float64)
+    np.add.at(sums, inverse, matrix)
+    sums = np.round(sums, 2)
+    return {str(key): sums[i] for i, key in enumerate(unique)}
+
+
+def group_nanmean(keys: Sequence[str], matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-key column means ignoring NaN cells, NaN where a key has no values."""
+    if len(keys) == 0:
+        return {}
+    unique, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    present = ~np.isnan(matrix)
+    sums = np.zeros((len(unique), matrix.shape[1]), dtype=np.float64)
+    counts = np.zeros_like(sums)
+    np.add.at(sums, inverse, np.where(present, matrix, 0.0))
+    np.add.at(counts, inverse, present.astype(np.float64))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return {str(key): means[i] for i, key in enumerate(unique)}
+
+
+def to_macro_nutrients(vector: np.ndarray) -> MacroNutrients:
+    return MacroNutrients(**{field: float(value) for field, value in zip(MACRO_FIELDS, vector)})
+
@@ -3,10 +3,19 @@ HTTP client for communicating with recipe-service.
 
 Fetches recipe details and ingredient macro data so that
 analytics-service can compute nutrition totals server-side.
+
+Responses are cached per process for RECIPE_CACHE_TTL_SECONDS and
+INGREDIENT_CACHE_TTL_SECONDS. Recipe-service does not notify this service of
+edits, so a changed recipe or ingredient may be served with its old macros
+until the entry expires. Meal entries are snapshots anyway: already logged
+meals keep the macros they were logged with.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
 import httpx
 
@@ -17,21 +26,71 @@ logger = logging.getLogger(__name__)
 # Reusable async client — created lazily, closed on shutdown.
 _client: Optional[httpx.AsyncClient] = None
 
-# ── Conversion table to grams ──────────────────────────────────────────
-# Used when recipe-service stores ingredient quantities in non-gram units.
-UNIT_TO_GRAMS: Dict[str, float] = {
-    "g": 1.0,
-    "kg": 1000.0,
-    "ml": 1.0,   
-    "l": 1000.0,
-    "tsp": 5.0,
-    "tbsp": 15.0,
-    "cup": 240.0,
-    "oz": 28.3495,
-    "lb": 453.592,
-    "pcs": 100.0,
-}
+# ── Response cache ─────────────────────────────────────────────────────
+
+class AsyncTTLCache:
+    """Bounded LRU cache with per-entry TTL and request coalescing.
+
+    Concurrent misses for the same key share a single in-flight fetch.
+    ``None`` results (not found / upstream errors) are never cached.
+    """
 
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Optional[Any]:
+        """Return the cached value or run ``fetch`` once for all concurrent callers."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, fetch: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        value = await fetch()
+        if value is not None:
+            self.put(key, value)
+        return value
+
+
+_recipe_cache = AsyncTTLCache(settings.RECIPE_CACHE_SIZE, settings.RECIPE_CACHE_TTL_SECONDS)
+_ingredient_cache = AsyncTTLCache(settings.INGREDIENT_CACHE_SIZE, settings.INGREDIENT_CACHE_TTL_SECONDS)
+
+
+# ── HTTP client ────────────────────────────────────────────────────────
 
 def _get_client() -> httpx.AsyncClient:
     global _client
@@ -60,9 +119,13 @@ async def close_client() -> None:
 
 async def fetch_recipe(recipe_id: str) -> Optional[Dict[str, Any]]:
     """
-    GET /recipes/{recipe_id} from recipe-service.
+    GET /recipes/{recipe_id} from recipe-service, served from the TTL cache when possible.
     Returns the raw recipe dict or None on failure.
     """
+    return await _recipe_cache.get_or_fetch(recipe_id, lambda: _request_recipe(recipe_id))
+
+
+async def _request_recipe(recipe_id: str) -> Optional[Dict[str, Any]]:
     client = _get_client()
     try:
         resp = await client.get(
@@ -82,52 +145,56 @@ async def fetch_recipe(recipe_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-async def fetch_ingredient(ingredient_id: str) -> Optional[Dict[str, Any]]:
-    """
-    GET /recipes/ingredients/{ingredient_id} from recipe-service.
-    Returns the raw ingredient dict or None on failure.
-    """
+async def _request_ingredients_bulk(ingredient_ids: List[str]) -> List[Dict[str, Any]]:
+    """POST /recipes/internal/ingredients/bulk – one $in lookup for a batch of IDs."""
     client = _get_client()
     try:
-        resp = await client.get(
-            f"/recipes/internal/ingredients/{ingredient_id}",
+        resp = await client.post(
+            "/recipes/internal/ingredients/bulk",
+            json={"ids": ingredient_ids},
             headers=_internal_headers(),
         )
         if resp.status_code == 200:
             return resp.json()
         logger.warning(
-            "recipe-service returned %s for ingredient %s: %s",
+            "recipe-service returned %s for %d bulk ingredients: %s",
             resp.status_code,
-            ingredient_id,
+            len(ingredient_ids),
             resp.text,
         )
     except httpx.HTTPError as exc:
-        logger.error("Failed to fetch ingredient %s: %s", ingredient_id, exc)
-    return None
+        logger.error("Failed to fetch %d ingredients in bulk: %s", len(ingredient_ids), exc)
+    return []
 
 
 async def fetch_ingredients_bulk(ingredient_ids: List[str]) -> Dict[str, Dict[str, Any]]:
     """
-    Fetch multiple ingredients in parallel.
+    Resolve multiple ingredients, serving cached ones locally and fetching
+    the rest through the bulk endpoint in batches of INGREDIENT_BULK_BATCH_SIZE.
     Returns a dict mapping ingredient_id → ingredient data.
     """
-    import asyncio
-
     results: Dict[str, Dict[str, Any]] = {}
-
-    async def _fetch_one(iid: str):
-        data = await fetch_ingredient(iid)
-        if data:
-            results[iid] = data
-
-    await asyncio.gather(*[_fetch_one(iid) for iid in set(ingredient_ids)])
+    missing: List[str] = []
+    for iid in dict.fromkeys(ingredient_ids):
+        cached = _ingredient_cache.get(iid)
+        if cached is not None:
+            results[iid] = cached
+        else:
+            missing.append(iid)
+
+    if not missing:
+        return results
+
+    batch_size = settings.INGREDIENT_BULK_BATCH_SIZE
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    responses = await asyncio.gather(*[_request_ingredients_bulk(batch) for batch in batches])
+
+    requested = set(missing)
+    for ingredients in responses:
+        for data in ingredients:
+            iid = data.get("_id") or data.get("id")
+            if iid in requested:
+                _ingredient_cache.put(iid, data)
+                results[iid] = data
     return results
 
-
-def convert_to_grams(quantity: float, unit: str) -> float:
-    """
-    Convert a quantity in any CapacityUnit to grams using the lookup table.
-    Falls back to treating the value as grams when the unit is unknown.
-    """
-    factor = UNIT_TO_GRAMS.get(unit, 1.0)
-    return round(quantity * factor, 2)
@@ -1,4 +1,5 @@
 import re
+from datetime import date
 from fastapi import HTTPException
 
 from src.validators.meal_entry import (
@@ -6,12 +7,15 @@ from src.validators.meal_entry import (
     MealEntryCreate,
     MealEntryUpdate,
     MealEntryResponse,
+    MealImportError,
+    MealImportResult,
 )
 from src.validators.daily_log import (
     DailyGoalsUpdate,
     DailyLogResponse,
     DailySummary,
 )
+from src.validators.rollup import NutritionRollupResponse
 
 
 def validate_date_format(date_str: str) -> str:
@@ -22,6 +26,10 @@ def validate_date_format(date_str: str) -> str:
             status_code=400,
             detail="Invalid date format. Expected YYYY-MM-DD"
         )
+    try:
+        date.fromisoformat(date_str)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {date_str}")
     return date_str
 
 
@@ -102,3 +102,17 @@ class MealEntryResponse(BaseModel):
     updated_at: datetime = Field(..., alias="_updated_at")
 
     model_config = ConfigDict(populate_by_name=True)
+
+
+class MealImportError(BaseModel):
+    """A single NDJSON line that could not be imported"""
+    line: int = Field(..., description="1-based line number in the uploaded NDJSON")
+    detail: str
+
+
+class MealImportResult(BaseModel):
+    """Response schema – summary of a bulk NDJSON meal import"""
+    imported: int = 0
+    failed: int = 0
+    days_updated: int = 0
+    errors: List[MealImportError] = Field(default_factory=list)
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, ConfigDict
+
+from src.models.meal_entry import MacroNutrients
+from src.models.rollup import GoalAdherence, RollupPeriod
+
+
+class NutritionRollupResponse(BaseModel):
+    """Response schema – weekly or monthly nutrition rollup"""
+    period: RollupPeriod
+    period_start: str
+    period_end: str
+    total_macros: MacroNutrients
+    average_macros: MacroNutrients
+    days_logged: int
+    meals_count: int
+    goal_adherence: GoalAdherence
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "period": "week",
+                "period_start": "2026-02-09",
+                "period_end": "2026-02-15",
+                "total_macros": {"calories": 12950.0, "proteins": 980.0, "carbs": 1400.0, "fats": 385.0},
+                "average_macros": {"calories": 1850.0, "proteins": 140.0, "carbs": 200.0, "fats": 55.0},
+                "days_logged": 7,
+                "meals_count": 24,
+                "goal_adherence": {"calories": 84.1, "proteins": 93.3, "carbs": None, "fats": None},
+            }
+        }
+    )
@@ -85,16 +85,14 @@ def test_get_daily_log_returns_400_for_invalid_date(mock_get_log, client):
     mock_get_log.assert_not_awaited()
 
 
-@patch("src.api.routes.MealEntryService.get_meals_for_date", new_callable=AsyncMock)
+@patch("src.api.routes.MealEntryService.count_meals_by_date", new_callable=AsyncMock)
 @patch("src.api.routes.DailyLogService.get_daily_logs_range", new_callable=AsyncMock)
-def test_get_daily_logs_range_success(mock_get_logs_range, mock_get_meals, client):
+def test_get_daily_logs_range_success(mock_get_logs_range, mock_count_meals, client):
     first_log = _sample_daily_log(user_id="gateway-user", date="2026-03-19")
     second_log = _sample_daily_log(user_id="gateway-user", date="2026-03-20")
 
-    first_meal = _sample_meal(user_id="gateway-user", date="2026-03-19", daily_log_id=first_log.id)
-
     mock_get_logs_range.return_value = [first_log, second_log]
-    mock_get_meals.side_effect = [[first_meal], []]
+    mock_count_meals.return_value = {"2026-03-19": 1}
 
     response = client.get(
         "/analytics/daily",
@@ -118,6 +116,7 @@ def test_get_daily_logs_range_success(mock_get_logs_range, mock_get_meals, clien
         },
     ]
     mock_get_logs_range.assert_awaited_once_with("gateway-user", "2026-03-19", "2026-03-20")
+    mock_count_meals.assert_awaited_once_with("gateway-user", "2026-03-19", "2026-03-20")
 
 
 @patch("src.api.routes.DailyLogService.get_daily_logs_range", new_callable=AsyncMock)
@@ -169,3 +168,38 @@ def test_update_daily_goals_returns_500_when_service_fails(mock_update_goals, cl
 
     assert response.status_code == 500
     assert response.json()["detail"] == "Failed to update goals"
+
+
+@patch("src.api.routes.MealEntryService.get_meals_for_date", new_callable=AsyncMock)
+@patch("src.api.routes.DailyLogService.recalculate_daily_totals", new_callable=AsyncMock)
+@patch("src.api.routes.DailyLogService.get_daily_log", new_callable=AsyncMock)
+def test_recalculate_daily_totals_success(mock_get_log, mock_recalculate, mock_get_meals, client):
+    log = _sample_daily_log(user_id="gateway-user", date="2026-03-20")
+    meal = _sample_meal(user_id="gateway-user", date="2026-03-20", daily_log_id=log.id)
+
+    mock_get_log.return_value = log
+    mock_get_meals.return_value = [meal]
+
+    response = client.post(
+        "/analytics/daily/2026-03-20/recalculate",
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == _daily_log_response_payload(log, [meal])
+    mock_recalculate.assert_awaited_once_with("gateway-user", "2026-03-20")
+
+
+@patch("src.api.routes.DailyLogService.recalculate_daily_totals", new_callable=AsyncMock)
+@patch("src.api.routes.DailyLogService.get_daily_log", new_callable=AsyncMock)
+def test_recalculate_daily_totals_returns_404_when_log_missing(mock_get_log, mock_recalculate, client):
+    mock_get_log.return_value = None
+
+    response = client.post(
+        "/analytics/daily/2026-03-20/recalculate",
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Daily log not found"
+    mock_recalculate.assert_not_awaited()
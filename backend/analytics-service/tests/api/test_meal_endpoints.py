@@ -1,6 +1,8 @@
+import json
 from unittest.mock import AsyncMock, patch
 
 from src.models.meal_entry import MacroNutrients, MealEntry, MealIngredient, MealType
+from src.validators.meal_entry import MealImportResult
 
 
 def _sample_meal(*, user_id: str, date: str, daily_log_id: str) -> MealEntry:
@@ -190,3 +192,84 @@ def test_delete_meal_entry_not_found(mock_delete_meal_entry, client):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Meal entry not found or you don't have permission to delete it"
+
+
+@patch("src.api.routes.MealEntryService.import_meal_entries", new_callable=AsyncMock)
+def test_import_meal_entries_streams_body_to_service(mock_import, client):
+    received = {}
+
+    async def fake_import(user_id, chunks):
+        received["user_id"] = user_id
+        received["body"] = b"".join([chunk async for chunk in chunks])
+        return MealImportResult(imported=2, days_updated=1)
+
+    mock_import.side_effect = fake_import
+    body = (
+        '{"date": "2026-03-20", "meal_type": "breakfast", "recipe_id": "recipe-1"}\n'
+        '{"date": "2026-03-20", "meal_type": "lunch", "recipe_id": "recipe-2"}\n'
+    )
+
+    response = client.post(
+        "/analytics/meals/import",
+        content=body,
+        headers={"X-User-Id": "gateway-user", "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"imported": 2, "failed": 0, "days_updated": 1, "errors": []}
+    assert received == {"user_id": "gateway-user", "body": body.encode()}
+
+
+@patch("src.api.routes.MealEntryService.import_meal_entries", new_callable=AsyncMock)
+def test_import_meal_entries_returns_500_for_unexpected_error(mock_import, client):
+    mock_import.side_effect = RuntimeError("db down")
+
+    response = client.post(
+        "/analytics/meals/import",
+        content=b"{}\n",
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to import meal entries"
+
+
+@patch("src.api.routes.MealEntryService.export_meal_entries")
+def test_export_meal_entries_streams_ndjson(mock_export, client):
+    entry = _sample_meal(user_id="gateway-user", date="2026-03-20", daily_log_id="log-1")
+
+    async def fake_export(user_id, date_from, date_to):
+        yield entry.model_dump_json(by_alias=True) + "\n"
+
+    mock_export.side_effect = fake_export
+
+    response = client.get(
+        "/analytics/meals/export",
+        params={"date_from": "2026-03-01", "date_to": "2026-03-31"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == _meal_payload(entry)
+    mock_export.assert_called_once_with("gateway-user", "2026-03-01", "2026-03-31")
+
+
+@patch("src.api.routes.MealEntryService.export_meal_entries")
+def test_export_meal_entries_validates_dates(mock_export, client):
+    invalid_format = client.get(
+        "/analytics/meals/export",
+        params={"date_from": "20-03-2026"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+    invalid_range = client.get(
+        "/analytics/meals/export",
+        params={"date_from": "2026-03-31", "date_to": "2026-03-01"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert invalid_format.status_code == 400
+    assert invalid_range.status_code == 400
+    mock_export.assert_not_called()
@@ -0,0 +1,122 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.models.meal_entry import MacroNutrients
+from src.models.rollup import GoalAdherence, NutritionRollup, RollupPeriod
+
+
+def _rollup(period: RollupPeriod, start: str, end: str) -> NutritionRollup:
+    return NutritionRollup(
+        user_id="gateway-user",
+        period=period,
+        period_start=start,
+        period_end=end,
+        total_macros=MacroNutrients(calories=14000.0, proteins=980.0, carbs=1400.0, fats=385.0),
+        average_macros=MacroNutrients(calories=2000.0, proteins=140.0, carbs=200.0, fats=55.0),
+        days_logged=7,
+        meals_count=21,
+        goal_adherence=GoalAdherence(calories=90.9),
+    )
+
+
+@patch("src.api.routes.RollupService.get_rollups", new_callable=AsyncMock)
+def test_get_weekly_rollups_success(mock_get_rollups, client):
+    rollup = _rollup(RollupPeriod.WEEK, "2026-03-16", "2026-03-22")
+    mock_get_rollups.return_value = [rollup]
+
+    response = client.get(
+        "/analytics/weekly",
+        params={"date_from": "2026-03-16", "date_to": "2026-03-20"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body[0]["period"] == "week"
+    assert body[0]["period_start"] == "2026-03-16"
+    assert body[0]["average_macros"]["calories"] == 2000.0
+    assert body[0]["goal_adherence"] == {"calories": 90.9, "proteins": None, "carbs": None, "fats": None}
+    assert "user_id" not in body[0]
+    mock_get_rollups.assert_awaited_once_with("gateway-user", RollupPeriod.WEEK, "2026-03-16", "2026-03-20")
+
+
+@patch("src.api.routes.RollupService.get_rollups", new_callable=AsyncMock)
+def test_get_monthly_rollups_success(mock_get_rollups, client):
+    mock_get_rollups.return_value = [_rollup(RollupPeriod.MONTH, "2026-03-01", "2026-03-31")]
+
+    response = client.get(
+        "/analytics/monthly",
+        params={"date_from": "2026-03-01", "date_to": "2026-03-31"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()[0]["period"] == "month"
+    mock_get_rollups.assert_awaited_once_with("gateway-user", RollupPeriod.MONTH, "2026-03-01", "2026-03-31")
+
+
+@patch("src.api.routes.RollupService.get_rollups", new_callable=AsyncMock)
+def test_get_rollups_rejects_too_long_range(mock_get_rollups, client):
+    with patch("src.api.routes.settings.ROLLUP_MAX_PERIODS", 2):
+        response = client.get(
+            "/analytics/monthly",
+            params={"date_from": "2026-01-01", "date_to": "2026-03-31"},
+            headers={"X-User-Id": "gateway-user"},
+        )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Date range spans more than 2 months"
+    mock_get_rollups.assert_not_awaited()
+
+
+@patch("src.api.routes.RollupService.get_rollups", new_callable=AsyncMock)
+def test_get_rollups_validates_dates_and_handles_errors(mock_get_rollups, client):
+    invalid = client.get(
+        "/analytics/weekly",
+        params={"date_from": "2026-03-20", "date_to": "2026-03-01"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+    mock_get_rollups.side_effect = RuntimeError("db down")
+    failed = client.get(
+        "/analytics/weekly",
+        params={"date_from": "2026-03-01", "date_to": "2026-03-20"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert invalid.status_code == 400
+    assert failed.status_code == 500
+    assert failed.json()["detail"] == "Failed to get nutrition rollups"
+
+
+@pytest.mark.parametrize(
+    "path, date_from, date_to",
+    [
+        ("/analytics/weekly", "2026-02-30", "2026-03-10"),
+        ("/analytics/weekly", "0001-01-01", "9999-12-30"),
+        ("/analytics/monthly", "2026-13-01", "2026-12-31"),
+    ],
+)
+@patch("src.api.routes.RollupService.get_rollups", new_callable=AsyncMock)
+def test_get_rollups_rejects_impossible_and_huge_ranges(mock_get_rollups, client, path, date_from, date_to):
+    response = client.get(
+        path,
+        params={"date_from": date_from, "date_to": date_to},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 400
+    mock_get_rollups.assert_not_awaited()
+
+
+@patch("src.api.routes.RollupService.get_rollups", new_callable=AsyncMock)
+def test_get_rollups_accepts_last_supported_month(mock_get_rollups, client):
+    mock_get_rollups.return_value = []
+
+    response = client.get(
+        "/analytics/monthly",
+        params={"date_from": "9999-11-01", "date_to": "9999-12-31"},
+        headers={"X-User-Id": "gateway-user"},
+    )
+
+    assert response.status_code == 200
@@ -1,15 +1,19 @@
+import asyncio
+import logging
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from src.models.daily_log import DailyLog
 from src.models.meal_entry import MacroNutrients, MealEntry, MealIngredient, MealType
 from src.services.analytics_service import (
     DailyLogService,
     MealEntryService,
-    _compute_macros_for_quantity,
     _compute_meal_macros,
+    _fetch_recipes,
     _resolve_ingredients_from_recipe,
     _resolve_manual_ingredients,
 )
@@ -46,18 +50,6 @@ def _meal_doc(entry_id: str = "entry-1", user_id: str = "user-1", date: str = "2
     ).model_dump(by_alias=True)
 
 
-def test_compute_macros_for_quantity_scales_values():
-    result = _compute_macros_for_quantity(
-        {"calories": 100, "proteins": 10, "carbs": 20, "fats": 5},
-        250.0,
-    )
-
-    assert result.calories == 250.0
-    assert result.proteins == 25.0
-    assert result.carbs == 50.0
-    assert result.fats == 12.5
-
-
 def test_compute_meal_macros_sums_model_and_object_variants():
     item_model = MealIngredient(
         ingredient_id="ing-1",
@@ -78,13 +70,12 @@ def test_compute_meal_macros_sums_model_and_object_variants():
 
 
 @pytest.mark.asyncio
-@patch("src.services.analytics_service.convert_to_grams")
 @patch("src.services.analytics_service.fetch_ingredients_bulk", new_callable=AsyncMock)
 @patch("src.services.analytics_service.fetch_recipe", new_callable=AsyncMock)
-async def test_resolve_ingredients_from_recipe_success(mock_fetch_recipe, mock_fetch_bulk, mock_convert):
+async def test_resolve_ingredients_from_recipe_success(mock_fetch_recipe, mock_fetch_bulk):
     mock_fetch_recipe.return_value = {
         "name": "Recipe X",
-        "ingredients": [{"ingredient_id": "ing-1", "quantity": 2, "capacity": "kg"}],
+        "ingredients": [{"ingredient_id": "ing-1", "quantity": 0.5, "capacity": "kg"}],
     }
     mock_fetch_bulk.return_value = {
         "ing-1": {
@@ -92,8 +83,6 @@ async def test_resolve_ingredients_from_recipe_success(mock_fetch_recipe, mock_f
             "macro_per_hundred": {"calories": 100, "proteins": 2, "carbs": 22, "fats": 0.5},
         }
     }
-    mock_convert.return_value = 500.0
-
     ingredients, recipe_name = await _resolve_ingredients_from_recipe("recipe-1")
 
     assert recipe_name == "Recipe X"
@@ -103,6 +92,35 @@ async def test_resolve_ingredients_from_recipe_success(mock_fetch_recipe, mock_f
     assert ingredients[0].macros.calories == 500.0
 
 
+@pytest.mark.asyncio
+@patch("src.services.analytics_service.fetch_ingredients_bulk", new_callable=AsyncMock)
+@patch("src.services.analytics_service.fetch_recipe", new_callable=AsyncMock)
+async def test_resolve_ingredients_from_recipe_uses_precomputed_nutrition(mock_fetch_recipe, mock_fetch_bulk):
+    mock_fetch_recipe.return_value = {
+        "name": "Recipe Z",
+        "ingredients": [{"ingredient_id": "ing-1", "quantity": 2, "capacity": "kg"}],
+        "nutrition": {
+            "total": {"calories": 2000, "carbs": 440, "proteins": 40, "fats": 10},
+            "per_serving": {"calories": 1000, "carbs": 220, "proteins": 20, "fats": 5},
+            "ingredients": [
+                {
+                    "ingredient_id": "ing-1",
+                    "name": "Rice",
+                    "quantity": 2000.0,
+                    "macros": {"calories": 2000, "carbs": 440, "proteins": 40, "fats": 10},
+                }
+            ],
+        },
+    }
+
+    ingredients, recipe_name = await _resolve_ingredients_from_recipe("recipe-z")
+
+    assert recipe_name == "Recipe Z"
+    assert ingredients[0].quantity == 2000.0
+    assert ingredients[0].macros.calories == 2000.0
+    mock_fetch_bulk.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 @patch("src.services.analytics_service.fetch_recipe", new_callable=AsyncMock)
 async def test_resolve_ingredients_from_recipe_not_found(mock_fetch_recipe):
@@ -122,13 +140,11 @@ async def test_resolve_ingredients_from_recipe_without_ingredients(mock_fetch_re
 
 
 @pytest.mark.asyncio
-@patch("src.services.analytics_service.convert_to_grams")
 @patch("src.services.analytics_service.fetch_ingredients_bulk", new_callable=AsyncMock)
 @patch("src.services.analytics_service.fetch_recipe", new_callable=AsyncMock)
 async def test_resolve_ingredients_from_recipe_skips_missing_and_handles_no_macros(
     mock_fetch_recipe,
     mock_fetch_bulk,
-    mock_convert,
 ):
     mock_fetch_recipe.return_value = {
         "name": "Recipe Y",
@@ -143,7 +159,6 @@ async def test_resolve_ingredients_from_recipe_skips_missing_and_handles_no_macr
             "macro_per_hundred": None,
         }
     }
-    mock_convert.side_effect = [1.0, 2.0]
 
     ingredients, _ = await _resolve_ingredients_from_recipe("recipe-y")
 
@@ -213,30 +228,39 @@ async def test_resolve_manual_ingredients_uses_default_macros_when_missing(mock_
 
 
 @pytest.mark.asyncio
-async def test_daily_log_service_get_or_create_returns_existing():
+async def test_daily_log_service_get_or_create_upserts_in_one_call():
     collection = MagicMock()
-    collection.find_one = AsyncMock(return_value=_daily_log_doc())
+    collection.find_one_and_update = AsyncMock(return_value=_daily_log_doc())
     db = {"daily_logs": collection}
 
     with patch("src.services.analytics_service.get_database", return_value=db):
         log = await DailyLogService.get_or_create_daily_log("user-1", "2026-03-20")
 
     assert isinstance(log, DailyLog)
-    collection.insert_one.assert_not_called()
+    collection.find_one_and_update.assert_awaited_once()
+    query, update = collection.find_one_and_update.await_args.args
+    kwargs = collection.find_one_and_update.await_args.kwargs
+    assert query == {"user_id": "user-1", "date": "2026-03-20"}
+    assert set(update) == {"$setOnInsert"}
+    assert "_id" in update["$setOnInsert"]
+    assert "user_id" not in update["$setOnInsert"]
+    assert kwargs["upsert"] is True
+    assert kwargs["return_document"] == ReturnDocument.AFTER
 
 
 @pytest.mark.asyncio
-async def test_daily_log_service_get_or_create_creates_new():
+async def test_daily_log_service_get_or_create_retries_on_duplicate_key():
     collection = MagicMock()
-    collection.find_one = AsyncMock(return_value=None)
-    collection.insert_one = AsyncMock()
+    collection.find_one_and_update = AsyncMock(
+        side_effect=[DuplicateKeyError("duplicate"), _daily_log_doc()]
+    )
     db = {"daily_logs": collection}
 
     with patch("src.services.analytics_service.get_database", return_value=db):
         log = await DailyLogService.get_or_create_daily_log("user-1", "2026-03-20")
 
     assert isinstance(log, DailyLog)
-    collection.insert_one.assert_awaited_once()
+    assert collection.find_one_and_update.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -274,40 +298,43 @@ async def test_daily_log_service_get_daily_logs_range():
 @pytest.mark.asyncio
 async def test_daily_log_service_update_goals_updates_values():
     collection = MagicMock()
-    collection.update_one = AsyncMock()
-    collection.find_one = AsyncMock(return_value=_daily_log_doc())
+    collection.find_one_and_update = AsyncMock(return_value=_daily_log_doc())
     db = {"daily_logs": collection}
 
     with patch("src.services.analytics_service.get_database", return_value=db), patch(
-        "src.services.analytics_service.DailyLogService.get_or_create_daily_log",
+        "src.services.analytics_service.RollupService.mark_stale",
         new_callable=AsyncMock,
-    ) as mock_ensure:
+    ) as mock_mark_stale:
         updated = await DailyLogService.update_goals(
             "user-1",
             "2026-03-20",
             DailyGoalsUpdate(calorie_goal=2200.0),
         )
 
+    mock_mark_stale.assert_awaited_once_with("user-1", "2026-03-20")
+
     assert isinstance(updated, DailyLog)
-    mock_ensure.assert_awaited_once_with("user-1", "2026-03-20")
-    collection.update_one.assert_awaited_once()
+    collection.find_one_and_update.assert_awaited_once()
+    update = collection.find_one_and_update.await_args.args[1]
+    assert update["$set"]["calorie_goal"] == 2200.0
+    assert "_updated_at" in update["$set"]
+    assert "calorie_goal" not in update["$setOnInsert"]
+    assert "_updated_at" not in update["$setOnInsert"]
+    assert "protein_goal" in update["$setOnInsert"]
 
 
 @pytest.mark.asyncio
 async def test_daily_log_service_update_goals_without_fields_returns_log():
     collection = MagicMock()
-    collection.update_one = AsyncMock()
-    collection.find_one = AsyncMock(return_value=_daily_log_doc())
+    collection.find_one_and_update = AsyncMock(return_value=_daily_log_doc())
     db = {"daily_logs": collection}
 
-    with patch("src.services.analytics_service.get_database", return_value=db), patch(
-        "src.services.analytics_service.DailyLogService.get_or_create_daily_log",
-        new_callable=AsyncMock,
-    ):
+    with patch("src.services.analytics_service.get_database", return_value=db):
         updated = await DailyLogService.update_goals("user-1", "2026-03-20", DailyGoalsUpdate())
 
     assert isinstance(updated, DailyLog)
-    collection.update_one.assert_not_called()
+    update = collection.find_one_and_update.await_args.args[1]
+    assert "$set" not in update
 
 
 @pytest.mark.asyncio
@@ -328,14 +355,101 @@ async def test_daily_log_service_recalculate_daily_totals_updates_aggregate():
 
     db = {"daily_logs": daily_collection, "meal_entries": meals_collection}
 
-    with patch("src.services.analytics_service.get_database", return_value=db):
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.RollupService.mark_stale",
+        new_callable=AsyncMock,
+    ) as mock_mark_stale:
         await DailyLogService.recalculate_daily_totals("user-1", "2026-03-20")
 
+    mock_mark_stale.assert_awaited_once_with("user-1", "2026-03-20")
+    # Every meal of the day counts, however many an import wrote
+    meals_cursor.to_list.assert_awaited_once_with(length=None)
+
     daily_collection.update_one.assert_awaited_once()
     update_doc = daily_collection.update_one.await_args.args[1]["$set"]["total_macros"]
     assert update_doc == {"calories": 250.0, "proteins": 22.0, "carbs": 50.0, "fats": 8.0}
 
 
+@pytest.mark.asyncio
+async def test_daily_log_service_apply_macro_delta_increments_totals():
+    collection = MagicMock()
+    collection.find_one_and_update = AsyncMock(
+        return_value={"total_macros": {"calories": 320.0, "proteins": 15.5, "carbs": 40.0, "fats": 9.0}}
+    )
+    db = {"daily_logs": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.RollupService.mark_stale",
+        new_callable=AsyncMock,
+    ) as mock_mark_stale, patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ) as mock_recalculate:
+        await DailyLogService.apply_macro_delta(
+            "user-1",
+            "2026-03-20",
+            {"calories": 120.0, "proteins": -4.5, "carbs": 0.0, "fats": 2.0},
+        )
+
+    mock_mark_stale.assert_awaited_once_with("user-1", "2026-03-20")
+    mock_recalculate.assert_not_awaited()
+
+    collection.find_one_and_update.assert_awaited_once()
+    query, pipeline = collection.find_one_and_update.await_args.args
+    assert query == {"user_id": "user-1", "date": "2026-03-20"}
+    totals = pipeline[0]["$set"]
+    assert totals["total_macros.proteins"] == {"$round": [
+        {"$add": [{"$ifNull": ["$total_macros.proteins", 0]}, -4.5]},
+        2,
+    ]}
+    assert {key for key in totals if key.startswith("total_macros.")} == {
+        "total_macros.calories",
+        "total_macros.proteins",
+        "total_macros.carbs",
+        "total_macros.fats",
+    }
+
+
+@pytest.mark.asyncio
+async def test_daily_log_service_apply_macro_delta_recalculates_drifted_totals(caplog):
+    collection = MagicMock()
+    collection.find_one_and_update = AsyncMock(
+        return_value={"total_macros": {"calories": 80.0, "proteins": -3.5, "carbs": 10.0, "fats": 1.0}}
+    )
+    db = {"daily_logs": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.RollupService.mark_stale",
+        new_callable=AsyncMock,
+    ) as mock_mark_stale, patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ) as mock_recalculate, caplog.at_level(logging.WARNING):
+        await DailyLogService.apply_macro_delta("user-1", "2026-03-20", {"proteins": -10.0})
+
+    mock_recalculate.assert_awaited_once_with("user-1", "2026-03-20")
+    # recalculate_daily_totals marks the rollups stale itself
+    mock_mark_stale.assert_not_awaited()
+    assert "went negative (proteins)" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_daily_log_service_apply_macro_delta_skips_zero_delta():
+    collection = MagicMock()
+    collection.update_one = AsyncMock()
+    db = {"daily_logs": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        await DailyLogService.apply_macro_delta(
+            "user-1",
+            "2026-03-20",
+            {"calories": 0.0, "proteins": 0.0, "carbs": 0.0, "fats": 0.0},
+        )
+
+    collection.update_one.assert_not_called()
+    collection.find_one_and_update.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_meal_entry_service_create_rejects_empty_payload():
     data = MealEntryCreate(date="2026-03-20", meal_type="breakfast")
@@ -372,16 +486,20 @@ async def test_meal_entry_service_create_recipe_mode():
         new_callable=AsyncMock,
         return_value=(resolved, "Recipe Name"),
     ) as mock_resolve, patch(
-        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        "src.services.analytics_service.DailyLogService.apply_macro_delta",
         new_callable=AsyncMock,
-    ) as mock_recalc:
+    ) as mock_apply_delta:
         created = await MealEntryService.create_meal_entry(data, "user-1")
 
     assert isinstance(created, MealEntry)
     assert created.recipe_name == "Recipe Name"
     mock_resolve.assert_awaited_once_with("recipe-1")
     collection.insert_one.assert_awaited_once()
-    mock_recalc.assert_awaited_once_with("user-1", "2026-03-20")
+    mock_apply_delta.assert_awaited_once_with(
+        "user-1",
+        "2026-03-20",
+        {"calories": 130.0, "proteins": 2.0, "carbs": 28.0, "fats": 0.3},
+    )
 
 
 @pytest.mark.asyncio
@@ -414,7 +532,7 @@ async def test_meal_entry_service_create_manual_mode():
         new_callable=AsyncMock,
         return_value=resolved,
     ) as mock_resolve, patch(
-        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        "src.services.analytics_service.DailyLogService.apply_macro_delta",
         new_callable=AsyncMock,
     ):
         created = await MealEntryService.create_meal_entry(data, "user-1")
@@ -455,6 +573,28 @@ async def test_meal_entry_service_get_meals_for_date():
     assert isinstance(meals[0], MealEntry)
 
 
+@pytest.mark.asyncio
+async def test_meal_entry_service_count_meals_by_date():
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(
+        return_value=[{"_id": "2026-03-19", "count": 2}, {"_id": "2026-03-20", "count": 1}]
+    )
+
+    collection = MagicMock()
+    collection.aggregate.return_value = cursor
+    db = {"meal_entries": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        counts = await MealEntryService.count_meals_by_date("user-1", "2026-03-19", "2026-03-21")
+
+    assert counts == {"2026-03-19": 2, "2026-03-20": 1}
+    pipeline = collection.aggregate.call_args.args[0]
+    assert pipeline[0]["$match"] == {
+        "user_id": "user-1",
+        "date": {"$gte": "2026-03-19", "$lte": "2026-03-21"},
+    }
+
+
 @pytest.mark.asyncio
 async def test_meal_entry_service_update_returns_none_when_missing():
     collection = MagicMock()
@@ -474,12 +614,10 @@ async def test_meal_entry_service_update_returns_none_when_missing():
 @pytest.mark.asyncio
 async def test_meal_entry_service_update_recipe_branch():
     existing = _meal_doc(entry_id="entry-1")
-    updated = _meal_doc(entry_id="entry-1")
-    updated["recipe_name"] = "Resolved Recipe"
 
     collection = MagicMock()
-    collection.find_one = AsyncMock(side_effect=[existing, updated])
-    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock(return_value=existing)
+    collection.find_one_and_update = AsyncMock(return_value=existing)
     db = {"meal_entries": collection}
 
     resolved = [
@@ -496,9 +634,9 @@ async def test_meal_entry_service_update_recipe_branch():
         new_callable=AsyncMock,
         return_value=(resolved, "Resolved Recipe"),
     ), patch(
-        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        "src.services.analytics_service.DailyLogService.apply_macro_delta",
         new_callable=AsyncMock,
-    ) as mock_recalc:
+    ) as mock_apply_delta:
         result = await MealEntryService.update_meal_entry(
             "entry-1",
             MealEntryUpdate(recipe_id="recipe-2"),
@@ -506,18 +644,23 @@ async def test_meal_entry_service_update_recipe_branch():
         )
 
     assert isinstance(result, MealEntry)
-    collection.update_one.assert_awaited_once()
-    mock_recalc.assert_awaited_once_with("user-1", existing["date"])
+    assert result.recipe_name == "Resolved Recipe"
+    assert result.total_macros.calories == 130.0
+    collection.find_one_and_update.assert_awaited_once()
+    mock_apply_delta.assert_awaited_once_with(
+        "user-1",
+        existing["date"],
+        {"calories": -70.0, "proteins": -28.0, "carbs": 28.0, "fats": -4.7},
+    )
 
 
 @pytest.mark.asyncio
 async def test_meal_entry_service_update_ingredients_branch():
     existing = _meal_doc(entry_id="entry-1")
-    updated = _meal_doc(entry_id="entry-1")
 
     collection = MagicMock()
-    collection.find_one = AsyncMock(side_effect=[existing, updated])
-    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock(return_value=existing)
+    collection.find_one_and_update = AsyncMock(return_value=existing)
     db = {"meal_entries": collection}
 
     resolved = [
@@ -534,9 +677,9 @@ async def test_meal_entry_service_update_ingredients_branch():
         new_callable=AsyncMock,
         return_value=resolved,
     ), patch(
-        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        "src.services.analytics_service.DailyLogService.apply_macro_delta",
         new_callable=AsyncMock,
-    ):
+    ) as mock_apply_delta:
         result = await MealEntryService.update_meal_entry(
             "entry-1",
             MealEntryUpdate(ingredients=[MealIngredientCreate(ingredient_id="ing-2", quantity=50.0)]),
@@ -544,7 +687,9 @@ async def test_meal_entry_service_update_ingredients_branch():
         )
 
     assert isinstance(result, MealEntry)
-    collection.update_one.assert_awaited_once()
+    assert result.ingredients[0].ingredient_id == "ing-2"
+    collection.find_one_and_update.assert_awaited_once()
+    mock_apply_delta.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -553,7 +698,7 @@ async def test_meal_entry_service_update_empty_updates_returns_existing():
 
     collection = MagicMock()
     collection.find_one = AsyncMock(return_value=existing)
-    collection.update_one = AsyncMock()
+    collection.find_one_and_update = AsyncMock()
     db = {"meal_entries": collection}
 
     with patch("src.services.analytics_service.get_database", return_value=db):
@@ -564,22 +709,22 @@ async def test_meal_entry_service_update_empty_updates_returns_existing():
         )
 
     assert isinstance(result, MealEntry)
-    collection.update_one.assert_not_called()
+    collection.find_one_and_update.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_meal_entry_service_update_returns_existing_when_refetch_missing():
+async def test_meal_entry_service_update_note_only_skips_delta():
     existing = _meal_doc(entry_id="entry-1")
 
     collection = MagicMock()
-    collection.find_one = AsyncMock(side_effect=[existing, None])
-    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock(return_value=existing)
+    collection.find_one_and_update = AsyncMock(return_value=existing)
     db = {"meal_entries": collection}
 
     with patch("src.services.analytics_service.get_database", return_value=db), patch(
-        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        "src.services.analytics_service.DailyLogService.apply_macro_delta",
         new_callable=AsyncMock,
-    ):
+    ) as mock_apply_delta:
         result = await MealEntryService.update_meal_entry(
             "entry-1",
             MealEntryUpdate(note="changed"),
@@ -587,6 +732,27 @@ async def test_meal_entry_service_update_returns_existing_when_refetch_missing()
         )
 
     assert isinstance(result, MealEntry)
+    assert result.note == "changed"
+    mock_apply_delta.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_meal_entry_service_update_returns_none_when_deleted_concurrently():
+    existing = _meal_doc(entry_id="entry-1")
+
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=existing)
+    collection.find_one_and_update = AsyncMock(return_value=None)
+    db = {"meal_entries": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        result = await MealEntryService.update_meal_entry(
+            "entry-1",
+            MealEntryUpdate(note="changed"),
+            "user-1",
+        )
+
+    assert result is None
 
 
 @pytest.mark.asyncio
@@ -594,32 +760,51 @@ async def test_meal_entry_service_delete_cases():
     existing = _meal_doc(entry_id="entry-1")
 
     collection_missing = MagicMock()
-    collection_missing.find_one = AsyncMock(return_value=None)
+    collection_missing.find_one_and_delete = AsyncMock(return_value=None)
     db_missing = {"meal_entries": collection_missing}
 
     with patch("src.services.analytics_service.get_database", return_value=db_missing):
         deleted = await MealEntryService.delete_meal_entry("entry-1", "user-1")
     assert deleted is False
 
-    collection_fail = MagicMock()
-    collection_fail.find_one = AsyncMock(return_value=existing)
-    collection_fail.delete_one = AsyncMock(return_value=SimpleNamespace(deleted_count=0))
-    db_fail = {"meal_entries": collection_fail}
-
-    with patch("src.services.analytics_service.get_database", return_value=db_fail):
-        deleted = await MealEntryService.delete_meal_entry("entry-1", "user-1")
-    assert deleted is False
-
     collection_ok = MagicMock()
-    collection_ok.find_one = AsyncMock(return_value=existing)
-    collection_ok.delete_one = AsyncMock(return_value=SimpleNamespace(deleted_count=1))
+    collection_ok.find_one_and_delete = AsyncMock(return_value=existing)
     db_ok = {"meal_entries": collection_ok}
 
     with patch("src.services.analytics_service.get_database", return_value=db_ok), patch(
-        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        "src.services.analytics_service.DailyLogService.apply_macro_delta",
         new_callable=AsyncMock,
-    ) as mock_recalc:
+    ) as mock_apply_delta:
         deleted = await MealEntryService.delete_meal_entry("entry-1", "user-1")
 
     assert deleted is True
-    mock_recalc.assert_awaited_once_with("user-1", existing["date"])
+    collection_ok.find_one_and_delete.assert_awaited_once_with({"_id": "entry-1", "user_id": "user-1"})
+    mock_apply_delta.assert_awaited_once_with(
+        "user-1",
+        existing["date"],
+        {"calories": -200.0, "proteins": -30.0, "carbs": 0.0, "fats": -5.0},
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_recipes_bounds_concurrent_requests():
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch_recipe(recipe_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {"_id": recipe_id}
+
+    recipe_ids = [f"recipe-{n}" for n in range(20)]
+    with patch("src.services.analytics_service.fetch_recipe", side_effect=fake_fetch_recipe), patch(
+        "src.services.analytics_service.settings.RECIPE_FETCH_CONCURRENCY", 3
+    ):
+        recipes = await _fetch_recipes(recipe_ids)
+
+    assert list(recipes) == recipe_ids
+    assert recipes["recipe-7"] == {"_id": "recipe-7"}
+    assert peak == 3
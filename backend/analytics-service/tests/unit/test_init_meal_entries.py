@@ -0,0 +1,123 @@
+import json
+from argparse import Namespace
+from collections import Counter
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import src.init_meal_entries as seed
+from src.validators.meal_entry import MealEntryCreate, MealImportError, MealImportResult
+
+
+def _args(**overrides) -> Namespace:
+    options = {"users": 3, "days": 2, "seed": 42, "concurrency": 2, "end_date": date(2026, 3, 31)}
+    options.update(overrides)
+    return Namespace(**options)
+
+
+def test_generate_meals_is_deterministic_per_user():
+    meals = seed.generate_meals(0, days=30, end=date(2026, 3, 31))
+
+    assert meals == seed.generate_meals(0, days=30, end=date(2026, 3, 31))
+    assert meals != seed.generate_meals(1, days=30, end=date(2026, 3, 31))
+    assert meals[0]["date"] == "2026-03-02"
+    assert meals[-1]["date"] == "2026-03-31"
+    assert all(MealEntryCreate(**meal).ingredients for meal in meals)
+    assert meals[0]["ingredients"][0]["ingredient_id"] == seed.make_ingredient_id(
+        meals[0]["ingredients"][0]["name"]
+    )
+
+
+def _collection(date_counts=()):
+    async def rows():
+        for day, count in date_counts:
+            yield {"_id": day, "count": count}
+
+    collection = MagicMock()
+    collection.aggregate = MagicMock(side_effect=lambda pipeline: rows())
+    collection.delete_many = AsyncMock()
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_seed_user_imports_generated_meals_as_ndjson():
+    collection = _collection()
+    streamed = []
+
+    async def import_meal_entries(user_id, chunks):
+        async for chunk in chunks:
+            streamed.append(json.loads(chunk))
+        return MealImportResult(imported=len(streamed), failed=1, errors=[MealImportError(line=1, detail="bad")])
+
+    with patch("src.init_meal_entries.get_database", return_value={"meal_entries": collection}), patch(
+        "src.init_meal_entries.MealEntryService.import_meal_entries", side_effect=import_meal_entries
+    ) as mock_import:
+        imported = await seed.seed_user(4, _args())
+
+    assert mock_import.call_args.args[0] == "system-seed|load-4"
+    assert streamed == seed.generate_meals(4, 2, 42, date(2026, 3, 31))
+    assert imported == len(streamed)
+    collection.delete_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_seed_user_skips_complete_dates_and_reseeds_partial_ones():
+    meals = seed.generate_meals(0, 3, 42, date(2026, 3, 31))
+    per_date = Counter(meal["date"] for meal in meals)
+    complete, partial, missing = sorted(per_date)
+    collection = _collection([(complete, per_date[complete]), (partial, per_date[partial] - 1)])
+    streamed = []
+
+    async def import_meal_entries(user_id, chunks):
+        async for chunk in chunks:
+            streamed.append(json.loads(chunk))
+        return MealImportResult(imported=len(streamed))
+
+    with patch("src.init_meal_entries.get_database", return_value={"meal_entries": collection}), patch(
+        "src.init_meal_entries.MealEntryService.import_meal_entries", side_effect=import_meal_entries
+    ):
+        imported = await seed.seed_user(0, _args(days=3))
+
+    pipeline = collection.aggregate.call_args.args[0]
+    assert pipeline[0]["$match"] == {"user_id": "system-seed|load-0", "date": {"$in": [complete, partial, missing]}}
+    collection.delete_many.assert_awaited_once_with({"user_id": "system-seed|load-0", "date": {"$in": [partial]}})
+    assert streamed == [meal for meal in meals if meal["date"] != complete]
+    assert imported == len(streamed)
+
+
+@pytest.mark.asyncio
+async def test_seed_user_skips_users_with_complete_history():
+    meals = seed.generate_meals(0, 2, 42, date(2026, 3, 31))
+    collection = _collection(Counter(meal["date"] for meal in meals).items())
+
+    with patch("src.init_meal_entries.get_database", return_value={"meal_entries": collection}), patch(
+        "src.init_meal_entries.MealEntryService.import_meal_entries", new_callable=AsyncMock
+    ) as mock_import:
+        imported = await seed.seed_user(0, _args())
+
+    assert imported == 0
+    mock_import.assert_not_awaited()
+    collection.delete_many.assert_not_awaited()
+
+
+def test_end_date_argument_pins_the_history(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["init_meal_entries", "--days", "7", "--end-date", "2026-03-31"])
+
+    args = seed.parse_args()
+
+    assert args.end_date == date(2026, 3, 31)
+    assert seed.generate_meals(0, args.days, args.seed, args.end_date)[-1]["date"] == "2026-03-31"
+
+
+@pytest.mark.asyncio
+async def test_init_meal_entries_seeds_every_user_and_disconnects():
+    with patch("src.init_meal_entries.connect_to_mongodb", new_callable=AsyncMock), patch(
+        "src.init_meal_entries.disconnect_from_mongodb", new_callable=AsyncMock
+    ) as mock_disconnect, patch("src.init_meal_entries.close_client", new_callable=AsyncMock), patch(
+        "src.init_meal_entries.seed_user", new_callable=AsyncMock, return_value=5
+    ) as mock_seed_user:
+        await seed.init_meal_entries(_args(users=3))
+
+    assert sorted(call.args[0] for call in mock_seed_user.await_args_list) == [0, 1, 2]
+    mock_disconnect.assert_awaited_once()
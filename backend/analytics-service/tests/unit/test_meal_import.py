@@ -0,0 +1,341 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from src.models.meal_entry import MacroNutrients, MealEntry, MealType
+from src.services.analytics_service import (
+    DailyLogService,
+    MealEntryService,
+    _is_valid_date,
+    _iter_ndjson,
+)
+
+
+RECIPE = {
+    "name": "Protein Oatmeal",
+    "nutrition": {
+        "ingredients": [
+            {
+                "ingredient_id": "ingredient-1",
+                "name": "Oats",
+                "quantity": 80.0,
+                "macros": {"calories": 310.0, "proteins": 10.0, "carbs": 54.0, "fats": 6.0},
+            }
+        ]
+    },
+}
+
+CHICKEN = {
+    "_id": "ingredient-2",
+    "name": "Chicken Breast",
+    "macro_per_hundred": {"calories": 165.0, "proteins": 31.0, "carbs": 0.0, "fats": 3.6},
+}
+
+
+async def _stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _ndjson(*items) -> bytes:
+    return "".join(
+        (item if isinstance(item, str) else json.dumps(item)) + "\n"
+        for item in items
+    ).encode()
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+        self.sort_args = None
+        self.batch = None
+
+    def sort(self, *args):
+        self.sort_args = args
+        return self
+
+    def batch_size(self, size):
+        self.batch = size
+        return self
+
+    async def __aiter__(self):
+        for document in self.documents:
+            yield document
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_joins_lines_split_across_chunks():
+    lines = [
+        item async for item in _iter_ndjson(_stream(b'{"a": 1}\n{"b"', b': 2}\n\n  \n{"c": 3}'))
+    ]
+
+    assert lines == [(1, '{"a": 1}'), (2, '{"b": 2}'), (5, '{"c": 3}')]
+
+
+def test_is_valid_date():
+    assert _is_valid_date("2026-03-20")
+    assert not _is_valid_date("2026-3-20")
+    assert not _is_valid_date("2026-02-30")
+    assert not _is_valid_date("20260320")
+
+
+@pytest.mark.asyncio
+async def test_ensure_daily_logs_upserts_in_bulk_and_maps_ids():
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[
+        {"_id": "log-1", "date": "2026-03-20"},
+        {"_id": "log-2", "date": "2026-03-21"},
+    ])
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock(side_effect=BulkWriteError({"writeErrors": [{"index": 0, "code": 11000}]}))
+    collection.find.return_value = cursor
+    db = {"daily_logs": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        log_ids = await DailyLogService.ensure_daily_logs("user-1", ["2026-03-20", "2026-03-21"])
+        empty = await DailyLogService.ensure_daily_logs("user-1", [])
+
+    assert log_ids == {"2026-03-20": "log-1", "2026-03-21": "log-2"}
+    assert empty == {}
+    operations = collection.bulk_write.await_args.args[0]
+    assert len(operations) == 2
+    assert operations[0]._filter == {"user_id": "user-1", "date": "2026-03-20"}
+    assert operations[0]._upsert is True
+    assert collection.bulk_write.await_args.kwargs == {"ordered": False}
+    assert collection.find.call_args.args[0] == {
+        "user_id": "user-1",
+        "date": {"$in": ["2026-03-20", "2026-03-21"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_meal_entries_batches_resolution_and_recalculates_each_day_once():
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    db = {"meal_entries": collection}
+
+    body = _ndjson(
+        {"date": "2026-03-20", "meal_type": "breakfast", "recipe_id": "recipe-1"},
+        {"date": "2026-03-20", "meal_type": "lunch", "ingredients": [
+            {"ingredient_id": "ingredient-2", "quantity": 200.0}
+        ]},
+        "not json",
+        {"date": "2026-3-20", "meal_type": "dinner", "recipe_id": "recipe-1"},
+        {"date": "2026-03-21", "meal_type": "dinner"},
+        {"date": "2026-03-21", "meal_type": "snack", "recipe_id": "missing"},
+        {"date": "2026-03-22", "meal_type": "dinner", "recipe_id": "recipe-1", "recipe_name": "Oats"},
+    )
+
+    async def fake_fetch_recipe(recipe_id):
+        return RECIPE if recipe_id == "recipe-1" else None
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.fetch_recipe",
+        new_callable=AsyncMock,
+        side_effect=fake_fetch_recipe,
+    ) as mock_fetch_recipe, patch(
+        "src.services.analytics_service.fetch_ingredients_bulk",
+        new_callable=AsyncMock,
+        return_value={"ingredient-2": CHICKEN},
+    ) as mock_bulk, patch(
+        "src.services.analytics_service.DailyLogService.ensure_daily_logs",
+        new_callable=AsyncMock,
+        return_value={"2026-03-20": "log-20", "2026-03-22": "log-22"},
+    ) as mock_ensure, patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ) as mock_recalculate:
+        result = await MealEntryService.import_meal_entries("user-1", _stream(body))
+
+    assert result.imported == 3
+    assert result.failed == 4
+    assert result.days_updated == 2
+    assert [error.line for error in result.errors] == [3, 4, 5, 6]
+    assert result.errors[3].detail == "Recipe missing not found in recipe-service"
+
+    # Recipe lookups are deduplicated per batch
+    fetched = [call.args[0] for call in mock_fetch_recipe.await_args_list]
+    assert fetched.count("recipe-1") == 3
+    assert fetched.count("missing") == 1
+    mock_bulk.assert_any_await(["ingredient-2"])
+    mock_ensure.assert_awaited_once_with("user-1", ["2026-03-20", "2026-03-22"])
+
+    documents = collection.insert_many.await_args.args[0]
+    assert collection.insert_many.await_count == 1
+    assert [doc["meal_type"] for doc in documents] == ["breakfast", "lunch", "dinner"]
+    assert [doc["daily_log_id"] for doc in documents] == ["log-20", "log-20", "log-22"]
+    assert documents[0]["recipe_name"] == "Protein Oatmeal"
+    assert documents[2]["recipe_name"] == "Oats"
+    assert documents[1]["total_macros"] == {"calories": 330.0, "proteins": 62.0, "carbs": 0.0, "fats": 7.2}
+
+    assert [call.args for call in mock_recalculate.await_args_list] == [
+        ("user-1", "2026-03-20"),
+        ("user-1", "2026-03-22"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_meal_entries_flushes_batches_and_enforces_entry_limit():
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    db = {"meal_entries": collection}
+    line = {"date": "2026-03-20", "meal_type": "breakfast", "recipe_id": "recipe-1"}
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.fetch_recipe",
+        new_callable=AsyncMock,
+        return_value=RECIPE,
+    ), patch(
+        "src.services.analytics_service.DailyLogService.ensure_daily_logs",
+        new_callable=AsyncMock,
+        return_value={"2026-03-20": "log-20"},
+    ), patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ) as mock_recalculate, patch(
+        "src.services.analytics_service.settings.MEAL_IMPORT_BATCH_SIZE", 2
+    ), patch(
+        "src.services.analytics_service.settings.MEAL_IMPORT_MAX_ENTRIES", 3
+    ):
+        result = await MealEntryService.import_meal_entries("user-1", _stream(_ndjson(line, line, line, line, line)))
+
+    assert result.imported == 3
+    assert result.failed == 1
+    assert result.errors[0].line == 4
+    assert result.errors[0].detail == "Import is limited to 3 entries per request"
+    assert [len(call.args[0]) for call in collection.insert_many.await_args_list] == [2, 1]
+    mock_recalculate.assert_awaited_once_with("user-1", "2026-03-20")
+
+
+@pytest.mark.asyncio
+async def test_import_meal_entries_reports_failed_inserts_and_missing_logs():
+    collection = MagicMock()
+    collection.insert_many = AsyncMock(side_effect=BulkWriteError({
+        "writeErrors": [{"index": 1, "errmsg": "duplicate key"}]
+    }))
+    db = {"meal_entries": collection}
+    body = _ndjson(
+        {"date": "2026-03-20", "meal_type": "breakfast", "recipe_id": "recipe-1"},
+        {"date": "2026-03-21", "meal_type": "lunch", "recipe_id": "recipe-1"},
+        {"date": "2026-03-22", "meal_type": "dinner", "recipe_id": "recipe-1"},
+    )
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.fetch_recipe",
+        new_callable=AsyncMock,
+        return_value=RECIPE,
+    ), patch(
+        "src.services.analytics_service.DailyLogService.ensure_daily_logs",
+        new_callable=AsyncMock,
+        return_value={"2026-03-20": "log-20", "2026-03-21": "log-21"},
+    ), patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ) as mock_recalculate:
+        result = await MealEntryService.import_meal_entries("user-1", _stream(body))
+
+    assert result.imported == 1
+    assert [(error.line, error.detail) for error in result.errors] == [
+        (3, "Daily log for 2026-03-22 could not be created"),
+        (2, "duplicate key"),
+    ]
+    mock_recalculate.assert_awaited_once_with("user-1", "2026-03-20")
+
+
+@pytest.mark.asyncio
+async def test_import_meal_entries_skips_insert_when_nothing_resolves():
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    db = {"meal_entries": collection}
+    body = _ndjson({"date": "2026-03-20", "meal_type": "lunch", "ingredients": [
+        {"ingredient_id": "ingredient-9", "quantity": 100.0}
+    ]})
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.fetch_ingredients_bulk",
+        new_callable=AsyncMock,
+        return_value={},
+    ), patch(
+        "src.services.analytics_service._resolve_meal_ingredients",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Ingredient data unavailable"),
+    ), patch(
+        "src.services.analytics_service.DailyLogService.ensure_daily_logs",
+        new_callable=AsyncMock,
+        return_value={},
+    ), patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ) as mock_recalculate:
+        result = await MealEntryService.import_meal_entries("user-1", _stream(body))
+
+    assert result.imported == 0
+    assert result.errors[0].detail == "Ingredient data unavailable"
+    collection.insert_many.assert_not_awaited()
+    mock_recalculate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_import_meal_entries_resolves_legacy_recipe_ingredients_in_bulk():
+    legacy_recipe = {
+        "name": "Chicken",
+        "ingredients": [{"ingredient_id": "ingredient-2", "quantity": 200.0, "capacity": "g"}],
+    }
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    db = {"meal_entries": collection}
+    body = _ndjson({"date": "2026-03-20", "meal_type": "lunch", "recipe_id": "legacy"})
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.fetch_recipe",
+        new_callable=AsyncMock,
+        return_value=legacy_recipe,
+    ), patch(
+        "src.services.analytics_service.fetch_ingredients_bulk",
+        new_callable=AsyncMock,
+        return_value={"ingredient-2": CHICKEN},
+    ) as mock_bulk, patch(
+        "src.services.analytics_service.DailyLogService.ensure_daily_logs",
+        new_callable=AsyncMock,
+        return_value={"2026-03-20": "log-20"},
+    ), patch(
+        "src.services.analytics_service.DailyLogService.recalculate_daily_totals",
+        new_callable=AsyncMock,
+    ):
+        result = await MealEntryService.import_meal_entries("user-1", _stream(body))
+
+    assert result.imported == 1
+    assert mock_bulk.await_args_list[0].args == (["ingredient-2"],)
+    assert collection.insert_many.await_args.args[0][0]["total_macros"]["proteins"] == 62.0
+
+
+@pytest.mark.asyncio
+async def test_export_meal_entries_streams_ndjson_in_date_order():
+    entry = MealEntry(
+        user_id="user-1",
+        daily_log_id="log-1",
+        date="2026-03-20",
+        meal_type=MealType.LUNCH,
+        total_macros=MacroNutrients(calories=330.0),
+    )
+    cursor = FakeCursor([entry.model_dump(by_alias=True)])
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"meal_entries": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        lines = [line async for line in MealEntryService.export_meal_entries("user-1", "2026-03-01", "2026-03-31")]
+        [line async for line in MealEntryService.export_meal_entries("user-1")]
+
+    assert len(lines) == 1
+    assert lines[0].endswith("\n")
+    assert json.loads(lines[0])["_id"] == entry.id
+    assert collection.find.call_args_list[0].args[0] == {
+        "user_id": "user-1",
+        "date": {"$gte": "2026-03-01", "$lte": "2026-03-31"},
+    }
+    assert collection.find.call_args_list[1].args[0] == {"user_id": "user-1"}
+    assert cursor.sort_args == ([("date", 1), ("_created_at", 1)],)
+    assert cursor.batch == 500
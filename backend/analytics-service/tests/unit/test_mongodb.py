@@ -70,7 +70,10 @@ async def test_create_indexes_success_creates_expected_indexes():
         def __getitem__(self, key):
             return super().__getitem__(key)
 
-    mongodb._database = FakeDB({"daily_logs": daily_logs, "meal_entries": meal_entries})
+    rollups = MagicMock()
+    rollups.create_index = AsyncMock()
+
+    mongodb._database = FakeDB({"daily_logs": daily_logs, "meal_entries": meal_entries, "nutrition_rollups": rollups})
 
     with patch("src.db.mongodb.settings.DAILY_LOG_COLLECTION", "daily_logs"), patch(
         "src.db.mongodb.settings.MEAL_ENTRIES_COLLECTION", "meal_entries"
@@ -79,6 +82,10 @@ async def test_create_indexes_success_creates_expected_indexes():
 
     assert daily_logs.create_index.await_count == 4
     assert meal_entries.create_index.await_count == 4
+    rollups.create_index.assert_awaited_once_with(
+        [("user_id", 1), ("period", 1), ("period_start", 1)],
+        unique=True,
+    )
 
 
 @pytest.mark.asyncio
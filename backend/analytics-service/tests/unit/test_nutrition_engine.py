@@ -0,0 +1,67 @@
+import numpy as np
+
+from src.models.meal_entry import MacroNutrients
+from src.services import nutrition_engine
+
+
+def test_macros_matrix_handles_missing_values():
+    matrix = nutrition_engine.macros_matrix([
+        {"calories": 100, "proteins": 10, "carbs": 20, "fats": 5},
+        None,
+        {"calories": 50},
+    ])
+
+    assert matrix.shape == (3, 4)
+    assert matrix.tolist() == [[100, 10, 20, 5], [0, 0, 0, 0], [50, 0, 0, 0]]
+    assert nutrition_engine.macros_matrix([]).shape == (0, 4)
+
+
+def test_to_grams_applies_unit_factors():
+    factors = nutrition_engine.unit_factors(["kg", "tbsp", "unknown"])
+    grams = nutrition_engine.to_grams([0.25, 2, 3], factors)
+
+    assert grams.tolist() == [250.0, 30.0, 3.0]
+
+
+def test_scale_per_hundred_and_total():
+    grams = np.array([250.0, 50.0])
+    per_hundred = nutrition_engine.macros_matrix([
+        {"calories": 100, "proteins": 10, "carbs": 20, "fats": 5},
+        {"calories": 884, "proteins": 0, "carbs": 0, "fats": 100},
+    ])
+
+    macros = nutrition_engine.scale_per_hundred(grams, per_hundred)
+
+    assert macros.tolist() == [[250.0, 25.0, 50.0, 12.5], [442.0, 0.0, 0.0, 50.0]]
+    assert nutrition_engine.to_macro_nutrients(nutrition_engine.total(macros)) == MacroNutrients(
+        calories=692.0, proteins=25.0, carbs=50.0, fats=62.5
+    )
+
+
+def test_group_totals_sums_rows_per_key():
+    matrix = nutrition_engine.macros_matrix([
+        {"calories": 100.1, "proteins": 1},
+        {"calories": 200.2, "proteins": 2},
+        {"calories": 50, "proteins": 5},
+    ])
+
+    totals = nutrition_engine.group_totals(["2026-03-20", "2026-03-21", "2026-03-20"], matrix)
+
+    assert set(totals) == {"2026-03-20", "2026-03-21"}
+    assert totals["2026-03-20"].tolist() == [150.1, 6.0, 0.0, 0.0]
+    assert totals["2026-03-21"].tolist() == [200.2, 2.0, 0.0, 0.0]
+    assert nutrition_engine.group_totals([], matrix[:0]) == {}
+
+
+def test_group_nanmean_ignores_missing_values():
+    matrix = np.array([
+        [100.0, np.nan],
+        [50.0, 80.0],
+        [np.nan, np.nan],
+    ])
+
+    means = nutrition_engine.group_nanmean(["w1", "w1", "w2"], matrix)
+
+    assert means["w1"].tolist() == [75.0, 80.0]
+    assert np.isnan(means["w2"]).all()
+    assert nutrition_engine.group_nanmean([], matrix[:0]) == {}
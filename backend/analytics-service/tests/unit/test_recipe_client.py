@@ -1,12 +1,24 @@
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import asyncio
+import time
+
 import httpx
 import pytest
 
 from src.services import recipe_client
 
 
+@pytest.fixture(autouse=True)
+def clear_recipe_caches():
+    recipe_client._recipe_cache.clear()
+    recipe_client._ingredient_cache.clear()
+    yield
+    recipe_client._recipe_cache.clear()
+    recipe_client._ingredient_cache.clear()
+
+
 class _Response:
     def __init__(self, status_code: int, payload=None, text: str = ""):
         self.status_code = status_code
@@ -95,39 +107,115 @@ async def test_fetch_recipe_handles_http_error():
 
 
 @pytest.mark.asyncio
-async def test_fetch_ingredient_success_and_error_paths():
+async def test_fetch_ingredients_bulk_deduplicates_ids_and_filters_unknown():
     client = MagicMock()
-    client.get = AsyncMock(
-        side_effect=[
-            _Response(200, {"id": "i1"}),
-            _Response(500, text="boom"),
-            httpx.HTTPError("down"),
-        ]
-    )
+    client.post = AsyncMock(return_value=_Response(200, [{"_id": "a"}, {"_id": "b"}]))
 
     with patch("src.services.recipe_client._get_client", return_value=client):
-        ok = await recipe_client.fetch_ingredient("i1")
-        fail = await recipe_client.fetch_ingredient("i2")
-        err = await recipe_client.fetch_ingredient("i3")
+        result = await recipe_client.fetch_ingredients_bulk(["a", "a", "missing", "b"])
 
-    assert ok == {"id": "i1"}
-    assert fail is None
-    assert err is None
+    assert set(result.keys()) == {"a", "b"}
+    client.post.assert_awaited_once()
+    assert client.post.await_args.kwargs["json"] == {"ids": ["a", "missing", "b"]}
 
 
 @pytest.mark.asyncio
-async def test_fetch_ingredients_bulk_deduplicates_ids_and_filters_none():
-    async def _fake_fetch(iid: str):
-        return {"id": iid} if iid != "missing" else None
+async def test_fetch_ingredients_bulk_batches_and_uses_cache():
+    async def _fake_post(url, json, headers):
+        return _Response(200, [{"_id": iid} for iid in json["ids"]])
 
-    with patch("src.services.recipe_client.fetch_ingredient", new_callable=AsyncMock) as mock_fetch:
-        mock_fetch.side_effect = _fake_fetch
-        result = await recipe_client.fetch_ingredients_bulk(["a", "a", "missing", "b"])
+    client = MagicMock()
+    client.post = AsyncMock(side_effect=_fake_post)
 
-    assert set(result.keys()) == {"a", "b"}
-    assert mock_fetch.await_count == 3
+    with patch("src.services.recipe_client._get_client", return_value=client), patch(
+        "src.services.recipe_client.settings.INGREDIENT_BULK_BATCH_SIZE", 2
+    ):
+        first = await recipe_client.fetch_ingredients_bulk(["a", "b", "c"])
+        second = await recipe_client.fetch_ingredients_bulk(["a", "b", "c"])
+
+    assert set(first) == set(second) == {"a", "b", "c"}
+    batches = [call.kwargs["json"]["ids"] for call in client.post.await_args_list]
+    assert batches == [["a", "b"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_fetch_ingredients_bulk_handles_error_responses():
+    client = MagicMock()
+    client.post = AsyncMock(side_effect=[_Response(500, text="boom"), httpx.HTTPError("down")])
+
+    with patch("src.services.recipe_client._get_client", return_value=client):
+        failed = await recipe_client.fetch_ingredients_bulk(["a"])
+        errored = await recipe_client.fetch_ingredients_bulk(["a"])
+
+    assert failed == {}
+    assert errored == {}
 
 
-def test_convert_to_grams_known_and_unknown_units():
-    assert recipe_client.convert_to_grams(2, "kg") == 2000.0
-    assert recipe_client.convert_to_grams(3, "unknown") == 3.0
+@pytest.mark.asyncio
+async def test_fetch_recipe_serves_repeated_lookups_from_cache():
+    client = MagicMock()
+    client.get = AsyncMock(return_value=_Response(200, {"id": "r1"}))
+
+    with patch("src.services.recipe_client._get_client", return_value=client):
+        first = await recipe_client.fetch_recipe("r1")
+        second = await recipe_client.fetch_recipe("r1")
+        # Edits in recipe-service become visible once the entry expires
+        with patch("src.services.recipe_client.time.monotonic", return_value=time.monotonic() + 3600):
+            third = await recipe_client.fetch_recipe("r1")
+
+    assert first == second == third == {"id": "r1"}
+    assert client.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_recipe_does_not_cache_failures():
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=[_Response(503, text="busy"), _Response(200, {"id": "r1"})])
+
+    with patch("src.services.recipe_client._get_client", return_value=client):
+        failed = await recipe_client.fetch_recipe("r1")
+        ok = await recipe_client.fetch_recipe("r1")
+        cached = await recipe_client.fetch_recipe("r1")
+
+    assert failed is None
+    assert ok == cached == {"id": "r1"}
+    assert client.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_coalesces_concurrent_misses():
+    cache = recipe_client.AsyncTTLCache(max_size=10, ttl_seconds=60)
+    release = asyncio.Event()
+    calls = 0
+
+    async def _fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": "x"}
+
+    waiters = [asyncio.create_task(cache.get_or_fetch("x", _fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert results == [{"id": "x"}] * 5
+    assert cache.get("x") == {"id": "x"}
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    cache = recipe_client.AsyncTTLCache(max_size=2, ttl_seconds=10)
+
+    with patch("src.services.recipe_client.time.monotonic", return_value=100.0):
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    with patch("src.services.recipe_client.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
@@ -0,0 +1,247 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.rollup import NutritionRollup, RollupPeriod
+from pymongo.errors import BulkWriteError
+
+from src.services.analytics_service import RollupService, count_periods, period_bounds, periods_in_range
+
+
+def _log_doc(date: str, calories: float, proteins: float = 0.0, calorie_goal=None, protein_goal=None) -> dict:
+    return {
+        "date": date,
+        "total_macros": {"calories": calories, "proteins": proteins, "carbs": 0.0, "fats": 0.0},
+        "calorie_goal": calorie_goal,
+        "protein_goal": protein_goal,
+        "carbs_goal": None,
+        "fats_goal": None,
+    }
+
+
+def test_period_bounds_week_and_month():
+    assert period_bounds(RollupPeriod.WEEK, "2026-03-19") == ("2026-03-16", "2026-03-22")
+    assert period_bounds(RollupPeriod.WEEK, "2026-03-16") == ("2026-03-16", "2026-03-22")
+    assert period_bounds(RollupPeriod.MONTH, "2024-02-10") == ("2024-02-01", "2024-02-29")
+    assert period_bounds(RollupPeriod.MONTH, "2026-12-31") == ("2026-12-01", "2026-12-31")
+
+
+def test_periods_in_range_covers_overlapping_periods():
+    weeks = periods_in_range(RollupPeriod.WEEK, "2026-03-19", "2026-03-30")
+    months = periods_in_range(RollupPeriod.MONTH, "2025-12-15", "2026-02-01")
+
+    assert weeks == [
+        ("2026-03-16", "2026-03-22"),
+        ("2026-03-23", "2026-03-29"),
+        ("2026-03-30", "2026-04-05"),
+    ]
+    assert [start for start, _ in months] == ["2025-12-01", "2026-01-01", "2026-02-01"]
+
+
+def test_periods_stop_at_the_last_representable_day():
+    assert period_bounds(RollupPeriod.WEEK, "9999-12-31") == ("9999-12-27", "9999-12-31")
+    assert periods_in_range(RollupPeriod.MONTH, "9999-11-15", "9999-12-31") == [
+        ("9999-11-01", "9999-11-30"),
+        ("9999-12-01", "9999-12-31"),
+    ]
+    assert periods_in_range(RollupPeriod.WEEK, "9999-12-30", "9999-12-31") == [("9999-12-27", "9999-12-31")]
+
+
+@pytest.mark.parametrize("period, date_from, date_to", [
+    (RollupPeriod.WEEK, "2026-03-19", "2026-03-30"),
+    (RollupPeriod.WEEK, "2026-03-16", "2026-03-16"),
+    (RollupPeriod.WEEK, "2025-12-29", "2027-01-03"),
+    (RollupPeriod.MONTH, "2025-12-15", "2026-02-01"),
+    (RollupPeriod.MONTH, "2024-02-29", "2024-02-29"),
+])
+def test_count_periods_matches_periods_in_range(period, date_from, date_to):
+    assert count_periods(period, date_from, date_to) == len(periods_in_range(period, date_from, date_to))
+
+
+def test_count_periods_of_huge_ranges_is_arithmetic():
+    assert count_periods(RollupPeriod.WEEK, "0001-01-01", "9999-12-31") == 521723
+    assert count_periods(RollupPeriod.MONTH, "0001-01-01", "9999-12-31") == 9999 * 12
+
+
+@pytest.mark.asyncio
+async def test_mark_stale_flags_week_and_month():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock()
+    db = {"nutrition_rollups": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        await RollupService.mark_stale("user-1", "2026-03-19")
+
+    week, month = collection.bulk_write.await_args.args[0]
+    assert week._filter == {"user_id": "user-1", "period": "week", "period_start": "2026-03-16"}
+    assert month._filter == {"user_id": "user-1", "period": "month", "period_start": "2026-03-01"}
+    assert week._doc["$set"] == {"stale": True}
+    assert week._doc["$inc"] == {"revision": 1}
+    assert week._upsert is True
+
+
+@pytest.mark.asyncio
+async def test_mark_stale_logs_errors():
+    with patch("src.services.analytics_service.get_database", side_effect=RuntimeError("down")):
+        await RollupService.mark_stale("user-1", "2026-03-19")
+
+
+@pytest.mark.asyncio
+async def test_compute_rollups_totals_averages_and_adherence():
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[
+        _log_doc("2026-03-16", 1800.0, 120.0, calorie_goal=2000.0, protein_goal=150.0),
+        _log_doc("2026-03-17", 2200.0, 150.0, calorie_goal=2000.0),
+        _log_doc("2026-03-18", 0.0, calorie_goal=2000.0),
+        _log_doc("2026-03-24", 1000.0),
+    ])
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"daily_logs": collection}
+
+    counts = {"2026-03-16": 3, "2026-03-17": 2, "2026-03-24": 1}
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.MealEntryService.count_meals_by_date",
+        new_callable=AsyncMock,
+        return_value=counts,
+    ) as mock_counts:
+        rollups = await RollupService.compute_rollups(
+            "user-1",
+            RollupPeriod.WEEK,
+            [("2026-03-16", "2026-03-22"), ("2026-03-23", "2026-03-29"), ("2026-03-30", "2026-04-05")],
+        )
+
+    mock_counts.assert_awaited_once_with("user-1", "2026-03-16", "2026-04-05")
+    first, second, empty = rollups
+
+    assert first.total_macros.calories == 4000.0
+    assert first.average_macros.calories == 2000.0
+    assert first.days_logged == 2
+    assert first.meals_count == 5
+    assert first.goal_adherence.calories == 100.0
+    assert first.goal_adherence.proteins == 80.0
+    assert first.goal_adherence.carbs is None
+
+    assert second.total_macros.calories == 1000.0
+    assert second.goal_adherence.calories is None
+
+    assert empty.days_logged == 0
+    assert empty.average_macros.calories == 0.0
+    assert empty.stale is False
+
+
+@pytest.mark.asyncio
+async def test_get_rollups_uses_fresh_documents_and_computes_missing():
+    fresh = NutritionRollup(
+        user_id="user-1",
+        period=RollupPeriod.MONTH,
+        period_start="2026-02-01",
+        period_end="2026-02-28",
+        days_logged=10,
+    ).model_dump(by_alias=True)
+    computed = NutritionRollup(
+        user_id="user-1",
+        period=RollupPeriod.MONTH,
+        period_start="2026-03-01",
+        period_end="2026-03-31",
+        days_logged=3,
+    )
+
+    stale = {**computed.model_dump(by_alias=True), "stale": True, "revision": 4}
+
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[fresh, stale])
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    collection.bulk_write = AsyncMock()
+    db = {"nutrition_rollups": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.RollupService.compute_rollups",
+        new_callable=AsyncMock,
+        return_value=[computed],
+    ) as mock_compute:
+        rollups = await RollupService.get_rollups("user-1", RollupPeriod.MONTH, "2026-02-10", "2026-03-05")
+
+    assert [r.period_start for r in rollups] == ["2026-03-01", "2026-02-01"]
+    mock_compute.assert_awaited_once_with("user-1", RollupPeriod.MONTH, [("2026-03-01", "2026-03-31")])
+    assert "stale" not in collection.find.call_args.args[0]
+
+    operation = collection.bulk_write.await_args.args[0][0]
+    assert operation._filter == {
+        "user_id": "user-1", "period": "month", "period_start": "2026-03-01", "revision": 4,
+    }
+    assert operation._doc["$set"]["days_logged"] == 3
+    assert operation._doc["$setOnInsert"] == {"_id": computed.id}
+    assert operation._upsert is True
+
+
+@pytest.mark.asyncio
+async def test_get_rollups_skips_compute_when_all_fresh():
+    fresh = NutritionRollup(
+        user_id="user-1",
+        period=RollupPeriod.WEEK,
+        period_start="2026-03-16",
+        period_end="2026-03-22",
+    ).model_dump(by_alias=True)
+
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[fresh])
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"nutrition_rollups": collection}
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.RollupService.compute_rollups",
+        new_callable=AsyncMock,
+    ) as mock_compute:
+        rollups = await RollupService.get_rollups("user-1", RollupPeriod.WEEK, "2026-03-17", "2026-03-18")
+
+    assert len(rollups) == 1
+    mock_compute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_save_rollups_logs_write_errors():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock(side_effect=RuntimeError("write failed"))
+    db = {"nutrition_rollups": collection}
+    rollup = NutritionRollup(
+        user_id="user-1",
+        period=RollupPeriod.WEEK,
+        period_start="2026-03-16",
+        period_end="2026-03-22",
+    )
+
+    with patch("src.services.analytics_service.get_database", return_value=db):
+        await RollupService._save([rollup])
+        await RollupService._save([])
+
+    collection.bulk_write.assert_awaited_once()
+    assert collection.bulk_write.await_args.args[0][0]._filter["revision"] == {"$in": [0, None]}
+
+
+@pytest.mark.asyncio
+async def test_save_rollups_keeps_periods_marked_stale_during_compute():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock(side_effect=[
+        BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "duplicate key"}]}),
+        BulkWriteError({"writeErrors": [{"index": 0, "code": 121, "errmsg": "validation failed"}]}),
+    ])
+    db = {"nutrition_rollups": collection}
+    rollup = NutritionRollup(
+        user_id="user-1",
+        period=RollupPeriod.WEEK,
+        period_start="2026-03-16",
+        period_end="2026-03-22",
+        revision=2,
+    )
+
+    with patch("src.services.analytics_service.get_database", return_value=db), patch(
+        "src.services.analytics_service.logger"
+    ) as mock_logger:
+        await RollupService._save([rollup])
+        mock_logger.error.assert_not_called()
+        await RollupService._save([rollup])
+        mock_logger.error.assert_called_once()
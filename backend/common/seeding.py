@@ -0,0 +1,107 @@
+"""
+Bulk seeding engine shared by the MongoDB seed scripts.
+
+Documents are written as unordered ``bulk_write`` batches of upserts keyed by
+a natural key (e.g. recipe name and author) with ``$setOnInsert``, so re-running
+a seed only adds what is missing and never overwrites edited documents.
+Batches of one collection run concurrently, and seed scripts run several
+collections at once with ``asyncio.gather``. Documents are consumed lazily
+with at most ``concurrency`` batches in flight, so generators of millions of
+synthetic documents seed in bounded memory.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Sequence, Set
+
+from pydantic import BaseModel
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CONCURRENCY = 4
+
+
+class SeedResult(BaseModel):
+    """Outcome of seeding one collection"""
+    collection: str
+    inserted: int = 0
+    existing: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.collection}: {self.inserted} inserted, {self.existing} already present, "
+            f"{self.failed} failed in {self.seconds:.2f}s"
+        )
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def bulk_upsert(
+    collection,
+    docs: Iterable[Dict[str, Any]],
+    key_fields: Sequence[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> SeedResult:
+    """Insert documents whose natural key is not present yet, in concurrent unordered batches"""
+    result = SeedResult(collection=collection.name)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    pending: Set[asyncio.Task] = set()
+    started = time.perf_counter()
+
+    async def write(batch: Sequence[Dict[str, Any]]) -> None:
+        operations = [
+            UpdateOne({field: doc[field] for field in key_fields}, {"$setOnInsert": doc}, upsert=True)
+            for doc in batch
+        ]
+        try:
+            outcome = await collection.bulk_write(operations, ordered=False)
+            result.inserted += outcome.upserted_count
+            result.existing += outcome.matched_count
+        except BulkWriteError as e:
+            # Unordered: the rest of the batch was still written
+            details = e.details
+            result.inserted += details.get("nUpserted", 0)
+            result.existing += details.get("nMatched", 0)
+            result.failed += len(details.get("writeErrors", []))
+            logger.error(f"{result.collection}: {len(details.get('writeErrors', []))} seed writes failed")
+        finally:
+            semaphore.release()
+
+    for batch in _batches(docs, max(batch_size, 1)):
+        # The next batch is only built once a write slot is free
+        await semaphore.acquire()
+        task = asyncio.create_task(write(batch))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    await asyncio.gather(*pending)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Command line options common to all seed scripts"""
+    parser.add_argument("--scale", type=int, default=0,
+                        help="Synthetic documents generated per curated document, for load tests (default: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the synthetic data generators")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Batches written at the same time per collection")
+    return parser
+
+
+def print_results(results: List[SeedResult]) -> None:
+    for result in results:
+        print(f"✅ {result.summary()}")
@@ -0,0 +1,62 @@
+"""
+Index-backed catalogue search shared by the MongoDB services.
+
+Queries of at least ``min_text_length`` characters (each service passes its
+TEXT_SEARCH_MIN_LENGTH setting) use the collection's weighted ``$text`` index
+and are ranked by ``textScore``. Shorter queries, and single words that match
+no whole (stemmed) word, fall back to an anchored name prefix range evaluated
+under a case and accent insensitive collation, so the collated name index
+serves them instead of an unanchored ``$regex`` scan.
+"""
+from typing import Any, Dict, List, Optional
+
+# Case and accent insensitive collation, the name indexes must be created with it
+SEARCH_COLLATION = {"locale": "en", "strength": 1}
+
+DEFAULT_MIN_TEXT_LENGTH = 3
+
+TEXT_SCORE_SORT = [("score", {"$meta": "textScore"}), ("_id", 1)]
+
+
+def text_filter(query: str) -> Dict[str, Any]:
+    return {"$text": {"$search": query}}
+
+
+def prefix_filter(field: str, query: str) -> Dict[str, Any]:
+    """Range covering every value starting with query (U+FFFF sorts after all characters)"""
+    return {field: {"$gte": query, "$lt": query + "\uffff"}}
+
+
+async def ranked_search(
+    collection,
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    projection: Optional[dict] = None,
+    prefix_field: str = "name",
+    skip: int = 0,
+    limit: int = 20,
+    min_text_length: int = DEFAULT_MIN_TEXT_LENGTH
+) -> List[dict]:
+    """Documents matching query and filters, best matches first"""
+    query = query.strip()
+    filters = filters or {}
+
+    if len(query) >= min_text_length:
+        text_query = {**filters, **text_filter(query)}
+        cursor = collection.find(text_query, projection).sort(TEXT_SCORE_SORT).skip(skip).limit(limit)
+        documents = await cursor.to_list(length=limit)
+
+        if documents or len(query.split()) > 1:
+            return documents
+        # A later page of an existing text result set is simply past its end
+        if skip and await collection.find_one(text_query, {"_id": 1}):
+            return documents
+
+    cursor = (
+        collection.find({**filters, **prefix_filter(prefix_field, query)}, projection)
+        .collation(SEARCH_COLLATION)
+        .sort(prefix_field, 1)
+        .skip(skip)
+        .limit(limit)
+    )
+    return await cursor.to_list(length=limit)
@@ -0,0 +1,25 @@
+"""
+Unit conversion shared by recipe-service (pre-computed recipe nutrition) and
+analytics-service (meal entry macros), so both convert an ingredient quantity
+to the same number of grams.
+"""
+from typing import Dict
+
+# Grams per unit of every CapacityUnit, volumes assume the density of water
+UNIT_TO_GRAMS: Dict[str, float] = {
+    "g": 1.0,
+    "kg": 1000.0,
+    "ml": 1.0,
+    "l": 1000.0,
+    "tsp": 5.0,
+    "tbsp": 15.0,
+    "cup": 240.0,
+    "oz": 28.3495,
+    "lb": 453.592,
+    "pcs": 100.0,
+}
+
+
+def convert_to_grams(quantity: float, unit: str) -> float:
+    """Convert a quantity in any CapacityUnit to grams, unknown units are treated as grams"""
+    return round(quantity * UNIT_TO_GRAMS.get(unit, 1.0), 2)
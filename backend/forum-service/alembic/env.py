@@ -19,6 +19,17 @@ if alembic_config.config_file_name is not None:
 
 target_metadata = SQLModel.metadata
 
+# Indexes whose definition depends on the database (e.g. the pgvector version)
+# and therefore live only in their migration, not in the models.
+MIGRATION_ONLY_INDEXES = {"ix_posts_embedding_ann"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from proposing to drop migration-only indexes."""
+    if type_ == "index" and name in MIGRATION_ONLY_INDEXES:
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -26,6 +37,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -50,7 +62,11 @@ async def run_migrations_online() -> None:
 
 def do_run_migrations(connection):
     """Execute migrations synchronously within async context."""
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
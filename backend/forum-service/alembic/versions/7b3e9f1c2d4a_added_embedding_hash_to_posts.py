@@ -0,0 +1,29 @@
+"""Added embedding_hash to posts for skipping unchanged embeddings.
+
+Revision ID: 7b3e9f1c2d4a
+Revises: 381520afd84a
+Create Date: 2026-10-19 10:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9f1c2d4a'
+down_revision: Union[str, Sequence[str], None] = '381520afd84a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('embedding_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'embedding_hash')
@@ -0,0 +1,37 @@
+"""Added embedding_cache table.
+
+Revision ID: 9d4f2a6b8c1e
+Revises: 7b3e9f1c2d4a
+Create Date: 2026-10-19 11:04:18.220914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel
+import pgvector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f2a6b8c1e'
+down_revision: Union[str, Sequence[str], None] = '7b3e9f1c2d4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embedding_cache',
+    sa.Column('key', postgresql.VARCHAR(length=64), nullable=False),
+    sa.Column('model', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('embedding_cache')
@@ -0,0 +1,59 @@
+"""Added ANN index on post embedding.
+
+HNSW is used when the installed pgvector supports it (>= 0.5.0),
+otherwise falls back to IVFFlat. Both use cosine distance ops to match
+the <=> operator used by vector_search.
+
+Revision ID: c5e8a3f7d2b9
+Revises: 9d4f2a6b8c1e
+Create Date: 2026-10-19 12:31:07.918342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a3f7d2b9'
+down_revision: Union[str, Sequence[str], None] = '9d4f2a6b8c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_posts_embedding_ann'
+HNSW_MIN_VERSION = (0, 5, 0)
+
+
+def _pgvector_version() -> tuple:
+    version = op.get_bind().execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    return tuple(int(part) for part in (version or "0").split("."))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _pgvector_version() >= HNSW_MIN_VERSION:
+        op.create_index(
+            INDEX_NAME,
+            'posts',
+            ['embedding'],
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+        )
+    else:
+        op.create_index(
+            INDEX_NAME,
+            'posts',
+            ['embedding'],
+            postgresql_using='ivfflat',
+            postgresql_with={'lists': 100},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX_NAME, table_name='posts')
@@ -0,0 +1,34 @@
+"""Added full-text GIN index on posts for hybrid RAG retrieval.
+
+The indexed expression must stay identical to POST_DOCUMENT_SQL in
+src/services/rag_service.py, otherwise the planner will not use it.
+
+Revision ID: e2a7c4b1f8d3
+Revises: c5e8a3f7d2b9
+Create Date: 2026-10-19 13:47:52.306511
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4b1f8d3'
+down_revision: Union[str, Sequence[str], None] = 'c5e8a3f7d2b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_posts_fts ON posts USING gin "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, '')))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_posts_fts")
@@ -0,0 +1,45 @@
+"""Added rag_answer_cache table.
+
+Revision ID: f4b1d9e6a3c7
+Revises: e2a7c4b1f8d3
+Create Date: 2026-10-19 15:20:33.671208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel
+import pgvector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b1d9e6a3c7'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c4b1f8d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rag_answer_cache',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('question', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('question_embedding', pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=False),
+    sa.Column('sources_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('source_ids', postgresql.ARRAY(sa.TEXT()), nullable=False),
+    sa.Column('answer', sa.TEXT(), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rag_answer_cache_sources_key'), 'rag_answer_cache', ['sources_key'], unique=False)
+    # Invalidation looks up entries citing a post with source_ids @> ARRAY[post_id]
+    op.create_index('ix_rag_answer_cache_source_ids', 'rag_answer_cache', ['source_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rag_answer_cache_source_ids', table_name='rag_answer_cache')
+    op.drop_index(op.f('ix_rag_answer_cache_sources_key'), table_name='rag_answer_cache')
+    op.drop_table('rag_answer_cache')
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import Dict
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional
 from common.auth_guard import require_auth
 from src.db.main import get_session
 
-from src.services.rag_service import ask
+from src.services.answer_cache import get_cached_answer, store_answer_in_new_session
+from src.services.rag_service import ask, retrieve, stream_answer, format_sources, NO_SOURCES_ANSWER
 from src.validators.rag import AskRequest, AskResponse
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,6 +64,112 @@ async def rag_query(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
-        )    
+        )
+
+
+
+def _sse(event: str, data) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _answer_events(
+    http_request: Request,
+    question: str,
+    prompt: Optional[str],
+    sources: List[dict],
+    cached_answer: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Sources first, then answer tokens as the LLM produces them, then done"""
+    yield _sse("sources", sources)
+
+    if prompt is None:
+        yield _sse("token", {"content": NO_SOURCES_ANSWER})
+        yield _sse("done", {})
+        return
+
+    if cached_answer:
+        yield _sse("token", {"content": cached_answer})
+        yield _sse("done", {})
+        return
+
+    answer_parts = []
+    try:
+        async with aclosing(stream_answer(prompt)) as tokens:
+            async for token in tokens:
+                if await http_request.is_disconnected():
+                    logger.info("Client disconnected, stopping answer generation")
+                    return
+                answer_parts.append(token)
+                yield _sse("token", {"content": token})
+        yield _sse("done", {})
+
+    except Exception as e:
+        logger.error(f"Error while streaming answer: {str(e)}", exc_info=True)
+        yield _sse("error", {"detail": "AI service temporarily unavailable"})
+        return
+
+    # Only complete answers are cached
+    if answer_parts:
+        await store_answer_in_new_session(
+            question,
+            [source["id"] for source in sources],
+            "".join(answer_parts)
+        )
+
+
+
+@router.post("/ai/ask/stream", status_code=status.HTTP_200_OK)
+async def rag_query_stream(
+    request: AskRequest,
+    http_request: Request,
+    session: AsyncSession = Depends(get_session),
+    token_payload: Dict = Depends(require_auth)
+):
+    """
+    Ask RAG system for forum data, streaming the answer as Server-Sent Events.
+    Events: `sources` (list of sources), `token` (answer fragment), `done`, `error`.
+    """
+    if not request.question.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Question cannot be empty"
+        )
+
+    logger.info(f"User {token_payload.get('sub')} asked (stream): {request.question}")
+
+    # Retrieval runs before the response starts, so the DB session is not
+    # needed while streaming and retrieval errors still map to status codes
+    try:
+        prompt, sources = await retrieve(session, request.question, request.top_k)
+
+    except ValueError as e:
+        logger.warning(f"Validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid input: {str(e)}"
+        )
+
+    except ConnectionError as e:
+        logger.error(f"API connection error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service temporarily unavailable"
+        )
+
+    except Exception as e:
+        logger.error(f"Unexpected error in rag_query_stream: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
 
+    cached_answer = await get_cached_answer(
+        session, request.question, [str(post.id) for post in sources]
+    )
 
+    return StreamingResponse(
+        _answer_events(http_request, request.question, prompt, format_sources(sources), cached_answer),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,163 @@
+"""
+Benchmark of the pgvector ANN index used by vector_search.
+
+Loads synthetic clustered vectors into a scratch table, builds the same
+kind of index as migration c5e8a3f7d2b9 and measures recall@k against an
+exact (NumPy) ground truth together with per-query latency for a range of
+hnsw.ef_search / ivfflat.probes values.
+
+Usage:
+    python -m src.benchmark_vector_index --rows 20000 --queries 100 --index hnsw
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "bench_post_embeddings"
+
+
+def generate_vectors(rows: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors, closer to real embeddings than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=rows)
+    vectors = centers[labels] + rng.normal(scale=0.5, size=(rows, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top_k(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Ground-truth neighbours by cosine similarity (vectors are normalized)"""
+    scores = queries @ data.T
+    top = np.argpartition(-scores, k, axis=1)[:, :k]
+    return np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+
+
+def to_pgvector(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+async def load_table(conn: AsyncConnection, data: np.ndarray, batch_size: int = 1000) -> None:
+    dim = data.shape[1]
+    await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE_NAME}"))
+    await conn.execute(text(f"CREATE TABLE {TABLE_NAME} (id integer PRIMARY KEY, embedding vector({dim}))"))
+
+    for start in range(0, len(data), batch_size):
+        rows = [
+            {"id": start + i, "embedding": to_pgvector(vector)}
+            for i, vector in enumerate(data[start:start + batch_size])
+        ]
+        await conn.execute(
+            text(f"INSERT INTO {TABLE_NAME} (id, embedding) VALUES (:id, CAST(:embedding AS vector))"),
+            rows
+        )
+    logger.info(f"Loaded {len(data)} vectors of dimension {dim}")
+
+
+async def build_index(conn: AsyncConnection, index: str, rows: int) -> float:
+    if index == "hnsw":
+        options = "WITH (m = 16, ef_construction = 64)"
+    else:
+        options = f"WITH (lists = {max(rows // 1000, 10)})"
+
+    started = time.perf_counter()
+    await conn.execute(text(
+        f"CREATE INDEX ON {TABLE_NAME} USING {index} (embedding vector_cosine_ops) {options}"
+    ))
+    await conn.execute(text(f"ANALYZE {TABLE_NAME}"))
+    return time.perf_counter() - started
+
+
+async def run_queries(
+    conn: AsyncConnection,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int
+) -> dict:
+    latencies: List[float] = []
+    hits = 0
+    statement = text(
+        f"SELECT id FROM {TABLE_NAME} "
+        "ORDER BY embedding <=> CAST(:query AS vector) LIMIT :k"
+    )
+
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        result = await conn.execute(statement, {"query": to_pgvector(query), "k": k})
+        ids = [row[0] for row in result.all()]
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len(set(ids) & set(expected.tolist()))
+
+    latencies_ms = np.array(latencies)
+    return {
+        "recall": hits / (len(queries) * k),
+        "p50": float(np.percentile(latencies_ms, 50)),
+        "p95": float(np.percentile(latencies_ms, 95)),
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    # Queries come from the same clusters as the data, like real questions vs posts
+    vectors = generate_vectors(args.rows + args.queries, args.dim, args.clusters, args.seed)
+    data, queries = vectors[:args.rows], vectors[args.rows:]
+    truth = exact_top_k(data, queries, args.k)
+
+    engine = create_async_engine(args.database_url, echo=False)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            await load_table(conn, data)
+            await conn.commit()
+
+            await conn.execute(text("SET enable_indexscan = off"))
+            exact = await run_queries(conn, queries, truth, args.k)
+            await conn.execute(text("RESET enable_indexscan"))
+            print(f"{'exact scan':<22} recall@{args.k}={exact['recall']:.3f}  "
+                  f"p50={exact['p50']:.2f}ms  p95={exact['p95']:.2f}ms")
+
+            build_seconds = await build_index(conn, args.index, args.rows)
+            await conn.commit()
+            print(f"{args.index} index built in {build_seconds:.1f}s")
+
+            setting = "hnsw.ef_search" if args.index == "hnsw" else "ivfflat.probes"
+            for value in args.values:
+                await conn.execute(text(f"SET {setting} = {int(value)}"))
+                stats = await run_queries(conn, queries, truth, args.k)
+                print(f"{setting + '=' + str(value):<22} recall@{args.k}={stats['recall']:.3f}  "
+                      f"p50={stats['p50']:.2f}ms  p95={stats['p95']:.2f}ms")
+
+            if not args.keep:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE_NAME}"))
+                await conn.commit()
+    finally:
+        await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recall@k vs latency benchmark for the post embedding ANN index")
+    parser.add_argument("--database-url", default=settings.FORUM_DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--index", choices=["hnsw", "ivfflat"], default="hnsw")
+    parser.add_argument("--values", type=int, nargs="+", default=[10, 20, 40, 80, 160],
+                        help="ef_search (hnsw) or probes (ivfflat) values to sweep")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table after the run")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(parse_args()))
@@ -42,6 +42,26 @@ class Settings(BaseSettings):
     OPENROUTER_API_KEY: str
     OPENROUTER_BASE_URL: str
 
+    #Embedding queue
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_BATCH_WAIT_SECONDS: float = 0.5
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_RETRY_BASE_DELAY: float = 2.0
+    EMBEDDING_CACHE_SIZE: int = 2048
+
+    #Vector index (recall/latency trade-off of the ANN index)
+    VECTOR_SEARCH_EF_SEARCH: int = 40
+    VECTOR_SEARCH_PROBES: int = 10
+
+    #Hybrid retrieval
+    RAG_CANDIDATES: int = 20
+    RAG_RRF_K: int = 60
+    RAG_CONTEXT_TOKEN_BUDGET: int = 1500
+
+    #Semantic answer cache
+    RAG_ANSWER_CACHE_SIMILARITY: float = 0.95
+    RAG_ANSWER_CACHE_TTL_SECONDS: int = 86400
+
     class Config:
         env_file = ".env.local" if Path(".env.local").exists() else ".env"
         case_sensitive = True
@@ -1,14 +1,29 @@
+"""
+Seed the forum with generated posts.
+
+Posts are generated deterministically from ``--seed`` (fixed IDs, authors and
+titles) and inserted in multi-row batches with ``ON CONFLICT DO NOTHING``, so
+re-running only adds missing posts. Embeddings are not generated inline: the
+embedding queue picks up every post without an embedding when the service
+starts. A plain run seeds an empty table only; ``--scale N`` seeds
+100 * (1 + N) posts for load tests, whatever the table already holds.
+
+Run from the service root:
+    python -m src.init_posts [--scale N]
+"""
+import argparse
 import asyncio
 import logging
 import uuid
 import random
+from datetime import datetime, timedelta, timezone
 from typing import List
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
 
 from src.db.main import engine
 from src.models.post import Post
-from src.services.embedding_service import generate_embedding, build_post_text
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,17 +48,29 @@ NOUNS = [
     "pre-workout snack", "recovery protocol", "hydration plan", "mindset shifts"
 ]
 
-def generate_mock_posts(count: int = 100) -> List[Post]:
+POSTS_PER_SCALE = 100
+MOCK_AUTHORS = 20
+MOCK_POST_MAX_AGE = timedelta(days=90)
+SEED_BATCH_SIZE = 500
+
+# Namespace of the deterministic mock post and author IDs
+MOCK_NS = uuid.UUID("7d1e4b2c-3a5f-4e8d-9c6b-0f1a2b3c4d5e")
+
+
+def generate_mock_posts(count: int = POSTS_PER_SCALE, seed: int = 42) -> List[Post]:
     """
     Generates a specified number of mock posts with random titles, content, and tags.
+    The same seed always yields the same posts, IDs included.
     """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    authors = [uuid.uuid5(MOCK_NS, f"author-{n}") for n in range(MOCK_AUTHORS)]
     posts = []
-    mock_author_id = uuid.uuid4()
-    
+
     for i in range(count):
-        topic = random.choice(TOPICS)
-        adj = random.choice(ADJECTIVES)
-        noun = random.choice(NOUNS)
+        topic = rng.choice(TOPICS)
+        adj = rng.choice(ADJECTIVES)
+        noun = rng.choice(NOUNS)
         
         title = f"{adj} {noun.title()} - {topic} #{i+1}"
         content = (
@@ -55,60 +82,65 @@ def generate_mock_posts(count: int = 100) -> List[Post]:
         tags = [topic.lower().replace(" ", "-"), noun.split()[0].lower(), "discussion"]
         
         post = Post(
-            author_id=mock_author_id,
+            id=uuid.uuid5(MOCK_NS, f"post-{seed}-{i}"),
+            author_id=rng.choice(authors),
             title=title,
             content=content,
             tags=tags,
-            total_likes=random.randint(0, 50),
-            views_count=random.randint(10, 200)
+            total_likes=rng.randint(0, 50),
+            views_count=rng.randint(10, 200),
+            created_at=now - rng.random() * MOCK_POST_MAX_AGE
         )
         posts.append(post)
     return posts
 
-async def seed_posts(session: AsyncSession, mock_posts: List[Post]) -> None:
+async def seed_posts(session: AsyncSession, mock_posts: List[Post], batch_size: int = SEED_BATCH_SIZE) -> None:
     """
-    Generates an embedding for each document using the RAG service and saves it to the database.
-    Generation is partially batched to avoid overwhelming the API.
+    Saves the posts with one multi-row insert per batch, skipping posts that already exist.
+    Embeddings are generated afterwards by the embedding queue of the running service.
     """
-    logger.info(f"Starting to save {len(mock_posts)} posts with RAG embeddings...")
-    
-    saved_count = 0
-    for post in mock_posts:
-        post_text = build_post_text(post)
-        
-        embedding = await generate_embedding(post_text)
-        if embedding:
-            post.embedding = embedding
-        else:
-            logger.warning(f"Failed to generate embedding for post: {post.title}")
-            
-        session.add(post)
-        saved_count += 1
-        
-        if saved_count % 10 == 0:
-            logger.info(f"Generated embeddings and prepared {saved_count}/{len(mock_posts)} posts...")
-            await session.commit()
-    
-    await session.commit()
+    logger.info(f"Starting to save {len(mock_posts)} posts...")
+
+    columns = [column.name for column in Post.__table__.columns]
+    for start in range(0, len(mock_posts), batch_size):
+        batch = mock_posts[start:start + batch_size]
+        statement = insert(Post).values([
+            {column: getattr(post, column) for column in columns} for post in batch
+        ]).on_conflict_do_nothing(index_elements=["id"])
+        await session.exec(statement)
+        await session.commit()
+        logger.info(f"Saved {start + len(batch)}/{len(mock_posts)} posts...")
+
     logger.info("Successfully finished initializing posts database!")
 
 
-async def init_posts() -> None:
+async def init_posts(args: argparse.Namespace) -> None:
     """
     Main orchestration function to check database state and initialize dummy data.
     """
     logger.info("Checking state of the 'posts' table in forum-service...")
-    
+
     async with AsyncSession(engine) as session:
-        result = await session.exec(select(Post).limit(1))
-        existing_post = result.first()
-        
-        if existing_post:
-            logger.info("Posts are already initialized. Skipping embedding generation and database seeding.")
-            return
+        # Posts seeded before IDs were deterministic cannot be matched, so a plain
+        # run leaves a populated table alone and only --scale adds to it
+        if not args.scale:
+            result = await session.exec(select(Post.id).limit(1))
+            if result.first():
+                logger.info("Posts are already initialized. Skipping database seeding.")
+                return
+
+        mock_posts = generate_mock_posts(count=POSTS_PER_SCALE * (1 + args.scale), seed=args.seed)
+        await seed_posts(session, mock_posts, args.batch_size)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed the forum with generated posts")
+    parser.add_argument("--scale", type=int, default=0,
+                        help=f"Additional {POSTS_PER_SCALE} posts per step, for load tests (default: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the post generator")
+    parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE)
+    return parser.parse_args()
 
-        mock_posts = generate_mock_posts(count=100)
-        await seed_posts(session, mock_posts)
 
 if __name__ == "__main__":
-    asyncio.run(init_posts())
\ No newline at end of file
+    asyncio.run(init_posts(parse_args()))
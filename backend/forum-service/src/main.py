@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from src.core.config import settings
+from src.services.embedding_queue import embedding_queue
 from sqlmodel import SQLModel
 import logging
 
@@ -21,7 +22,9 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print(f"Server is starting...")
+    embedding_queue.start()
     yield
+    await embedding_queue.stop()
     print(f"Server has been stopped")
 
 
@@ -4,6 +4,8 @@ from .post_view import PostView
 from .comment_like import CommentLike
 from .post import Post
 from .comment import Comment
+from .embedding_cache import EmbeddingCacheEntry
+from .answer_cache import AnswerCacheEntry
 
 __all__ = [
     "PostLike",
@@ -11,4 +13,6 @@ __all__ = [
     "CommentLike",
     "Post",
     "Comment",
+    "EmbeddingCacheEntry",
+    "AnswerCacheEntry",
 ]
\ No newline at end of file
@@ -0,0 +1,60 @@
+import sqlalchemy.dialects.postgresql as pg
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import Index
+from datetime import datetime, timezone
+from typing import List
+import uuid
+from pgvector.sqlalchemy import Vector
+
+
+class AnswerCacheEntry(SQLModel, table=True):
+    """Cached RAG answer for a question and the exact set of posts it was generated from"""
+
+    __tablename__ = "rag_answer_cache"
+    __table_args__ = (
+        Index("ix_rag_answer_cache_source_ids", "source_ids", postgresql_using="gin"),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID,
+            nullable=False,
+            primary_key=True,
+            default=uuid.uuid4
+        )
+    )
+
+    question: str = Field(
+        max_length=500,
+        description="Question the answer was generated for"
+    )
+
+    question_embedding: List[float] = Field(
+        sa_column=Column(Vector(1536), nullable=False),
+        description="Embedding of the question, used for similarity lookup"
+    )
+
+    sources_key: str = Field(
+        max_length=64,
+        index=True,
+        description="Hash of the LLM model and source post IDs in ranked order"
+    )
+
+    source_ids: List[str] = Field(
+        sa_column=Column(pg.ARRAY(pg.TEXT), nullable=False),
+        description="IDs of the posts the answer was generated from"
+    )
+
+    answer: str = Field(
+        sa_column=Column(pg.TEXT, nullable=False),
+        description="Generated answer"
+    )
+
+    created_at: datetime = Field(
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            default=lambda: datetime.now(timezone.utc)
+        ),
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
@@ -0,0 +1,39 @@
+import sqlalchemy.dialects.postgresql as pg
+from sqlmodel import SQLModel, Field, Column
+from datetime import datetime, timezone
+from typing import List
+from pgvector.sqlalchemy import Vector
+
+
+class EmbeddingCacheEntry(SQLModel, table=True):
+    """Persistent cache of embeddings keyed by content hash"""
+
+    __tablename__ = "embedding_cache"
+
+    key: str = Field(
+        sa_column=Column(
+            pg.VARCHAR(64),
+            nullable=False,
+            primary_key=True
+        ),
+        description="SHA-256 of the embedding model and normalized text"
+    )
+
+    model: str = Field(
+        max_length=200,
+        description="Embedding model the vector was generated with"
+    )
+
+    embedding: List[float] = Field(
+        sa_column=Column(Vector(1536), nullable=False),
+        description="Cached vector embedding"
+    )
+
+    created_at: datetime = Field(
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            default=lambda: datetime.now(timezone.utc)
+        ),
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
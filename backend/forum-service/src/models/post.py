@@ -1,5 +1,6 @@
 import sqlalchemy.dialects.postgresql as pg
 from sqlmodel import SQLModel, Field, Relationship, Column
+from sqlalchemy import Index, text
 from datetime import datetime, timezone
 from typing import Optional, List
 import uuid
@@ -10,6 +11,17 @@ class Post(SQLModel, table=True):
     """Model for forum posts"""
 
     __tablename__ = "posts"
+    # The ANN index on `embedding` (ix_posts_embedding_ann) is owned by migration
+    # c5e8a3f7d2b9, which picks HNSW or IVFFlat from the installed pgvector version,
+    # so it is intentionally not declared here (see alembic/env.py).
+    __table_args__ = (
+        # Full-text index for hybrid RAG retrieval, created by migration e2a7c4b1f8d3
+        Index(
+            "ix_posts_fts",
+            text("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))"),
+            postgresql_using="gin"
+        ),
+    )
 
     id: uuid.UUID = Field(
         sa_column=Column(
@@ -87,6 +99,12 @@ class Post(SQLModel, table=True):
         description="Vector embedding of the post for RAG"
     )
 
+    embedding_hash: Optional[str] = Field(
+        default=None,
+        max_length=64,
+        description="Hash of the text the current embedding was generated from"
+    )
+
     created_at: datetime = Field(
         sa_column=Column(
             pg.TIMESTAMP(timezone=True),
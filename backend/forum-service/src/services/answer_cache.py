@@ -0,0 +1,102 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete
+
+from src.core.config import settings
+from src.db.main import engine
+from src.models.answer_cache import AnswerCacheEntry
+from src.services.embedding_cache import get_or_create_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def sources_key(source_ids: List[str]) -> str:
+    """
+    Key of the ranked source list (and the LLM that answered from it). The
+    answer cites sources by position ([1], [2], ...), so the same posts
+    retrieved in another order must not share an answer.
+    """
+    payload = settings.RETRIEVE_LLM + ":" + ",".join(source_ids)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_cached_answer(
+    session: AsyncSession,
+    question: str,
+    source_ids: List[str]
+) -> Optional[str]:
+    """
+    Return a cached answer for a paraphrase of the question, if one exists.
+    A hit needs the same retrieved sources in the same order and a question embedding within
+    RAG_ANSWER_CACHE_SIMILARITY (cosine) of the cached question.
+    """
+    if not source_ids:
+        return None
+
+    try:
+        embedding = await get_or_create_embedding(session, question)
+        if embedding is None:
+            return None
+
+        distance = AnswerCacheEntry.question_embedding.cosine_distance(embedding).label("distance")
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.RAG_ANSWER_CACHE_TTL_SECONDS)
+        statement = (
+            select(AnswerCacheEntry.answer, distance)
+            .where(AnswerCacheEntry.sources_key == sources_key(source_ids))
+            .where(AnswerCacheEntry.created_at >= cutoff)
+            .order_by(distance)
+            .limit(1)
+        )
+        result = await session.exec(statement)
+        row = result.first()
+
+        if row and row[1] <= 1 - settings.RAG_ANSWER_CACHE_SIMILARITY:
+            logger.info(f"Answer cache hit (distance={row[1]:.4f})")
+            return row[0]
+        return None
+    except Exception as e:
+        logger.error(f"Error reading answer cache: {str(e)}")
+        return None
+
+
+async def store_answer(
+    session: AsyncSession,
+    question: str,
+    source_ids: List[str],
+    answer: str
+) -> None:
+    """Cache an answer, failures are only logged"""
+    try:
+        embedding = await get_or_create_embedding(session, question)
+        if embedding is None:
+            return
+
+        session.add(AnswerCacheEntry(
+            question=question,
+            question_embedding=embedding,
+            sources_key=sources_key(source_ids),
+            source_ids=list(source_ids),
+            answer=answer
+        ))
+        await session.commit()
+    except Exception as e:
+        logger.error(f"Error storing answer in cache: {str(e)}")
+        await session.rollback()
+
+
+async def store_answer_in_new_session(question: str, source_ids: List[str], answer: str) -> None:
+    """store_answer for callers that no longer hold a session (e.g. after streaming)"""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await store_answer(session, question, source_ids, answer)
+
+
+async def invalidate_post(session: AsyncSession, post_id: UUID) -> None:
+    """Drop cached answers citing the post, committed together with the caller's transaction"""
+    await session.exec(
+        delete(AnswerCacheEntry).where(AnswerCacheEntry.source_ids.contains([str(post_id)]))
+    )
@@ -0,0 +1,137 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.config import settings
+from src.db.main import engine
+from src.models.embedding_cache import EmbeddingCacheEntry
+from src.services.embedding_service import content_hash, generate_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by content_hash (embedding model + normalized text).
+    Hot entries live in an in-process LRU, everything is persisted in the
+    embedding_cache table so repeated texts skip the remote API across restarts.
+    """
+
+    def __init__(self, max_size: int = settings.EMBEDDING_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+
+
+    def get_local(self, key: str) -> Optional[List[float]]:
+        """Get embedding from the in-memory tier"""
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+        return embedding
+
+
+    def put_local(self, key: str, embedding: List[float]) -> None:
+        """Put embedding into the in-memory tier, evicting least recently used entries"""
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+    async def get_many(
+        self,
+        session: AsyncSession,
+        keys: List[str]
+    ) -> Dict[str, List[float]]:
+        """Look up embeddings in memory first, then in one query against the persistent tier"""
+        found: Dict[str, List[float]] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            embedding = self.get_local(key)
+            if embedding is not None:
+                found[key] = embedding
+            else:
+                missing.append(key)
+
+        if not missing:
+            return found
+
+        try:
+            statement = select(EmbeddingCacheEntry).where(EmbeddingCacheEntry.key.in_(missing))
+            result = await session.exec(statement)
+            for entry in result.all():
+                found[entry.key] = entry.embedding
+                self.put_local(entry.key, entry.embedding)
+        except Exception as e:
+            logger.error(f"Error reading embedding cache: {str(e)}")
+
+        return found
+
+
+    async def put_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings in both tiers, persistent write failures are only logged.
+        The persistent write uses its own session so committing or rolling it back
+        never touches (or expires) objects loaded in the caller's session.
+        """
+        if not embeddings:
+            return
+
+        for key, embedding in embeddings.items():
+            self.put_local(key, embedding)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            try:
+                statement = insert(EmbeddingCacheEntry).values([
+                    {"key": key, "model": settings.EMBEDDING_MODEL, "embedding": embedding}
+                    for key, embedding in embeddings.items()
+                ]).on_conflict_do_nothing(index_elements=["key"])
+                await session.exec(statement)
+                await session.commit()
+            except Exception as e:
+                logger.error(f"Error writing embedding cache: {str(e)}")
+                await session.rollback()
+
+
+embedding_cache = EmbeddingCache()
+
+
+async def get_or_create_embeddings(
+    session: AsyncSession,
+    texts: List[str]
+) -> Optional[List[List[float]]]:
+    """Embeddings for texts, calling the embeddings API only for texts missing from the cache"""
+    keys = [content_hash(text) for text in texts]
+    found = await embedding_cache.get_many(session, keys)
+
+    missing = {key: text for key, text in zip(keys, texts) if key not in found}
+    if missing:
+        generated = await generate_embeddings(list(missing.values()))
+        if generated is None or len(generated) != len(missing):
+            return None
+        new_embeddings = dict(zip(missing.keys(), generated))
+        await embedding_cache.put_many(new_embeddings)
+        found.update(new_embeddings)
+
+    logger.info(f"Embedding cache: {len(keys) - len(missing)} hits, {len(missing)} misses")
+    return [found[key] for key in keys]
+
+
+async def get_or_create_embedding(
+    session: AsyncSession,
+    text: str
+) -> Optional[List[float]]:
+    """Embedding for a single text, served from the cache when possible"""
+    if not text or not text.strip():
+        logger.warning("Empty text passed to get_or_create_embedding")
+        return None
+
+    embeddings = await get_or_create_embeddings(session, [text])
+    return embeddings[0] if embeddings else None
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.db.main import get_session
+from src.models.post import Post
+from src.services.embedding_cache import get_or_create_embeddings
+from src.services.embedding_service import build_post_text, content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingQueue:
+    """
+    In-process queue that embeds posts outside of the request path.
+    Post writes only enqueue the post ID, a single worker drains the queue in
+    batches (one embeddings API call per batch), skips posts whose text did not
+    change since the last embedding and retries failed posts with backoff.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        batch_wait_seconds: float = settings.EMBEDDING_BATCH_WAIT_SECONDS,
+        max_retries: int = settings.EMBEDDING_MAX_RETRIES,
+        retry_base_delay: float = settings.EMBEDDING_RETRY_BASE_DELAY
+    ):
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._pending: Set[UUID] = set()
+        self._worker: Optional[asyncio.Task] = None
+        self._retry_tasks: Set[asyncio.Task] = set()
+
+
+    def enqueue(self, post_id: UUID, attempt: int = 0) -> None:
+        """Schedule a post for embedding, ignoring posts that are already queued"""
+        if post_id in self._pending:
+            return
+        self._pending.add(post_id)
+        self._queue.put_nowait((post_id, attempt))
+
+
+    def size(self) -> int:
+        """Number of posts waiting to be embedded"""
+        return self._queue.qsize()
+
+
+    def start(self) -> None:
+        """Start the background worker"""
+        if self._worker and not self._worker.done():
+            return
+        self._worker = asyncio.create_task(self._run())
+        logger.info("Embedding queue worker started")
+
+
+    async def stop(self) -> None:
+        """Stop the background worker and pending retries"""
+        tasks = list(self._retry_tasks)
+        if self._worker:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        self._retry_tasks.clear()
+        logger.info("Embedding queue worker stopped")
+
+
+    async def process_batch(
+        self,
+        session: AsyncSession,
+        batch: List[Tuple[UUID, int]]
+    ) -> int:
+        """Embed a batch of posts with one API call, returns number of embedded posts"""
+        attempts: Dict[UUID, int] = dict(batch)
+
+        statement = select(Post).where(Post.id.in_(list(attempts)))
+        result = await session.exec(statement)
+        posts = result.all()
+
+        pending = []
+        for post in posts:
+            text = build_post_text(post)
+            digest = content_hash(text)
+            if post.embedding is not None and post.embedding_hash == digest:
+                logger.info(f"Post {post.id} text unchanged, skipping embedding")
+                continue
+            pending.append((post, text, digest))
+
+        if not pending:
+            return 0
+
+        embeddings = await get_or_create_embeddings(session, [text for _, text, _ in pending])
+        if embeddings is None or len(embeddings) != len(pending):
+            self._schedule_retry([(post.id, attempts[post.id]) for post, _, _ in pending])
+            return 0
+
+        try:
+            for (post, _, digest), embedding in zip(pending, embeddings):
+                post.embedding = embedding
+                post.embedding_hash = digest
+                session.add(post)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        logger.info(f"Embedded and saved {len(pending)} posts")
+        return len(pending)
+
+
+    async def _next_batch(self) -> List[Tuple[UUID, int]]:
+        """Wait for the first item, then collect more until the batch is full or the wait expires"""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_wait_seconds
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        for post_id, _ in batch:
+            self._pending.discard(post_id)
+        return batch
+
+
+    def _schedule_retry(self, items: List[Tuple[UUID, int]]) -> None:
+        """Re-enqueue failed posts after an exponential backoff"""
+        for post_id, attempt in items:
+            if attempt >= self.max_retries:
+                logger.error(f"Giving up on embedding post {post_id} after {attempt + 1} attempts")
+                continue
+
+            delay = self.retry_base_delay * (2 ** attempt)
+            logger.warning(f"Retrying embedding of post {post_id} in {delay:.1f}s (attempt {attempt + 1})")
+            task = asyncio.create_task(self._enqueue_later(post_id, attempt + 1, delay))
+            self._retry_tasks.add(task)
+            task.add_done_callback(self._retry_tasks.discard)
+
+
+    async def _enqueue_later(self, post_id: UUID, attempt: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.enqueue(post_id, attempt)
+
+
+    async def _enqueue_missing(self) -> None:
+        """Enqueue posts that have no embedding yet (e.g. lost on a previous shutdown)"""
+        try:
+            async for session in get_session():
+                statement = select(Post.id).where(Post.embedding.is_(None))
+                result = await session.exec(statement)
+                post_ids = result.all()
+                for post_id in post_ids:
+                    self.enqueue(post_id)
+                logger.info(f"Enqueued {len(post_ids)} posts without embedding")
+                break
+        except Exception as e:
+            logger.error(f"Error enqueuing posts without embedding: {str(e)}")
+
+
+    async def _run(self) -> None:
+        await self._enqueue_missing()
+
+        while True:
+            batch = await self._next_batch()
+            try:
+                async for session in get_session():
+                    await self.process_batch(session, batch)
+                    break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error processing embedding batch: {str(e)}")
+                self._schedule_retry(batch)
+
+
+embedding_queue = EmbeddingQueue()
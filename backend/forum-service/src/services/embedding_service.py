@@ -1,7 +1,7 @@
+import hashlib
 import logging
 from typing import Optional, List
 from openai import AsyncOpenAI
-from sqlmodel.ext.asyncio.session import AsyncSession
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,13 @@ def build_post_text(post) -> str:
     return " ".join(parts)
 
 
+def content_hash(text: str) -> str:
+    """Hashing normalized text together with the embedding model"""
+    normalized = " ".join(text.split()).lower()
+    payload = f"{settings.EMBEDDING_MODEL}:{normalized}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 async def generate_embedding(text: str) -> Optional[List[float]]:
     """Generating embedding for text"""
     try:
@@ -50,20 +57,21 @@ async def generate_embedding(text: str) -> Optional[List[float]]:
         return None
 
 
-async def embed_post(session: AsyncSession ,post) -> Optional[List[float]]:
-    """Generating embed for whole Post(title, content, tags)"""
+async def generate_embeddings(texts: List[str]) -> Optional[List[List[float]]]:
+    """Generating embeddings for many texts with a single API call"""
+    if not texts:
+        return []
+
     try:
-        post_text = build_post_text(post)
-        embedding = await generate_embedding(post_text)
+        response = await client.embeddings.create(
+            model=settings.EMBEDDING_MODEL,
+            input=texts
+        )
 
-        if embedding:
-            post.embedding = embedding
-            session.add(post)
-            await session.commit()
-            logger.info(f"Embedded and saved post {post.id}")
+        data = sorted(response.data, key=lambda item: item.index)
+        logger.info(f"Generated {len(data)} embeddings in one batch")
+        return [item.embedding for item in data]
 
-        return embedding
     except Exception as e:
-        logger.error(f"Error embedding post {post.id}: {str(e)}")
-        await session.rollback()
-        return None
\ No newline at end of file
+        logger.error(f"Error generating batch embeddings: {str(e)}")
+        return None
@@ -11,13 +11,17 @@ from src.models.post_view import PostView
 from src.models.post_like import PostLike
 from src.models.comment import Comment
 from src.models.comment_like import CommentLike
+from src.services.answer_cache import invalidate_post
 from src.services.comment_service import CommentService
-from src.services.embedding_service import embed_post
+from src.services.embedding_queue import embedding_queue
 
 
 
 logger = logging.getLogger(__name__)
 
+# Fields that make up the embedded post text (see build_post_text)
+EMBEDDED_FIELDS = {"title", "content", "tags"}
+
 
 
 class PostService:
@@ -80,8 +84,8 @@ class PostService:
             await session.commit()
             await session.refresh(new_post)
 
-            #Creating embedding for the post
-            await embed_post(session, new_post)
+            #Embedding is generated in the background
+            embedding_queue.enqueue(new_post.id)
 
             logger.info(f"Created new post with ID: {new_post.id}")
             return new_post
@@ -112,12 +116,16 @@ class PostService:
                     setattr(post, key, value)
 
             session.add(post)
-            #Creating embedding for the post
-            await embed_post(session, post)
-            
+            #Cached RAG answers citing this post may be outdated
+            if EMBEDDED_FIELDS.intersection(post_data):
+                await invalidate_post(session, post_id)
             await session.commit()
             await session.refresh(post)
 
+            #Re-embedding only when the embedded text could have changed
+            if EMBEDDED_FIELDS.intersection(post_data):
+                embedding_queue.enqueue(post.id)
+
             logger.info(f"Updated post with ID: {post_id}")
             return post
         except Exception as e:
@@ -173,7 +181,10 @@ class PostService:
                 delete(PostView).where(PostView.post_id == post_id)
             )
 
-            # 7. Delete the Post itself
+            # 7. Drop cached RAG answers citing this post
+            await invalidate_post(session, post_id)
+
+            # 8. Delete the Post itself
             await session.delete(post)
             await session.commit()
             logger.info(f"Deleted post with ID: {post_id} and all related records")
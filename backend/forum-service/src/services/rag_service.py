@@ -1,25 +1,66 @@
+import asyncio
 import logging
-from typing import List
-from sqlmodel import select
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlmodel import select, text
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import cast
 from pgvector.sqlalchemy import Vector
 
+from src.db.main import engine
 from src.models.post import Post
-from src.services.embedding_service import generate_embedding, client
+from src.services.answer_cache import get_cached_answer, store_answer
+from src.services.embedding_cache import get_or_create_embedding
+from src.services.embedding_service import client
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Must match the expression of the ix_posts_fts GIN index
+POST_DOCUMENT_SQL = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))"
+# OR together the question terms, plainto_tsquery alone would AND all of them
+POST_QUERY_SQL = "to_tsquery('english', replace(plainto_tsquery('english', :query)::text, '&', '|'))"
 
-async def vector_search(session: AsyncSession, query: str, top_k: int = 5) -> List[Post]:
+NO_SOURCES_ANSWER = "No relevant posts found to answer your question."
+
+
+async def set_vector_search_params(
+    session: AsyncSession,
+    top_k: int,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None
+) -> None:
+    """
+    Set ANN index recall knobs for the current transaction only.
+    hnsw.ef_search is kept >= top_k, otherwise HNSW returns fewer than top_k rows.
+    """
+    ef_search = max(ef_search or settings.VECTOR_SEARCH_EF_SEARCH, top_k)
+    probes = probes or settings.VECTOR_SEARCH_PROBES
+
+    await session.exec(
+        text(
+            "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+            "set_config('ivfflat.probes', :probes, true)"
+        ),
+        params={"ef_search": str(ef_search), "probes": str(probes)}
+    )
+
+
+async def vector_search(
+    session: AsyncSession,
+    query: str,
+    top_k: int = 5,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None
+) -> List[Post]:
     """Search posts by semantic similarity using pgvector cosine distance (<=>)."""
-    query_embedding = await generate_embedding(query)
+    query_embedding = await get_or_create_embedding(session, query)
     if not query_embedding:
         logger.warning("Could not generate embedding for query: %s", query)
         return []
 
     query_vec = cast(query_embedding, Vector(1536))
+    await set_vector_search_params(session, top_k, ef_search, probes)
 
     stmt = (
         select(Post)
@@ -31,22 +72,102 @@ async def vector_search(session: AsyncSession, query: str, top_k: int = 5) -> Li
     return list(result.all())
 
 
-async def ask(session: AsyncSession, question: str, top_k: int = 5) -> dict:
-    """RAG pipeline: retrieve relevant posts → build prompt → call LLM → return answer + sources."""
-    sources = await vector_search(session, question, top_k)
+async def lexical_search(session: AsyncSession, query: str, top_k: int = 5) -> List[Post]:
+    """Search posts with PostgreSQL full-text search ranked by ts_rank_cd."""
+    statement = (
+        select(Post)
+        .where(text(f"{POST_DOCUMENT_SQL} @@ {POST_QUERY_SQL}"))
+        .order_by(text(f"ts_rank_cd({POST_DOCUMENT_SQL}, {POST_QUERY_SQL}) DESC"), Post.created_at.desc())
+        .limit(top_k)
+    )
+    result = await session.exec(statement, params={"query": query})
+    return list(result.all())
 
-    if not sources:
-        return {
-            "answer": "No relevant posts found to answer your question.",
-            "sources": []
-        }
 
-    context = "\n\n".join(
-        f"[{i + 1}] Title: {post.title}\n{post.content}"
-        for i, post in enumerate(sources)
+async def _lexical_search_in_new_session(query: str, top_k: int) -> List[Post]:
+    """A session cannot run two queries at once, so the lexical leg gets its own"""
+    async with AsyncSession(engine, expire_on_commit=False) as lexical_session:
+        return await lexical_search(lexical_session, query, top_k)
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Post]],
+    k: int = settings.RAG_RRF_K
+) -> List[Post]:
+    """Fuse ranked lists with RRF (score = sum of 1 / (k + rank)), deduplicating by post ID."""
+    scores: Dict[UUID, float] = {}
+    posts: Dict[UUID, Post] = {}
+
+    for ranking in rankings:
+        for rank, post in enumerate(ranking, start=1):
+            scores[post.id] = scores.get(post.id, 0.0) + 1.0 / (k + rank)
+            posts.setdefault(post.id, post)
+
+    ordered_ids = sorted(scores, key=lambda post_id: scores[post_id], reverse=True)
+    return [posts[post_id] for post_id in ordered_ids]
+
+
+async def hybrid_search(session: AsyncSession, query: str, top_k: int = 5) -> List[Post]:
+    """Run vector and full-text retrieval concurrently and fuse them with RRF."""
+    candidates = max(top_k, settings.RAG_CANDIDATES)
+
+    vector_result, lexical_result = await asyncio.gather(
+        vector_search(session, query, candidates),
+        _lexical_search_in_new_session(query, candidates),
+        return_exceptions=True
     )
 
-    prompt = (
+    rankings = []
+    for name, ranking in (("vector", vector_result), ("lexical", lexical_result)):
+        if isinstance(ranking, BaseException):
+            logger.error(f"Error in {name} retrieval: {str(ranking)}")
+            continue
+        rankings.append(ranking)
+
+    fused = reciprocal_rank_fusion(rankings)
+    logger.info(
+        f"Hybrid search fused {sum(len(r) for r in rankings)} candidates into {len(fused)} posts"
+    )
+    return fused[:top_k]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return max(1, len(text) // 4)
+
+
+def build_context(
+    posts: List[Post],
+    token_budget: int = settings.RAG_CONTEXT_TOKEN_BUDGET
+) -> Tuple[str, List[Post]]:
+    """
+    Build the numbered prompt context from posts in rank order, stopping at token_budget.
+    The first post is truncated rather than dropped so there is always some context.
+    Returns the context and the posts that made it in.
+    """
+    blocks = []
+    included = []
+    used_tokens = 0
+
+    for post in posts:
+        block = f"[{len(blocks) + 1}] Title: {post.title}\n{post.content}"
+        tokens = estimate_tokens(block)
+
+        if used_tokens + tokens > token_budget:
+            if blocks:
+                break
+            block = block[:token_budget * 4]
+            tokens = estimate_tokens(block)
+
+        blocks.append(block)
+        included.append(post)
+        used_tokens += tokens
+
+    return "\n\n".join(blocks), included
+
+
+def build_prompt(question: str, context: str) -> str:
+    return (
         "You are a helpful assistant for a fitness and meal planning community forum.\n"
         "Answer the following question using only the forum posts provided below.\n"
         "Reference post numbers (e.g. [1], [2]) when citing information.\n\n"
@@ -54,17 +175,76 @@ async def ask(session: AsyncSession, question: str, top_k: int = 5) -> dict:
         f"Question: {question}\n\nAnswer:"
     )
 
+
+def format_sources(sources: List[Post]) -> List[dict]:
+    return [
+        {"id": str(post.id), "title": post.title}
+        for post in sources
+    ]
+
+
+async def retrieve(session: AsyncSession, question: str, top_k: int = 5) -> Tuple[Optional[str], List[Post]]:
+    """Retrieval half of the RAG pipeline: returns the LLM prompt (None without sources) and the sources."""
+    retrieved = await hybrid_search(session, question, top_k)
+    if not retrieved:
+        return None, []
+
+    context, sources = build_context(retrieved)
+    return build_prompt(question, context), sources
+
+
+async def ask(session: AsyncSession, question: str, top_k: int = 5) -> dict:
+    """RAG pipeline: retrieve relevant posts → build prompt → call LLM → return answer + sources."""
+    prompt, sources = await retrieve(session, question, top_k)
+
+    if not sources:
+        return {
+            "answer": NO_SOURCES_ANSWER,
+            "sources": []
+        }
+
+    source_ids = [str(post.id) for post in sources]
+    cached_answer = await get_cached_answer(session, question, source_ids)
+    if cached_answer:
+        return {
+            "answer": cached_answer,
+            "sources": format_sources(sources)
+        }
+
     response = await client.chat.completions.create(
         model=settings.RETRIEVE_LLM,
         messages=[{"role": "user", "content": prompt}]
     )
 
-    answer = response.choices[0].message.content or "I could not generate a response based on the available forum posts."
+    answer = response.choices[0].message.content
+    if answer:
+        await store_answer(session, question, source_ids, answer)
+    else:
+        answer = "I could not generate a response based on the available forum posts."
 
     return {
         "answer": answer,
-        "sources": [
-            {"id": str(post.id), "title": post.title}
-            for post in sources
-        ]
-    }
\ No newline at end of file
+        "sources": format_sources(sources)
+    }
+
+
+async def stream_answer(prompt: str) -> AsyncIterator[str]:
+    """
+    Stream answer tokens from the LLM as they arrive.
+    Closing the generator early (e.g. client disconnected) closes the upstream
+    stream so generation stops instead of running to completion.
+    """
+    stream = await client.chat.completions.create(
+        model=settings.RETRIEVE_LLM,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    )
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+    finally:
+        await stream.close()
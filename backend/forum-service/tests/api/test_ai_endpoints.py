@@ -1,6 +1,20 @@
+import asyncio
+import json
 from unittest.mock import ANY, AsyncMock, patch
 
-from tests.factories import build_ai_response
+import pytest
+
+from src.api import ai as ai_routes
+from tests.factories import build_ai_response, build_post
+
+
+@pytest.fixture(autouse=True)
+def answer_cache_mocks():
+    with patch("src.api.ai.get_cached_answer", new_callable=AsyncMock) as mock_get, patch(
+        "src.api.ai.store_answer_in_new_session", new_callable=AsyncMock
+    ) as mock_store:
+        mock_get.return_value = None
+        yield mock_get, mock_store
 
 
 @patch("src.api.ai.ask", new_callable=AsyncMock)
@@ -85,3 +99,139 @@ def test_rag_query_returns_500_on_unexpected_error(mock_ask, client):
 
     assert response.status_code == 500
     assert response.json()["detail"] == "Internal server error"
+
+
+def _parse_sse(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _token_stream(*tokens, error=None):
+    async def _stream(prompt):
+        for token in tokens:
+            yield token
+        if error:
+            raise error
+
+    return _stream
+
+
+@patch("src.api.ai.stream_answer", new=_token_stream("Eat ", "protein [1]"))
+@patch("src.api.ai.retrieve", new_callable=AsyncMock)
+def test_rag_query_stream_sends_sources_then_tokens(mock_retrieve, answer_cache_mocks, client):
+    post = build_post(title="Recovery meals")
+    mock_retrieve.return_value = ("prompt", [post])
+
+    response = client.post(
+        "/forum/ai/ask/stream",
+        json={"question": "What should I eat after a hard workout?", "top_k": 3},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert _parse_sse(response.text) == [
+        ("sources", [{"id": str(post.id), "title": "Recovery meals"}]),
+        ("token", {"content": "Eat "}),
+        ("token", {"content": "protein [1]"}),
+        ("done", {}),
+    ]
+    mock_retrieve.assert_awaited_once_with(ANY, "What should I eat after a hard workout?", 3)
+    _, mock_store = answer_cache_mocks
+    mock_store.assert_awaited_once_with(
+        "What should I eat after a hard workout?", [str(post.id)], "Eat protein [1]"
+    )
+
+
+@patch("src.api.ai.stream_answer")
+@patch("src.api.ai.retrieve", new_callable=AsyncMock)
+def test_rag_query_stream_serves_cached_answer(mock_retrieve, mock_stream, answer_cache_mocks, client):
+    post = build_post()
+    mock_retrieve.return_value = ("prompt", [post])
+    mock_get, mock_store = answer_cache_mocks
+    mock_get.return_value = "Cached answer [1]"
+
+    response = client.post("/forum/ai/ask/stream", json={"question": "What to eat post workout?"})
+
+    events = _parse_sse(response.text)
+    assert events[1:] == [("token", {"content": "Cached answer [1]"}), ("done", {})]
+    mock_get.assert_awaited_once_with(ANY, "What to eat post workout?", [str(post.id)])
+    mock_stream.assert_not_called()
+    mock_store.assert_not_awaited()
+
+
+@patch("src.api.ai.retrieve", new_callable=AsyncMock)
+def test_rag_query_stream_without_sources(mock_retrieve, client):
+    mock_retrieve.return_value = (None, [])
+
+    response = client.post("/forum/ai/ask/stream", json={"question": "Very niche topic"})
+
+    events = _parse_sse(response.text)
+    assert events[0] == ("sources", [])
+    assert events[1][1]["content"] == "No relevant posts found to answer your question."
+    assert events[-1] == ("done", {})
+
+
+@patch("src.api.ai.stream_answer", new=_token_stream("partial", error=RuntimeError("llm down")))
+@patch("src.api.ai.retrieve", new_callable=AsyncMock)
+def test_rag_query_stream_reports_generation_error(mock_retrieve, client):
+    mock_retrieve.return_value = ("prompt", [build_post()])
+
+    response = client.post("/forum/ai/ask/stream", json={"question": "How to bulk?"})
+
+    events = _parse_sse(response.text)
+    assert events[1] == ("token", {"content": "partial"})
+    assert events[-1] == ("error", {"detail": "AI service temporarily unavailable"})
+
+
+@patch("src.api.ai.retrieve", new_callable=AsyncMock)
+def test_rag_query_stream_returns_400_for_blank_question(mock_retrieve, client):
+    response = client.post("/forum/ai/ask/stream", json={"question": "   "})
+
+    assert response.status_code == 400
+    mock_retrieve.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    ("error", "status_code"),
+    [
+        (ValueError("bad"), 400),
+        (ConnectionError("down"), 503),
+        (RuntimeError("boom"), 500),
+    ],
+)
+@patch("src.api.ai.retrieve", new_callable=AsyncMock)
+def test_rag_query_stream_maps_retrieval_errors(mock_retrieve, error, status_code, client):
+    mock_retrieve.side_effect = error
+
+    response = client.post("/forum/ai/ask/stream", json={"question": "How to cut safely?"})
+
+    assert response.status_code == status_code
+
+
+def test_answer_events_stop_generation_when_client_disconnects(monkeypatch):
+    closed = []
+
+    async def _stream(prompt):
+        try:
+            for token in ("a", "b", "c"):
+                yield token
+        finally:
+            closed.append(True)
+
+    class _DisconnectedRequest:
+        async def is_disconnected(self):
+            return True
+
+    monkeypatch.setattr(ai_routes, "stream_answer", _stream)
+
+    async def _collect():
+        return [event async for event in ai_routes._answer_events(_DisconnectedRequest(), "q", "prompt", [])]
+
+    events = asyncio.run(_collect())
+
+    assert len(events) == 1
+    assert events[0].startswith("event: sources")
+    assert closed == [True]
@@ -430,10 +430,12 @@ def test_get_all_posts_and_get_post_by_id_paths():
 
 
 def test_create_post_and_update_post_paths(monkeypatch):
-    async def _embed(*args, **kwargs):
-        return [0.1, 0.2]
-
-    monkeypatch.setattr(post_service_module, "embed_post", _embed)
+    enqueued = []
+    monkeypatch.setattr(
+        post_service_module,
+        "embedding_queue",
+        SimpleNamespace(enqueue=enqueued.append),
+    )
 
     author_id = uuid4()
     create_session = FakeAsyncSession()
@@ -449,6 +451,7 @@ def test_create_post_and_update_post_paths(monkeypatch):
     )
     assert created is not None
     assert create_session.commits >= 1
+    assert enqueued == [created.id]
 
     fail_create_session = FakeAsyncSession(commit_plan=[RuntimeError("db")])
     assert (
@@ -482,6 +485,14 @@ def test_create_post_and_update_post_paths(monkeypatch):
     )
     assert updated.title == "new title"
     assert updated.views_count == 2
+    assert enqueued[-1] == post.id
+    assert "rag_answer_cache" in str(update_session.exec_calls[-1][0])
+
+    enqueued.clear()
+    images_session = FakeAsyncSession(exec_plan=[FakeResult(first=post)])
+    run(PostService.update_post(images_session, post.id, {"images": ["https://example.com/a.jpg"]}))
+    assert enqueued == []
+    assert len(images_session.exec_calls) == 1
 
     missing_update = FakeAsyncSession(exec_plan=[FakeResult(first=None)])
     assert run(PostService.update_post(missing_update, uuid4(), {"title": "x"})) is None
@@ -510,6 +521,7 @@ def test_delete_post_paths():
     )
     assert run(PostService.delete_post(success, post_id)) is True
     assert post in success.deleted
+    assert "rag_answer_cache" in str(success.exec_calls[-1][0])
 
     failing = FakeAsyncSession(exec_plan=[RuntimeError("db")])
     assert run(PostService.delete_post(failing, post_id)) is False
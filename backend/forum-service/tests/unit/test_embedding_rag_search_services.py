@@ -5,6 +5,9 @@ from uuid import uuid4
 
 import httpx
 
+from src.services import answer_cache
+from src.services import embedding_cache as cache_module
+from src.services import embedding_queue as queue_module
 from src.services import embedding_service as embedding
 from src.services import rag_service as rag
 from src.services.search_service import SearchService
@@ -21,15 +24,35 @@ def run(coro):
     return asyncio.run(coro)
 
 
+def _session_ctx(session):
+    class _Ctx:
+        async def __aenter__(self):
+            return session
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    return lambda _engine, **_kwargs: _Ctx()
+
+
 class _EmbeddingsClient:
     def __init__(self, vector=None, error=None):
         self._vector = vector or [0.1, 0.2]
         self._error = error
+        self.calls = []
 
     async def create(self, **kwargs):
+        self.calls.append(kwargs)
         if self._error:
             raise self._error
-        return SimpleNamespace(data=[SimpleNamespace(embedding=self._vector)])
+        inputs = kwargs["input"] if isinstance(kwargs["input"], list) else [kwargs["input"]]
+        data = [
+            SimpleNamespace(index=i, embedding=[float(i)] + self._vector)
+            for i in range(len(inputs))
+        ]
+        if not isinstance(kwargs["input"], list):
+            data[0].embedding = self._vector
+        return SimpleNamespace(data=list(reversed(data)))
 
 
 def _build_post(title="Title", content="Content", tags=None):
@@ -71,43 +94,222 @@ def test_generate_embedding_handles_client_error(monkeypatch):
     assert run(embedding.generate_embedding("hello")) is None
 
 
-def test_embed_post_saves_embedding_when_generated(monkeypatch):
+def test_content_hash_normalizes_whitespace_and_case():
+    assert embedding.content_hash("Hello   World") == embedding.content_hash(" hello world ")
+    assert embedding.content_hash("Hello") != embedding.content_hash("Hello there")
+
+
+def test_generate_embeddings_uses_one_call_and_keeps_order(monkeypatch):
+    embeddings_client = _EmbeddingsClient(vector=[0.5])
+    monkeypatch.setattr(embedding, "client", SimpleNamespace(embeddings=embeddings_client))
+
+    result = run(embedding.generate_embeddings(["a", "b", "c"]))
+
+    assert result == [[0.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+    assert len(embeddings_client.calls) == 1
+    assert embeddings_client.calls[0]["input"] == ["a", "b", "c"]
+
+
+def test_generate_embeddings_handles_empty_input_and_errors(monkeypatch):
+    assert run(embedding.generate_embeddings([])) == []
+
+    fake_client = SimpleNamespace(embeddings=_EmbeddingsClient(error=RuntimeError("boom")))
+    monkeypatch.setattr(embedding, "client", fake_client)
+
+    assert run(embedding.generate_embeddings(["a"])) is None
+
+
+def test_embedding_cache_local_tier_evicts_least_recently_used():
+    cache = cache_module.EmbeddingCache(max_size=2)
+    cache.put_local("a", [1.0])
+    cache.put_local("b", [2.0])
+    assert cache.get_local("a") == [1.0]
+
+    cache.put_local("c", [3.0])
+
+    assert cache.get_local("b") is None
+    assert cache.get_local("a") == [1.0]
+    assert cache.get_local("c") == [3.0]
+
+
+def test_embedding_cache_get_many_reads_persistent_tier_once():
+    cache = cache_module.EmbeddingCache()
+    cache.put_local("local", [1.0])
+    session = FakeAsyncSession(
+        exec_plan=[FakeResult(all_values=[SimpleNamespace(key="stored", embedding=[2.0])])]
+    )
+
+    found = run(cache.get_many(session, ["local", "stored", "missing", "stored"]))
+
+    assert found == {"local": [1.0], "stored": [2.0]}
+    assert len(session.exec_calls) == 1
+    assert cache.get_local("stored") == [2.0]
+
+
+def test_embedding_cache_put_many_tolerates_persistent_errors(monkeypatch):
+    cache = cache_module.EmbeddingCache()
+    session = FakeAsyncSession(exec_plan=[RuntimeError("db")])
+    monkeypatch.setattr(cache_module, "AsyncSession", _session_ctx(session))
+
+    run(cache.put_many({"k": [0.5]}))
+
+    assert cache.get_local("k") == [0.5]
+    assert session.rollbacks == 1
+
+
+def test_get_or_create_embeddings_only_generates_misses(monkeypatch):
+    cache = cache_module.EmbeddingCache()
+    cache.put_local(embedding.content_hash("cached text"), [1.0])
+    monkeypatch.setattr(cache_module, "embedding_cache", cache)
+    calls = []
+
+    async def _generate(texts):
+        calls.append(texts)
+        return [[2.0]]
+
+    monkeypatch.setattr(cache_module, "generate_embeddings", _generate)
     session = FakeAsyncSession()
-    post = _build_post()
+    cache_session = FakeAsyncSession()
+    monkeypatch.setattr(cache_module, "AsyncSession", _session_ctx(cache_session))
+
+    result = run(cache_module.get_or_create_embeddings(session, ["Cached  TEXT", "new text", "new text"]))
+
+    assert result == [[1.0], [2.0], [2.0]]
+    assert calls == [["new text"]]
+    # The cache write is committed in its own session, never in the caller's
+    assert cache_session.commits == 1
+    assert session.commits == 0
+    assert session.rollbacks == 0
+
+    # Repeated query is served from memory without calling the API
+    assert run(cache_module.get_or_create_embedding(session, "new text")) == [2.0]
+    assert len(calls) == 1
+
 
-    async def _fake_generate(_text):
-        return [0.3, 0.4]
+def test_get_or_create_embedding_handles_blank_text_and_failures(monkeypatch):
+    monkeypatch.setattr(cache_module, "embedding_cache", cache_module.EmbeddingCache())
 
-    monkeypatch.setattr(embedding, "generate_embedding", _fake_generate)
+    async def _generate(texts):
+        return None
+
+    monkeypatch.setattr(cache_module, "generate_embeddings", _generate)
+
+    assert run(cache_module.get_or_create_embedding(FakeAsyncSession(), "  ")) is None
+    assert run(cache_module.get_or_create_embedding(FakeAsyncSession(), "question")) is None
+
+
+def test_embedding_queue_enqueue_deduplicates_pending_posts():
+    queue = queue_module.EmbeddingQueue()
+    post_id = uuid4()
+
+    queue.enqueue(post_id)
+    queue.enqueue(post_id)
+
+    assert queue.size() == 1
+
+
+def test_embedding_queue_collects_batches_up_to_batch_size():
+    queue = queue_module.EmbeddingQueue(batch_size=2, batch_wait_seconds=0.01)
+    ids = [uuid4() for _ in range(3)]
+    for post_id in ids:
+        queue.enqueue(post_id)
+
+    async def _drain():
+        return await queue._next_batch(), await queue._next_batch()
 
-    result = run(embedding.embed_post(session, post))
+    first, second = run(_drain())
 
-    assert result == [0.3, 0.4]
-    assert post.embedding == [0.3, 0.4]
+    assert [post_id for post_id, _ in first] == ids[:2]
+    assert [post_id for post_id, _ in second] == ids[2:]
+    # Drained posts can be enqueued again
+    queue.enqueue(ids[0])
+    assert queue.size() == 1
+
+
+def test_embedding_queue_process_batch_skips_unchanged_posts(monkeypatch):
+    unchanged = _build_post("Same", "Same content")
+    unchanged.embedding = [0.1]
+    unchanged.embedding_hash = embedding.content_hash(embedding.build_post_text(unchanged))
+    changed = _build_post("New", "New content")
+    changed.embedding = [0.1]
+    changed.embedding_hash = "stale"
+    session = FakeAsyncSession(exec_plan=[FakeResult(all_values=[unchanged, changed])])
+    calls = []
+
+    async def _generate(_session, texts):
+        calls.append(texts)
+        return [[0.7, 0.8]]
+
+    monkeypatch.setattr(queue_module, "get_or_create_embeddings", _generate)
+    queue = queue_module.EmbeddingQueue()
+
+    embedded = run(queue.process_batch(session, [(unchanged.id, 0), (changed.id, 0)]))
+
+    assert embedded == 1
+    assert calls == [[embedding.build_post_text(changed)]]
+    assert changed.embedding == [0.7, 0.8]
+    assert changed.embedding_hash == embedding.content_hash(embedding.build_post_text(changed))
     assert session.commits == 1
-    assert session.added[-1] is post
 
 
-def test_embed_post_rolls_back_on_error(monkeypatch):
-    session = FakeAsyncSession()
+def test_embedding_queue_process_batch_schedules_retry_on_failure(monkeypatch):
     post = _build_post()
+    post.embedding = None
+    post.embedding_hash = None
+    session = FakeAsyncSession(exec_plan=[FakeResult(all_values=[post])])
+    retried = []
 
-    async def _fake_generate(_text):
-        raise RuntimeError("embed error")
+    async def _generate(_session, texts):
+        return None
 
-    monkeypatch.setattr(embedding, "generate_embedding", _fake_generate)
+    monkeypatch.setattr(queue_module, "get_or_create_embeddings", _generate)
+    queue = queue_module.EmbeddingQueue()
+    monkeypatch.setattr(queue, "_schedule_retry", retried.extend)
 
-    result = run(embedding.embed_post(session, post))
+    assert run(queue.process_batch(session, [(post.id, 2)])) == 0
+    assert retried == [(post.id, 2)]
+    assert session.commits == 0
 
-    assert result is None
-    assert session.rollbacks == 1
+
+def test_embedding_queue_retries_with_backoff_until_max_retries():
+    queue = queue_module.EmbeddingQueue(max_retries=2, retry_base_delay=0.01)
+    retried_id = uuid4()
+    dropped_id = uuid4()
+
+    async def _retry():
+        queue._schedule_retry([(retried_id, 1), (dropped_id, 2)])
+        await asyncio.gather(*list(queue._retry_tasks))
+        return await queue._next_batch()
+
+    batch = run(_retry())
+
+    assert batch == [(retried_id, 2)]
+
+
+def test_embedding_queue_start_and_stop(monkeypatch):
+    queue = queue_module.EmbeddingQueue()
+
+    async def _noop():
+        return None
+
+    monkeypatch.setattr(queue, "_enqueue_missing", _noop)
+
+    async def _lifecycle():
+        queue.start()
+        await asyncio.sleep(0)
+        running = queue._worker is not None and not queue._worker.done()
+        await queue.stop()
+        return running
+
+    assert run(_lifecycle()) is True
+    assert queue._worker is None
 
 
 def test_vector_search_returns_empty_without_query_embedding(monkeypatch):
-    async def _no_embedding(_query):
+    async def _no_embedding(_session, _query):
         return None
 
-    monkeypatch.setattr(rag, "generate_embedding", _no_embedding)
+    monkeypatch.setattr(rag, "get_or_create_embedding", _no_embedding)
 
     result = run(rag.vector_search(FakeAsyncSession(), "q"))
 
@@ -116,24 +318,94 @@ def test_vector_search_returns_empty_without_query_embedding(monkeypatch):
 
 def test_vector_search_returns_posts(monkeypatch):
     post = _build_post("Found", "Body")
-    session = FakeAsyncSession(exec_plan=[FakeResult(all_values=[post])])
+    session = FakeAsyncSession(exec_plan=[FakeResult(), FakeResult(all_values=[post])])
 
-    async def _embedding(_query):
+    async def _embedding(_session, _query):
         return [0.1] * 1536
 
-    monkeypatch.setattr(rag, "generate_embedding", _embedding)
+    monkeypatch.setattr(rag, "get_or_create_embedding", _embedding)
 
     result = run(rag.vector_search(session, "fitness", top_k=3))
 
     assert len(result) == 1
     assert result[0].title == "Found"
+    assert session.exec_calls[0][2]["params"] == {"ef_search": "40", "probes": "10"}
+
+
+def test_set_vector_search_params_keeps_ef_search_above_top_k():
+    session = FakeAsyncSession()
+
+    run(rag.set_vector_search_params(session, top_k=50, ef_search=20, probes=4))
+
+    statement, _, kwargs = session.exec_calls[0]
+    assert "hnsw.ef_search" in str(statement)
+    assert kwargs["params"] == {"ef_search": "50", "probes": "4"}
+
+
+def test_lexical_search_passes_query_as_parameter():
+    post = _build_post("Oats", "Overnight oats")
+    session = FakeAsyncSession(exec_plan=[FakeResult(all_values=[post])])
+
+    result = run(rag.lexical_search(session, "oats breakfast", top_k=3))
+
+    statement, _, kwargs = session.exec_calls[0]
+    assert result == [post]
+    assert kwargs["params"] == {"query": "oats breakfast"}
+    assert "ts_rank_cd" in str(statement)
+
+
+def test_reciprocal_rank_fusion_rewards_posts_found_by_both_retrievers():
+    a, b, c = _build_post("A"), _build_post("B"), _build_post("C")
+
+    fused = rag.reciprocal_rank_fusion([[a, b], [c, b]], k=60)
+
+    assert fused[0] is b
+    assert {post.id for post in fused} == {a.id, b.id, c.id}
+    assert len(fused) == 3
+
+
+def test_hybrid_search_fuses_and_survives_failing_retriever(monkeypatch):
+    a, b = _build_post("A"), _build_post("B")
+
+    async def _vector(session, query, top_k):
+        return [a, b]
+
+    async def _lexical(query, top_k):
+        return [b]
+
+    monkeypatch.setattr(rag, "vector_search", _vector)
+    monkeypatch.setattr(rag, "_lexical_search_in_new_session", _lexical)
+
+    assert run(rag.hybrid_search(FakeAsyncSession(), "q", top_k=1)) == [b]
+
+    async def _lexical_error(query, top_k):
+        raise RuntimeError("fts down")
+
+    monkeypatch.setattr(rag, "_lexical_search_in_new_session", _lexical_error)
+
+    assert run(rag.hybrid_search(FakeAsyncSession(), "q", top_k=5)) == [a, b]
+
+
+def test_build_context_respects_token_budget():
+    first = _build_post("First", "x" * 400)
+    second = _build_post("Second", "y" * 400)
+
+    context, included = rag.build_context([first, second], token_budget=120)
+
+    assert included == [first]
+    assert context.startswith("[1] Title: First")
+    assert "Second" not in context
+
+    truncated, included = rag.build_context([first], token_budget=10)
+    assert included == [first]
+    assert len(truncated) == 40
 
 
 def test_ask_returns_no_sources_message(monkeypatch):
-    async def _vector_search(*args, **kwargs):
+    async def _hybrid_search(*args, **kwargs):
         return []
 
-    monkeypatch.setattr(rag, "vector_search", _vector_search)
+    monkeypatch.setattr(rag, "hybrid_search", _hybrid_search)
 
     result = run(rag.ask(FakeAsyncSession(), "question"))
 
@@ -144,7 +416,7 @@ def test_ask_returns_no_sources_message(monkeypatch):
 def test_ask_returns_answer_and_sources(monkeypatch):
     post = _build_post("Source title", "Source content")
 
-    async def _vector_search(*args, **kwargs):
+    async def _hybrid_search(*args, **kwargs):
         return [post]
 
     class _ChatCreate:
@@ -154,13 +426,104 @@ def test_ask_returns_answer_and_sources(monkeypatch):
             )
 
     fake_client = SimpleNamespace(chat=SimpleNamespace(completions=_ChatCreate()))
-    monkeypatch.setattr(rag, "vector_search", _vector_search)
+    stored = []
+
+    async def _no_cached_answer(*args):
+        return None
+
+    async def _store_answer(session, question, source_ids, answer):
+        stored.append((question, source_ids, answer))
+
+    monkeypatch.setattr(rag, "hybrid_search", _hybrid_search)
     monkeypatch.setattr(rag, "client", fake_client)
+    monkeypatch.setattr(rag, "get_cached_answer", _no_cached_answer)
+    monkeypatch.setattr(rag, "store_answer", _store_answer)
 
     result = run(rag.ask(FakeAsyncSession(), "question"))
 
     assert result["answer"] == "Use [1]"
     assert result["sources"][0]["title"] == "Source title"
+    assert stored == [("question", [str(post.id)], "Use [1]")]
+
+
+def test_ask_returns_cached_answer_without_calling_llm(monkeypatch):
+    post = _build_post("Source title", "Source content")
+
+    async def _hybrid_search(*args, **kwargs):
+        return [post]
+
+    async def _cached_answer(session, question, source_ids):
+        assert source_ids == [str(post.id)]
+        return "Cached [1]"
+
+    class _ChatCreate:
+        async def create(self, **kwargs):
+            raise AssertionError("LLM must not be called on cache hit")
+
+    monkeypatch.setattr(rag, "hybrid_search", _hybrid_search)
+    monkeypatch.setattr(rag, "get_cached_answer", _cached_answer)
+    monkeypatch.setattr(rag, "client", SimpleNamespace(chat=SimpleNamespace(completions=_ChatCreate())))
+
+    result = run(rag.ask(FakeAsyncSession(), "question"))
+
+    assert result["answer"] == "Cached [1]"
+    assert result["sources"] == [{"id": str(post.id), "title": "Source title"}]
+
+
+def test_sources_key_depends_on_source_order():
+    # Citations [1], [2] point at source positions, reordered sources need their own answer
+    assert answer_cache.sources_key(["b", "a"]) != answer_cache.sources_key(["a", "b"])
+    assert answer_cache.sources_key(["a", "b"]) == answer_cache.sources_key(["a", "b"])
+    assert answer_cache.sources_key(["a"]) != answer_cache.sources_key(["a", "b"])
+
+
+def test_get_cached_answer_applies_similarity_threshold(monkeypatch):
+    async def _embedding(session, text):
+        return [0.1] * 1536
+
+    monkeypatch.setattr(answer_cache, "get_or_create_embedding", _embedding)
+
+    close = FakeAsyncSession(exec_plan=[FakeResult(first=("Cached", 0.01))])
+    assert run(answer_cache.get_cached_answer(close, "q", ["p1"])) == "Cached"
+
+    far = FakeAsyncSession(exec_plan=[FakeResult(first=("Cached", 0.2))])
+    assert run(answer_cache.get_cached_answer(far, "q", ["p1"])) is None
+
+    failing = FakeAsyncSession(exec_plan=[RuntimeError("db")])
+    assert run(answer_cache.get_cached_answer(failing, "q", ["p1"])) is None
+
+    assert run(answer_cache.get_cached_answer(FakeAsyncSession(), "q", [])) is None
+
+
+def test_store_answer_adds_entry_and_tolerates_errors(monkeypatch):
+    async def _embedding(session, text):
+        return [0.1] * 1536
+
+    monkeypatch.setattr(answer_cache, "get_or_create_embedding", _embedding)
+
+    session = FakeAsyncSession()
+    run(answer_cache.store_answer(session, "q", ["p2", "p1"], "answer"))
+
+    entry = session.added[-1]
+    assert entry.answer == "answer"
+    assert entry.source_ids == ["p2", "p1"]
+    assert entry.sources_key == answer_cache.sources_key(["p2", "p1"])
+    assert session.commits == 1
+
+    failing = FakeAsyncSession(commit_plan=[RuntimeError("db")])
+    run(answer_cache.store_answer(failing, "q", ["p1"], "answer"))
+    assert failing.rollbacks == 1
+
+
+def test_invalidate_post_deletes_entries_citing_post():
+    session = FakeAsyncSession()
+    post_id = uuid4()
+
+    run(answer_cache.invalidate_post(session, post_id))
+
+    statement = session.exec_calls[0][0]
+    assert "DELETE FROM rag_answer_cache" in str(statement)
+    assert "source_ids @>" in str(statement)
 
 
 def test_search_aggregates_all_categories(monkeypatch):
@@ -451,3 +814,52 @@ def test_search_by_tag_returns_empty_on_error():
     session = FakeAsyncSession(exec_plan=[RuntimeError("db")])
 
     assert run(SearchService.search_by_tag(session=session, tag="fit")) == []
+
+
+def test_retrieve_builds_prompt_from_hybrid_results(monkeypatch):
+    post = _build_post("Oats", "Overnight oats")
+
+    async def _hybrid_search(*args, **kwargs):
+        return [post]
+
+    monkeypatch.setattr(rag, "hybrid_search", _hybrid_search)
+
+    prompt, sources = run(rag.retrieve(FakeAsyncSession(), "breakfast?"))
+
+    assert sources == [post]
+    assert "[1] Title: Oats" in prompt
+    assert prompt.endswith("Question: breakfast?\n\nAnswer:")
+
+
+def test_stream_answer_yields_tokens_and_closes_stream(monkeypatch):
+    class _Stream:
+        def __init__(self):
+            self.closed = False
+
+        def __aiter__(self):
+            async def _gen():
+                yield SimpleNamespace(choices=[])
+                for content in ("Hel", None, "lo"):
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+            return _gen()
+
+        async def close(self):
+            self.closed = True
+
+    stream = _Stream()
+    calls = []
+
+    class _ChatCreate:
+        async def create(self, **kwargs):
+            calls.append(kwargs)
+            return stream
+
+    monkeypatch.setattr(rag, "client", SimpleNamespace(chat=SimpleNamespace(completions=_ChatCreate())))
+
+    async def _collect():
+        return [token async for token in rag.stream_answer("prompt")]
+
+    assert run(_collect()) == ["Hel", "lo"]
+    assert calls[0]["stream"] is True
+    assert stream.closed is True
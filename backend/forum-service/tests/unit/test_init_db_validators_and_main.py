@@ -1,4 +1,5 @@
 import asyncio
+from argparse import Namespace
 import runpy
 import sys
 from types import SimpleNamespace
@@ -6,6 +7,7 @@ from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from src import init_posts as init_posts_module
 from src.db import main as db_main
@@ -25,39 +27,32 @@ def test_generate_mock_posts_creates_expected_count():
     assert all(post.content for post in posts)
 
 
-def test_seed_posts_commits_in_batches(monkeypatch):
-    posts = init_posts_module.generate_mock_posts(count=11)
-    session = FakeAsyncSession()
-
-    async def _embed(text):
-        return [0.1, 0.2]
-
-    monkeypatch.setattr(init_posts_module, "generate_embedding", _embed)
+def test_generate_mock_posts_is_deterministic():
+    first = init_posts_module.generate_mock_posts(count=5, seed=7)
+    second = init_posts_module.generate_mock_posts(count=5, seed=7)
 
-    run(init_posts_module.seed_posts(session, posts))
+    assert [(post.id, post.author_id, post.title) for post in first] == [
+        (post.id, post.author_id, post.title) for post in second
+    ]
+    assert len({post.id for post in first}) == 5
+    assert first[0].id not in {post.id for post in init_posts_module.generate_mock_posts(count=5, seed=8)}
 
-    assert session.commits == 2
-    assert len(session.added) == 11
 
-
-def test_seed_posts_handles_missing_embedding(monkeypatch):
-    posts = init_posts_module.generate_mock_posts(count=1)
+def test_seed_posts_inserts_in_batches_without_embeddings():
+    posts = init_posts_module.generate_mock_posts(count=11)
     session = FakeAsyncSession()
 
-    async def _embed(text):
-        return None
-
-    monkeypatch.setattr(init_posts_module, "generate_embedding", _embed)
+    run(init_posts_module.seed_posts(session, posts, batch_size=5))
 
-    run(init_posts_module.seed_posts(session, posts))
+    assert session.commits == 3
+    assert len(session.exec_calls) == 3
+    sql = str(session.exec_calls[0][0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO posts" in sql
+    assert "ON CONFLICT (id) DO NOTHING" in sql
+    assert all(post.embedding is None for post in posts)
 
-    assert session.commits == 1
-    assert posts[0].embedding is None
-
-
-def test_init_posts_skips_when_data_exists(monkeypatch):
-    session = FakeAsyncSession(exec_plan=[FakeResult(first=SimpleNamespace(id=uuid4()))])
 
+def _session_ctx(session):
     class _Ctx:
         async def __aenter__(self):
             return session
@@ -65,11 +60,17 @@ def test_init_posts_skips_when_data_exists(monkeypatch):
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    monkeypatch.setattr(init_posts_module, "AsyncSession", lambda _engine: _Ctx())
+    return lambda _engine: _Ctx()
+
+
+def test_init_posts_skips_when_data_exists(monkeypatch):
+    session = FakeAsyncSession(exec_plan=[FakeResult(first=uuid4())])
+
+    monkeypatch.setattr(init_posts_module, "AsyncSession", _session_ctx(session))
     seed_mock = AsyncMock()
     monkeypatch.setattr(init_posts_module, "seed_posts", seed_mock)
 
-    run(init_posts_module.init_posts())
+    run(init_posts_module.init_posts(Namespace(scale=0, seed=42, batch_size=500)))
 
     seed_mock.assert_not_awaited()
 
@@ -77,22 +78,33 @@ def test_init_posts_skips_when_data_exists(monkeypatch):
 def test_init_posts_seeds_when_table_empty(monkeypatch):
     session = FakeAsyncSession(exec_plan=[FakeResult(first=None)])
 
-    class _Ctx:
-        async def __aenter__(self):
-            return session
+    monkeypatch.setattr(init_posts_module, "AsyncSession", _session_ctx(session))
+    fake_posts = [SimpleNamespace(id=uuid4())]
+    monkeypatch.setattr(init_posts_module, "generate_mock_posts", lambda count, seed: fake_posts)
+    seed_mock = AsyncMock()
+    monkeypatch.setattr(init_posts_module, "seed_posts", seed_mock)
 
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
+    run(init_posts_module.init_posts(Namespace(scale=0, seed=42, batch_size=500)))
 
-    monkeypatch.setattr(init_posts_module, "AsyncSession", lambda _engine: _Ctx())
-    fake_posts = [SimpleNamespace(id=uuid4())]
-    monkeypatch.setattr(init_posts_module, "generate_mock_posts", lambda count=100: fake_posts)
+    seed_mock.assert_awaited_once_with(session, fake_posts, 500)
+
+
+def test_init_posts_with_scale_seeds_populated_table(monkeypatch):
+    session = FakeAsyncSession()
+
+    monkeypatch.setattr(init_posts_module, "AsyncSession", _session_ctx(session))
+    generated = []
+    monkeypatch.setattr(
+        init_posts_module, "generate_mock_posts", lambda count, seed: generated.append((count, seed)) or []
+    )
     seed_mock = AsyncMock()
     monkeypatch.setattr(init_posts_module, "seed_posts", seed_mock)
 
-    run(init_posts_module.init_posts())
+    run(init_posts_module.init_posts(Namespace(scale=3, seed=9, batch_size=100)))
 
-    seed_mock.assert_awaited_once_with(session, fake_posts)
+    assert generated == [(400, 9)]
+    assert session.exec_calls == []
+    seed_mock.assert_awaited_once_with(session, [], 100)
 
 
 def test_get_session_yields_session(monkeypatch):
@@ -212,6 +212,20 @@ async def proxy_workouts_search(request: Request, headers: Dict = Depends(get_au
 
 
 # Forum Service Proxy Routes
+@router.post("/forum/ai/ask/stream")
+async def proxy_forum_ai_stream(request: Request, headers: Dict = Depends(get_auth_headers)):
+    """Proxy streamed RAG answers without buffering the event stream"""
+    return await proxy.forward_stream(
+        service_name="forum",
+        path="/forum/ai/ask/stream",
+        method="POST",
+        headers=headers,
+        body=await request.body(),
+        params=dict(request.query_params),
+        timeout=120.0
+    )
+
+
 @router.api_route("/forum/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def proxy_forum(path: str, request: Request, headers: Dict = Depends(get_auth_headers)):
     """Proxy all requests to forum service"""
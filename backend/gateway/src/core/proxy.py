@@ -1,6 +1,7 @@
 import httpx
 import logging
 from fastapi import Request, Response, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Optional, Dict
 from src.core.config import settings
 
@@ -104,6 +105,85 @@ class ServiceProxy:
                 detail=f"Internal server error while proxying to {service_name}"
             )
     
+    async def forward_stream(
+        self,
+        service_name: str,
+        path: str,
+        method: str = "POST",
+        headers: Optional[Dict] = None,
+        body: Optional[bytes] = None,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+    ) -> StreamingResponse:
+        """
+        Forward a request and relay the response body chunk by chunk (e.g. Server-Sent Events)
+        instead of buffering it. The upstream connection is closed when the client goes away.
+        """
+        if service_name not in self.services:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown service: {service_name}"
+            )
+
+        service_url = self.services[service_name]
+        url = f"{service_url}{path}"
+
+        logger.info(f"Proxying streamed {method} request to {service_name}: {url}")
+
+        request_timeout = httpx.Timeout(timeout=timeout, connect=settings.CONNECT_TIMEOUT) if timeout else self.timeout
+        client = httpx.AsyncClient(timeout=request_timeout)
+
+        try:
+            upstream_request = client.build_request(
+                method=method,
+                url=url,
+                headers=self._filter_headers(headers or {}),
+                content=body,
+                params=params
+            )
+            response = await client.send(upstream_request, stream=True)
+        except httpx.TimeoutException:
+            await client.aclose()
+            logger.error(f"Timeout while connecting to {service_name} service")
+            raise HTTPException(
+                status_code=504,
+                detail=f"Gateway timeout: {service_name} service did not respond in time"
+            )
+        except httpx.ConnectError:
+            await client.aclose()
+            logger.error(f"Cannot connect to {service_name} service at {service_url}")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Service unavailable: Cannot connect to {service_name} service"
+            )
+        except httpx.HTTPError as e:
+            await client.aclose()
+            logger.error(f"HTTP error while calling {service_name}: {str(e)}")
+            raise HTTPException(
+                status_code=502,
+                detail=f"Bad gateway: Error communicating with {service_name} service"
+            )
+
+        async def relay():
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await response.aclose()
+                await client.aclose()
+
+        excluded_headers = {"content-length", "content-type", "transfer-encoding", "connection", "host"}
+        return StreamingResponse(
+            relay(),
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type"),
+            headers={
+                key: value
+                for key, value in response.headers.items()
+                if key.lower() not in excluded_headers
+            }
+        )
+
     def _filter_headers(self, headers: Dict) -> Dict:
         """Filter out headers that shouldn't be forwarded"""
         excluded_headers = {
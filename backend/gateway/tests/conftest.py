@@ -0,0 +1,11 @@
+import os
+
+# Ensure required settings exist before importing app modules.
+os.environ.setdefault("AUTH_REDIS_PASSWORD", "test-redis-password")
+os.environ.setdefault("REDIS_AUTH_URL", "redis://localhost:6379")
+os.environ.setdefault("AUTH_SERVICE_URL", "http://auth-service:8000")
+os.environ.setdefault("USER_SERVICE_URL", "http://user-service:8000")
+os.environ.setdefault("RECIPE_SERVICE_URL", "http://recipe-service:8000")
+os.environ.setdefault("WORKOUT_SERVICE_URL", "http://workout-service:8000")
+os.environ.setdefault("FORUM_SERVICE_URL", "http://forum-service:8000")
+os.environ.setdefault("ANALYTICS_SERVICE_URL", "http://analytics-service:8000")
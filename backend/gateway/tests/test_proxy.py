@@ -0,0 +1,155 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.core import proxy as proxy_module
+from src.core.proxy import ServiceProxy
+from src.main import app
+
+
+class TrackingStream(httpx.AsyncByteStream):
+    """Upstream body that records how far it was read and whether it was closed"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+def mock_upstream(handler):
+    """Patch the proxy's AsyncClient so requests hit `handler` instead of the network"""
+    real_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch.object(proxy_module.httpx, "AsyncClient", side_effect=client_factory)
+
+
+def sse_upstream(stream, status_code=200, seen=None):
+    def handler(request):
+        if seen is not None:
+            seen.append(request)
+        return httpx.Response(
+            status_code,
+            headers={"content-type": "text/event-stream", "x-request-id": "abc"},
+            stream=stream,
+        )
+    return handler
+
+
+async def collect(response):
+    return [chunk async for chunk in response.body_iterator]
+
+
+@pytest.mark.asyncio
+async def test_forward_stream_relays_chunks_unbuffered():
+    stream = TrackingStream([b"data: one\n\n", b"data: two\n\n", b"data: [DONE]\n\n"])
+    seen = []
+
+    with mock_upstream(sse_upstream(stream, seen=seen)):
+        response = await ServiceProxy().forward_stream(
+            "forum", "/forum/ai/ask/stream",
+            headers={"host": "gateway", "authorization": "Bearer token"},
+            body=b'{"question": "q"}',
+            params={"lang": "pl"},
+        )
+        chunks = await collect(response)
+
+    assert chunks == [b"data: one\n\n", b"data: two\n\n", b"data: [DONE]\n\n"]
+    assert response.status_code == 200
+    assert response.media_type == "text/event-stream"
+    assert response.headers["x-request-id"] == "abc"
+    assert str(seen[0].url) == "http://forum-service:8000/forum/ai/ask/stream?lang=pl"
+    assert seen[0].headers["authorization"] == "Bearer token"
+    assert seen[0].headers["host"] == "forum-service:8000"
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_forward_stream_preserves_upstream_error_status():
+    stream = TrackingStream([b'{"detail": "Rate limited"}'])
+
+    with mock_upstream(sse_upstream(stream, status_code=429)):
+        response = await ServiceProxy().forward_stream("forum", "/forum/ai/ask/stream")
+        chunks = await collect(response)
+
+    assert response.status_code == 429
+    assert chunks == [b'{"detail": "Rate limited"}']
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_forward_stream_closes_upstream_when_client_disconnects():
+    stream = TrackingStream([b"data: one\n\n", b"data: two\n\n", b"data: three\n\n"])
+
+    with mock_upstream(sse_upstream(stream)):
+        response = await ServiceProxy().forward_stream("forum", "/forum/ai/ask/stream")
+        relay = response.body_iterator
+        assert await relay.__anext__() == b"data: one\n\n"
+        # Starlette cancels the body iterator when the client goes away
+        await relay.aclose()
+
+    assert stream.closed
+    assert stream.sent == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, status_code", [
+    (httpx.ConnectTimeout("timed out"), 504),
+    (httpx.ConnectError("refused"), 503),
+    (httpx.RemoteProtocolError("broken"), 502),
+])
+async def test_forward_stream_maps_connection_errors(error, status_code):
+    def handler(request):
+        raise error
+
+    with mock_upstream(handler):
+        with pytest.raises(HTTPException) as exc_info:
+            await ServiceProxy().forward_stream("forum", "/forum/ai/ask/stream")
+
+    assert exc_info.value.status_code == status_code
+
+
+@pytest.mark.asyncio
+async def test_forward_stream_rejects_unknown_service():
+    with pytest.raises(HTTPException) as exc_info:
+        await ServiceProxy().forward_stream("billing", "/stream")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_ai_ask_stream_route_proxies_event_stream():
+    stream = TrackingStream([b"data: hello\n\n", b"data: [DONE]\n\n"])
+    seen = []
+
+    with mock_upstream(sse_upstream(stream, seen=seen)):
+        response = TestClient(app).post("/api/v1/forum/ai/ask/stream", json={"question": "q"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == "data: hello\n\ndata: [DONE]\n\n"
+    assert seen[0].method == "POST"
+    assert seen[0].content == b'{"question":"q"}'
+    assert stream.closed
+
+
+def test_ai_ask_stream_route_forwards_upstream_error_status():
+    stream = TrackingStream([b'{"detail": "Post not found"}'])
+
+    with mock_upstream(sse_upstream(stream, status_code=404)):
+        response = TestClient(app).post("/api/v1/forum/ai/ask/stream", json={"question": "q"})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Post not found"}
@@ -0,0 +1,7 @@
+"""
+Load testing of the whole backend through the API gateway.
+
+- ``generate``: grows a deterministic synthetic dataset in every service
+- ``stub_llm``: OpenAI-compatible LLM stub for RAG and embedding traffic
+- ``run``: asyncio load driver with realistic request mixes and p50/p95/p99 reports
+"""
@@ -0,0 +1,83 @@
+"""
+Generate a large synthetic dataset across all services.
+
+Runs the seed script of every service inside its running container
+(``docker compose exec``), so each one writes with its own models, settings
+and database. All generators are deterministic for a given ``--seed`` and
+skip what already exists, so a dataset can be grown step by step
+(``--scale 10``, then ``--scale 100``) without duplicates.
+
+Dataset size, with the 55 curated recipes, 300+ ingredients and 120+ exercises:
+    recipes      55 * (1 + scale)         posts    100 * (1 + scale)
+    ingredients ~300 * (1 + scale)        users    --users
+    exercises   ~120 * (1 + scale)        meals    ~3 * --users * --days
+
+Usage (from the backend directory, with the stack running):
+    python -m loadtest.generate --scale 1000 --users 10000 --days 365 --end-date 2026-06-30
+"""
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COMPOSE_FILE = Path(__file__).resolve().parents[2] / "docker-compose.yml"
+
+
+def seed_commands(args: argparse.Namespace) -> List[List[Sequence[str]]]:
+    """Seed commands per service, in stages: users first, everything else in parallel"""
+    common = ["--seed", str(args.seed)]
+    scale = ["--scale", str(args.scale)] + common
+    end_date = ["--end-date", args.end_date] if args.end_date else []
+    return [
+        [
+            ("user-service", "python", "-m", "src.init_users", "--users", str(args.users), *common),
+        ],
+        [
+            ("recipe-service", "python", "-m", "src.seed", *scale),
+            ("workout-service", "python", "-m", "src.init_exercises", *scale),
+            ("forum-service", "python", "-m", "src.init_posts", *scale),
+            ("analytics-service", "python", "-m", "src.init_meal_entries",
+             "--users", str(args.users), "--days", str(args.days), *end_date, *common),
+        ],
+    ]
+
+
+async def run_in_service(compose_file: Path, service: str, *command: str) -> None:
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        "docker", "compose", "-f", str(compose_file), "exec", "-T", service, *command
+    )
+    if await process.wait():
+        raise RuntimeError(f"Seeding {service} failed with exit code {process.returncode}")
+    logger.info(f"{service} seeded in {time.perf_counter() - started:.1f}s")
+
+
+async def generate(args: argparse.Namespace) -> None:
+    for stage in seed_commands(args):
+        if args.dry_run:
+            for service, *command in stage:
+                print(f"docker compose exec -T {service} {' '.join(command)}")
+            continue
+        await asyncio.gather(*(run_in_service(args.compose_file, service, *command) for service, *command in stage))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset in every service")
+    parser.add_argument("--scale", type=int, default=10,
+                        help="Synthetic recipes, ingredients, exercises and posts per curated one")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=90, help="Days of meal history per user")
+    parser.add_argument("--end-date", help="Last day of meal history (YYYY-MM-DD), pin it for a reproducible dataset")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compose-file", type=Path, default=COMPOSE_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="Print the commands instead of running them")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(generate(parse_args()))
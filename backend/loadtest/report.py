@@ -0,0 +1,120 @@
+"""
+Latency reports of load runs.
+
+A run is summarised per operation (count, errors, throughput and latency
+percentiles) and stored as JSON, so two runs can be compared later, e.g. the
+same mix before and after a change or at two dataset sizes.
+"""
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class OperationStats(BaseModel):
+    """Latencies in milliseconds of one operation"""
+    count: int = 0
+    errors: int = 0
+    rps: float = 0.0
+    mean: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+    status_codes: Dict[str, int] = Field(default_factory=dict)
+
+    @classmethod
+    def from_samples(cls, latencies: List[float], statuses: List[int], seconds: float) -> "OperationStats":
+        ordered = sorted(latencies)
+        codes: Dict[str, int] = {}
+        for status in statuses:
+            codes[str(status)] = codes.get(str(status), 0) + 1
+        return cls(
+            count=len(ordered),
+            # Status 0 is a transport error (timeout, refused connection)
+            errors=sum(1 for status in statuses if status == 0 or status >= 400),
+            rps=round(len(ordered) / seconds, 2) if seconds else 0.0,
+            mean=round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            max=round(ordered[-1], 2) if ordered else 0.0,
+            status_codes=codes,
+            **{f"p{p}": round(percentile(ordered, p), 2) for p in PERCENTILES},
+        )
+
+
+class RunReport(BaseModel):
+    """Result of one load run"""
+    label: str
+    started_at: datetime
+    seconds: float
+    config: Dict = Field(default_factory=dict)
+    total: OperationStats
+    operations: Dict[str, OperationStats] = Field(default_factory=dict)
+
+    def save(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.started_at:%Y%m%d-%H%M%S}-{self.label}.json"
+        path.write_text(self.model_dump_json(indent=2))
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "RunReport":
+        return cls.model_validate_json(Path(path).read_text())
+
+
+def format_report(report: RunReport) -> str:
+    lines = [
+        f"{report.label}: {report.total.count} requests in {report.seconds:.1f}s",
+        f"{'operation':<26}{'count':>8}{'err%':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+    ]
+    rows = sorted(report.operations.items()) + [("TOTAL", report.total)]
+    for name, stats in rows:
+        error_rate = 100 * stats.errors / stats.count if stats.count else 0.0
+        lines.append(
+            f"{name:<26}{stats.count:>8}{error_rate:>7.1f}{stats.rps:>9.1f}"
+            f"{stats.p50:>9.1f}{stats.p95:>9.1f}{stats.p99:>9.1f}{stats.max:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{100 * (after - before) / before:+.1f}%"
+
+
+def format_comparison(baseline: RunReport, current: RunReport) -> str:
+    """Percentile changes per operation, negative is faster"""
+    lines = [
+        f"{current.label} vs {baseline.label} (latency change, negative is faster)",
+        f"{'operation':<26}" + "".join(f"{'p' + str(p):>18}" for p in PERCENTILES) + f"{'rps':>12}",
+    ]
+    names = sorted(set(baseline.operations) & set(current.operations))
+    rows = [(name, baseline.operations[name], current.operations[name]) for name in names]
+    rows.append(("TOTAL", baseline.total, current.total))
+    for name, before, after in rows:
+        cells = "".join(
+            f"{getattr(after, f'p{p}'):>9.1f} {_change(getattr(before, f'p{p}'), getattr(after, f'p{p}')):>8}"
+            for p in PERCENTILES
+        )
+        lines.append(f"{name:<26}{cells}{_change(before.rps, after.rps):>12}")
+    return "\n".join(lines)
+
+
+def latest_report(directory: Path, label: Optional[str] = None) -> Optional[Path]:
+    """Most recent stored report, optionally of one label"""
+    pattern = f"*-{label}.json" if label else "*.json"
+    reports = sorted(Path(directory).glob(pattern))
+    return reports[-1] if reports else None
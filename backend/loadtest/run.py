@@ -0,0 +1,180 @@
+"""
+Load driver for the API gateway.
+
+Runs ``--concurrency`` virtual users in a closed loop for ``--duration``
+seconds. Each virtual user sends the calls of the chosen mix (see
+``scenarios.MIXES``) with an optional think time, and every response time
+after the warm-up is recorded. The run is printed as a p50/p95/p99 table per
+operation and stored as JSON under ``--results``; ``--compare`` prints the
+change against an earlier report (or ``latest`` for the newest one).
+
+Requests are authenticated with a gateway session cookie (``--session-id``)
+or a bearer token (``--token``). With a bearer token ``--users N`` spreads
+the requests over the synthetic users ``system-seed|load-{0..N-1}`` through
+the ``X-User-Id`` header, which only a test deployment should accept.
+
+Usage (from the backend directory):
+    python -m loadtest.run --mix mixed --concurrency 50 --duration 120 --label baseline
+    python -m loadtest.run --mix search --compare latest
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+from loadtest.report import OperationStats, RunReport, format_comparison, format_report, latest_report
+from loadtest.scenarios import MIXES, Call, Context, pick
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# One line per request would drown the report
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def auth_headers(args: argparse.Namespace) -> Dict[str, str]:
+    headers = {}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+    return headers
+
+
+async def discover(client: httpx.AsyncClient) -> Context:
+    """IDs of existing posts, recipes and ingredients for the operations that need them"""
+    ctx = Context()
+    lookups = (
+        ("post_ids", "/forum/posts", {"limit": 200}),
+        ("recipe_ids", "/recipes/", {"limit": 100, "view": "summary"}),
+        ("ingredient_ids", "/recipes/ingredients", {"limit": 200}),
+    )
+    for field, path, params in lookups:
+        try:
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+            payload = response.json()
+            items = payload.get("items", []) if isinstance(payload, dict) else payload
+            setattr(ctx, field, [str(item.get("_id") or item.get("id")) for item in items])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Could not load {field} from {path}: {e}")
+    logger.info(
+        f"Discovered {len(ctx.post_ids)} posts, {len(ctx.recipe_ids)} recipes, "
+        f"{len(ctx.ingredient_ids)} ingredients"
+    )
+    return ctx
+
+
+async def send(client: httpx.AsyncClient, call: Call, headers: Dict[str, str]) -> Tuple[int, float]:
+    """Status code (0 on transport errors) and latency in milliseconds"""
+    started = time.perf_counter()
+    try:
+        response = await client.request(call.method, call.path, params=call.params, json=call.body, headers=headers)
+        await response.aread()
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0
+    return status, (time.perf_counter() - started) * 1000
+
+
+async def run(args: argparse.Namespace) -> RunReport:
+    mix = MIXES[args.mix]
+    samples: Dict[str, Tuple[List[float], List[int]]] = {}
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    cookies = {"session_id": args.session_id} if args.session_id else None
+    async with httpx.AsyncClient(
+        base_url=args.gateway.rstrip("/") + "/api/v1",
+        headers=auth_headers(args),
+        cookies=cookies,
+        timeout=args.timeout,
+        limits=limits,
+    ) as client:
+        ctx = await discover(client)
+
+        started_at = datetime.now()
+        start = time.perf_counter()
+        measure_from = start + args.warmup
+        stop_at = measure_from + args.duration
+
+        async def virtual_user(number: int) -> None:
+            rng = random.Random(f"{args.seed}:{number}")
+            headers = {}
+            if args.users and args.token:
+                headers["X-User-Id"] = f"system-seed|load-{rng.randrange(args.users)}"
+            while time.perf_counter() < stop_at:
+                call = pick(rng, mix, ctx)
+                sent_at = time.perf_counter()
+                status, latency = await send(client, call, headers)
+                if sent_at >= measure_from:
+                    latencies, statuses = samples.setdefault(call.operation, ([], []))
+                    latencies.append(latency)
+                    statuses.append(status)
+                if args.think_ms:
+                    await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+        logger.info(f"Running mix '{args.mix}' with {args.concurrency} virtual users for {args.duration}s")
+        await asyncio.gather(*(virtual_user(number) for number in range(args.concurrency)))
+
+    seconds = min(time.perf_counter(), stop_at) - measure_from
+    all_latencies = [latency for latencies, _ in samples.values() for latency in latencies]
+    all_statuses = [status for _, statuses in samples.values() for status in statuses]
+    config = {
+        key: value for key, value in vars(args).items()
+        if key not in ("token", "session_id", "compare", "results")
+    }
+    return RunReport(
+        label=args.label or args.mix,
+        started_at=started_at,
+        seconds=round(seconds, 2),
+        config=config,
+        total=OperationStats.from_samples(all_latencies, all_statuses, seconds),
+        operations={
+            name: OperationStats.from_samples(latencies, statuses, seconds)
+            for name, (latencies, statuses) in samples.items()
+        },
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the MealUp gateway with realistic request mixes")
+    parser.add_argument("--gateway", default=os.getenv("LOADTEST_GATEWAY_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("LOADTEST_TOKEN"), help="Bearer access token")
+    parser.add_argument("--session-id", default=os.getenv("LOADTEST_SESSION_ID"), help="Gateway session cookie")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Seconds before measuring starts")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between calls of a virtual user")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=0,
+                        help="Spread requests over this many synthetic users (bearer token only)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", help="Report name (default: the mix)")
+    parser.add_argument("--results", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--compare", help="Baseline report path, or 'latest' for the newest stored report")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    baseline_path = latest_report(args.results) if args.compare == "latest" else args.compare
+
+    report = asyncio.run(run(args))
+    path = report.save(args.results)
+    print(format_report(report))
+    print(f"Report saved to {path}")
+
+    if baseline_path:
+        print()
+        print(format_comparison(RunReport.load(baseline_path), report))
+
+
+if __name__ == "__main__":
+    main()
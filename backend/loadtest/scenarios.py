@@ -0,0 +1,153 @@
+"""
+Request mixes of the load driver.
+
+Every operation builds one gateway call from a seeded ``random.Random`` and
+the IDs discovered when the run starts, so the same seed replays the same
+sequence of calls. A mix gives each operation a relative weight.
+"""
+import random
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Call(BaseModel):
+    """One gateway request"""
+    operation: str
+    method: str = "GET"
+    path: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    body: Optional[Any] = None
+
+
+class Context(BaseModel):
+    """IDs the operations pick from, discovered through the gateway before the run"""
+    post_ids: List[str] = Field(default_factory=list)
+    recipe_ids: List[str] = Field(default_factory=list)
+    ingredient_ids: List[str] = Field(default_factory=list)
+    today: date = Field(default_factory=date.today)
+
+
+SEARCH_TERMS = [
+    "chicken", "salmon", "rice", "pasta", "oats", "banana", "avocado", "tomato soup",
+    "protein", "vegan", "keto", "salad", "curry", "pancakes", "smoothie", "egg",
+    "squat", "push up", "deadlift", "plank", "stretching", "cardio", "lunges", "bench press",
+]
+
+QUESTIONS = [
+    "What should I eat before a {topic} session?",
+    "How much protein do I need for {topic}?",
+    "Is creatine useful for {topic}?",
+    "What is a good {noun} for beginners?",
+    "How do I recover faster after {topic}?",
+    "Can you recommend a {noun} for {topic}?",
+]
+
+TOPICS = ["strength training", "marathon prep", "weight loss", "muscle gain", "calisthenics", "yoga"]
+NOUNS = ["meal prep strategy", "workout routine", "dinner recipe", "stretching guide", "recovery protocol"]
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+
+def _prefix(rng: random.Random) -> str:
+    term = rng.choice(SEARCH_TERMS)
+    return term[:rng.randint(1, min(len(term), 5))]
+
+
+def forum_feed(rng: random.Random, ctx: Context) -> Call:
+    return Call(operation="forum.feed", path="/forum/posts", params={"skip": rng.choice([0, 0, 0, 20, 40]), "limit": 20})
+
+
+def forum_trending(rng: random.Random, ctx: Context) -> Call:
+    return Call(operation="forum.trending", path="/forum/posts/trending", params={"limit": 20})
+
+
+def forum_post(rng: random.Random, ctx: Context) -> Call:
+    if not ctx.post_ids:
+        return forum_feed(rng, ctx)
+    return Call(operation="forum.post", path=f"/forum/posts/{rng.choice(ctx.post_ids)}")
+
+
+def forum_search(rng: random.Random, ctx: Context) -> Call:
+    return Call(operation="forum.search", path="/forum/search", params={"q": rng.choice(SEARCH_TERMS), "limit": 20})
+
+
+def forum_ask(rng: random.Random, ctx: Context) -> Call:
+    question = rng.choice(QUESTIONS).format(topic=rng.choice(TOPICS), noun=rng.choice(NOUNS))
+    return Call(operation="forum.ask", method="POST", path="/forum/ai/ask", body={"question": question, "top_k": 5})
+
+
+def recipes_feed(rng: random.Random, ctx: Context) -> Call:
+    return Call(
+        operation="recipes.feed", path="/recipes/",
+        params={"skip": rng.choice([0, 0, 0, 20, 40]), "limit": 20, "view": "card"}
+    )
+
+
+def recipes_get(rng: random.Random, ctx: Context) -> Call:
+    if not ctx.recipe_ids:
+        return recipes_feed(rng, ctx)
+    return Call(operation="recipes.get", path=f"/recipes/{rng.choice(ctx.recipe_ids)}")
+
+
+def recipes_search(rng: random.Random, ctx: Context) -> Call:
+    return Call(
+        operation="recipes.search", path="/recipes/search",
+        params={"q": rng.choice(SEARCH_TERMS), "limit": 20, "view": "card"}
+    )
+
+
+def ingredients_autocomplete(rng: random.Random, ctx: Context) -> Call:
+    return Call(operation="ingredients.autocomplete", path="/recipes/ingredients/autocomplete", params={"q": _prefix(rng)})
+
+
+def exercises_search(rng: random.Random, ctx: Context) -> Call:
+    return Call(operation="exercises.search", path="/workouts/exercises", params={"search": rng.choice(SEARCH_TERMS), "limit": 20})
+
+
+def meals_log(rng: random.Random, ctx: Context) -> Call:
+    if not ctx.ingredient_ids:
+        return meals_daily(rng, ctx)
+    ingredients = [
+        {"ingredient_id": ingredient_id, "quantity": round(rng.uniform(30, 250), 1)}
+        for ingredient_id in rng.sample(ctx.ingredient_ids, min(len(ctx.ingredient_ids), rng.randint(1, 4)))
+    ]
+    return Call(
+        operation="meals.log", method="POST", path="/analytics/meals",
+        body={"date": ctx.today.isoformat(), "meal_type": rng.choice(MEAL_TYPES), "ingredients": ingredients}
+    )
+
+
+def meals_daily(rng: random.Random, ctx: Context) -> Call:
+    day = ctx.today - timedelta(days=rng.choice([0, 0, 1, 2, 7]))
+    return Call(operation="meals.daily", path=f"/analytics/daily/{day.isoformat()}")
+
+
+def meals_weekly(rng: random.Random, ctx: Context) -> Call:
+    return Call(
+        operation="meals.weekly", path="/analytics/weekly",
+        params={"date_from": (ctx.today - timedelta(weeks=12)).isoformat(), "date_to": ctx.today.isoformat()}
+    )
+
+
+Operation = Callable[[random.Random, Context], Call]
+
+MIXES: Dict[str, Dict[Operation, int]] = {
+    "feed": {forum_feed: 35, forum_trending: 10, forum_post: 15, recipes_feed: 25, recipes_get: 15},
+    "search": {recipes_search: 30, ingredients_autocomplete: 35, exercises_search: 15, forum_search: 20},
+    "meals": {meals_log: 50, meals_daily: 35, meals_weekly: 15},
+    "rag": {forum_ask: 1},
+    # Typical app session: mostly reading, some searching and logging, a few assistant questions
+    "mixed": {
+        forum_feed: 20, forum_trending: 5, forum_post: 10, recipes_feed: 15, recipes_get: 10,
+        recipes_search: 8, ingredients_autocomplete: 10, exercises_search: 4, forum_search: 4,
+        meals_log: 6, meals_daily: 5, meals_weekly: 1, forum_ask: 2,
+    },
+}
+
+
+def pick(rng: random.Random, mix: Dict[Operation, int], ctx: Context) -> Call:
+    """Next call of a mix"""
+    operation, = rng.choices(list(mix), weights=list(mix.values()))
+    return operation(rng, ctx)
@@ -0,0 +1,142 @@
+"""
+OpenAI-compatible stub of the LLM provider for load tests.
+
+Serves ``/chat/completions`` (plain and streamed) and ``/embeddings`` with
+configurable latency, so RAG and embedding traffic can be load tested
+without paying for, or being rate limited by, the real provider. Point the
+forum service at it with ``OPENROUTER_BASE_URL=http://<host>:8099``.
+
+Embeddings are a hashed bag of words: every word maps to a fixed random
+vector and a text embeds as the normalized sum of its words, so texts
+sharing words are close and vector search returns meaningful neighbours.
+
+Usage (from the backend directory):
+    python -m loadtest.stub_llm --port 8099 --latency-ms 400 --tokens-per-second 60
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+import zlib
+from functools import lru_cache
+from typing import List, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+ANSWER = (
+    "Based on the community posts, aim for a balanced plate with a lean protein source, "
+    "complex carbohydrates and vegetables, stay hydrated and keep your training consistent. "
+    "Adjust portions to your goals and listen to your body during recovery."
+)
+
+app = FastAPI(title="Stub LLM")
+app.state.latency_ms = 400.0
+app.state.tokens_per_second = 60.0
+app.state.dim = 1536
+
+
+@lru_cache(maxsize=100_000)
+def word_vector(word: str, dim: int) -> Tuple[float, ...]:
+    rng = random.Random(zlib.crc32(word.encode()))
+    return tuple(rng.gauss(0, 1) for _ in range(dim))
+
+
+def embed(text: str, dim: int) -> List[float]:
+    total = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()) or [""]:
+        for i, value in enumerate(word_vector(word, dim)):
+            total[i] += value
+    norm = math.sqrt(sum(value * value for value in total)) or 1.0
+    return [value / norm for value in total]
+
+
+def _completion_id() -> str:
+    return f"chatcmpl-{uuid.uuid4().hex}"
+
+
+@app.post("/embeddings")
+async def embeddings(request: Request):
+    payload = await request.json()
+    inputs = payload["input"] if isinstance(payload["input"], list) else [payload["input"]]
+    await asyncio.sleep(app.state.latency_ms / 4000)
+    return {
+        "object": "list",
+        "model": payload.get("model", "stub"),
+        "data": [
+            {"object": "embedding", "index": i, "embedding": embed(text, app.state.dim)}
+            for i, text in enumerate(inputs)
+        ],
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    payload = await request.json()
+    model = payload.get("model", "stub")
+    words = ANSWER.split(" ")
+
+    # Time to first token, then a steady token rate
+    await asyncio.sleep(app.state.latency_ms / 1000)
+
+    if not payload.get("stream"):
+        await asyncio.sleep(len(words) / app.state.tokens_per_second)
+        return {
+            "id": _completion_id(),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": ANSWER},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(words), "total_tokens": len(words)},
+        }
+
+    completion_id = _completion_id()
+
+    def chunk(delta: dict, finish_reason=None) -> str:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    async def stream():
+        yield chunk({"role": "assistant", "content": ""})
+        for i, word in enumerate(words):
+            await asyncio.sleep(1 / app.state.tokens_per_second)
+            yield chunk({"content": word if i == 0 else " " + word})
+        yield chunk({}, "stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stub for load tests")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0)
+    parser.add_argument("--dim", type=int, default=1536, help="Embedding dimension, must match the posts table")
+    args = parser.parse_args()
+
+    app.state.latency_ms = args.latency_ms
+    app.state.tokens_per_second = args.tokens_per_second
+    app.state.dim = args.dim
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+
+from loadtest.report import OperationStats, RunReport, format_comparison, percentile
+
+
+def _report(label, total, **operations):
+    return RunReport(
+        label=label, started_at=datetime(2026, 10, 19, 12, 0), seconds=60.0,
+        total=total, operations=operations,
+    )
+
+
+def test_percentile_of_empty_samples_is_zero():
+    assert percentile([], 50) == 0.0
+    assert percentile([], 99) == 0.0
+
+
+@pytest.mark.parametrize("p", [1, 50, 95, 99, 100])
+def test_percentile_of_single_sample_is_that_sample(p):
+    assert percentile([42.0], p) == 42.0
+
+
+def test_percentile_uses_nearest_rank_on_100_samples():
+    samples = [float(value) for value in range(1, 101)]
+
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile(samples, 100) == 100.0
+    assert percentile(samples, 0) == 1.0
+
+
+def test_percentile_rounds_rank_up():
+    # ceil(0.99 * 10) = 10, so p99 of ten samples is the slowest one
+    assert percentile([float(value) for value in range(1, 11)], 99) == 10.0
+    assert percentile([1.0, 2.0, 3.0], 50) == 2.0
+
+
+def test_operation_stats_from_no_samples_is_all_zero():
+    stats = OperationStats.from_samples([], [], seconds=0)
+
+    assert stats == OperationStats()
+
+
+def test_operation_stats_from_single_sample():
+    stats = OperationStats.from_samples([12.345], [200], seconds=2.0)
+
+    assert stats.count == 1
+    assert stats.errors == 0
+    assert stats.rps == 0.5
+    assert stats.mean == stats.p50 == stats.p95 == stats.p99 == stats.max == 12.35
+    assert stats.status_codes == {"200": 1}
+
+
+def test_operation_stats_counts_transport_and_http_errors():
+    latencies = [float(value) for value in range(100, 0, -1)]
+    statuses = [200] * 96 + [404, 500, 0, 0]
+
+    stats = OperationStats.from_samples(latencies, statuses, seconds=10.0)
+
+    assert stats.count == 100
+    assert stats.errors == 4
+    assert stats.rps == 10.0
+    assert stats.mean == 50.5
+    assert (stats.p50, stats.p95, stats.p99, stats.max) == (50.0, 95.0, 99.0, 100.0)
+    assert stats.status_codes == {"200": 96, "404": 1, "500": 1, "0": 2}
+
+
+def test_format_comparison_reports_relative_change_per_operation():
+    baseline = _report(
+        "before",
+        OperationStats(count=10, rps=20.0, p50=10.0, p95=20.0, p99=40.0),
+        **{
+            "forum.feed": OperationStats(count=5, rps=10.0, p50=10.0, p95=20.0, p99=40.0),
+            "forum.ask": OperationStats(count=5, rps=10.0, p50=100.0, p95=200.0, p99=400.0),
+        },
+    )
+    current = _report(
+        "after",
+        OperationStats(count=10, rps=25.0, p50=5.0, p95=30.0, p99=40.0),
+        **{
+            "forum.feed": OperationStats(count=5, rps=12.5, p50=5.0, p95=30.0, p99=40.0),
+            "recipes.feed": OperationStats(count=5, rps=10.0, p50=1.0, p95=1.0, p99=1.0),
+        },
+    )
+
+    lines = format_comparison(baseline, current).splitlines()
+
+    assert lines[0] == "after vs before (latency change, negative is faster)"
+    # Only operations present in both runs are compared, TOTAL comes last
+    assert [line.split()[0] for line in lines[2:]] == ["forum.feed", "TOTAL"]
+    assert lines[2].split()[1:] == ["5.0", "-50.0%", "30.0", "+50.0%", "40.0", "+0.0%", "+25.0%"]
+
+
+def test_format_comparison_without_baseline_latency_is_not_applicable():
+    baseline = _report("before", OperationStats())
+    current = _report("after", OperationStats(count=1, rps=1.0, p50=5.0, p95=5.0, p99=5.0))
+
+    total = format_comparison(baseline, current).splitlines()[-1]
+
+    assert total.split() == ["TOTAL", "5.0", "n/a", "5.0", "n/a", "5.0", "n/a", "n/a"]
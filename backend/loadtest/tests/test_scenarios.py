@@ -0,0 +1,48 @@
+import random
+from collections import Counter
+from datetime import date
+
+from loadtest.scenarios import MIXES, Context, forum_ask, forum_feed, forum_post, pick
+
+
+def _context():
+    return Context(
+        post_ids=["p1", "p2"], recipe_ids=["r1"], ingredient_ids=["i1", "i2", "i3"], today=date(2026, 10, 19)
+    )
+
+
+def test_pick_replays_the_same_calls_for_the_same_seed():
+    rng_a, rng_b = random.Random(7), random.Random(7)
+
+    calls_a = [pick(rng_a, MIXES["mixed"], _context()) for _ in range(200)]
+    calls_b = [pick(rng_b, MIXES["mixed"], _context()) for _ in range(200)]
+
+    assert calls_a == calls_b
+    assert calls_a != [pick(random.Random(8), MIXES["mixed"], _context()) for _ in range(200)]
+
+
+def test_pick_follows_mix_weights():
+    rng = random.Random(1)
+    mix = {forum_feed: 3, forum_ask: 1}
+
+    counts = Counter(pick(rng, mix, _context()).operation for _ in range(4000))
+
+    assert set(counts) == {"forum.feed", "forum.ask"}
+    assert 2.5 < counts["forum.feed"] / counts["forum.ask"] < 3.5
+
+
+def test_pick_falls_back_when_no_ids_were_discovered():
+    call = pick(random.Random(3), {forum_post: 1}, Context())
+
+    assert call.operation == "forum.feed"
+    assert call.path == "/forum/posts"
+
+
+def test_every_mix_builds_valid_calls():
+    rng = random.Random(5)
+
+    for name, mix in MIXES.items():
+        for _ in range(50):
+            call = pick(rng, mix, _context())
+            assert call.path.startswith("/"), name
+            assert call.method in {"GET", "POST"}
@@ -1,14 +1,19 @@
 import logging
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, Header, Depends
-import asyncio
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Header, Depends, Response, Path
+from pydantic import ValidationError
 from src.core.config import settings
 from src.models.model import (
     Recipe, RecipeCreate, RecipeUpdate, RecipeResponse,
-    Ingredient, IngredientCreate, IngredientUpdate, IngredientResponse
+    Ingredient, IngredientCreate, IngredientUpdate, IngredientResponse, IngredientSuggestion,
+    IngredientBulkRequest, RecipeView, RecipeViewResponse, RecipeListViewResponse,
+    RecipeIngredientsResponse, ImageJobResponse, RecipeVersionInfo
 )
 from src.services.recipe_service import RecipeService, IngredientService
-from src.services.image_generation_service import generate_recipe_image
+from src.services.recipe_version_service import RecipeVersionService
+from src.services.image_job_queue import image_job_queue
+from src.services.image_store import IMAGE_VARIANTS, ORIGINAL, get_image
+from src.services.nutrition_service import refresh_recipes_for_ingredient
 from typing import Dict
 
 from common.auth_guard import require_auth 
@@ -48,6 +53,20 @@ async def get_ingredients(
         raise HTTPException(status_code=500, detail="Failed to get ingredients")
 
 
+@router.get("/ingredients/autocomplete", response_model=list[IngredientSuggestion])
+async def autocomplete_ingredients(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(settings.INGREDIENT_AUTOCOMPLETE_LIMIT, ge=1, le=50),
+    token_payload: Dict = Depends(require_auth)
+):
+    """Ingredient name suggestions for the ingredient picker"""
+    try:
+        return await IngredientService.autocomplete_ingredients(q, limit)
+    except Exception as e:
+        logger.error(f"Error autocompleting ingredients: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to autocomplete ingredients")
+
+
 @router.get("/ingredients/{ingredient_id}", response_model=IngredientResponse)
 async def get_ingredient(
     ingredient_id: str,
@@ -76,6 +95,20 @@ async def get_ingredient_internal(
     return ingredient
 
 
+@router.post("/internal/ingredients/bulk", response_model=list[IngredientResponse])
+async def get_ingredients_bulk_internal(
+    request: IngredientBulkRequest,
+    _: None = Depends(require_internal_access),
+):
+    """Internal endpoint for analytics-service to resolve many ingredients at once.
+    Unknown IDs are omitted from the response."""
+    try:
+        return await IngredientService.get_ingredients_by_ids(request.ids)
+    except Exception as e:
+        logger.error(f"Error getting ingredients in bulk: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to get ingredients")
+
+
 @router.post("/ingredients", response_model=IngredientResponse, status_code=201)
 async def create_ingredient(
     ingredient_data: IngredientCreate, 
@@ -94,6 +127,7 @@ async def create_ingredient(
 async def update_ingredient(
     ingredient_id: str,
     ingredient_update: IngredientUpdate,
+    background_tasks: BackgroundTasks,
     token_payload: Dict = Depends(require_auth)
 ):
     """Update an ingredient"""
@@ -101,6 +135,10 @@ async def update_ingredient(
     
     if not ingredient:
         raise HTTPException(status_code=404, detail="Ingredient not found")
+
+    # Recipes store resolved ingredient macros, refresh them without blocking the response
+    if ingredient_update.model_fields_set & {"name", "macro_per_hundred"}:
+        background_tasks.add_task(refresh_recipes_for_ingredient, ingredient_id)
     
     return ingredient
 
@@ -108,6 +146,7 @@ async def update_ingredient(
 @router.delete("/ingredients/{ingredient_id}", status_code=204)
 async def delete_ingredient(
     ingredient_id: str,
+    background_tasks: BackgroundTasks,
     token_payload: Dict = Depends(require_auth)
 ):
     """Delete an ingredient"""
@@ -115,22 +154,25 @@ async def delete_ingredient(
     
     if not deleted:
         raise HTTPException(status_code=404, detail="Ingredient not found")
+
+    background_tasks.add_task(refresh_recipes_for_ingredient, ingredient_id)
     
     return None
 
 
 # ============ RECIPE ENDPOINTS ============
 
-@router.get("/", response_model=list[RecipeResponse])
+@router.get("/", response_model=RecipeListViewResponse)
 async def get_recipes(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     author_id: Optional[str] = Query(None),
+    view: RecipeView = Query(RecipeView.FULL, description="Fields to return: summary, card, ingredients or full"),
     token_payload: Dict = Depends(require_auth)
 ):
     """Get list of recipes with pagination"""
     try:
-        recipes = await RecipeService.get_recipes(skip, limit, author_id)
+        recipes = await RecipeService.get_recipes(skip, limit, author_id, view)
         return recipes
     except Exception as e:
         logger.error(f"Error getting recipes: {str(e)}")
@@ -148,25 +190,27 @@ async def create_recipe(
     
     try:
         recipe = await RecipeService.create_recipe(recipe_data, user_id)
-        
-        #Creating coroutine for image generation, we don't want to await it here to avoid blocking the response
-        asyncio.create_task(
-            generate_recipe_image(recipe.id, recipe.name)
-        )
-
-        return recipe
     except Exception as e:
         logger.error(f"Error creating recipe: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create recipe")
 
+    # Image generation runs in the persistent job queue workers, not in the request
+    try:
+        await image_job_queue.enqueue(recipe.id, recipe.name)
+    except Exception as e:
+        logger.error(f"Error enqueuing image job for recipe {recipe.id}: {str(e)}")
+
+    return recipe
+
 
-@router.get("/search", response_model=list[RecipeResponse])
+@router.get("/search", response_model=RecipeListViewResponse)
 async def search_recipes(
     q: str = Query(..., min_length=1, max_length=200, description="Search query"),
     tags: Optional[list[str]] = Query(None, description="Filter by tags"),
     author_id: Optional[str] = Query(None, description="Filter by author"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    view: RecipeView = Query(RecipeView.FULL, description="Fields to return: summary, card, ingredients or full"),
     token_payload: Dict = Depends(require_auth)
 ):
     """Search recipes by name, description, tags, or author"""
@@ -176,7 +220,8 @@ async def search_recipes(
             tags=tags,
             author_id=author_id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            view=view
         )
         return recipes
     except Exception as e:
@@ -184,13 +229,51 @@ async def search_recipes(
         raise HTTPException(status_code=500, detail="Failed to search recipes")
 
 
-@router.get("/{recipe_id}", response_model=RecipeResponse)
+@router.get("/images/{image_id}")
+async def get_recipe_image(
+    image_id: str,
+    variant: str = Query(ORIGINAL, description="original or thumbnail (WebP)"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
+):
+    """
+    Serve a stored recipe image, answering 304 when the client copy is current.
+    Public, because browsers load it from a plain ``<img src>`` without an
+    Authorization header; image IDs are random UUIDs and cannot be guessed.
+    """
+    if variant not in IMAGE_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"Unknown image variant: {variant}")
+
+    try:
+        image = await get_image(image_id, variant)
+    except Exception as e:
+        logger.error(f"Error loading image {image_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to load image")
+
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    etag = f"\"{image['etag']}\""
+    # Image IDs are never reused, a stored image can be cached forever, also by shared caches
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.IMAGE_CACHE_MAX_AGE}, immutable",
+    }
+    if if_none_match:
+        client_tags = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in client_tags or etag in client_tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=image["data"], media_type=image["content_type"], headers=headers)
+
+
+@router.get("/{recipe_id}", response_model=RecipeViewResponse)
 async def get_recipe(
     recipe_id: str,
+    view: RecipeView = Query(RecipeView.FULL, description="Fields to return: summary, card, ingredients or full"),
     token_payload: Dict = Depends(require_auth)
 ):
     """Get a recipe by ID"""
-    recipe = await RecipeService.get_recipe(recipe_id)
+    recipe = await RecipeService.get_recipe(recipe_id, view)
     
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -198,13 +281,13 @@ async def get_recipe(
     return recipe
 
 
-@router.get("/internal/recipes/{recipe_id}", response_model=RecipeResponse)
+@router.get("/internal/recipes/{recipe_id}", response_model=RecipeIngredientsResponse)
 async def get_recipe_internal(
     recipe_id: str,
     _: None = Depends(require_internal_access),
 ):
-    """Internal endpoint for analytics-service recipe lookups."""
-    recipe = await RecipeService.get_recipe(recipe_id)
+    """Internal endpoint for analytics-service recipe lookups (name, ingredients and nutrition only)."""
+    recipe = await RecipeService.get_recipe(recipe_id, RecipeView.INGREDIENTS)
 
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -212,6 +295,53 @@ async def get_recipe_internal(
     return recipe
 
 
+@router.get("/{recipe_id}/image-job", response_model=ImageJobResponse)
+async def get_recipe_image_job(
+    recipe_id: str,
+    token_payload: Dict = Depends(require_auth)
+):
+    """Get the status of the image generation job of a recipe"""
+    job = await image_job_queue.get_job(recipe_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Image job not found")
+
+    return job
+
+
+@router.get("/{recipe_id}/versions", response_model=list[RecipeVersionInfo])
+async def get_recipe_versions(
+    recipe_id: str,
+    token_payload: Dict = Depends(require_auth)
+):
+    """Get the version history of a recipe, newest first"""
+    versions = await RecipeVersionService.list_versions(recipe_id)
+    
+    if versions is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    
+    return versions
+
+
+@router.get("/{recipe_id}/versions/{version}", response_model=RecipeResponse)
+async def get_recipe_version(
+    recipe_id: str,
+    version: int = Path(..., ge=1),
+    token_payload: Dict = Depends(require_auth)
+):
+    """Get a recipe as it was in the given version"""
+    try:
+        recipe = await RecipeVersionService.get_recipe_version(recipe_id, version)
+    except ValidationError as e:
+        logger.error(f"Cannot rebuild version {version} of recipe {recipe_id}: {str(e)}")
+        raise HTTPException(status_code=409, detail="Recipe version cannot be rebuilt")
+    
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe version not found")
+    
+    return recipe
+
+
 @router.put("/{recipe_id}", response_model=RecipeResponse)
 async def update_recipe(
     recipe_id: str,
@@ -24,6 +24,35 @@ class Settings(BaseSettings):
     INGREDIENTS_COLLECTION: str = "ingredients"
     RECIPE_VERSIONS_COLLECTION: str = "recipe_versions"
 
+    # Recipe image store (GridFS bucket) and thumbnail pipeline
+    RECIPE_IMAGES_BUCKET: str = "recipe_images"
+    IMAGE_THUMBNAIL_SIZE: int = 256
+    IMAGE_THUMBNAIL_QUALITY: int = 80
+    # Public URL prefix (gateway) used to build the image reference stored on recipes
+    IMAGE_BASE_URL: str = "http://localhost:8000/api/v1"
+    IMAGE_CACHE_MAX_AGE: int = 31536000
+
+    # Persistent image generation queue
+    IMAGE_JOBS_COLLECTION: str = "image_jobs"
+    IMAGE_WORKER_CONCURRENCY: int = 2
+    IMAGE_JOB_MAX_ATTEMPTS: int = 5
+    IMAGE_JOB_RETRY_BASE_DELAY: float = 30.0
+    IMAGE_JOB_POLL_SECONDS: float = 5.0
+    # Running jobs not finished within this time are considered lost and claimed again
+    IMAGE_JOB_LOCK_TIMEOUT_SECONDS: int = 600
+    # Finished jobs are kept this long for status inspection
+    IMAGE_JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+
+    # Shorter search queries use the name prefix instead of the $text index
+    TEXT_SEARCH_MIN_LENGTH: int = 3
+
+    # In-memory ingredient autocomplete index, reloaded periodically to pick up writes of other instances
+    INGREDIENT_INDEX_REFRESH_SECONDS: float = 300.0
+    INGREDIENT_AUTOCOMPLETE_LIMIT: int = 10
+
+    # Batch size of the background job refreshing recipe nutrition after ingredient changes
+    NUTRITION_REFRESH_BATCH_SIZE: int = 100
+
     AUTH0_DOMAIN: str
     AUTH0_AUDIENCE: Optional[str] = None
     ALGORITHMS: str
@@ -4,6 +4,7 @@ from typing import Optional
 import logging
 
 from src.core.config import settings
+from common.text_search import SEARCH_COLLATION
 
 logger = logging.getLogger(__name__)
 
@@ -50,12 +51,35 @@ async def _create_indexes():
         await recipes_collection.create_index("_created_at")
         await recipes_collection.create_index("_updated_at")
         await recipes_collection.create_index([("_created_at", -1)])
+        # Lookup of dependent recipes when an ingredient changes
+        await recipes_collection.create_index("ingredients.ingredient_id")
+        # Ranked search (name outweighs instructions) and its short prefix fallback
+        await recipes_collection.create_index(
+            [("name", "text"), ("prepare_instruction", "text")],
+            weights={"name": 10, "prepare_instruction": 1},
+            name="recipe_text"
+        )
+        await recipes_collection.create_index("name", collation=SEARCH_COLLATION, name="name_ci")
 
         # Ingredients collection indexes
         ingredients_collection = _database[settings.INGREDIENTS_COLLECTION]
         await ingredients_collection.create_index("name")
+        await ingredients_collection.create_index([("name", "text")], name="ingredient_text")
+        await ingredients_collection.create_index("name", collation=SEARCH_COLLATION, name="name_ci")
         await ingredients_collection.create_index("_created_at")
 
+        # Cleanup of stored images per recipe (GridFS indexes files by filename itself)
+        images_files = _database[f"{settings.RECIPE_IMAGES_BUCKET}.files"]
+        await images_files.create_index("metadata.recipe_id")
+
+        # Image job queue: claim order and cleanup of finished jobs
+        image_jobs = _database[settings.IMAGE_JOBS_COLLECTION]
+        await image_jobs.create_index([("status", 1), ("next_run_at", 1)])
+        await image_jobs.create_index(
+            "finished_at",
+            expireAfterSeconds=settings.IMAGE_JOB_RETENTION_SECONDS
+        )
+
         # Recipe versions collection indexes (for versioning)
         versions_collection = _database[settings.RECIPE_VERSIONS_COLLECTION]
         await versions_collection.create_index("recipe_id")
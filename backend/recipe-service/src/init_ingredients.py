@@ -4,21 +4,25 @@ Initialize MongoDB with 300+ real-world ingredients.
 Deterministic UUIDs are generated from ingredient names so that
 init_recipes.py can reference them reliably.
 
-Run from the src/ directory:
-    python init_ingredients.py
+Ingredients are upserted by ID in unordered batches, so re-running only adds
+missing ingredients. ``--scale N`` adds N synthetic variants of every
+ingredient for load tests.
+
+Run from the service root:
+    python -m src.init_ingredients [--scale N]
 """
 
+import argparse
 import asyncio
-import sys
+import random
 import uuid
-from datetime import datetime
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent))
+from itertools import chain
+from typing import Iterator
 
-from db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
-from core.config import settings
-from models.model import Ingredient, Macro
+from common.seeding import SeedResult, add_seed_arguments, bulk_upsert, print_results
+from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
+from src.core.config import settings
+from src.models.model import Ingredient, Macro
 
 # ---------------------------------------------------------------------------
 # Deterministic ID generation — shared with init_recipes.py
@@ -463,28 +467,42 @@ def build_ingredient(name, units, cal, carbs, prot, fat):
     )
 
 
-async def init_ingredients():
-    """Seed the ingredients collection (idempotent — skips if data exists)."""
-    try:
-        print("Connecting to MongoDB…")
-        await connect_to_mongodb()
+SYNTHETIC_MACRO_JITTER = 0.15
+
+
+def generate_synthetic_ingredients(scale: int, seed: int = 42) -> Iterator[Ingredient]:
+    """``scale`` variants of every ingredient ("Tomato #3") with jittered macros."""
+    rng = random.Random(seed)
+
+    def jitter(value: float) -> float:
+        return round(value * rng.uniform(1 - SYNTHETIC_MACRO_JITTER, 1 + SYNTHETIC_MACRO_JITTER), 1)
 
-        db = get_database()
-        collection = db[settings.INGREDIENTS_COLLECTION]
+    for k in range(1, scale + 1):
+        for name, units, cal, carbs, prot, fat in ALL_INGREDIENTS:
+            yield build_ingredient(f"{name} #{k}", units, jitter(cal), jitter(carbs), jitter(prot), jitter(fat))
 
-        existing_count = await collection.count_documents({})
-        if existing_count > 0:
-            print(f"⚠️  Collection already has {existing_count} ingredients — skipping.")
-            return
 
-        docs = []
-        for row in ALL_INGREDIENTS:
-            ingredient = build_ingredient(*row)
-            docs.append(ingredient.model_dump(by_alias=True))
+def build_ingredient_docs(scale: int = 0, seed: int = 42) -> Iterator[dict]:
+    """Documents of the curated ingredients followed by the synthetic ones, built lazily."""
+    curated = (build_ingredient(*row) for row in ALL_INGREDIENTS)
+    for ingredient in chain(curated, generate_synthetic_ingredients(scale, seed)):
+        yield ingredient.model_dump(by_alias=True)
 
-        result = await collection.insert_many(docs)
 
-        print(f"✅ Inserted {len(result.inserted_ids)} ingredients.")
+async def seed_ingredients(args: argparse.Namespace) -> SeedResult:
+    """Upsert the ingredient documents (idempotent — existing ingredients are left untouched)."""
+    collection = get_database()[settings.INGREDIENTS_COLLECTION]
+    docs = build_ingredient_docs(args.scale, args.seed)
+    return await bulk_upsert(collection, docs, ("_id",), args.batch_size, args.concurrency)
+
+
+async def init_ingredients(args: argparse.Namespace):
+    """Seed the ingredients collection."""
+    try:
+        print("Connecting to MongoDB…")
+        await connect_to_mongodb()
+
+        print_results([await seed_ingredients(args)])
         print(f"   Categories: Vegetables({len(VEGETABLES)}), Fruits({len(FRUITS)}), "
               f"Meat({len(MEAT_AND_POULTRY)}), Seafood({len(FISH_AND_SEAFOOD)}), "
               f"Dairy({len(DAIRY_AND_EGGS)}), Grains({len(GRAINS_PASTA_BREAD)}), "
@@ -499,6 +517,10 @@ async def init_ingredients():
         await disconnect_from_mongodb()
 
 
+def parse_args() -> argparse.Namespace:
+    return add_seed_arguments(argparse.ArgumentParser(description="Seed the ingredient catalogue")).parse_args()
+
+
 if __name__ == "__main__":
     print(f"Total ingredients to seed: {len(ALL_INGREDIENTS)}")
-    asyncio.run(init_ingredients())
+    asyncio.run(init_ingredients(parse_args()))
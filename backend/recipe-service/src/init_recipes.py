@@ -3,32 +3,39 @@
 Initialize MongoDB with 55+ real recipes that reference ingredients
 by deterministic UUID (same namespace as init_ingredients.py).
 
-Run init_ingredients.py FIRST, then run this script.
+Recipes are upserted by (name, author) in unordered batches, so re-running
+only adds missing recipes. Nutrition is computed in memory from the
+ingredient catalogue, so this script does not depend on init_ingredients
+having run first. ``--scale N`` adds N synthetic recipes per curated recipe
+for load tests.
 
-Run from the src/ directory:
-    python init_recipes.py
+Run from the service root:
+    python -m src.init_recipes [--scale N]
 """
 
+import argparse
 import asyncio
-import sys
+import random
 import uuid
-from pathlib import Path
+from itertools import chain
+from typing import Dict, Iterator
 
-sys.path.insert(0, str(Path(__file__).parent))
-
-from db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
-from core.config import settings
-from models.model import Recipe, WeightedIngredient
+from common.seeding import SeedResult, add_seed_arguments, bulk_upsert, print_results
+from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
+from src.core.config import settings
+from src.init_ingredients import ALL_INGREDIENTS, build_ingredient, make_ingredient_id
+from src.models.model import Ingredient, Recipe, WeightedIngredient
+from src.services.nutrition_service import compute_recipe_nutrition
 
 # ---------------------------------------------------------------------------
-# Deterministic ID generation — MUST match init_ingredients.py
+# Deterministic recipe IDs, so every run and every replica seeds the same documents
 # ---------------------------------------------------------------------------
-INGREDIENT_NS = uuid.UUID("a3bb189e-8bf9-3888-9912-ace4e6543002")
+RECIPE_NS = uuid.UUID("5c3f7e1a-2b8d-4c6e-9f0a-1d2e3f4a5b6c")
 
 
-def make_ingredient_id(name: str) -> str:
-    """Generate a deterministic UUID-5 from an ingredient name."""
-    return str(uuid.uuid5(INGREDIENT_NS, name.lower().strip()))
+def make_recipe_id(name: str, author_id: str) -> str:
+    """Generate a deterministic UUID-5 from a recipe name and its author."""
+    return str(uuid.uuid5(RECIPE_NS, f"{author_id}/{name.lower().strip()}"))
 
 
 def ing(name: str, capacity: str, quantity: float) -> dict:
@@ -1798,46 +1805,87 @@ RECIPES = [
 
 
 # ---------------------------------------------------------------------------
-# Init function
+# Document builders
 # ---------------------------------------------------------------------------
-async def init_recipes():
-    """Seed the recipes collection (idempotent — skips if data exists)."""
-    try:
-        print("Connecting to MongoDB…")
-        await connect_to_mongodb()
+SYNTHETIC_AUTHORS = 50
+SYNTHETIC_CAPACITIES = ("g", "ml", "tbsp", "tsp", "cup", "pcs")
+
 
-        db = get_database()
-        collection = db[settings.RECIPES_COLLECTION]
+def build_catalogue() -> Dict[str, Ingredient]:
+    """The curated ingredients by ID, used to compute recipe nutrition."""
+    catalogue = [build_ingredient(*row) for row in ALL_INGREDIENTS]
+    return {ingredient.id: ingredient for ingredient in catalogue}
 
-        existing_count = await collection.count_documents({})
-        if existing_count > 0:
-            print(f"⚠️  Collection already has {existing_count} recipes — skipping.")
-            return
 
-        docs = []
-        for r in RECIPES:
-            weighted = [
-                WeightedIngredient(**i) for i in r["ingredients"]
-            ]
-            recipe = Recipe(
-                name=r["name"],
-                author_id=r["author_id"],
-                ingredients=weighted,
-                prepare_instruction=r["prepare_instruction"],
-                time_to_prepare=r["time_to_prepare"],
-                total_likes=r.get("total_likes", 0),
-                image=r.get("image", None)
-            )
-            docs.append(recipe.model_dump(by_alias=True))
+def build_recipe(data: dict, catalogue: Dict[str, Ingredient]) -> Recipe:
+    ingredients = [WeightedIngredient(**i) for i in data["ingredients"]]
+    servings = data.get("servings", 1)
+    return Recipe(
+        _id=make_recipe_id(data["name"], data["author_id"]),
+        name=data["name"],
+        author_id=data["author_id"],
+        ingredients=ingredients,
+        prepare_instruction=data["prepare_instruction"],
+        time_to_prepare=data["time_to_prepare"],
+        servings=servings,
+        total_likes=data.get("total_likes", 0),
+        image=data.get("image", None),
+        nutrition=compute_recipe_nutrition(ingredients, catalogue, servings)
+    )
 
-        result = await collection.insert_many(docs)
 
-        print(f"✅ Inserted {len(result.inserted_ids)} recipes.")
+def generate_synthetic_recipes(scale: int, seed: int = 42) -> Iterator[dict]:
+    """
+    ``scale`` variants of every curated recipe ("Classic Scrambled Eggs #3")
+    with random catalogue ingredients, authors, servings and likes.
+    """
+    rng = random.Random(seed)
+    ingredient_ids = sorted(make_ingredient_id(row[0]) for row in ALL_INGREDIENTS)
 
-        # Print summary
-        for recipe_doc, recipe_data in zip(docs, RECIPES):
-            n_ing = len(recipe_data["ingredients"])
-            print(f"  • {recipe_data['name']} ({n_ing} ingredients)")
+    for k in range(1, scale + 1):
+        for base in RECIPES:
+            yield {
+                "name": f"{base['name']} #{k}",
+                "author_id": f"system-seed|load-{rng.randrange(SYNTHETIC_AUTHORS)}",
+                "ingredients": [
+                    {
+                        "ingredient_id": ingredient_id,
+                        "capacity": rng.choice(SYNTHETIC_CAPACITIES),
+                        "quantity": rng.randint(1, 40) * 5,
+                    }
+                    for ingredient_id in rng.sample(ingredient_ids, rng.randint(3, 12))
+                ],
+                "prepare_instruction": base["prepare_instruction"],
+                "time_to_prepare": max(60, int(base["time_to_prepare"] * rng.uniform(0.5, 1.5))),
+                "servings": rng.randint(1, 6),
+                "total_likes": int(rng.paretovariate(1.5)) - 1,
+            }
+
+
+def build_recipe_docs(scale: int = 0, seed: int = 42) -> Iterator[dict]:
+    """Documents of the curated recipes followed by the synthetic ones, built lazily."""
+    catalogue = build_catalogue()
+    for data in chain(RECIPES, generate_synthetic_recipes(scale, seed)):
+        yield build_recipe(data, catalogue).model_dump(by_alias=True)
+
+
+# ---------------------------------------------------------------------------
+# Init function
+# ---------------------------------------------------------------------------
+async def seed_recipes(args: argparse.Namespace) -> SeedResult:
+    """Upsert the recipe documents (idempotent — existing recipes are left untouched)."""
+    collection = get_database()[settings.RECIPES_COLLECTION]
+    docs = build_recipe_docs(args.scale, args.seed)
+    return await bulk_upsert(collection, docs, ("name", "author_id"), args.batch_size, args.concurrency)
+
+
+async def init_recipes(args: argparse.Namespace):
+    """Seed the recipes collection."""
+    try:
+        print("Connecting to MongoDB…")
+        await connect_to_mongodb()
+
+        print_results([await seed_recipes(args)])
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -1846,6 +1894,10 @@ async def init_recipes():
         await disconnect_from_mongodb()
 
 
+def parse_args() -> argparse.Namespace:
+    return add_seed_arguments(argparse.ArgumentParser(description="Seed the recipes")).parse_args()
+
+
 if __name__ == "__main__":
     print(f"Total recipes to seed: {len(RECIPES)}")
-    asyncio.run(init_recipes())
+    asyncio.run(init_recipes(parse_args()))
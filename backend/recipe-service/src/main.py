@@ -4,6 +4,8 @@ from contextlib import asynccontextmanager
 from src.core.config import settings
 from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb
 from src.api.routes import router as recipe_router
+from src.services.image_job_queue import image_job_queue
+from src.services.ingredient_index import ingredient_index
 import logging
 
 logging.basicConfig(
@@ -19,7 +21,13 @@ async def lifespan(app: FastAPI):
     logger.info("Server is starting...")
     # Connect to MongoDB
     await connect_to_mongodb()
+    # Workers draining the persistent image generation queue
+    image_job_queue.start()
+    # Loads the ingredient autocomplete index and keeps it fresh
+    ingredient_index.start()
     yield
+    await ingredient_index.stop()
+    await image_job_queue.stop()
     # Disconnect from MongoDB
     await disconnect_from_mongodb()
     logger.info("Server has been stopped")
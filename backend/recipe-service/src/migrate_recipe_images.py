@@ -0,0 +1,37 @@
+# backend/recipe-service/src/migrate_recipe_images.py
+"""
+Move base64 images still embedded in recipe documents into the GridFS image
+store and replace them with short image URLs, and link the thumbnail of
+recipes migrated before ``thumbnail_url`` existed. Safe to run repeatedly.
+
+Run from the service root:
+    python -m src.migrate_recipe_images
+"""
+
+import asyncio
+
+from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb
+from src.services.image_store import backfill_thumbnail_urls, migrate_inline_images
+
+
+async def migrate_recipe_images():
+    """Move base64 images embedded in recipe documents to the GridFS image store."""
+    try:
+        print("Connecting to MongoDB…")
+        await connect_to_mongodb()
+
+        migrated = await migrate_inline_images()
+        print(f"✅ Migrated {migrated} recipe images.")
+
+        linked = await backfill_thumbnail_urls()
+        print(f"✅ Linked {linked} recipe thumbnails.")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+    finally:
+        await disconnect_from_mongodb()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_recipe_images())
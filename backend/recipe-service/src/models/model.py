@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Union
 from enum import Enum
 from datetime import datetime
 import uuid
@@ -84,6 +84,26 @@ class WeightedIngredient(BaseModel):
     )
 
 
+class IngredientNutrition(BaseModel):
+    """Ingredient of a recipe resolved to grams and absolute macros"""
+    ingredient_id: str = Field(..., description="ID reference to the ingredient")
+    name: str = Field(..., description="Ingredient name at computation time")
+    quantity: float = Field(..., ge=0, description="Quantity in grams")
+    macros: Macro = Field(..., description="Macro nutrients for this quantity")
+
+
+class NutritionSummary(BaseModel):
+    """Macro totals of a recipe without the per-ingredient breakdown"""
+    total: Macro = Field(..., description="Macro nutrients of the whole recipe")
+    per_serving: Macro = Field(..., description="Macro nutrients of a single serving")
+
+
+class RecipeNutrition(NutritionSummary):
+    """Pre-computed macro totals of a recipe, refreshed when the recipe or its ingredients change"""
+    ingredients: List[IngredientNutrition] = Field(default_factory=list, description="Resolved ingredient macros")
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class Recipe(BaseModel):
     """Recipe document stored in MongoDB"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id", description="Unique recipe ID")
@@ -92,8 +112,12 @@ class Recipe(BaseModel):
     ingredients: List[WeightedIngredient] = Field(..., min_length=1, description="List of weighted ingredients")
     prepare_instruction: List[str] = Field(..., min_length=1, description="Step-by-step preparation instructions")
     time_to_prepare: int = Field(..., gt=0, description="Time to prepare in seconds")
-    image: Optional[str] = Field(None, description="Recipe Image in base64 format")
+    servings: int = Field(default=1, ge=1, description="Number of servings the recipe yields")
+    image: Optional[str] = Field(None, description="URL of the recipe image served from the image store")
+    thumbnail_url: Optional[str] = Field(None, description="URL of the WebP thumbnail of the recipe image")
     total_likes: int = Field(default=0, ge=0, description="Total number of likes")
+    nutrition: Optional[RecipeNutrition] = Field(None, description="Pre-computed macro totals")
+    version: int = Field(default=1, ge=1, description="Content version, incremented on every update")
     created_at: datetime = Field(default_factory=datetime.utcnow, alias="_created_at")
     updated_at: datetime = Field(default_factory=datetime.utcnow, alias="_updated_at")
 
@@ -124,12 +148,36 @@ class Recipe(BaseModel):
     )
 
 
+class RecipeVersionDiff(BaseModel):
+    """
+    Reverse diff stored in the versions collection: the values the changed
+    fields had in ``version``, before the update that produced ``version + 1``
+    """
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id")
+    recipe_id: str = Field(..., description="ID of the versioned recipe")
+    version: int = Field(..., ge=1, description="Version the stored values belong to")
+    changes: Dict[str, Any] = Field(default_factory=dict, description="Previous values of the changed fields")
+    unset: List[str] = Field(default_factory=list, description="Changed fields the recipe did not have in ``version``")
+    author_id: str = Field(..., description="User ID of the author who made the update")
+    created_at: datetime = Field(default_factory=datetime.utcnow, alias="_created_at")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class RecipeVersionInfo(BaseModel):
+    """Entry of the version history of a recipe"""
+    version: int = Field(..., ge=1)
+    created_at: datetime = Field(..., description="When this version was created")
+    changed_fields: List[str] = Field(default_factory=list, description="Fields changed compared to the previous version")
+
+
 class RecipeCreate(BaseModel):
     """Schema for creating a new recipe"""
     name: str = Field(..., min_length=1, max_length=200)
     ingredients: List[WeightedIngredient] = Field(..., min_length=1)
     prepare_instruction: List[str] = Field(..., min_length=1, description="List of instruction steps")
     time_to_prepare: int = Field(..., gt=0, description="Time in seconds")
+    servings: int = Field(1, ge=1, description="Number of servings")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -158,6 +206,7 @@ class RecipeUpdate(BaseModel):
     ingredients: Optional[List[WeightedIngredient]] = None
     prepare_instruction: Optional[str] = Field(None, min_length=1)
     time_to_prepare: Optional[int] = Field(None, gt=0)
+    servings: Optional[int] = Field(None, ge=1)
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -201,11 +250,116 @@ class IngredientUpdate(BaseModel):
     macro_per_hundred: Optional[Macro] = None
 
 
+class IngredientBulkRequest(BaseModel):
+    """Schema for resolving many ingredients in one internal call"""
+    ids: List[str] = Field(..., min_length=1, max_length=500, description="Ingredient IDs to resolve")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ids": [
+                    "550e8400-e29b-41d4-a716-446655440000",
+                    "550e8400-e29b-41d4-a716-446655440001",
+                ],
+            }
+        }
+    )
+
+
+class ImageJobStatus(str, Enum):
+    """Lifecycle of a recipe image generation job"""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ImageJob(BaseModel):
+    """Image generation job stored in MongoDB, at most one per recipe"""
+    id: str = Field(..., alias="_id", description="Recipe ID the image is generated for")
+    recipe_name: str = Field(..., description="Recipe name used in the image prompt")
+    status: ImageJobStatus = Field(default=ImageJobStatus.PENDING)
+    attempts: int = Field(default=0, ge=0, description="Number of started attempts")
+    next_run_at: datetime = Field(default_factory=datetime.utcnow, description="Earliest time of the next attempt")
+    locked_at: Optional[datetime] = Field(None, description="When a worker claimed the job")
+    finished_at: Optional[datetime] = Field(None, description="When the job reached done or failed")
+    last_error: Optional[str] = None
+    image: Optional[str] = Field(None, description="Image reference produced by the job")
+    created_at: datetime = Field(default_factory=datetime.utcnow, alias="_created_at")
+    updated_at: datetime = Field(default_factory=datetime.utcnow, alias="_updated_at")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ImageJobResponse(ImageJob):
+    """Response schema for image job status"""
+    pass
+
+
+class RecipeView(str, Enum):
+    """Named projections of a recipe document, from the lightest to the full document"""
+    SUMMARY = "summary"
+    CARD = "card"
+    INGREDIENTS = "ingredients"
+    FULL = "full"
+
+
 class RecipeResponse(Recipe):
     """Response schema for recipe endpoints"""
     pass
 
 
+class RecipeSummaryResponse(BaseModel):
+    """Response schema for the ``summary`` view – identification and list metadata only"""
+    id: str = Field(..., alias="_id")
+    name: str
+    author_id: str
+    time_to_prepare: int
+    servings: int = 1
+    total_likes: int = 0
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class RecipeCardResponse(RecipeSummaryResponse):
+    """Response schema for the ``card`` view – what a recipe tile in a list page shows"""
+    image: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    nutrition: Optional[NutritionSummary] = None
+    created_at: datetime = Field(..., alias="_created_at")
+
+
+class RecipeIngredientsResponse(BaseModel):
+    """Response schema for the ``ingredients`` view – what meal logging needs to resolve macros"""
+    id: str = Field(..., alias="_id")
+    name: str
+    ingredients: List[WeightedIngredient]
+    servings: int = 1
+    nutrition: Optional[RecipeNutrition] = None
+    version: int = 1
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+# Any of the recipe views, the matching model is picked from the fields present
+RecipeViewResponse = Union[RecipeResponse, RecipeIngredientsResponse, RecipeCardResponse, RecipeSummaryResponse]
+RecipeListViewResponse = Union[
+    List[RecipeResponse],
+    List[RecipeIngredientsResponse],
+    List[RecipeCardResponse],
+    List[RecipeSummaryResponse],
+]
+
+
 class IngredientResponse(Ingredient):
     """Response schema for ingredient endpoints"""
     pass
+
+
+class IngredientSuggestion(BaseModel):
+    """Autocomplete entry served from the in-memory ingredient index"""
+    id: str = Field(..., alias="_id", description="Ingredient ID")
+    name: str = Field(..., description="Ingredient name")
+    units: str = Field(..., description="Base unit of measurement")
+
+    model_config = ConfigDict(populate_by_name=True)
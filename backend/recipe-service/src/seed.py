@@ -0,0 +1,33 @@
+"""
+Seed the ingredient catalogue and the recipes concurrently.
+
+Run from the service root:
+    python -m src.seed [--scale N] [--batch-size N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+
+from common.seeding import add_seed_arguments, print_results
+from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb
+from src.init_ingredients import seed_ingredients
+from src.init_recipes import seed_recipes
+
+
+async def seed(args: argparse.Namespace):
+    try:
+        print("Connecting to MongoDB…")
+        await connect_to_mongodb()
+
+        # Recipe nutrition is computed in memory, so both collections load in parallel
+        print_results(await asyncio.gather(seed_ingredients(args), seed_recipes(args)))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+    finally:
+        await disconnect_from_mongodb()
+
+
+if __name__ == "__main__":
+    parser = add_seed_arguments(argparse.ArgumentParser(description="Seed ingredients and recipes"))
+    asyncio.run(seed(parser.parse_args()))
@@ -1,9 +1,9 @@
 import random
 import logging
-from datetime import datetime
+from typing import Optional
 import httpx
-from src.db.mongodb import get_database
 from src.core.config import settings
+from src.services.image_store import store_recipe_image
 
 logger = logging.getLogger(__name__)
 
@@ -83,19 +83,27 @@ def _build_prompt(recipe_name: str) -> str:
     )
 
 
-async def generate_recipe_image(recipe_id: str, recipe_name: str) -> None:
+class ImageGenerationError(Exception):
+    """Image generation failed, ``retryable`` tells the job queue whether another attempt makes sense"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+async def generate_recipe_image(recipe_id: str, recipe_name: str) -> Optional[str]:
     """
-    Generate an AI image for a recipe via OpenRouter and persist the
-    base64 data-URL in MongoDB.
-    This function is designed to be fired as a background task
-    (asyncio.create_task) so it never blocks the HTTP response.
+    Generate an AI image for a recipe via OpenRouter and move it into the
+    image store, the recipe document only keeps the image URL.
+    Runs inside the image job queue workers, failures are raised as
+    ImageGenerationError so the queue can retry them.
+    Returns the image reference or None when the recipe was deleted meanwhile.
     """
     logger.info(f"Starting image generation for recipe {recipe_id} ({recipe_name})")
 
     api_key = settings.OPEN_ROUTER_API_KEY
     if not api_key:
-        logger.warning("OPEN_ROUTER_API_KEY is not set — skipping image generation")
-        return
+        raise ImageGenerationError("OPEN_ROUTER_API_KEY is not set", retryable=False)
 
     prompt = _build_prompt(recipe_name)
     logger.debug(f"Image prompt: {prompt}")
@@ -139,35 +147,29 @@ async def generate_recipe_image(recipe_id: str, recipe_name: str) -> None:
         )
 
         if not base64_data_url:
-            logger.error(f"Empty image URL in OpenRouter response for recipe {recipe_id}")
-            return
-
-        #Saving in database
-        db = get_database()
-        collection = db[settings.RECIPES_COLLECTION]
-        await collection.update_one(
-            {"_id": recipe_id},
-            {
-                "$set": {
-                    "image": base64_data_url,
-                    "_updated_at": datetime.utcnow(),
-                }
-            },
-        )
-        logger.info(f"Image saved for recipe {recipe_id} ({len(base64_data_url)} chars)")
-
+            raise ImageGenerationError(f"Empty image URL in OpenRouter response for recipe {recipe_id}")
+
+        #Saving in image store
+        reference = await store_recipe_image(recipe_id, base64_data_url)
+        if reference is None:
+            logger.warning(f"Recipe {recipe_id} was deleted before its image was saved")
+            return None
+        logger.info(f"Image saved for recipe {recipe_id} ({reference})")
+        return reference
+
+    except ImageGenerationError:
+        raise
     except httpx.HTTPStatusError as e:
-        logger.error(
+        raise ImageGenerationError(
             f"OpenRouter HTTP error for recipe {recipe_id}: "
             f"{e.response.status_code} — {e.response.text}"
         )
-    except KeyError as e:
-        logger.error(
+    except (KeyError, IndexError, TypeError) as e:
+        raise ImageGenerationError(
             f"Unexpected OpenRouter response structure for recipe {recipe_id}: "
-            f"missing key {e}. Full response: {result}"
+            f"missing key {e}"
         )
     except Exception as e:
-        logger.error(
-            f"Image generation failed for recipe {recipe_id}: {type(e).__name__}: {e}",
-            exc_info=True,
-        )
\ No newline at end of file
+        raise ImageGenerationError(
+            f"Image generation failed for recipe {recipe_id}: {type(e).__name__}: {e}"
+        )
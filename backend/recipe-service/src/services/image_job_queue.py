@@ -0,0 +1,194 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.core.config import settings
+from src.db.mongodb import get_database
+from src.models.model import ImageJob, ImageJobStatus
+from src.services.image_generation_service import ImageGenerationError, generate_recipe_image
+
+logger = logging.getLogger(__name__)
+
+
+class ImageJobQueue:
+    """
+    Persistent queue of recipe image generation jobs.
+    Jobs live in the image_jobs collection (one document per recipe, so repeated
+    requests for the same recipe collapse into one job) and are drained by a
+    fixed number of workers. Failed attempts are retried with exponential backoff,
+    jobs left running by a crashed process are claimed again after the lock timeout.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.IMAGE_WORKER_CONCURRENCY,
+        max_attempts: int = settings.IMAGE_JOB_MAX_ATTEMPTS,
+        retry_base_delay: float = settings.IMAGE_JOB_RETRY_BASE_DELAY,
+        poll_seconds: float = settings.IMAGE_JOB_POLL_SECONDS,
+        lock_timeout_seconds: int = settings.IMAGE_JOB_LOCK_TIMEOUT_SECONDS
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.poll_seconds = poll_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+
+    @staticmethod
+    def _collection():
+        return get_database()[settings.IMAGE_JOBS_COLLECTION]
+
+
+    async def enqueue(self, recipe_id: str, recipe_name: str) -> None:
+        """Schedule image generation for a recipe, a job that is already running is left alone"""
+        now = datetime.utcnow()
+        try:
+            await self._collection().update_one(
+                {"_id": recipe_id, "status": {"$ne": ImageJobStatus.RUNNING.value}},
+                {
+                    "$set": {
+                        "recipe_name": recipe_name,
+                        "status": ImageJobStatus.PENDING.value,
+                        "attempts": 0,
+                        "next_run_at": now,
+                        "locked_at": None,
+                        "finished_at": None,
+                        "last_error": None,
+                        "_updated_at": now,
+                    },
+                    "$setOnInsert": {"_created_at": now},
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # The filter did not match because the job is running, the upsert collided with it
+            logger.info(f"Image job for recipe {recipe_id} is already running")
+            return
+
+        if self._wakeup:
+            self._wakeup.set()
+
+
+    async def get_job(self, recipe_id: str) -> Optional[ImageJob]:
+        """Current state of the image job of a recipe"""
+        job = await self._collection().find_one({"_id": recipe_id})
+        return ImageJob(**job) if job else None
+
+
+    async def claim(self) -> Optional[ImageJob]:
+        """Atomically take the next due job, including jobs whose worker lock expired"""
+        now = datetime.utcnow()
+        expired = now - timedelta(seconds=self.lock_timeout_seconds)
+        job = await self._collection().find_one_and_update(
+            {"$or": [
+                {"status": ImageJobStatus.PENDING.value, "next_run_at": {"$lte": now}},
+                {"status": ImageJobStatus.RUNNING.value, "locked_at": {"$lt": expired}},
+            ]},
+            {
+                "$set": {"status": ImageJobStatus.RUNNING.value, "locked_at": now, "_updated_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        return ImageJob(**job) if job else None
+
+
+    async def process(self, job: ImageJob) -> None:
+        """Run one attempt of a claimed job and record its outcome"""
+        try:
+            reference = await generate_recipe_image(job.id, job.recipe_name)
+        except ImageGenerationError as e:
+            await self._record_failure(job, str(e), e.retryable)
+            return
+        except Exception as e:
+            await self._record_failure(job, f"{type(e).__name__}: {e}", True)
+            return
+
+        await self._update_claimed(job, {
+            "status": ImageJobStatus.DONE.value,
+            "image": reference,
+            "last_error": None,
+            "finished_at": datetime.utcnow(),
+        })
+        logger.info(f"Image job for recipe {job.id} done after {job.attempts} attempt(s)")
+
+
+    async def _record_failure(self, job: ImageJob, error: str, retryable: bool) -> None:
+        if retryable and job.attempts < self.max_attempts:
+            delay = self.retry_base_delay * (2 ** (job.attempts - 1))
+            logger.warning(f"Image job for recipe {job.id} failed, retrying in {delay:.0f}s: {error}")
+            await self._update_claimed(job, {
+                "status": ImageJobStatus.PENDING.value,
+                "next_run_at": datetime.utcnow() + timedelta(seconds=delay),
+                "locked_at": None,
+                "last_error": error,
+            })
+            return
+
+        logger.error(f"Giving up on image job for recipe {job.id} after {job.attempts} attempt(s): {error}")
+        await self._update_claimed(job, {
+            "status": ImageJobStatus.FAILED.value,
+            "last_error": error,
+            "finished_at": datetime.utcnow(),
+        })
+
+
+    async def _update_claimed(self, job: ImageJob, fields: dict) -> None:
+        """Update a job only while it still holds our claim (not re-enqueued or re-claimed)"""
+        fields["_updated_at"] = datetime.utcnow()
+        await self._collection().update_one(
+            {"_id": job.id, "status": ImageJobStatus.RUNNING.value, "locked_at": job.locked_at},
+            {"$set": fields}
+        )
+
+
+    def start(self) -> None:
+        """Start the worker pool"""
+        if any(not worker.done() for worker in self._workers):
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._run(number)) for number in range(self.concurrency)]
+        logger.info(f"Image job queue started with {self.concurrency} workers")
+
+
+    async def stop(self) -> None:
+        """Stop the worker pool, interrupted jobs are picked up again after the lock timeout"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Image job queue stopped")
+
+
+    async def _wait_for_work(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+    async def _run(self, number: int) -> None:
+        while True:
+            try:
+                job = await self.claim()
+                if job is None:
+                    await self._wait_for_work()
+                    continue
+                await self.process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Image worker {number} error: {str(e)}")
+                await asyncio.sleep(self.poll_seconds)
+
+
+image_job_queue = ImageJobQueue()
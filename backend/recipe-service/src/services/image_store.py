@@ -0,0 +1,205 @@
+"""
+Recipe image storage.
+
+Generated images are decoded from their base64 data URL and stored as binary
+files in a GridFS bucket, together with a resized WebP thumbnail. Recipe
+documents only carry a short URL pointing at the image endpoint, so list and
+search responses no longer drag hundreds of KB of base64 through Mongo,
+Pydantic and JSON.
+"""
+from typing import Optional, Tuple
+from datetime import datetime
+from io import BytesIO
+import asyncio
+import base64
+import binascii
+import hashlib
+import logging
+import re
+import uuid
+
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from PIL import Image, UnidentifiedImageError
+
+from src.db.mongodb import get_database
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ORIGINAL = "original"
+THUMBNAIL = "thumbnail"
+IMAGE_VARIANTS = (ORIGINAL, THUMBNAIL)
+
+_DATA_URL = re.compile(r"^data:(?P<content_type>image/[\w.+-]+);base64,(?P<data>.+)$", re.DOTALL)
+
+
+def decode_data_url(data_url: str) -> Tuple[bytes, str]:
+    """Decode a ``data:image/...;base64,`` URL into (bytes, content_type)"""
+    match = _DATA_URL.match(data_url or "")
+    if not match:
+        raise ValueError("Image is not a base64 data URL")
+    try:
+        data = base64.b64decode(match.group("data"), validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("Image data URL contains invalid base64")
+    return data, match.group("content_type")
+
+
+def make_thumbnail(data: bytes, size: Optional[int] = None, quality: Optional[int] = None) -> bytes:
+    """Resize an image to fit in a size x size box and encode it as WebP"""
+    size = size or settings.IMAGE_THUMBNAIL_SIZE
+    quality = quality or settings.IMAGE_THUMBNAIL_QUALITY
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            image.thumbnail((size, size))
+            output = BytesIO()
+            image.save(output, format="WEBP", quality=quality, method=4)
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"Unsupported image data: {e}")
+    return output.getvalue()
+
+
+def compute_etag(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def image_url(image_id: str, variant: str = ORIGINAL) -> str:
+    """Short reference stored in the recipe ``image`` (or ``thumbnail_url``) field"""
+    url = f"{settings.IMAGE_BASE_URL}/recipes/images/{image_id}"
+    return url if variant == ORIGINAL else f"{url}?variant={variant}"
+
+
+def _bucket() -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(get_database(), bucket_name=settings.RECIPE_IMAGES_BUCKET)
+
+
+def _filename(image_id: str, variant: str) -> str:
+    return f"{image_id}/{variant}"
+
+
+async def save_recipe_image(recipe_id: str, data: bytes, content_type: str) -> str:
+    """Store the original image and its WebP thumbnail, returns the new image ID"""
+    # Pillow work is CPU bound, keep it off the event loop
+    thumbnail = await asyncio.to_thread(make_thumbnail, data)
+
+    image_id = str(uuid.uuid4())
+    bucket = _bucket()
+    for variant, payload, variant_type in (
+        (ORIGINAL, data, content_type),
+        (THUMBNAIL, thumbnail, "image/webp"),
+    ):
+        await bucket.upload_from_stream(
+            _filename(image_id, variant),
+            payload,
+            metadata={
+                "recipe_id": recipe_id,
+                "image_id": image_id,
+                "variant": variant,
+                "content_type": variant_type,
+                "etag": compute_etag(payload),
+            },
+        )
+
+    logger.info(
+        f"Stored image {image_id} for recipe {recipe_id} "
+        f"({len(data)} bytes, thumbnail {len(thumbnail)} bytes)"
+    )
+    return image_id
+
+
+async def get_image(image_id: str, variant: str = ORIGINAL) -> Optional[dict]:
+    """Load a stored image variant, returns dict with data, content_type and etag"""
+    try:
+        stream = await _bucket().open_download_stream_by_name(_filename(image_id, variant))
+    except NoFile:
+        return None
+
+    metadata = stream.metadata or {}
+    data = await stream.read()
+    return {
+        "data": data,
+        "content_type": metadata.get("content_type", "application/octet-stream"),
+        "etag": metadata.get("etag") or compute_etag(data),
+    }
+
+
+async def delete_recipe_images(recipe_id: str, keep: Optional[str] = None) -> int:
+    """Delete stored images of a recipe except the ``keep`` image ID, returns deleted file count"""
+    bucket = _bucket()
+    query = {"metadata.recipe_id": recipe_id}
+    if keep:
+        query["metadata.image_id"] = {"$ne": keep}
+
+    deleted = 0
+    async for grid_out in bucket.find(query):
+        try:
+            await bucket.delete(grid_out._id)
+            deleted += 1
+        except NoFile:
+            continue
+    return deleted
+
+
+async def store_recipe_image(recipe_id: str, data_url: str) -> Optional[str]:
+    """
+    Move a base64 data URL into the image store and point the recipe at it.
+    Returns the new image reference or None when the recipe no longer exists.
+    """
+    data, content_type = decode_data_url(data_url)
+    image_id = await save_recipe_image(recipe_id, data, content_type)
+    reference = image_url(image_id)
+
+    collection = get_database()[settings.RECIPES_COLLECTION]
+    result = await collection.update_one(
+        {"_id": recipe_id},
+        {"$set": {
+            "image": reference,
+            "thumbnail_url": image_url(image_id, THUMBNAIL),
+            "_updated_at": datetime.utcnow(),
+        }}
+    )
+    if result.matched_count == 0:
+        # Recipe was deleted while the image was generated
+        await delete_recipe_images(recipe_id)
+        return None
+
+    await delete_recipe_images(recipe_id, keep=image_id)
+    return reference
+
+
+async def migrate_inline_images() -> int:
+    """Move base64 images still embedded in recipe documents to the image store"""
+    collection = get_database()[settings.RECIPES_COLLECTION]
+    cursor = collection.find({"image": {"$regex": "^data:"}}, {"_id": 1, "image": 1})
+
+    migrated = 0
+    async for recipe in cursor:
+        try:
+            if await store_recipe_image(recipe["_id"], recipe["image"]):
+                migrated += 1
+        except ValueError as e:
+            logger.error(f"Skipping inline image of recipe {recipe['_id']}: {str(e)}")
+    logger.info(f"Migrated {migrated} inline recipe images")
+    return migrated
+
+
+async def backfill_thumbnail_urls() -> int:
+    """Link the stored thumbnail of recipes migrated before ``thumbnail_url`` existed"""
+    collection = get_database()[settings.RECIPES_COLLECTION]
+    cursor = collection.find(
+        {"image": {"$regex": "/recipes/images/[^/?]+$"}, "thumbnail_url": None},
+        {"_id": 1, "image": 1},
+    )
+
+    updated = 0
+    async for recipe in cursor:
+        image_id = recipe["image"].rsplit("/", 1)[-1]
+        await collection.update_one(
+            {"_id": recipe["_id"], "image": recipe["image"]},
+            {"$set": {"thumbnail_url": image_url(image_id, THUMBNAIL)}}
+        )
+        updated += 1
+    logger.info(f"Linked thumbnails of {updated} recipes")
+    return updated
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import settings
+from src.db.mongodb import get_database
+from src.models.model import Ingredient, IngredientSuggestion
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(text: str) -> str:
+    """Lower-case, accent-folded and whitespace-collapsed form used as index key"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(folded.casefold().split())
+
+
+class IngredientIndex:
+    """
+    In-process autocomplete index of the ingredient catalogue.
+    Every word suffix of a normalized name ("tomato paste", "paste") is kept in
+    a sorted array, so a prefix lookup is a binary search plus a short scan and
+    suggestions never touch Mongo. The catalogue is small and read-mostly: it
+    is loaded at startup, patched by this instance's ingredient writes and
+    reloaded periodically to pick up writes made by other instances.
+    """
+
+    def __init__(self, refresh_seconds: float = settings.INGREDIENT_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+
+        self._suggestions: Dict[str, IngredientSuggestion] = {}
+        self._keys: List[Tuple[str, int, str]] = []
+        self._loaded = False
+        # Local writes made while a load is awaiting Mongo, replayed over its snapshot
+        # (None marks a removal) so they are not lost until the next reload
+        self._pending_writes: List[Dict[str, Optional[IngredientSuggestion]]] = []
+        self._refresher: Optional[asyncio.Task] = None
+
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+
+    def size(self) -> int:
+        """Number of indexed ingredients"""
+        return len(self._suggestions)
+
+
+    async def load(self) -> int:
+        """Replace the index with the current ingredient catalogue, returns number of ingredients"""
+        pending: Dict[str, Optional[IngredientSuggestion]] = {}
+        self._pending_writes.append(pending)
+        try:
+            collection = get_database()[settings.INGREDIENTS_COLLECTION]
+            cursor = collection.find({}, {"name": 1, "units": 1})
+            documents = await cursor.to_list(length=None)
+        finally:
+            self._pending_writes.remove(pending)
+
+        suggestions = {
+            document["_id"]: IngredientSuggestion(**document) for document in documents
+        }
+        for ingredient_id, suggestion in pending.items():
+            if suggestion is None:
+                suggestions.pop(ingredient_id, None)
+            else:
+                suggestions[ingredient_id] = suggestion
+
+        self._suggestions = suggestions
+        self._rebuild()
+        self._loaded = True
+        logger.info(f"Ingredient index loaded with {len(self._suggestions)} ingredients")
+        return len(self._suggestions)
+
+
+    def upsert(self, ingredient: Ingredient) -> None:
+        """Add or replace one ingredient after a local write"""
+        suggestion = IngredientSuggestion(
+            _id=ingredient.id, name=ingredient.name, units=ingredient.units
+        )
+        self._record_write(ingredient.id, suggestion)
+        self._suggestions[ingredient.id] = suggestion
+        self._rebuild()
+
+
+    def remove(self, ingredient_id: str) -> None:
+        """Drop one ingredient after a local delete"""
+        self._record_write(ingredient_id, None)
+        if self._suggestions.pop(ingredient_id, None) is not None:
+            self._rebuild()
+
+
+    def _record_write(self, ingredient_id: str, suggestion: Optional[IngredientSuggestion]) -> None:
+        for pending in self._pending_writes:
+            pending[ingredient_id] = suggestion
+
+
+    def search(self, query: str, limit: int = settings.INGREDIENT_AUTOCOMPLETE_LIMIT) -> List[IngredientSuggestion]:
+        """
+        Ingredients with a name word starting with query.
+        Names starting with the query come first, then earlier word matches, then shorter names.
+        """
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+
+        best: Dict[str, Tuple[int, int, str]] = {}
+        keys = self._keys
+        for index in range(bisect_left(keys, (prefix,)), len(keys)):
+            key, position, ingredient_id = keys[index]
+            if not key.startswith(prefix):
+                break
+            name = self._suggestions[ingredient_id].name
+            rank = (position, len(name), normalize_name(name))
+            if ingredient_id not in best or rank < best[ingredient_id]:
+                best[ingredient_id] = rank
+
+        ranked = sorted(best, key=best.__getitem__)[:limit]
+        return [self._suggestions[ingredient_id] for ingredient_id in ranked]
+
+
+    def _rebuild(self) -> None:
+        keys = []
+        for ingredient_id, suggestion in self._suggestions.items():
+            words = normalize_name(suggestion.name).split(" ")
+            for position in range(len(words)):
+                keys.append((" ".join(words[position:]), position, ingredient_id))
+        keys.sort()
+        self._keys = keys
+
+
+    def start(self) -> None:
+        """Start the periodic reload"""
+        if self._refresher and not self._refresher.done():
+            return
+        self._refresher = asyncio.create_task(self._run())
+
+
+    async def stop(self) -> None:
+        """Stop the periodic reload"""
+        if self._refresher:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+        self._refresher = None
+
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error loading ingredient index: {str(e)}")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+ingredient_index = IngredientIndex()
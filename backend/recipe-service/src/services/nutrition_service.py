@@ -0,0 +1,139 @@
+"""
+Pre-computed recipe nutrition.
+
+Recipes store their resolved ingredient macros together with per-recipe and
+per-serving totals, so consumers (analytics-service) read one document instead
+of converting units and scaling macros on every meal entry.
+"""
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+
+from pymongo import UpdateOne
+
+from src.db.mongodb import get_database
+from src.models.model import Ingredient, IngredientNutrition, Macro, RecipeNutrition, WeightedIngredient
+from src.core.config import settings
+from common.units import convert_to_grams
+
+logger = logging.getLogger(__name__)
+
+MACRO_FIELDS = ("calories", "carbs", "proteins", "fats")
+
+
+def _scale_macro(macro_per_hundred: Optional[Macro], grams: float) -> Macro:
+    if macro_per_hundred is None:
+        return Macro(calories=0, carbs=0, proteins=0, fats=0)
+    factor = grams / 100.0
+    return Macro(**{field: round(getattr(macro_per_hundred, field) * factor, 2) for field in MACRO_FIELDS})
+
+
+def _sum_macros(macros: List[Macro], divisor: int = 1) -> Macro:
+    return Macro(**{
+        field: round(sum(getattr(macro, field) for macro in macros) / divisor, 2)
+        for field in MACRO_FIELDS
+    })
+
+
+def compute_recipe_nutrition(
+    ingredients: List[WeightedIngredient],
+    ingredients_map: Dict[str, Ingredient],
+    servings: int = 1
+) -> RecipeNutrition:
+    """Resolve weighted ingredients to grams and macros, ingredients that no longer exist are skipped"""
+    resolved: List[IngredientNutrition] = []
+    for weighted in ingredients:
+        ingredient = ingredients_map.get(weighted.ingredient_id)
+        if ingredient is None:
+            logger.warning(f"Ingredient {weighted.ingredient_id} not found, skipping in nutrition")
+            continue
+
+        grams = convert_to_grams(weighted.quantity, weighted.capacity)
+        resolved.append(IngredientNutrition(
+            ingredient_id=weighted.ingredient_id,
+            name=ingredient.name,
+            quantity=grams,
+            macros=_scale_macro(ingredient.macro_per_hundred, grams),
+        ))
+
+    macros = [item.macros for item in resolved]
+    return RecipeNutrition(
+        total=_sum_macros(macros),
+        per_serving=_sum_macros(macros, max(servings, 1)),
+        ingredients=resolved,
+    )
+
+
+async def _load_ingredients(ingredient_ids: List[str]) -> Dict[str, Ingredient]:
+    """Load ingredients with a single $in query"""
+    db = get_database()
+    collection = db[settings.INGREDIENTS_COLLECTION]
+
+    unique_ids = list(dict.fromkeys(ingredient_ids))
+    cursor = collection.find({"_id": {"$in": unique_ids}})
+    docs = await cursor.to_list(length=len(unique_ids))
+    return {doc["_id"]: Ingredient(**doc) for doc in docs}
+
+
+async def build_recipe_nutrition(
+    ingredients: List[WeightedIngredient],
+    servings: int = 1
+) -> RecipeNutrition:
+    """Compute nutrition for a recipe that is about to be written"""
+    ingredients_map = await _load_ingredients([item.ingredient_id for item in ingredients])
+    return compute_recipe_nutrition(ingredients, ingredients_map, servings)
+
+
+async def refresh_recipes_for_ingredient(ingredient_id: str) -> int:
+    """
+    Recompute nutrition of every recipe that uses an ingredient.
+    Designed to run as a background task (FastAPI BackgroundTasks) after an
+    ingredient changes, recipes are processed in batches with one ingredient
+    lookup and one bulk write per batch. Returns the number of updated recipes.
+    """
+    batch_size = settings.NUTRITION_REFRESH_BATCH_SIZE
+    updated = 0
+
+    try:
+        db = get_database()
+        collection = db[settings.RECIPES_COLLECTION]
+        cursor = collection.find(
+            {"ingredients.ingredient_id": ingredient_id},
+            {"ingredients": 1, "servings": 1}
+        )
+        while True:
+            recipes = await cursor.to_list(length=batch_size)
+            if not recipes:
+                break
+
+            weighted_by_recipe = {
+                recipe["_id"]: [WeightedIngredient(**item) for item in recipe.get("ingredients", [])]
+                for recipe in recipes
+            }
+            ingredients_map = await _load_ingredients([
+                item.ingredient_id for weighted in weighted_by_recipe.values() for item in weighted
+            ])
+
+            now = datetime.utcnow()
+            operations = [
+                UpdateOne(
+                    {"_id": recipe["_id"]},
+                    {"$set": {
+                        "nutrition": compute_recipe_nutrition(
+                            weighted_by_recipe[recipe["_id"]],
+                            ingredients_map,
+                            recipe.get("servings", 1)
+                        ).model_dump(),
+                        "_updated_at": now,
+                    }}
+                )
+                for recipe in recipes
+            ]
+            await collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+
+        logger.info(f"Refreshed nutrition of {updated} recipes using ingredient {ingredient_id}")
+    except Exception as e:
+        logger.error(f"Failed to refresh nutrition for ingredient {ingredient_id}: {str(e)}")
+
+    return updated
@@ -1,16 +1,49 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import logging
 
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
 from src.db.mongodb import get_database
 from src.models.model import (
-    Recipe, RecipeCreate, RecipeUpdate, 
-    Ingredient, IngredientCreate, IngredientUpdate
+    Recipe, RecipeCreate, RecipeUpdate, WeightedIngredient,
+    Ingredient, IngredientCreate, IngredientUpdate, IngredientSuggestion,
+    RecipeView, RecipeSummaryResponse, RecipeCardResponse, RecipeIngredientsResponse
 )
+from src.services.nutrition_service import build_recipe_nutrition
+from src.services.image_store import delete_recipe_images
+from common.text_search import ranked_search
+from src.services.ingredient_index import ingredient_index
+from src.services.recipe_version_service import RecipeVersionService
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_SUMMARY_FIELDS = {"name": 1, "author_id": 1, "time_to_prepare": 1, "servings": 1, "total_likes": 1}
+
+# Mongo projections of the recipe views, None reads the whole document
+RECIPE_VIEW_PROJECTIONS: Dict[RecipeView, Optional[dict]] = {
+    RecipeView.SUMMARY: _SUMMARY_FIELDS,
+    RecipeView.CARD: {
+        **_SUMMARY_FIELDS,
+        "image": 1,
+        "thumbnail_url": 1,
+        "nutrition.total": 1,
+        "nutrition.per_serving": 1,
+        "_created_at": 1,
+    },
+    RecipeView.INGREDIENTS: {"name": 1, "ingredients": 1, "servings": 1, "nutrition": 1, "version": 1},
+    RecipeView.FULL: None,
+}
+
+RECIPE_VIEW_MODELS: Dict[RecipeView, type] = {
+    RecipeView.SUMMARY: RecipeSummaryResponse,
+    RecipeView.CARD: RecipeCardResponse,
+    RecipeView.INGREDIENTS: RecipeIngredientsResponse,
+    RecipeView.FULL: Recipe,
+}
+
 
 class IngredientService:
     """Service for ingredient CRUD operations"""
@@ -30,6 +63,7 @@ class IngredientService:
 
         ingredient_dict = ingredient.model_dump(by_alias=True)
         await collection.insert_one(ingredient_dict)
+        ingredient_index.upsert(ingredient)
 
         logger.info(f"Created ingredient {ingredient.id}")
         return ingredient
@@ -45,55 +79,79 @@ class IngredientService:
             return Ingredient(**ingredient_data)
         return None
     
+    @staticmethod
+    async def get_ingredients_by_ids(ingredient_ids: List[str]) -> List[Ingredient]:
+        """Get many ingredients by ID with a single $in query"""
+        db = get_database()
+        collection = db[settings.INGREDIENTS_COLLECTION]
+
+        unique_ids = list(dict.fromkeys(ingredient_ids))
+        cursor = collection.find({"_id": {"$in": unique_ids}})
+        ingredients = await cursor.to_list(length=len(unique_ids))
+
+        return [Ingredient(**ingredient) for ingredient in ingredients]
+
     @staticmethod
     async def get_ingredients(
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None
     ) -> List[Ingredient]:
-        """Get list of ingredients with pagination and search"""
+        """Get list of ingredients with pagination and ranked name search"""
         db = get_database()
         collection = db[settings.INGREDIENTS_COLLECTION]
         
-        query = {}
         if search:
-            query["name"] = {"$regex": search, "$options": "i"}
-        
-        cursor = collection.find(query).sort("name", 1).skip(skip).limit(limit)
-        ingredients = await cursor.to_list(length=limit)
+            ingredients = await ranked_search(
+                collection, search, skip=skip, limit=limit, min_text_length=settings.TEXT_SEARCH_MIN_LENGTH
+            )
+        else:
+            cursor = collection.find({}).sort("name", 1).skip(skip).limit(limit)
+            ingredients = await cursor.to_list(length=limit)
 
         return [Ingredient(**ingredient) for ingredient in ingredients]
     
+    @staticmethod
+    async def autocomplete_ingredients(query: str, limit: int = settings.INGREDIENT_AUTOCOMPLETE_LIMIT) -> List[IngredientSuggestion]:
+        """Ingredient name suggestions from the in-memory index, Mongo search until it is loaded"""
+        if ingredient_index.loaded:
+            return ingredient_index.search(query, limit)
+
+        collection = get_database()[settings.INGREDIENTS_COLLECTION]
+        ingredients = await ranked_search(
+            collection, query, projection={"name": 1, "units": 1}, limit=limit,
+            min_text_length=settings.TEXT_SEARCH_MIN_LENGTH
+        )
+        return [IngredientSuggestion(**ingredient) for ingredient in ingredients]
+
     @staticmethod
     async def update_ingredient(
         ingredient_id: str,
         ingredient_update: IngredientUpdate
     ) -> Optional[Ingredient]:
-        """Update an ingredient"""
+        """Update an ingredient, returns None when it does not exist"""
         db = get_database()
         collection = db[settings.INGREDIENTS_COLLECTION]
         
-        # Check if ingredient exists
-        existing = await collection.find_one({"_id": ingredient_id})
-        if not existing:
-            return None
-        
-        # Prepare update data
         update_data = ingredient_update.model_dump(exclude_unset=True)
-        if update_data:
-            update_data["_updated_at"] = datetime.utcnow()
-            
-            await collection.update_one(
-                {"_id": ingredient_id},
-                {"$set": update_data}
-            )
-            
-            updated_ingredient = await collection.find_one({"_id": ingredient_id})
-            if updated_ingredient is None:
-                return None
-            return Ingredient(**updated_ingredient)
+        if not update_data:
+            existing = await collection.find_one({"_id": ingredient_id})
+            return Ingredient(**existing) if existing else None
+        
+        update_data["_updated_at"] = datetime.utcnow()
+        
+        # Single round trip: update and read back the new document atomically
+        updated_ingredient = await collection.find_one_and_update(
+            {"_id": ingredient_id},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated_ingredient is None:
+            return None
         
-        return Ingredient(**existing)
+        ingredient = Ingredient(**updated_ingredient)
+        ingredient_index.upsert(ingredient)
+        return ingredient
     
     @staticmethod
     async def delete_ingredient(ingredient_id: str) -> bool:
@@ -104,6 +162,7 @@ class IngredientService:
         result = await collection.delete_one({"_id": ingredient_id})
         
         if result.deleted_count > 0:
+            ingredient_index.remove(ingredient_id)
             logger.info(f"Deleted ingredient {ingredient_id}")
             return True
         return False
@@ -124,7 +183,9 @@ class RecipeService:
             ingredients=recipe_data.ingredients,
             prepare_instruction=recipe_data.prepare_instruction,
             time_to_prepare=recipe_data.time_to_prepare,
+            servings=recipe_data.servings,
             image=None,
+            nutrition=await build_recipe_nutrition(recipe_data.ingredients, recipe_data.servings),
         )
 
         recipe_dict = recipe.model_dump(by_alias=True)
@@ -134,23 +195,24 @@ class RecipeService:
         return recipe
     
     @staticmethod
-    async def get_recipe(recipe_id: str) -> Optional[Recipe]:
-        """Get a recipe by ID"""
+    async def get_recipe(recipe_id: str, view: RecipeView = RecipeView.FULL) -> Optional[BaseModel]:
+        """Get a recipe by ID, reading only the fields of the requested view"""
         db = get_database()
         collection = db[settings.RECIPES_COLLECTION]
         
-        recipe_data = await collection.find_one({"_id": recipe_id})
+        recipe_data = await collection.find_one({"_id": recipe_id}, RECIPE_VIEW_PROJECTIONS[view])
         if recipe_data:
-            return Recipe(**recipe_data)
+            return RECIPE_VIEW_MODELS[view](**recipe_data)
         return None
     
     @staticmethod
     async def get_recipes(
         skip: int = 0,
         limit: int = 20,
-        author_id: Optional[str] = None
-    ) -> List[Recipe]:
-        """Get list of recipes with pagination"""
+        author_id: Optional[str] = None,
+        view: RecipeView = RecipeView.FULL
+    ) -> List[BaseModel]:
+        """Get list of recipes with pagination, reading only the fields of the requested view"""
         db = get_database()
         collection = db[settings.RECIPES_COLLECTION]
         
@@ -158,10 +220,11 @@ class RecipeService:
         if author_id:
             query["author_id"] = author_id
         
-        cursor = collection.find(query).sort("_created_at", -1).skip(skip).limit(limit)
+        cursor = collection.find(query, RECIPE_VIEW_PROJECTIONS[view]).sort("_created_at", -1).skip(skip).limit(limit)
         recipes = await cursor.to_list(length=limit)
 
-        return [Recipe(**recipe) for recipe in recipes]
+        model = RECIPE_VIEW_MODELS[view]
+        return [model(**recipe) for recipe in recipes]
     
     @staticmethod
     async def update_recipe(
@@ -169,33 +232,53 @@ class RecipeService:
         recipe_update: RecipeUpdate,
         author_id: str
     ) -> Optional[Recipe]:
-        """Update a recipe (only by author)"""
+        """Update a recipe (only by author), returns None when it does not exist or belongs to someone else"""
         db = get_database()
         collection = db[settings.RECIPES_COLLECTION]
         
-        # Check if recipe exists and belongs to author
-        existing = await collection.find_one({"_id": recipe_id, "author_id": author_id})
-        if not existing:
-            return None
-        
-        # Prepare update data
+        owned = {"_id": recipe_id, "author_id": author_id}
         update_data = recipe_update.model_dump(exclude_unset=True)
-        if update_data:
-            update_data["_updated_at"] = datetime.utcnow()
-            
-            result = await collection.update_one(
-                {"_id": recipe_id},
-                {"$set": update_data}
-            )
-            
-            if result.modified_count > 0:
-                logger.info(f"Updated recipe {recipe_id}")
-                updated_recipe = await collection.find_one({"_id": recipe_id})
-                if updated_recipe is None:
+        if not update_data:
+            existing = await collection.find_one(owned)
+            return Recipe(**existing) if existing else None
+        
+        update_data["_updated_at"] = datetime.utcnow()
+
+        # Keep pre-computed nutrition in sync with the new ingredients / servings
+        if "ingredients" in update_data or "servings" in update_data:
+            ingredients = recipe_update.ingredients
+            servings = recipe_update.servings
+            if not ingredients or not servings:
+                # Only the unchanged half is read, and only when it is needed
+                existing = await collection.find_one(owned, {"ingredients": 1, "servings": 1})
+                if not existing:
                     return None
-                return Recipe(**updated_recipe)
+                ingredients = ingredients or [
+                    WeightedIngredient(**ingredient) for ingredient in existing["ingredients"]
+                ]
+                servings = servings or existing.get("servings", 1)
+            nutrition = await build_recipe_nutrition(ingredients, servings)
+            update_data["nutrition"] = nutrition.model_dump()
+        
+        # Ownership check, update and version bump in one atomic round trip. The pipeline
+        # form treats recipes written before versioning as version 1, values are $literal
+        # so user text is never evaluated as an expression. The previous document is
+        # returned to diff against, the new one is the previous one plus the update.
+        before = await collection.find_one_and_update(
+            owned,
+            [{"$set": {
+                **{field: {"$literal": value} for field, value in update_data.items()},
+                "version": {"$add": [{"$ifNull": ["$version", 1]}, 1]},
+            }}],
+            return_document=ReturnDocument.BEFORE
+        )
+        if before is None:
+            return None
         
-        return Recipe(**existing)
+        await RecipeVersionService.record_version(before, update_data, author_id)
+        
+        logger.info(f"Updated recipe {recipe_id}")
+        return Recipe(**{**before, **update_data, "version": before.get("version", 1) + 1})
     
     @staticmethod
     async def delete_recipe(recipe_id: str, author_id: str) -> bool:
@@ -207,6 +290,14 @@ class RecipeService:
         
         if result.deleted_count > 0:
             logger.info(f"Deleted recipe {recipe_id}")
+            try:
+                await delete_recipe_images(recipe_id)
+            except Exception as e:
+                logger.error(f"Error deleting images of recipe {recipe_id}: {str(e)}")
+            try:
+                await RecipeVersionService.delete_versions(recipe_id)
+            except Exception as e:
+                logger.error(f"Error deleting version history of recipe {recipe_id}: {str(e)}")
             return True
         return False
     
@@ -216,18 +307,16 @@ class RecipeService:
         db = get_database()
         collection = db[settings.RECIPES_COLLECTION]
         
-        result = await collection.update_one(
+        updated_recipe = await collection.find_one_and_update(
             {"_id": recipe_id},
-            {"$inc": {"total_likes": 1}}
+            {"$inc": {"total_likes": 1}},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count > 0:
-            logger.info(f"Liked recipe {recipe_id}")
-            updated_recipe = await collection.find_one({"_id": recipe_id})
-            if updated_recipe is None:
-                return None
-            return Recipe(**updated_recipe)
-        return None
+        if updated_recipe is None:
+            return None
+        logger.info(f"Liked recipe {recipe_id}")
+        return Recipe(**updated_recipe)
     
     @staticmethod
     async def unlike_recipe(recipe_id: str) -> Optional[Recipe]:
@@ -235,18 +324,17 @@ class RecipeService:
         db = get_database()
         collection = db[settings.RECIPES_COLLECTION]
         
-        result = await collection.update_one(
+        # Never goes below zero: recipes without likes do not match
+        updated_recipe = await collection.find_one_and_update(
             {"_id": recipe_id, "total_likes": {"$gt": 0}},
-            {"$inc": {"total_likes": -1}}
+            {"$inc": {"total_likes": -1}},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count > 0:
-            logger.info(f"Unliked recipe {recipe_id}")
-            updated_recipe = await collection.find_one({"_id": recipe_id})
-            if updated_recipe is None:
-                return None
-            return Recipe(**updated_recipe)
-        return None
+        if updated_recipe is None:
+            return None
+        logger.info(f"Unliked recipe {recipe_id}")
+        return Recipe(**updated_recipe)
 
 
     @staticmethod
@@ -255,21 +343,15 @@ class RecipeService:
         tags: Optional[List[str]] = None,
         author_id: Optional[str] = None,
         skip: int = 0,
-        limit: int = 20
-    ) -> List[Recipe]:
-        """Search recipes with MongoDB text search and filters"""
+        limit: int = 20,
+        view: RecipeView = RecipeView.FULL
+    ) -> List[BaseModel]:
+        """Search recipes with the weighted MongoDB text index and filters, best matches first"""
         db = get_database()
         collection = db[settings.RECIPES_COLLECTION]
         
         filters: dict[str, Any] = {}
         
-        # Text search using MongoDB regex
-        if query:
-            filters["$or"] = [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"prepare_instruction": {"$regex": query, "$options": "i"}}
-            ]
-        
         # Filter by tags
         if tags:
             filters["tags"] = {"$in": tags}
@@ -278,8 +360,16 @@ class RecipeService:
         if author_id:
             filters["author_id"] = author_id
         
-        cursor = collection.find(filters).sort("_created_at", -1).skip(skip).limit(limit)
-        recipes = await cursor.to_list(length=limit)
+        projection = RECIPE_VIEW_PROJECTIONS[view]
+        if query:
+            recipes = await ranked_search(
+                collection, query, filters, projection, skip=skip, limit=limit,
+                min_text_length=settings.TEXT_SEARCH_MIN_LENGTH
+            )
+        else:
+            cursor = collection.find(filters, projection).sort("_created_at", -1).skip(skip).limit(limit)
+            recipes = await cursor.to_list(length=limit)
         
         logger.info(f"Found {len(recipes)} recipes for query '{query}'")
-        return [Recipe(**recipe) for recipe in recipes]
\ No newline at end of file
+        model = RECIPE_VIEW_MODELS[view]
+        return [model(**recipe) for recipe in recipes]
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Recipe version history.
+
+Recipes carry a ``version`` number that every update increments. Instead of
+copying the whole recipe, an update stores a reverse diff holding only the
+previous values of the fields it changed, so history grows with the size of
+the edits. A past version is rebuilt from the current document by applying
+the diffs newest first.
+
+Nutrition is not versioned: it is derived data that ingredient edits
+rewrite in the background without a new version, so a stored value would not
+belong to the version it was read back with. Rebuilt past versions carry no
+nutrition.
+"""
+from typing import Any, Dict, List, Optional
+import logging
+
+from src.db.mongodb import get_database
+from src.models.model import Recipe, RecipeVersionDiff, RecipeVersionInfo
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Recipe content tracked by the history, likes, the generated image and nutrition are not versioned
+VERSIONED_FIELDS = ("name", "ingredients", "prepare_instruction", "time_to_prepare", "servings")
+
+# Stored with every diff so a rebuilt version carries its own timestamp
+_TIMESTAMP_FIELD = "_updated_at"
+
+
+def compute_changes(before: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Previous values of the versioned fields that update_data actually changes"""
+    return {
+        field: before[field]
+        for field in VERSIONED_FIELDS
+        if field in update_data and field in before and before[field] != update_data[field]
+    }
+
+
+def compute_unset(before: Dict[str, Any], update_data: Dict[str, Any]) -> List[str]:
+    """Versioned fields update_data sets that the document did not have (e.g. servings of older recipes)"""
+    return [field for field in VERSIONED_FIELDS if field in update_data and field not in before]
+
+
+class RecipeVersionService:
+    """Service for the recipe version history"""
+
+    @staticmethod
+    async def record_version(before: Dict[str, Any], update_data: Dict[str, Any], author_id: str) -> None:
+        """Store the reverse diff of an update given the recipe document before it"""
+        collection = get_database()[settings.RECIPE_VERSIONS_COLLECTION]
+
+        changes = compute_changes(before, update_data)
+        changes[_TIMESTAMP_FIELD] = before.get(_TIMESTAMP_FIELD)
+        diff = RecipeVersionDiff(
+            recipe_id=before["_id"],
+            version=before.get("version", 1),
+            changes=changes,
+            unset=compute_unset(before, update_data),
+            author_id=author_id
+        )
+
+        try:
+            await collection.insert_one(diff.model_dump(by_alias=True))
+        except Exception as e:
+            # The update itself succeeded, only this step of the history is lost
+            logger.error(f"Error recording version {diff.version} of recipe {diff.recipe_id}: {str(e)}")
+
+
+    @staticmethod
+    async def list_versions(recipe_id: str) -> Optional[List[RecipeVersionInfo]]:
+        """Version history of a recipe, newest first, None when the recipe does not exist"""
+        db = get_database()
+        recipe = await db[settings.RECIPES_COLLECTION].find_one(
+            {"_id": recipe_id}, {"version": 1, "_created_at": 1}
+        )
+        if not recipe:
+            return None
+
+        cursor = db[settings.RECIPE_VERSIONS_COLLECTION].find(
+            {"recipe_id": recipe_id}, {"version": 1, "changes": 1, "unset": 1, "_created_at": 1}
+        ).sort("version", -1)
+        diffs = await cursor.to_list(length=None)
+
+        # The diff of version N is written when version N + 1 is created
+        history = [
+            RecipeVersionInfo(
+                version=diff["version"] + 1,
+                created_at=diff["_created_at"],
+                changed_fields=[
+                    field for field in [*diff["changes"], *diff.get("unset", [])] if field in VERSIONED_FIELDS
+                ]
+            )
+            for diff in diffs
+        ]
+        history.append(RecipeVersionInfo(version=1, created_at=recipe["_created_at"]))
+        return history
+
+
+    @staticmethod
+    async def get_recipe_version(recipe_id: str, version: int) -> Optional[Recipe]:
+        """
+        Recipe as it was in the given version, None when the recipe or the version does not exist.
+        Raises pydantic ValidationError when the rebuilt document is not a valid recipe.
+        """
+        db = get_database()
+        recipe = await db[settings.RECIPES_COLLECTION].find_one({"_id": recipe_id})
+        if not recipe:
+            return None
+
+        current_version = recipe.get("version", 1)
+        if version < 1 or version > current_version:
+            return None
+        if version == current_version:
+            return Recipe(**recipe)
+
+        cursor = db[settings.RECIPE_VERSIONS_COLLECTION].find(
+            {"recipe_id": recipe_id, "version": {"$gte": version}}
+        ).sort("version", -1)
+        diffs = await cursor.to_list(length=None)
+
+        expected = list(range(current_version - 1, version - 1, -1))
+        if [diff["version"] for diff in diffs] != expected:
+            logger.warning(f"History of recipe {recipe_id} is incomplete, cannot rebuild version {version}")
+            return None
+
+        for diff in diffs:
+            recipe.update(diff["changes"])
+            for field in diff.get("unset", []):
+                recipe.pop(field, None)
+        # Diffs written before ``unset`` existed stored absent fields as None, let the defaults apply
+        for field in VERSIONED_FIELDS:
+            if recipe.get(field, ...) is None:
+                del recipe[field]
+        recipe["nutrition"] = None
+        recipe["version"] = version
+        return Recipe(**recipe)
+
+
+    @staticmethod
+    async def delete_versions(recipe_id: str) -> int:
+        """Delete the history of a recipe, returns number of deleted diffs"""
+        collection = get_database()[settings.RECIPE_VERSIONS_COLLECTION]
+        result = await collection.delete_many({"recipe_id": recipe_id})
+        return result.deleted_count
@@ -1,6 +1,6 @@
 from unittest.mock import AsyncMock, patch
 
-from src.models.model import Ingredient
+from src.models.model import Ingredient, IngredientSuggestion
 
 
 def _ingredient_response_payload(ingredient: Ingredient) -> dict:
@@ -74,6 +74,51 @@ def test_get_ingredient_internal_success(mock_get_ingredient, client):
     assert response.json() == _ingredient_response_payload(ingredient)
 
 
+@patch("src.api.routes.IngredientService.get_ingredients_by_ids", new_callable=AsyncMock)
+def test_get_ingredients_bulk_internal_success(mock_get_by_ids, client):
+    first = Ingredient(name="Olive Oil", units="ml")
+    second = Ingredient(name="Garlic", units="g")
+    mock_get_by_ids.return_value = [first, second]
+
+    response = client.post(
+        "/recipes/internal/ingredients/bulk",
+        json={"ids": [first.id, second.id, "missing"]},
+        headers={"X-Internal-Token": "mealup-internal-dev-token"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [_ingredient_response_payload(first), _ingredient_response_payload(second)]
+    mock_get_by_ids.assert_awaited_once_with([first.id, second.id, "missing"])
+
+
+@patch("src.api.routes.IngredientService.get_ingredients_by_ids", new_callable=AsyncMock)
+def test_get_ingredients_bulk_internal_requires_token_and_ids(mock_get_by_ids, client):
+    unauthorized = client.post("/recipes/internal/ingredients/bulk", json={"ids": ["ing-1"]})
+    empty = client.post(
+        "/recipes/internal/ingredients/bulk",
+        json={"ids": []},
+        headers={"X-Internal-Token": "mealup-internal-dev-token"},
+    )
+
+    assert unauthorized.status_code == 401
+    assert empty.status_code == 422
+    mock_get_by_ids.assert_not_awaited()
+
+
+@patch("src.api.routes.IngredientService.get_ingredients_by_ids", new_callable=AsyncMock)
+def test_get_ingredients_bulk_internal_returns_500_on_error(mock_get_by_ids, client):
+    mock_get_by_ids.side_effect = RuntimeError("db down")
+
+    response = client.post(
+        "/recipes/internal/ingredients/bulk",
+        json={"ids": ["ing-1"]},
+        headers={"X-Internal-Token": "mealup-internal-dev-token"},
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to get ingredients"
+
+
 @patch("src.api.routes.IngredientService.create_ingredient", new_callable=AsyncMock)
 def test_create_ingredient_success(mock_create_ingredient, client):
     ingredient = Ingredient(name="Flour", units="g")
@@ -105,8 +150,9 @@ def test_create_ingredient_returns_500_on_service_error(mock_create_ingredient,
     assert response.json()["detail"] == "Failed to create ingredient"
 
 
+@patch("src.api.routes.refresh_recipes_for_ingredient", new_callable=AsyncMock)
 @patch("src.api.routes.IngredientService.update_ingredient", new_callable=AsyncMock)
-def test_update_ingredient_success(mock_update_ingredient, client):
+def test_update_ingredient_success(mock_update_ingredient, mock_refresh, client):
     ingredient = Ingredient(name="Sugar", units="g")
     updated = Ingredient(_id=ingredient.id, name="Brown Sugar", units="g")
     mock_update_ingredient.return_value = updated
@@ -119,6 +165,22 @@ def test_update_ingredient_success(mock_update_ingredient, client):
     assert response.status_code == 200
     assert response.json() == _ingredient_response_payload(updated)
     mock_update_ingredient.assert_awaited_once()
+    mock_refresh.assert_awaited_once_with(ingredient.id)
+
+
+@patch("src.api.routes.refresh_recipes_for_ingredient", new_callable=AsyncMock)
+@patch("src.api.routes.IngredientService.update_ingredient", new_callable=AsyncMock)
+def test_update_ingredient_image_only_skips_nutrition_refresh(mock_update_ingredient, mock_refresh, client):
+    ingredient = Ingredient(name="Sugar", units="g")
+    mock_update_ingredient.return_value = ingredient
+
+    response = client.put(
+        f"/recipes/ingredients/{ingredient.id}",
+        json={"image": "https://example.com/sugar.jpg"},
+    )
+
+    assert response.status_code == 200
+    mock_refresh.assert_not_called()
 
 
 @patch("src.api.routes.IngredientService.update_ingredient", new_callable=AsyncMock)
@@ -131,8 +193,9 @@ def test_update_ingredient_not_found(mock_update_ingredient, client):
     assert response.json()["detail"] == "Ingredient not found"
 
 
+@patch("src.api.routes.refresh_recipes_for_ingredient", new_callable=AsyncMock)
 @patch("src.api.routes.IngredientService.delete_ingredient", new_callable=AsyncMock)
-def test_delete_ingredient_success(mock_delete_ingredient, client):
+def test_delete_ingredient_success(mock_delete_ingredient, mock_refresh, client):
     mock_delete_ingredient.return_value = True
 
     response = client.delete("/recipes/ingredients/ing-1")
@@ -140,6 +203,7 @@ def test_delete_ingredient_success(mock_delete_ingredient, client):
     assert response.status_code == 204
     assert response.content == b""
     mock_delete_ingredient.assert_awaited_once_with("ing-1")
+    mock_refresh.assert_awaited_once_with("ing-1")
 
 
 @patch("src.api.routes.IngredientService.delete_ingredient", new_callable=AsyncMock)
@@ -150,3 +214,21 @@ def test_delete_ingredient_not_found(mock_delete_ingredient, client):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Ingredient not found"
+
+
+@patch("src.api.routes.IngredientService.autocomplete_ingredients", new_callable=AsyncMock)
+def test_autocomplete_ingredients(mock_autocomplete, client):
+    mock_autocomplete.return_value = [IngredientSuggestion(_id="ing-1", name="Tomato", units="g")]
+
+    response = client.get("/recipes/ingredients/autocomplete", params={"q": "tom", "limit": 5})
+
+    assert response.status_code == 200
+    assert response.json() == [{"_id": "ing-1", "name": "Tomato", "units": "g"}]
+    mock_autocomplete.assert_awaited_once_with("tom", 5)
+
+    assert client.get("/recipes/ingredients/autocomplete").status_code == 422
+
+    mock_autocomplete.side_effect = RuntimeError("index broken")
+    failed = client.get("/recipes/ingredients/autocomplete", params={"q": "tom"})
+    assert failed.status_code == 500
+    assert failed.json()["detail"] == "Failed to autocomplete ingredients"
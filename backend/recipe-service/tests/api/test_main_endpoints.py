@@ -3,25 +3,38 @@ from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
 
 
+@patch("src.main.ingredient_index")
+@patch("src.main.image_job_queue")
 @patch("src.main.disconnect_from_mongodb", new_callable=AsyncMock)
 @patch("src.main.connect_to_mongodb", new_callable=AsyncMock)
-def test_root_endpoint(_mock_connect, _mock_disconnect):
+def test_root_endpoint(_mock_connect, _mock_disconnect, mock_queue, mock_index):
     from src.main import app
 
+    mock_queue.stop = AsyncMock()
+    mock_index.stop = AsyncMock()
     with TestClient(app) as client:
         response = client.get("/")
 
+    mock_queue.start.assert_called_once()
+    mock_queue.stop.assert_awaited_once()
+    mock_index.start.assert_called_once()
+    mock_index.stop.assert_awaited_once()
+
     assert response.status_code == 200
     body = response.json()
     assert body["message"] == "Recipe Service is running"
     assert "version" in body
 
 
+@patch("src.main.ingredient_index")
+@patch("src.main.image_job_queue")
 @patch("src.main.disconnect_from_mongodb", new_callable=AsyncMock)
 @patch("src.main.connect_to_mongodb", new_callable=AsyncMock)
-def test_health_endpoint(_mock_connect, _mock_disconnect):
+def test_health_endpoint(_mock_connect, _mock_disconnect, mock_queue, mock_index):
     from src.main import app
 
+    mock_queue.stop = AsyncMock()
+    mock_index.stop = AsyncMock()
     with TestClient(app) as client:
         response = client.get("/health")
 
@@ -1,6 +1,24 @@
+from datetime import datetime
 from unittest.mock import AsyncMock, patch
 
-from src.models.model import CapacityUnit, Recipe, WeightedIngredient
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.api.routes import router
+from src.models.model import (
+    CapacityUnit,
+    Recipe,
+    ImageJob,
+    ImageJobStatus,
+    RecipeCardResponse,
+    RecipeIngredientsResponse,
+    RecipeSummaryResponse,
+    RecipeVersionInfo,
+    RecipeView,
+    WeightedIngredient,
+)
 
 
 def _recipe_response_payload(recipe: Recipe) -> dict:
@@ -32,7 +50,7 @@ def test_get_recipes_success(mock_get_recipes, client):
 
     assert response.status_code == 200
     assert response.json() == [_recipe_response_payload(recipe)]
-    mock_get_recipes.assert_awaited_once_with(2, 5, "user-1")
+    mock_get_recipes.assert_awaited_once_with(2, 5, "user-1", RecipeView.FULL)
 
 
 @patch("src.api.routes.RecipeService.get_recipes", new_callable=AsyncMock)
@@ -45,9 +63,9 @@ def test_get_recipes_returns_500_on_service_error(mock_get_recipes, client):
     assert response.json()["detail"] == "Failed to get recipes"
 
 
-@patch("src.api.routes.generate_recipe_image", new_callable=AsyncMock)
+@patch("src.api.routes.image_job_queue.enqueue", new_callable=AsyncMock)
 @patch("src.api.routes.RecipeService.create_recipe", new_callable=AsyncMock)
-def test_create_recipe_success(mock_create_recipe, _mock_generate_image, client):
+def test_create_recipe_success(mock_create_recipe, mock_enqueue, client):
     recipe = _sample_recipe(author_id="user-abc")
     mock_create_recipe.return_value = recipe
 
@@ -72,6 +90,28 @@ def test_create_recipe_success(mock_create_recipe, _mock_generate_image, client)
     assert response.status_code == 201
     assert response.json() == _recipe_response_payload(recipe)
     mock_create_recipe.assert_awaited_once()
+    mock_enqueue.assert_awaited_once_with(recipe.id, "Tomato Pasta")
+
+
+@patch("src.api.routes.image_job_queue.enqueue", new_callable=AsyncMock)
+@patch("src.api.routes.RecipeService.create_recipe", new_callable=AsyncMock)
+def test_create_recipe_succeeds_when_enqueue_fails(mock_create_recipe, mock_enqueue, client):
+    recipe = _sample_recipe(author_id="user-abc")
+    mock_create_recipe.return_value = recipe
+    mock_enqueue.side_effect = RuntimeError("queue down")
+
+    response = client.post(
+        "/recipes/",
+        json={
+            "name": "Tomato Pasta",
+            "ingredients": [{"ingredient_id": "ingredient-1", "capacity": "g", "quantity": 250.0}],
+            "prepare_instruction": ["Boil water"],
+            "time_to_prepare": 900,
+        },
+        headers={"X-User-Id": "user-abc"},
+    )
+
+    assert response.status_code == 201
 
 
 def test_create_recipe_requires_x_user_id_header(client):
@@ -97,7 +137,7 @@ def test_get_recipe_success(mock_get_recipe, client):
 
     assert response.status_code == 200
     assert response.json() == _recipe_response_payload(recipe)
-    mock_get_recipe.assert_awaited_once_with(recipe.id)
+    mock_get_recipe.assert_awaited_once_with(recipe.id, RecipeView.FULL)
 
 
 @patch("src.api.routes.RecipeService.get_recipe", new_callable=AsyncMock)
@@ -122,7 +162,7 @@ def test_get_recipe_internal_requires_token(mock_get_recipe, client):
 @patch("src.api.routes.RecipeService.get_recipe", new_callable=AsyncMock)
 def test_get_recipe_internal_success(mock_get_recipe, client):
     recipe = _sample_recipe()
-    mock_get_recipe.return_value = recipe
+    mock_get_recipe.return_value = RecipeIngredientsResponse(**recipe.model_dump(by_alias=True))
 
     response = client.get(
         f"/recipes/internal/recipes/{recipe.id}",
@@ -130,7 +170,15 @@ def test_get_recipe_internal_success(mock_get_recipe, client):
     )
 
     assert response.status_code == 200
-    assert response.json() == _recipe_response_payload(recipe)
+    assert response.json() == {
+        "_id": recipe.id,
+        "name": "Tomato Pasta",
+        "ingredients": [{"ingredient_id": "ingredient-1", "capacity": "g", "quantity": 250.0}],
+        "servings": 1,
+        "nutrition": None,
+        "version": 1,
+    }
+    mock_get_recipe.assert_awaited_once_with(recipe.id, RecipeView.INGREDIENTS)
 
 
 @patch("src.api.routes.RecipeService.update_recipe", new_callable=AsyncMock)
@@ -253,6 +301,7 @@ def test_search_recipes_success(mock_search_recipes, client):
         author_id="author-x",
         skip=0,
         limit=10,
+        view=RecipeView.FULL,
     )
 
 
@@ -264,3 +313,172 @@ def test_search_recipes_returns_500_on_service_error(mock_search_recipes, client
 
     assert response.status_code == 500
     assert response.json()["detail"] == "Failed to search recipes"
+
+
+@patch("src.api.routes.get_image", new_callable=AsyncMock)
+def test_get_recipe_image_serves_bytes_with_etag(mock_get_image, client):
+    mock_get_image.return_value = {"data": b"webp-bytes", "content_type": "image/webp", "etag": "abc123"}
+
+    response = client.get("/recipes/images/image-1", params={"variant": "thumbnail"})
+
+    assert response.status_code == 200
+    assert response.content == b"webp-bytes"
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["etag"] == '"abc123"'
+    assert "immutable" in response.headers["cache-control"]
+    mock_get_image.assert_awaited_once_with("image-1", "thumbnail")
+
+
+@patch("src.api.routes.get_image", new_callable=AsyncMock)
+def test_get_recipe_image_is_public(mock_get_image):
+    # <img src> sends no Authorization header, so the image must load without the auth override
+    mock_get_image.return_value = {"data": b"png", "content_type": "image/png", "etag": "abc123"}
+    app = FastAPI()
+    app.include_router(router, prefix="/recipes")
+
+    with TestClient(app) as anonymous:
+        response = anonymous.get("/recipes/images/image-1")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public")
+
+
+@patch("src.api.routes.get_image", new_callable=AsyncMock)
+def test_get_recipe_image_returns_304_for_matching_etag(mock_get_image, client):
+    mock_get_image.return_value = {"data": b"png", "content_type": "image/png", "etag": "abc123"}
+
+    matching = client.get("/recipes/images/image-1", headers={"If-None-Match": 'W/"old", "abc123"'})
+    wildcard = client.get("/recipes/images/image-1", headers={"If-None-Match": "*"})
+    stale = client.get("/recipes/images/image-1", headers={"If-None-Match": '"old"'})
+
+    assert matching.status_code == 304
+    assert matching.content == b""
+    assert matching.headers["etag"] == '"abc123"'
+    assert wildcard.status_code == 304
+    assert stale.status_code == 200
+
+
+@patch("src.api.routes.get_image", new_callable=AsyncMock)
+def test_get_recipe_image_errors(mock_get_image, client):
+    invalid_variant = client.get("/recipes/images/image-1", params={"variant": "huge"})
+
+    mock_get_image.return_value = None
+    missing = client.get("/recipes/images/image-1")
+
+    mock_get_image.side_effect = RuntimeError("gridfs down")
+    failed = client.get("/recipes/images/image-1")
+
+    assert invalid_variant.status_code == 400
+    assert missing.status_code == 404
+    assert failed.status_code == 500
+
+
+@patch("src.api.routes.RecipeService.get_recipes", new_callable=AsyncMock)
+def test_get_recipes_card_view_returns_only_card_fields(mock_get_recipes, client):
+    recipe = _sample_recipe()
+    mock_get_recipes.return_value = [RecipeCardResponse(**recipe.model_dump(by_alias=True))]
+
+    response = client.get("/recipes/", params={"view": "card"})
+
+    assert response.status_code == 200
+    body = response.json()[0]
+    assert set(body) == {
+        "_id", "name", "author_id", "time_to_prepare", "servings",
+        "total_likes", "image", "thumbnail_url", "nutrition", "_created_at",
+    }
+    mock_get_recipes.assert_awaited_once_with(0, 20, None, RecipeView.CARD)
+
+
+@patch("src.api.routes.RecipeService.search_recipes", new_callable=AsyncMock)
+def test_search_recipes_summary_view(mock_search_recipes, client):
+    recipe = _sample_recipe()
+    mock_search_recipes.return_value = [RecipeSummaryResponse(**recipe.model_dump(by_alias=True))]
+
+    response = client.get("/recipes/search", params={"q": "pasta", "view": "summary"})
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "_id": recipe.id,
+        "name": "Tomato Pasta",
+        "author_id": "user-1",
+        "time_to_prepare": 900,
+        "servings": 1,
+        "total_likes": 0,
+    }]
+    assert mock_search_recipes.await_args.kwargs["view"] == RecipeView.SUMMARY
+
+
+def test_get_recipe_rejects_unknown_view(client):
+    response = client.get("/recipes/recipe-1", params={"view": "everything"})
+
+    assert response.status_code == 422
+
+
+@patch("src.api.routes.image_job_queue.get_job", new_callable=AsyncMock)
+def test_get_recipe_image_job_status(mock_get_job, client):
+    mock_get_job.return_value = ImageJob(
+        _id="recipe-1",
+        recipe_name="Tomato Pasta",
+        status=ImageJobStatus.PENDING,
+        attempts=2,
+        last_error="OpenRouter HTTP error",
+    )
+
+    response = client.get("/recipes/recipe-1/image-job")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["_id"] == "recipe-1"
+    assert body["status"] == "pending"
+    assert body["attempts"] == 2
+    assert body["last_error"] == "OpenRouter HTTP error"
+
+    mock_get_job.return_value = None
+    missing = client.get("/recipes/recipe-2/image-job")
+    assert missing.status_code == 404
+
+
+@patch("src.api.routes.RecipeVersionService.list_versions", new_callable=AsyncMock)
+def test_get_recipe_versions(mock_list_versions, client):
+    mock_list_versions.return_value = [
+        RecipeVersionInfo(version=2, created_at=datetime(2024, 1, 2), changed_fields=["servings"]),
+        RecipeVersionInfo(version=1, created_at=datetime(2024, 1, 1)),
+    ]
+
+    response = client.get("/recipes/recipe-1/versions")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"version": 2, "created_at": "2024-01-02T00:00:00", "changed_fields": ["servings"]},
+        {"version": 1, "created_at": "2024-01-01T00:00:00", "changed_fields": []},
+    ]
+    mock_list_versions.assert_awaited_once_with("recipe-1")
+
+    mock_list_versions.return_value = None
+    assert client.get("/recipes/missing/versions").status_code == 404
+
+
+@patch("src.api.routes.RecipeVersionService.get_recipe_version", new_callable=AsyncMock)
+def test_get_recipe_version(mock_get_version, client):
+    recipe = _sample_recipe()
+    mock_get_version.return_value = recipe
+
+    response = client.get(f"/recipes/{recipe.id}/versions/1")
+
+    assert response.status_code == 200
+    assert response.json() == _recipe_response_payload(recipe)
+    mock_get_version.assert_awaited_once_with(recipe.id, 1)
+
+    assert client.get(f"/recipes/{recipe.id}/versions/0").status_code == 422
+
+    mock_get_version.return_value = None
+    missing = client.get(f"/recipes/{recipe.id}/versions/7")
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Recipe version not found"
+
+    with pytest.raises(ValidationError) as invalid:
+        Recipe(author_id="author-1")
+    mock_get_version.side_effect = invalid.value
+    broken = client.get(f"/recipes/{recipe.id}/versions/1")
+    assert broken.status_code == 409
+    assert broken.json()["detail"] == "Recipe version cannot be rebuilt"
@@ -0,0 +1,253 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.models.model import ImageJob, ImageJobStatus
+from src.services.image_generation_service import ImageGenerationError
+from src.services.image_job_queue import ImageJobQueue
+
+
+def _queue(**overrides) -> ImageJobQueue:
+    options = {
+        "concurrency": 2,
+        "max_attempts": 3,
+        "retry_base_delay": 10.0,
+        "poll_seconds": 0.01,
+        "lock_timeout_seconds": 600,
+    }
+    options.update(overrides)
+    return ImageJobQueue(**options)
+
+
+def _collection():
+    collection = MagicMock()
+    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.find_one_and_update = AsyncMock(return_value=None)
+    return collection
+
+
+def _job(attempts: int = 1) -> ImageJob:
+    return ImageJob(
+        _id="recipe-1",
+        recipe_name="Soup",
+        status=ImageJobStatus.RUNNING,
+        attempts=attempts,
+        locked_at=datetime(2024, 1, 1, 12, 0, 0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_enqueue_upserts_pending_job_and_wakes_workers():
+    queue = _queue()
+    queue._wakeup = asyncio.Event()
+    collection = _collection()
+
+    with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}):
+        await queue.enqueue("recipe-1", "Soup")
+
+    args, kwargs = collection.update_one.await_args
+    assert args[0] == {"_id": "recipe-1", "status": {"$ne": "running"}}
+    assert args[1]["$set"]["status"] == "pending"
+    assert args[1]["$set"]["attempts"] == 0
+    assert args[1]["$set"]["recipe_name"] == "Soup"
+    assert "_created_at" in args[1]["$setOnInsert"]
+    assert kwargs == {"upsert": True}
+    assert queue._wakeup.is_set()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_leaves_running_job_alone():
+    queue = _queue()
+    queue._wakeup = asyncio.Event()
+    collection = _collection()
+    collection.update_one.side_effect = DuplicateKeyError("duplicate _id")
+
+    with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}):
+        await queue.enqueue("recipe-1", "Soup")
+
+    assert not queue._wakeup.is_set()
+
+
+@pytest.mark.asyncio
+async def test_get_job_returns_model_or_none():
+    queue = _queue()
+    collection = _collection()
+    collection.find_one.return_value = {
+        "_id": "recipe-1", "recipe_name": "Soup", "status": "done", "attempts": 1, "image": "http://img"
+    }
+
+    with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}):
+        job = await queue.get_job("recipe-1")
+        collection.find_one.return_value = None
+        missing = await queue.get_job("recipe-2")
+
+    assert job.id == "recipe-1"
+    assert job.status == ImageJobStatus.DONE
+    assert job.image == "http://img"
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_due_or_expired_jobs():
+    queue = _queue(lock_timeout_seconds=60)
+    collection = _collection()
+    collection.find_one_and_update.return_value = {
+        "_id": "recipe-1", "recipe_name": "Soup", "status": "running", "attempts": 1,
+        "locked_at": datetime(2024, 1, 1)
+    }
+
+    with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}):
+        job = await queue.claim()
+        collection.find_one_and_update.return_value = None
+        nothing = await queue.claim()
+
+    assert job.status == ImageJobStatus.RUNNING
+    assert nothing is None
+
+    args, kwargs = collection.find_one_and_update.await_args
+    pending, expired = args[0]["$or"]
+    assert pending["status"] == "pending"
+    assert expired["status"] == "running"
+    assert pending["next_run_at"]["$lte"] - expired["locked_at"]["$lt"] == timedelta(seconds=60)
+    assert args[1]["$set"]["status"] == "running"
+    assert args[1]["$inc"] == {"attempts": 1}
+    assert kwargs == {"sort": [("next_run_at", 1)], "return_document": ReturnDocument.AFTER}
+
+
+@pytest.mark.asyncio
+async def test_process_marks_job_done():
+    queue = _queue()
+    collection = _collection()
+    job = _job()
+
+    with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}), patch(
+        "src.services.image_job_queue.generate_recipe_image",
+        new_callable=AsyncMock,
+        return_value="http://gateway/recipes/images/image-1",
+    ) as mock_generate:
+        await queue.process(job)
+
+    mock_generate.assert_awaited_once_with("recipe-1", "Soup")
+    args, _ = collection.update_one.await_args
+    assert args[0] == {"_id": "recipe-1", "status": "running", "locked_at": job.locked_at}
+    assert args[1]["$set"]["status"] == "done"
+    assert args[1]["$set"]["image"] == "http://gateway/recipes/images/image-1"
+    assert args[1]["$set"]["last_error"] is None
+    assert "finished_at" in args[1]["$set"]
+
+
+@pytest.mark.asyncio
+async def test_process_reschedules_retryable_failure_with_backoff():
+    queue = _queue(retry_base_delay=10.0)
+    collection = _collection()
+
+    for attempts, delay in ((1, 10), (2, 20)):
+        collection.update_one.reset_mock()
+        with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}), patch(
+            "src.services.image_job_queue.generate_recipe_image",
+            new_callable=AsyncMock,
+            side_effect=ImageGenerationError("OpenRouter HTTP error"),
+        ):
+            before = datetime.utcnow()
+            await queue.process(_job(attempts))
+
+        fields = collection.update_one.await_args.args[1]["$set"]
+        assert fields["status"] == "pending"
+        assert fields["last_error"] == "OpenRouter HTTP error"
+        assert fields["locked_at"] is None
+        assert fields["next_run_at"] - before >= timedelta(seconds=delay)
+        assert fields["next_run_at"] - before < timedelta(seconds=delay + 5)
+
+
+@pytest.mark.asyncio
+async def test_process_fails_job_without_retry():
+    queue = _queue(max_attempts=3)
+    collection = _collection()
+
+    cases = (
+        (_job(1), ImageGenerationError("OPEN_ROUTER_API_KEY is not configured", retryable=False), "OPEN_ROUTER_API_KEY is not configured"),
+        (_job(3), ImageGenerationError("Empty image URL"), "Empty image URL"),
+    )
+    for job, error, message in cases:
+        with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}), patch(
+            "src.services.image_job_queue.generate_recipe_image", new_callable=AsyncMock, side_effect=error
+        ):
+            await queue.process(job)
+
+        fields = collection.update_one.await_args.args[1]["$set"]
+        assert fields["status"] == "failed"
+        assert fields["last_error"] == message
+        assert "finished_at" in fields
+
+
+@pytest.mark.asyncio
+async def test_process_treats_unexpected_errors_as_retryable():
+    queue = _queue()
+    collection = _collection()
+
+    with patch("src.services.image_job_queue.get_database", return_value={"image_jobs": collection}), patch(
+        "src.services.image_job_queue.generate_recipe_image",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Image is not a base64 data URL"),
+    ):
+        await queue.process(_job())
+
+    fields = collection.update_one.await_args.args[1]["$set"]
+    assert fields["status"] == "pending"
+    assert fields["last_error"] == "ValueError: Image is not a base64 data URL"
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_jobs_and_stop():
+    queue = _queue(concurrency=2)
+    jobs = [_job(), None]
+    processed = asyncio.Event()
+
+    async def claim():
+        return jobs.pop(0) if jobs else None
+
+    async def process(job):
+        processed.set()
+
+    queue.claim = AsyncMock(side_effect=claim)
+    queue.process = AsyncMock(side_effect=process)
+
+    queue.start()
+    workers = list(queue._workers)
+    queue.start()
+    assert queue._workers == workers
+    assert len(workers) == 2
+
+    await asyncio.wait_for(processed.wait(), 1)
+    queue._wakeup.set()
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    queue.process.assert_awaited_once()
+    assert queue._workers == []
+    assert all(worker.cancelled() for worker in workers)
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_claim_errors():
+    queue = _queue(concurrency=1)
+    calls = []
+
+    async def claim():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("mongo down")
+        return None
+
+    queue.claim = AsyncMock(side_effect=claim)
+
+    queue.start()
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert len(calls) >= 2
@@ -0,0 +1,195 @@
+import base64
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from gridfs.errors import NoFile
+from PIL import Image
+
+from src.services import image_store
+
+
+def _png(width: int = 512, height: int = 384, mode: str = "RGB") -> bytes:
+    output = BytesIO()
+    Image.new(mode, (width, height), color=(200, 80, 40, 255)[:len(mode)]).save(output, format="PNG")
+    return output.getvalue()
+
+
+def _data_url(data: bytes, content_type: str = "image/png") -> str:
+    return f"data:{content_type};base64,{base64.b64encode(data).decode()}"
+
+
+class _FakeFind:
+    def __init__(self, files):
+        self.files = files
+
+    async def __aiter__(self):
+        for grid_out in self.files:
+            yield grid_out
+
+
+def test_decode_data_url_success_and_errors():
+    data, content_type = image_store.decode_data_url(_data_url(b"png-bytes", "image/jpeg"))
+    assert data == b"png-bytes"
+    assert content_type == "image/jpeg"
+
+    for invalid in ("https://example.com/image.png", "data:image/png;base64,@@@", "data:image/png;base64,=", "data:text/plain;base64,YWJj", None):
+        with pytest.raises(ValueError):
+            image_store.decode_data_url(invalid)
+
+
+def test_make_thumbnail_resizes_to_webp():
+    thumbnail = image_store.make_thumbnail(_png(), size=128)
+
+    with Image.open(BytesIO(thumbnail)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (128, 96)
+
+    with Image.open(BytesIO(image_store.make_thumbnail(_png(64, 64, "RGBA")))) as image:
+        assert image.size == (64, 64)
+
+    with pytest.raises(ValueError, match="Unsupported image data"):
+        image_store.make_thumbnail(b"not an image")
+
+
+def test_image_url_uses_public_base():
+    with patch.object(image_store.settings, "IMAGE_BASE_URL", "https://gateway/api/v1"):
+        assert image_store.image_url("image-1") == "https://gateway/api/v1/recipes/images/image-1"
+        assert image_store.image_url("image-1", image_store.THUMBNAIL) == (
+            "https://gateway/api/v1/recipes/images/image-1?variant=thumbnail"
+        )
+
+
+@pytest.mark.asyncio
+async def test_save_recipe_image_uploads_original_and_thumbnail():
+    bucket = MagicMock()
+    bucket.upload_from_stream = AsyncMock()
+    original = _png()
+
+    with patch("src.services.image_store._bucket", return_value=bucket):
+        image_id = await image_store.save_recipe_image("recipe-1", original, "image/png")
+
+    calls = bucket.upload_from_stream.await_args_list
+    assert [call.args[0] for call in calls] == [f"{image_id}/original", f"{image_id}/thumbnail"]
+    assert calls[0].args[1] == original
+    assert calls[0].kwargs["metadata"] == {
+        "recipe_id": "recipe-1",
+        "image_id": image_id,
+        "variant": "original",
+        "content_type": "image/png",
+        "etag": image_store.compute_etag(original),
+    }
+    assert calls[1].kwargs["metadata"]["content_type"] == "image/webp"
+
+
+@pytest.mark.asyncio
+async def test_get_image_found_and_missing():
+    stream = MagicMock()
+    stream.metadata = {"content_type": "image/webp", "etag": "abc"}
+    stream.read = AsyncMock(return_value=b"webp")
+    bucket = MagicMock()
+    bucket.open_download_stream_by_name = AsyncMock(side_effect=[stream, NoFile("missing")])
+
+    with patch("src.services.image_store._bucket", return_value=bucket):
+        found = await image_store.get_image("image-1", image_store.THUMBNAIL)
+        missing = await image_store.get_image("image-2")
+
+    assert found == {"data": b"webp", "content_type": "image/webp", "etag": "abc"}
+    assert missing is None
+    assert bucket.open_download_stream_by_name.await_args_list[0].args == ("image-1/thumbnail",)
+
+
+@pytest.mark.asyncio
+async def test_delete_recipe_images_keeps_current_image():
+    bucket = MagicMock()
+    bucket.find.return_value = _FakeFind([SimpleNamespace(_id="f1"), SimpleNamespace(_id="f2")])
+    bucket.delete = AsyncMock(side_effect=[None, NoFile("gone")])
+
+    with patch("src.services.image_store._bucket", return_value=bucket):
+        deleted = await image_store.delete_recipe_images("recipe-1", keep="image-2")
+
+    assert deleted == 1
+    bucket.find.assert_called_once_with({
+        "metadata.recipe_id": "recipe-1",
+        "metadata.image_id": {"$ne": "image-2"},
+    })
+
+
+@pytest.mark.asyncio
+async def test_store_recipe_image_points_recipe_at_new_image():
+    collection = MagicMock()
+    collection.update_one = AsyncMock(side_effect=[
+        SimpleNamespace(matched_count=1),
+        SimpleNamespace(matched_count=0),
+    ])
+    db = {"recipes": collection}
+
+    with patch("src.services.image_store.get_database", return_value=db), patch(
+        "src.services.image_store.save_recipe_image", new_callable=AsyncMock, side_effect=["image-1", "image-2"]
+    ) as mock_save, patch(
+        "src.services.image_store.delete_recipe_images", new_callable=AsyncMock
+    ) as mock_delete, patch.object(image_store.settings, "IMAGE_BASE_URL", "http://gw"):
+        reference = await image_store.store_recipe_image("recipe-1", _data_url(b"png"))
+        orphan = await image_store.store_recipe_image("recipe-2", _data_url(b"png"))
+
+    assert reference == "http://gw/recipes/images/image-1"
+    assert orphan is None
+    mock_save.assert_any_await("recipe-1", b"png", "image/png")
+    assert collection.update_one.await_args_list[0].args[1]["$set"]["image"] == reference
+    assert collection.update_one.await_args_list[0].args[1]["$set"]["thumbnail_url"] == (
+        "http://gw/recipes/images/image-1?variant=thumbnail"
+    )
+    assert [call.args for call in mock_delete.await_args_list] == [("recipe-1",), ("recipe-2",)]
+    assert mock_delete.await_args_list[0].kwargs == {"keep": "image-1"}
+
+
+@pytest.mark.asyncio
+async def test_migrate_inline_images_moves_data_urls():
+    collection = MagicMock()
+    collection.find.return_value = _FakeFind([
+        {"_id": "recipe-1", "image": _data_url(b"png")},
+        {"_id": "recipe-2", "image": "data:image/png;base64,@@"},
+        {"_id": "recipe-3", "image": _data_url(b"png")},
+    ])
+    db = {"recipes": collection}
+
+    async def fake_store(recipe_id, data_url):
+        if recipe_id == "recipe-2":
+            raise ValueError("invalid base64")
+        return None if recipe_id == "recipe-3" else "http://gw/recipes/images/x"
+
+    with patch("src.services.image_store.get_database", return_value=db), patch(
+        "src.services.image_store.store_recipe_image", new_callable=AsyncMock, side_effect=fake_store
+    ):
+        migrated = await image_store.migrate_inline_images()
+
+    assert migrated == 1
+    assert collection.find.call_args.args == ({"image": {"$regex": "^data:"}}, {"_id": 1, "image": 1})
+
+
+@pytest.mark.asyncio
+async def test_backfill_thumbnail_urls_links_stored_thumbnails():
+    collection = MagicMock()
+    collection.find.return_value = _FakeFind([{"_id": "recipe-1", "image": "http://gw/recipes/images/image-1"}])
+    collection.update_one = AsyncMock()
+
+    with patch("src.services.image_store.get_database", return_value={"recipes": collection}), patch.object(
+        image_store.settings, "IMAGE_BASE_URL", "http://gw"
+    ):
+        linked = await image_store.backfill_thumbnail_urls()
+
+    assert linked == 1
+    collection.update_one.assert_awaited_once_with(
+        {"_id": "recipe-1", "image": "http://gw/recipes/images/image-1"},
+        {"$set": {"thumbnail_url": "http://gw/recipes/images/image-1?variant=thumbnail"}},
+    )
+
+
+def test_bucket_uses_configured_name():
+    with patch("src.services.image_store.get_database", return_value="db"), patch(
+        "src.services.image_store.AsyncIOMotorGridFSBucket"
+    ) as mock_bucket:
+        image_store._bucket()
+
+    mock_bucket.assert_called_once_with("db", bucket_name="recipe_images")
@@ -35,11 +35,17 @@ async def test_connect_and_disconnect_to_mongodb_success():
     recipes.create_index = AsyncMock()
     ingredients.create_index = AsyncMock()
     versions.create_index = AsyncMock()
+    image_files = MagicMock()
+    image_files.create_index = AsyncMock()
+    image_jobs = MagicMock()
+    image_jobs.create_index = AsyncMock()
 
     fake_db = {
         "recipes": recipes,
         "ingredients": ingredients,
         "recipe_versions": versions,
+        "recipe_images.files": image_files,
+        "image_jobs": image_jobs,
     }
     fake_client = _FakeClient(db_map={"recipe_db": fake_db})
 
@@ -48,6 +54,20 @@ async def test_connect_and_disconnect_to_mongodb_success():
         mongodb._database = None
         await mongodb.connect_to_mongodb()
 
+    image_files.create_index.assert_awaited_once_with("metadata.recipe_id")
+    recipes.create_index.assert_any_await(
+        [("name", "text"), ("prepare_instruction", "text")],
+        weights={"name": 10, "prepare_instruction": 1},
+        name="recipe_text",
+    )
+    recipes.create_index.assert_any_await("name", collation=mongodb.SEARCH_COLLATION, name="name_ci")
+    ingredients.create_index.assert_any_await([("name", "text")], name="ingredient_text")
+    ingredients.create_index.assert_any_await("name", collation=mongodb.SEARCH_COLLATION, name="name_ci")
+    image_jobs.create_index.assert_any_await([("status", 1), ("next_run_at", 1)])
+    image_jobs.create_index.assert_any_await(
+        "finished_at", expireAfterSeconds=mongodb.settings.IMAGE_JOB_RETENTION_SECONDS
+    )
+
     assert mongodb.get_database() is fake_db
     assert mongodb.get_client() is fake_client
     fake_client.admin.command.assert_awaited_once_with("ping")
@@ -115,17 +135,16 @@ def test_build_prompt_contains_recipe_name():
 async def test_generate_recipe_image_skips_without_api_key(monkeypatch):
     monkeypatch.setattr(image_generation_service.settings, "OPEN_ROUTER_API_KEY", "")
 
-    await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+    with pytest.raises(image_generation_service.ImageGenerationError) as error:
+        await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+
+    assert error.value.retryable is False
 
 
 @pytest.mark.asyncio
 async def test_generate_recipe_image_success(monkeypatch):
     monkeypatch.setattr(image_generation_service.settings, "OPEN_ROUTER_API_KEY", "test-key")
 
-    mock_collection = MagicMock()
-    mock_collection.update_one = AsyncMock()
-    mock_db = {"recipes": mock_collection}
-
     fake_response = MagicMock()
     fake_response.raise_for_status = MagicMock()
     fake_response.json.return_value = {
@@ -144,12 +163,17 @@ async def test_generate_recipe_image_success(monkeypatch):
     mock_client_ctx.__aenter__ = AsyncMock(return_value=mock_client)
     mock_client_ctx.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("src.services.image_generation_service.get_database", return_value=mock_db), patch(
+    with patch(
+        "src.services.image_generation_service.store_recipe_image",
+        new_callable=AsyncMock,
+        return_value="http://gateway/recipes/images/image-1",
+    ) as mock_store, patch(
         "src.services.image_generation_service.httpx.AsyncClient", return_value=mock_client_ctx
     ):
-        await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+        reference = await image_generation_service.generate_recipe_image("recipe-1", "Soup")
 
-    mock_collection.update_one.assert_awaited_once()
+    assert reference == "http://gateway/recipes/images/image-1"
+    mock_store.assert_awaited_once_with("recipe-1", "data:image/png;base64,abc")
 
 
 @pytest.mark.asyncio
@@ -173,7 +197,8 @@ async def test_generate_recipe_image_handles_empty_and_keyerror_and_http_error(m
         "error", request=request, response=response
     )
 
-    for fake_response in (empty_url_response, key_error_response, http_error_response):
+    expected_errors = ("Empty image URL", "Unexpected OpenRouter response structure", "OpenRouter HTTP error")
+    for fake_response, expected in zip((empty_url_response, key_error_response, http_error_response), expected_errors):
         mock_client = MagicMock()
         mock_client.post = AsyncMock(return_value=fake_response)
         mock_client_ctx = MagicMock()
@@ -181,9 +206,13 @@ async def test_generate_recipe_image_handles_empty_and_keyerror_and_http_error(m
         mock_client_ctx.__aexit__ = AsyncMock(return_value=False)
 
         with patch("src.services.image_generation_service.httpx.AsyncClient", return_value=mock_client_ctx), patch(
-            "src.services.image_generation_service.get_database", return_value={"recipes": MagicMock()}
-        ):
-            await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+            "src.services.image_generation_service.store_recipe_image", new_callable=AsyncMock
+        ) as mock_store:
+            with pytest.raises(image_generation_service.ImageGenerationError, match=expected) as error:
+                await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+
+        assert error.value.retryable is True
+        mock_store.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -197,4 +226,32 @@ async def test_generate_recipe_image_handles_generic_exception(monkeypatch):
     mock_client_ctx.__aexit__ = AsyncMock(return_value=False)
 
     with patch("src.services.image_generation_service.httpx.AsyncClient", return_value=mock_client_ctx):
-        await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+        with pytest.raises(image_generation_service.ImageGenerationError, match="RuntimeError: network fail"):
+            await image_generation_service.generate_recipe_image("recipe-1", "Soup")
+
+
+@pytest.mark.asyncio
+async def test_generate_recipe_image_skips_deleted_recipe(monkeypatch):
+    monkeypatch.setattr(image_generation_service.settings, "OPEN_ROUTER_API_KEY", "test-key")
+
+    fake_response = MagicMock()
+    fake_response.raise_for_status = MagicMock()
+    fake_response.json.return_value = {
+        "choices": [{"message": {"images": [{"image_url": {"url": "data:image/png;base64,abc"}}]}}]
+    }
+    mock_client = MagicMock()
+    mock_client.post = AsyncMock(return_value=fake_response)
+    mock_client_ctx = MagicMock()
+    mock_client_ctx.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_client_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    with patch(
+        "src.services.image_generation_service.store_recipe_image",
+        new_callable=AsyncMock,
+        return_value=None,
+    ) as mock_store, patch(
+        "src.services.image_generation_service.httpx.AsyncClient", return_value=mock_client_ctx
+    ):
+        assert await image_generation_service.generate_recipe_image("recipe-1", "Soup") is None
+
+    mock_store.assert_awaited_once()
@@ -0,0 +1,119 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.models.model import Ingredient
+from src.services.ingredient_index import IngredientIndex, normalize_name
+
+
+def _docs(*names):
+    return [{"_id": f"ing-{i}", "name": name, "units": "g"} for i, name in enumerate(names)]
+
+
+def _collection(documents):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=documents)
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    return collection
+
+
+async def _loaded_index(*names) -> IngredientIndex:
+    index = IngredientIndex()
+    collection = _collection(_docs(*names))
+    with patch("src.services.ingredient_index.get_database", return_value={"ingredients": collection}):
+        assert await index.load() == len(names)
+    collection.find.assert_called_once_with({}, {"name": 1, "units": 1})
+    return index
+
+
+def test_normalize_name_folds_case_accents_and_spaces():
+    assert normalize_name("  Crème   FRAÎCHE ") == "creme fraiche"
+    assert normalize_name("Jalapeño") == "jalapeno"
+    assert normalize_name(None) == ""
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_prefix_before_word_matches():
+    index = await _loaded_index("Tomato paste", "Tomato", "Cherry tomato", "Potato", "Sun-dried tomatoes")
+
+    assert index.loaded
+    assert index.size() == 5
+    assert [s.name for s in index.search("tom")] == ["Tomato", "Tomato paste", "Cherry tomato", "Sun-dried tomatoes"]
+    assert [s.name for s in index.search("PASTE")] == ["Tomato paste"]
+    assert [s.name for s in index.search("tomato p")] == ["Tomato paste"]
+    assert [s.name for s in index.search("tom", limit=2)] == ["Tomato", "Tomato paste"]
+    assert index.search("zucchini") == []
+    assert index.search("   ") == []
+
+
+@pytest.mark.asyncio
+async def test_search_is_accent_insensitive_and_reports_each_ingredient_once():
+    index = await _loaded_index("Crème fraîche", "Cream cheese cream")
+
+    assert [s.name for s in index.search("creme")] == ["Crème fraîche"]
+    assert [s.id for s in index.search("cream")] == ["ing-1"]
+    assert index.search("fraich")[0].units == "g"
+
+
+@pytest.mark.asyncio
+async def test_upsert_and_remove_patch_the_index():
+    index = await _loaded_index("Tomato")
+
+    index.upsert(Ingredient(_id="ing-0", name="Roma tomato", units="pcs"))
+    index.upsert(Ingredient(_id="ing-9", name="Basil", units="g"))
+    assert [s.name for s in index.search("roma")] == ["Roma tomato"]
+    assert index.search("tomato")[0].units == "pcs"
+    assert [s.id for s in index.search("bas")] == ["ing-9"]
+
+    index.remove("ing-9")
+    index.remove("missing")
+    assert index.search("bas") == []
+    assert index.size() == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_during_load_are_kept_over_the_stale_snapshot():
+    index = await _loaded_index("Tomato", "Basil")
+    collection = _collection(_docs("Tomato", "Basil"))
+
+    async def _snapshot_then_local_writes(length=None):
+        # Snapshot was read before these local writes reached the index
+        index.upsert(Ingredient(_id="ing-0", name="Roma tomato", units="pcs"))
+        index.upsert(Ingredient(_id="ing-7", name="Oregano", units="g"))
+        index.remove("ing-1")
+        return _docs("Tomato", "Basil")
+
+    collection.find.return_value.to_list = AsyncMock(side_effect=_snapshot_then_local_writes)
+    with patch("src.services.ingredient_index.get_database", return_value={"ingredients": collection}):
+        assert await index.load() == 2
+
+    assert [s.name for s in index.search("tomato")] == ["Roma tomato"]
+    assert [s.id for s in index.search("oreg")] == ["ing-7"]
+    assert index.search("bas") == []
+    assert index._pending_writes == []
+
+
+@pytest.mark.asyncio
+async def test_periodic_reload_survives_errors_and_stops():
+    index = IngredientIndex(refresh_seconds=0.01)
+    collection = _collection(_docs("Tomato"))
+    database = MagicMock()
+    database.__getitem__.side_effect = [RuntimeError("mongo down"), collection, collection, collection, collection]
+
+    with patch("src.services.ingredient_index.get_database", return_value=database):
+        index.start()
+        refresher = index._refresher
+        index.start()
+        assert index._refresher is refresher
+
+        for _ in range(100):
+            if index.loaded:
+                break
+            await asyncio.sleep(0.01)
+        await index.stop()
+
+    assert index.loaded
+    assert index._refresher is None
+    assert refresher.cancelled()
@@ -0,0 +1,115 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from common.units import UNIT_TO_GRAMS, convert_to_grams
+from src.models.model import CapacityUnit, Ingredient, Macro, WeightedIngredient
+from src.services import nutrition_service
+
+
+def _ingredient(ingredient_id: str, name: str, calories: float, proteins: float = 0.0) -> Ingredient:
+    return Ingredient(
+        _id=ingredient_id,
+        name=name,
+        units="g",
+        macro_per_hundred=Macro(calories=calories, carbs=0, proteins=proteins, fats=0),
+    )
+
+
+def _weighted(ingredient_id: str, capacity: CapacityUnit, quantity: float) -> WeightedIngredient:
+    return WeightedIngredient(ingredient_id=ingredient_id, capacity=capacity, quantity=quantity)
+
+
+def test_convert_to_grams_known_and_unknown_units():
+    assert convert_to_grams(2, CapacityUnit.KILOGRAM) == 2000.0
+    assert convert_to_grams(2, "tbsp") == 30.0
+    assert convert_to_grams(3, "unknown") == 3.0
+
+
+def test_unit_table_covers_every_capacity_unit():
+    assert set(UNIT_TO_GRAMS) == {unit.value for unit in CapacityUnit}
+
+
+def test_compute_recipe_nutrition_totals_servings_and_missing_ingredients():
+    ingredients = [
+        _weighted("rice", CapacityUnit.GRAM, 200),
+        _weighted("chicken", CapacityUnit.KILOGRAM, 0.3),
+        _weighted("gone", CapacityUnit.GRAM, 50),
+        _weighted("salt", CapacityUnit.TEASPOON, 1),
+    ]
+    ingredients_map = {
+        "rice": _ingredient("rice", "Rice", 130, 2.7),
+        "chicken": _ingredient("chicken", "Chicken", 165, 31),
+        "salt": Ingredient(_id="salt", name="Salt", units="g"),
+    }
+
+    nutrition = nutrition_service.compute_recipe_nutrition(ingredients, ingredients_map, servings=3)
+
+    assert [item.ingredient_id for item in nutrition.ingredients] == ["rice", "chicken", "salt"]
+    assert nutrition.ingredients[1].quantity == 300.0
+    assert nutrition.ingredients[1].macros.calories == 495.0
+    assert nutrition.ingredients[2].macros.calories == 0
+    assert nutrition.total.calories == 755.0
+    assert nutrition.total.proteins == 98.4
+    assert nutrition.per_serving.calories == 251.67
+
+
+@pytest.mark.asyncio
+async def test_build_recipe_nutrition_loads_ingredients_with_one_query():
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[_ingredient("rice", "Rice", 130).model_dump(by_alias=True)])
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"ingredients": collection}
+
+    with patch("src.services.nutrition_service.get_database", return_value=db):
+        nutrition = await nutrition_service.build_recipe_nutrition(
+            [_weighted("rice", CapacityUnit.GRAM, 100), _weighted("rice", CapacityUnit.GRAM, 50)],
+            servings=1,
+        )
+
+    collection.find.assert_called_once_with({"_id": {"$in": ["rice"]}})
+    assert nutrition.total.calories == 195.0
+
+
+@pytest.mark.asyncio
+async def test_refresh_recipes_for_ingredient_updates_dependent_recipes_in_batches():
+    recipes_cursor = MagicMock()
+    recipes_cursor.to_list = AsyncMock(side_effect=[
+        [
+            {"_id": "r1", "ingredients": [{"ingredient_id": "rice", "capacity": "g", "quantity": 100}], "servings": 2},
+            {"_id": "r2", "ingredients": [{"ingredient_id": "rice", "capacity": "kg", "quantity": 1}]},
+        ],
+        [],
+    ])
+    recipes = MagicMock()
+    recipes.find.return_value = recipes_cursor
+    recipes.bulk_write = AsyncMock()
+
+    ingredients_cursor = MagicMock()
+    ingredients_cursor.to_list = AsyncMock(return_value=[_ingredient("rice", "Rice", 130).model_dump(by_alias=True)])
+    ingredients = MagicMock()
+    ingredients.find.return_value = ingredients_cursor
+
+    db = {"recipes": recipes, "ingredients": ingredients}
+
+    with patch("src.services.nutrition_service.get_database", return_value=db):
+        updated = await nutrition_service.refresh_recipes_for_ingredient("rice")
+
+    assert updated == 2
+    recipes.find.assert_called_once_with({"ingredients.ingredient_id": "rice"}, {"ingredients": 1, "servings": 1})
+    ingredients.find.assert_called_once_with({"_id": {"$in": ["rice"]}})
+    operations = recipes.bulk_write.await_args.args[0]
+    first = operations[0]._doc["$set"]["nutrition"]
+    second = operations[1]._doc["$set"]["nutrition"]
+    assert first["total"]["calories"] == 130.0
+    assert first["per_serving"]["calories"] == 65.0
+    assert second["total"]["calories"] == 1300.0
+
+
+@pytest.mark.asyncio
+async def test_refresh_recipes_for_ingredient_logs_and_returns_zero_on_error():
+    with patch("src.services.nutrition_service.get_database", side_effect=RuntimeError("not connected")):
+        updated = await nutrition_service.refresh_recipes_for_ingredient("rice")
+
+    assert updated == 0
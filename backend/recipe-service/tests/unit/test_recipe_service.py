@@ -2,9 +2,23 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-
-from src.models.model import CapacityUnit, IngredientCreate, IngredientUpdate, RecipeCreate, RecipeUpdate
-from src.services.recipe_service import IngredientService, RecipeService
+from pymongo import ReturnDocument
+
+from src.models.model import (
+    CapacityUnit,
+    IngredientCreate,
+    IngredientSuggestion,
+    IngredientUpdate,
+    Macro,
+    RecipeCreate,
+    RecipeCardResponse,
+    RecipeIngredientsResponse,
+    RecipeNutrition,
+    RecipeSummaryResponse,
+    RecipeUpdate,
+    RecipeView,
+)
+from src.services.recipe_service import RECIPE_VIEW_PROJECTIONS, IngredientService, RecipeService
 
 
 def _ingredient_doc(ingredient_id: str = "ing-1", name: str = "Tomato") -> dict:
@@ -13,6 +27,10 @@ def _ingredient_doc(ingredient_id: str = "ing-1", name: str = "Tomato") -> dict:
     return Ingredient(_id=ingredient_id, name=name, units="g").model_dump(by_alias=True)
 
 
+def _macro(calories: float) -> Macro:
+    return Macro(calories=calories, carbs=0, proteins=0, fats=0)
+
+
 def _recipe_doc(recipe_id: str = "rec-1", author_id: str = "author-1", likes: int = 0) -> dict:
     from src.models.model import Recipe, WeightedIngredient
 
@@ -39,11 +57,14 @@ async def test_ingredient_create():
     collection.insert_one = AsyncMock()
     db = {"ingredients": collection}
 
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.ingredient_index"
+    ) as mock_index:
         created = await IngredientService.create_ingredient(IngredientCreate(name="Salt", units="g"))
 
     assert created.name == "Salt"
     collection.insert_one.assert_awaited_once()
+    mock_index.upsert.assert_called_once_with(created)
 
 
 @pytest.mark.asyncio
@@ -61,6 +82,23 @@ async def test_ingredient_get_found_and_missing():
     assert missing is None
 
 
+@pytest.mark.asyncio
+async def test_get_ingredients_by_ids_uses_single_in_query():
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[_ingredient_doc("ing-1"), _ingredient_doc("ing-2", "Pepper")])
+
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"ingredients": collection}
+
+    with patch("src.services.recipe_service.get_database", return_value=db):
+        result = await IngredientService.get_ingredients_by_ids(["ing-1", "ing-2", "ing-1", "missing"])
+
+    assert [ingredient.id for ingredient in result] == ["ing-1", "ing-2"]
+    collection.find.assert_called_once_with({"_id": {"$in": ["ing-1", "ing-2", "missing"]}})
+    cursor.to_list.assert_awaited_once_with(length=3)
+
+
 @pytest.mark.asyncio
 async def test_get_ingredients_with_and_without_search():
     cursor = MagicMock()
@@ -75,21 +113,31 @@ async def test_get_ingredients_with_and_without_search():
 
     with patch("src.services.recipe_service.get_database", return_value=db):
         result = await IngredientService.get_ingredients(skip=1, limit=2, search="pep")
+        listed = await IngredientService.get_ingredients(skip=0, limit=2)
 
     assert len(result) == 2
-    collection.find.assert_called_once_with({"name": {"$regex": "pep", "$options": "i"}})
+    assert len(listed) == 2
+    assert collection.find.call_args_list[0].args == ({"$text": {"$search": "pep"}}, None)
+    assert collection.find.call_args_list[-1].args == ({},)
+    cursor.sort.assert_called_with("name", 1)
 
 
 @pytest.mark.asyncio
 async def test_update_ingredient_not_found():
     collection = MagicMock()
     collection.find_one = AsyncMock(return_value=None)
+    collection.find_one_and_update = AsyncMock(return_value=None)
     db = {"ingredients": collection}
 
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.ingredient_index"
+    ) as mock_index:
         result = await IngredientService.update_ingredient("missing", IngredientUpdate(name="New"))
+        unchanged = await IngredientService.update_ingredient("missing", IngredientUpdate())
 
     assert result is None
+    assert unchanged is None
+    mock_index.upsert.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -108,24 +156,28 @@ async def test_update_ingredient_without_payload_changes_returns_existing():
 
 @pytest.mark.asyncio
 async def test_update_ingredient_with_payload_handles_updated_lookup():
-    existing = _ingredient_doc("ing-11", "Oil")
     updated = _ingredient_doc("ing-11", "Olive Oil")
 
     collection = MagicMock()
-    collection.find_one = AsyncMock(side_effect=[existing, updated, None])
-    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock()
+    collection.find_one_and_update = AsyncMock(return_value=updated)
     db = {"ingredients": collection}
 
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.ingredient_index"
+    ) as mock_index:
         ok = await IngredientService.update_ingredient("ing-11", IngredientUpdate(name="Olive Oil"))
 
     assert ok is not None
     assert ok.name == "Olive Oil"
+    mock_index.upsert.assert_called_once_with(ok)
+    collection.find_one.assert_not_awaited()
 
-    collection.find_one = AsyncMock(side_effect=[existing, None])
-    with patch("src.services.recipe_service.get_database", return_value=db):
-        none_after_update = await IngredientService.update_ingredient("ing-11", IngredientUpdate(name="Olive Oil"))
-    assert none_after_update is None
+    args, kwargs = collection.find_one_and_update.await_args
+    assert args[0] == {"_id": "ing-11"}
+    assert args[1]["$set"]["name"] == "Olive Oil"
+    assert "_updated_at" in args[1]["$set"]
+    assert kwargs == {"return_document": ReturnDocument.AFTER}
 
 
 @pytest.mark.asyncio
@@ -134,12 +186,46 @@ async def test_delete_ingredient_true_and_false():
     collection.delete_one = AsyncMock(side_effect=[SimpleNamespace(deleted_count=1), SimpleNamespace(deleted_count=0)])
     db = {"ingredients": collection}
 
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.ingredient_index"
+    ) as mock_index:
         ok = await IngredientService.delete_ingredient("ing-1")
         fail = await IngredientService.delete_ingredient("ing-1")
 
     assert ok is True
     assert fail is False
+    mock_index.remove.assert_called_once_with("ing-1")
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_ingredients_uses_index_once_loaded():
+    suggestion = IngredientSuggestion(_id="ing-1", name="Tomato", units="g")
+    cursor = MagicMock()
+    cursor.collation.return_value = cursor
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[{"_id": "ing-2", "name": "Tofu", "units": "g"}])
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"ingredients": collection}
+
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.ingredient_index"
+    ) as mock_index:
+        mock_index.loaded = True
+        mock_index.search.return_value = [suggestion]
+        indexed = await IngredientService.autocomplete_ingredients("tom", 5)
+
+        mock_index.loaded = False
+        fallback = await IngredientService.autocomplete_ingredients("to", 5)
+
+    assert indexed == [suggestion]
+    mock_index.search.assert_called_once_with("tom", 5)
+    assert [s.name for s in fallback] == ["Tofu"]
+    collection.find.assert_called_once_with(
+        {"name": {"$gte": "to", "$lt": "to\uffff"}}, {"name": 1, "units": 1}
+    )
 
 
 @pytest.mark.asyncio
@@ -156,12 +242,20 @@ async def test_recipe_create_and_get_paths():
         time_to_prepare=120,
     )
 
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    nutrition = RecipeNutrition(total=_macro(130), per_serving=_macro(130))
+
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.build_recipe_nutrition",
+        new_callable=AsyncMock,
+        return_value=nutrition,
+    ) as mock_build:
         created = await RecipeService.create_recipe(recipe_create, "author-1")
         found = await RecipeService.get_recipe("rec-1")
         missing = await RecipeService.get_recipe("missing")
 
     assert created.author_id == "author-1"
+    assert created.nutrition == nutrition
+    mock_build.assert_awaited_once_with(recipe_create.ingredients, 1)
     assert found is not None
     assert missing is None
 
@@ -182,7 +276,59 @@ async def test_get_recipes_filter_and_mapping():
         result = await RecipeService.get_recipes(skip=0, limit=2, author_id="a1")
 
     assert len(result) == 2
-    collection.find.assert_called_once_with({"author_id": "a1"})
+    collection.find.assert_called_once_with({"author_id": "a1"}, None)
+
+
+@pytest.mark.asyncio
+async def test_get_recipes_with_view_projects_fields():
+    doc = _recipe_doc("r1", "a1")
+    card_doc = {key: doc[key] for key in ("_id", "name", "author_id", "time_to_prepare", "servings", "total_likes", "image", "_created_at")}
+
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[card_doc])
+
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"recipes": collection}
+
+    with patch("src.services.recipe_service.get_database", return_value=db):
+        result = await RecipeService.get_recipes(view=RecipeView.CARD)
+
+    assert isinstance(result[0], RecipeCardResponse)
+    assert result[0].nutrition is None
+    projection = collection.find.call_args.args[1]
+    assert projection == RECIPE_VIEW_PROJECTIONS[RecipeView.CARD]
+    assert "prepare_instruction" not in projection
+    assert "ingredients" not in projection
+    assert projection["nutrition.per_serving"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_recipe_views():
+    doc = _recipe_doc("r1", "a1")
+    collection = MagicMock()
+    collection.find_one = AsyncMock(side_effect=[
+        {key: doc[key] for key in ("_id", "name", "ingredients", "servings", "nutrition")},
+        {key: doc[key] for key in ("_id", "name", "author_id", "time_to_prepare", "servings", "total_likes")},
+        None,
+    ])
+    db = {"recipes": collection}
+
+    with patch("src.services.recipe_service.get_database", return_value=db):
+        ingredients_view = await RecipeService.get_recipe("r1", RecipeView.INGREDIENTS)
+        summary_view = await RecipeService.get_recipe("r1", RecipeView.SUMMARY)
+        missing = await RecipeService.get_recipe("r2", RecipeView.SUMMARY)
+
+    assert isinstance(ingredients_view, RecipeIngredientsResponse)
+    assert ingredients_view.ingredients[0].ingredient_id == "ing-1"
+    assert isinstance(summary_view, RecipeSummaryResponse)
+    assert missing is None
+    assert collection.find_one.await_args_list[0].args == (
+        {"_id": "r1"}, {"name": 1, "ingredients": 1, "servings": 1, "nutrition": 1, "version": 1}
+    )
 
 
 @pytest.mark.asyncio
@@ -191,9 +337,13 @@ async def test_update_recipe_branches():
     db = {"recipes": collection}
 
     collection.find_one = AsyncMock(return_value=None)
+    collection.find_one_and_update = AsyncMock(return_value=None)
     with patch("src.services.recipe_service.get_database", return_value=db):
         not_found = await RecipeService.update_recipe("rec-1", RecipeUpdate(time_to_prepare=300), "author-1")
+        not_found_unchanged = await RecipeService.update_recipe("rec-1", RecipeUpdate(), "author-2")
     assert not_found is None
+    assert not_found_unchanged is None
+    collection.find_one.assert_awaited_once_with({"_id": "rec-1", "author_id": "author-2"})
 
     existing = _recipe_doc("rec-1", "author-1")
     collection.find_one = AsyncMock(return_value=existing)
@@ -202,23 +352,82 @@ async def test_update_recipe_branches():
     assert unchanged is not None
     assert unchanged.id == "rec-1"
 
-    collection.find_one = AsyncMock(side_effect=[existing, _recipe_doc("rec-1", "author-1")])
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=1))
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    before = _recipe_doc("rec-1", "author-1")
+    collection.find_one = AsyncMock()
+    collection.find_one_and_update = AsyncMock(return_value=before)
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.RecipeVersionService.record_version", new_callable=AsyncMock
+    ) as mock_record:
         updated = await RecipeService.update_recipe("rec-1", RecipeUpdate(time_to_prepare=350), "author-1")
     assert updated is not None
+    assert updated.time_to_prepare == 350
+    assert updated.version == 2
+    collection.find_one.assert_not_awaited()
 
-    collection.find_one = AsyncMock(return_value=existing)
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=0))
-    with patch("src.services.recipe_service.get_database", return_value=db):
-        fallback = await RecipeService.update_recipe("rec-1", RecipeUpdate(time_to_prepare=350), "author-1")
-    assert fallback is not None
+    args, kwargs = collection.find_one_and_update.await_args
+    assert args[0] == {"_id": "rec-1", "author_id": "author-1"}
+    stage = args[1][0]["$set"]
+    assert stage["time_to_prepare"] == {"$literal": 350}
+    assert stage["version"] == {"$add": [{"$ifNull": ["$version", 1]}, 1]}
+    assert "nutrition" not in stage
+    assert kwargs == {"return_document": ReturnDocument.BEFORE}
 
-    collection.find_one = AsyncMock(side_effect=[existing, None])
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=1))
-    with patch("src.services.recipe_service.get_database", return_value=db):
-        missing_after_update = await RecipeService.update_recipe("rec-1", RecipeUpdate(time_to_prepare=350), "author-1")
-    assert missing_after_update is None
+    update_data = mock_record.await_args.args[1]
+    mock_record.assert_awaited_once_with(before, update_data, "author-1")
+    assert update_data["time_to_prepare"] == 350
+
+
+@pytest.mark.asyncio
+async def test_update_recipe_recomputes_nutrition_when_servings_change():
+    existing = _recipe_doc("rec-1", "author-1")
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value={"_id": "rec-1", "ingredients": existing["ingredients"], "servings": 2})
+    collection.find_one_and_update = AsyncMock(return_value=existing)
+    db = {"recipes": collection}
+    nutrition = RecipeNutrition(total=_macro(200), per_serving=_macro(50))
+
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.build_recipe_nutrition",
+        new_callable=AsyncMock,
+        return_value=nutrition,
+    ) as mock_build, patch("src.services.recipe_service.RecipeVersionService.record_version", new_callable=AsyncMock):
+        await RecipeService.update_recipe("rec-1", RecipeUpdate(servings=4), "author-1")
+
+    collection.find_one.assert_awaited_once_with(
+        {"_id": "rec-1", "author_id": "author-1"}, {"ingredients": 1, "servings": 1}
+    )
+    ingredients, servings = mock_build.await_args.args
+    assert [item.ingredient_id for item in ingredients] == ["ing-1"]
+    assert servings == 4
+    update_doc = collection.find_one_and_update.await_args.args[1][0]["$set"]
+    assert update_doc["nutrition"]["$literal"]["per_serving"]["calories"] == 50
+
+
+@pytest.mark.asyncio
+async def test_update_recipe_nutrition_paths_without_extra_read():
+    existing = _recipe_doc("rec-1", "author-1")
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.find_one_and_update = AsyncMock(return_value=existing)
+    db = {"recipes": collection}
+    nutrition = RecipeNutrition(total=_macro(200), per_serving=_macro(100))
+    update = RecipeUpdate(ingredients=existing["ingredients"], servings=2)
+
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.build_recipe_nutrition",
+        new_callable=AsyncMock,
+        return_value=nutrition,
+    ) as mock_build, patch("src.services.recipe_service.RecipeVersionService.record_version", new_callable=AsyncMock):
+        updated = await RecipeService.update_recipe("rec-1", update, "author-1")
+        missing = await RecipeService.update_recipe("rec-1", RecipeUpdate(servings=3), "author-2")
+
+    assert updated is not None
+    assert missing is None
+    mock_build.assert_awaited_once()
+    collection.find_one_and_update.assert_awaited_once()
+    collection.find_one.assert_awaited_once_with(
+        {"_id": "rec-1", "author_id": "author-2"}, {"ingredients": 1, "servings": 1}
+    )
 
 
 @pytest.mark.asyncio
@@ -227,51 +436,71 @@ async def test_delete_recipe_true_and_false():
     collection.delete_one = AsyncMock(side_effect=[SimpleNamespace(deleted_count=1), SimpleNamespace(deleted_count=0)])
     db = {"recipes": collection}
 
-    with patch("src.services.recipe_service.get_database", return_value=db):
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.delete_recipe_images", new_callable=AsyncMock
+    ) as mock_delete_images, patch(
+        "src.services.recipe_service.RecipeVersionService.delete_versions", new_callable=AsyncMock
+    ) as mock_delete_versions:
         ok = await RecipeService.delete_recipe("rec-1", "author-1")
         fail = await RecipeService.delete_recipe("rec-1", "author-1")
 
     assert ok is True
     assert fail is False
+    mock_delete_images.assert_awaited_once_with("rec-1")
+    mock_delete_versions.assert_awaited_once_with("rec-1")
+
+
+@pytest.mark.asyncio
+async def test_delete_recipe_ignores_image_cleanup_errors():
+    collection = MagicMock()
+    collection.delete_one = AsyncMock(return_value=SimpleNamespace(deleted_count=1))
+    db = {"recipes": collection}
+
+    with patch("src.services.recipe_service.get_database", return_value=db), patch(
+        "src.services.recipe_service.delete_recipe_images",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("gridfs down"),
+    ), patch(
+        "src.services.recipe_service.RecipeVersionService.delete_versions",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("mongo down"),
+    ):
+        assert await RecipeService.delete_recipe("rec-1", "author-1") is True
 
 
 @pytest.mark.asyncio
 async def test_like_and_unlike_recipe_branches():
     collection = MagicMock()
+    collection.find_one = AsyncMock()
     db = {"recipes": collection}
 
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=0))
+    collection.find_one_and_update = AsyncMock(return_value=None)
     with patch("src.services.recipe_service.get_database", return_value=db):
         no_like = await RecipeService.like_recipe("rec-1")
+        no_unlike = await RecipeService.unlike_recipe("rec-1")
     assert no_like is None
+    assert no_unlike is None
 
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=1))
-    collection.find_one = AsyncMock(return_value=_recipe_doc("rec-1", likes=1))
+    collection.find_one_and_update = AsyncMock(return_value=_recipe_doc("rec-1", likes=1))
     with patch("src.services.recipe_service.get_database", return_value=db):
         liked = await RecipeService.like_recipe("rec-1")
     assert liked is not None
     assert liked.total_likes == 1
+    collection.find_one_and_update.assert_awaited_once_with(
+        {"_id": "rec-1"}, {"$inc": {"total_likes": 1}}, return_document=ReturnDocument.AFTER
+    )
 
-    collection.find_one = AsyncMock(return_value=None)
-    with patch("src.services.recipe_service.get_database", return_value=db):
-        liked_missing = await RecipeService.like_recipe("rec-1")
-    assert liked_missing is None
-
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=0))
-    with patch("src.services.recipe_service.get_database", return_value=db):
-        no_unlike = await RecipeService.unlike_recipe("rec-1")
-    assert no_unlike is None
-
-    collection.update_one = AsyncMock(return_value=SimpleNamespace(modified_count=1))
-    collection.find_one = AsyncMock(return_value=_recipe_doc("rec-1", likes=0))
+    collection.find_one_and_update = AsyncMock(return_value=_recipe_doc("rec-1", likes=0))
     with patch("src.services.recipe_service.get_database", return_value=db):
         unliked = await RecipeService.unlike_recipe("rec-1")
     assert unliked is not None
-
-    collection.find_one = AsyncMock(return_value=None)
-    with patch("src.services.recipe_service.get_database", return_value=db):
-        unliked_missing = await RecipeService.unlike_recipe("rec-1")
-    assert unliked_missing is None
+    assert unliked.total_likes == 0
+    collection.find_one_and_update.assert_awaited_once_with(
+        {"_id": "rec-1", "total_likes": {"$gt": 0}},
+        {"$inc": {"total_likes": -1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    collection.find_one.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -298,11 +527,30 @@ async def test_search_recipes_builds_filters():
     assert len(result) == 1
     collection.find.assert_called_once_with(
         {
-            "$or": [
-                {"name": {"$regex": "pasta", "$options": "i"}},
-                {"prepare_instruction": {"$regex": "pasta", "$options": "i"}},
-            ],
             "tags": {"$in": ["quick"]},
             "author_id": "author-x",
-        }
+            "$text": {"$search": "pasta"},
+        },
+        None,
     )
+    cursor.sort.assert_called_once_with([("score", {"$meta": "textScore"}), ("_id", 1)])
+
+
+@pytest.mark.asyncio
+async def test_search_recipes_without_query_lists_newest_first():
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[_recipe_doc("r1")])
+
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    db = {"recipes": collection}
+
+    with patch("src.services.recipe_service.get_database", return_value=db):
+        result = await RecipeService.search_recipes(query="", view=RecipeView.SUMMARY)
+
+    assert isinstance(result[0], RecipeSummaryResponse)
+    collection.find.assert_called_once_with({}, RECIPE_VIEW_PROJECTIONS[RecipeView.SUMMARY])
+    cursor.sort.assert_called_once_with("_created_at", -1)
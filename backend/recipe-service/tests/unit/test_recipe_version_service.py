@@ -0,0 +1,209 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.model import Recipe
+from src.services.recipe_version_service import RecipeVersionService, compute_changes, compute_unset
+
+
+def _recipe_doc(version: int = 3, **overrides) -> dict:
+    doc = Recipe(
+        _id="rec-1",
+        name="Pasta v3",
+        author_id="author-1",
+        ingredients=[{"ingredient_id": "ing-1", "capacity": "g", "quantity": 300.0}],
+        prepare_instruction=["Boil", "Serve"],
+        time_to_prepare=900,
+        servings=3,
+        version=version,
+        _created_at=datetime(2024, 1, 1),
+        _updated_at=datetime(2024, 1, 3),
+    ).model_dump(by_alias=True)
+    doc.update(overrides)
+    return doc
+
+
+def _cursor(items):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=items)
+    return cursor
+
+
+def _db(recipe, diffs=None):
+    recipes = MagicMock()
+    recipes.find_one = AsyncMock(return_value=recipe)
+    versions = MagicMock()
+    versions.find.return_value = _cursor(diffs or [])
+    versions.insert_one = AsyncMock()
+    versions.delete_many = AsyncMock(return_value=SimpleNamespace(deleted_count=2))
+    return {"recipes": recipes, "recipe_versions": versions}
+
+
+def test_compute_changes_keeps_only_changed_versioned_fields():
+    before = _recipe_doc(nutrition={"total": {"calories": 100}, "computed_at": datetime(2024, 1, 1)})
+    update = {
+        "time_to_prepare": 900,
+        "servings": 4,
+        "total_likes": 7,
+        "nutrition": {"total": {"calories": 100}, "computed_at": datetime(2024, 2, 1)},
+        "_updated_at": datetime(2024, 2, 1),
+    }
+
+    assert compute_changes(before, update) == {"servings": 3}
+
+    # Nutrition is derived and not versioned
+    update["nutrition"] = {"total": {"calories": 150}, "computed_at": datetime(2024, 2, 1)}
+    assert "nutrition" not in compute_changes(before, update)
+
+
+def test_compute_unset_records_fields_missing_from_legacy_documents():
+    before = _recipe_doc()
+    del before["servings"]
+    update = {"servings": 4, "time_to_prepare": 600}
+
+    assert compute_changes(before, update) == {"time_to_prepare": 900}
+    assert compute_unset(before, update) == ["servings"]
+
+
+@pytest.mark.asyncio
+async def test_record_version_stores_reverse_diff():
+    db = _db(None)
+    before = _recipe_doc(version=2)
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        await RecipeVersionService.record_version(before, {"servings": 4, "name": "Pasta v3"}, "author-1")
+
+    stored = db["recipe_versions"].insert_one.await_args.args[0]
+    assert stored["recipe_id"] == "rec-1"
+    assert stored["version"] == 2
+    assert stored["author_id"] == "author-1"
+    assert stored["changes"] == {"servings": 3, "_updated_at": datetime(2024, 1, 3)}
+    assert stored["unset"] == []
+
+
+@pytest.mark.asyncio
+async def test_record_version_logs_insert_errors():
+    db = _db(None)
+    db["recipe_versions"].insert_one.side_effect = RuntimeError("mongo down")
+    before = _recipe_doc(version=1)
+    del before["version"]
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        await RecipeVersionService.record_version(before, {"servings": 4}, "author-1")
+
+    assert db["recipe_versions"].insert_one.await_args.args[0]["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_versions_newest_first():
+    diffs = [
+        {"version": 2, "changes": {"name": "Pasta v2", "_updated_at": None}, "_created_at": datetime(2024, 1, 3)},
+        {
+            "version": 1,
+            "changes": {"servings": 1, "nutrition": None, "_updated_at": None},
+            "unset": ["time_to_prepare"],
+            "_created_at": datetime(2024, 1, 2),
+        },
+    ]
+    db = _db({"_id": "rec-1", "version": 3, "_created_at": datetime(2024, 1, 1)}, diffs)
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        history = await RecipeVersionService.list_versions("rec-1")
+        db["recipes"].find_one.return_value = None
+        missing = await RecipeVersionService.list_versions("rec-2")
+
+    assert [(entry.version, entry.changed_fields) for entry in history] == [
+        (3, ["name"]),
+        (2, ["servings", "time_to_prepare"]),
+        (1, []),
+    ]
+    assert history[-1].created_at == datetime(2024, 1, 1)
+    assert missing is None
+    db["recipe_versions"].find.assert_called_once_with(
+        {"recipe_id": "rec-1"}, {"version": 1, "changes": 1, "unset": 1, "_created_at": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_recipe_version_applies_diffs_newest_first():
+    diffs = [
+        {"version": 2, "changes": {"name": "Pasta v2", "_updated_at": datetime(2024, 1, 2)}},
+        {"version": 1, "changes": {"name": "Pasta", "servings": 1, "_updated_at": datetime(2024, 1, 1)}},
+    ]
+    db = _db(_recipe_doc(version=3), diffs)
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        first = await RecipeVersionService.get_recipe_version("rec-1", 1)
+
+    assert first.version == 1
+    assert first.name == "Pasta"
+    assert first.servings == 1
+    assert first.time_to_prepare == 900
+    assert first.updated_at == datetime(2024, 1, 1)
+    assert first.nutrition is None
+    db["recipe_versions"].find.assert_called_once_with({"recipe_id": "rec-1", "version": {"$gte": 1}})
+
+    db = _db(None, diffs[:1])
+    db["recipes"].find_one.side_effect = lambda *_: _recipe_doc(version=3)
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        second = await RecipeVersionService.get_recipe_version("rec-1", 2)
+        current = await RecipeVersionService.get_recipe_version("rec-1", 3)
+
+    assert (second.version, second.name, second.servings) == (2, "Pasta v2", 3)
+    assert (current.version, current.name) == (3, "Pasta v3")
+    db["recipe_versions"].find.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_recipe_version_drops_fields_the_legacy_document_lacked():
+    recipe = _recipe_doc(version=3, nutrition={"total": {"calories": 1, "proteins": 0, "carbs": 0, "fats": 0}})
+    diffs = [
+        {"version": 2, "changes": {"name": "Pasta v2", "_updated_at": None}, "unset": ["servings"]},
+        # Written before ``unset`` existed, the absent field was stored as None
+        {"version": 1, "changes": {"servings": None, "_updated_at": datetime(2024, 1, 1)}},
+    ]
+    db = _db(recipe, diffs)
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        first = await RecipeVersionService.get_recipe_version("rec-1", 1)
+
+    assert (first.name, first.servings) == ("Pasta v2", 1)
+    assert first.nutrition is None
+
+    diffs[1]["changes"]["name"] = None
+    db = _db(_recipe_doc(version=3), diffs)
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        with pytest.raises(ValidationError):
+            await RecipeVersionService.get_recipe_version("rec-1", 1)
+
+
+@pytest.mark.asyncio
+async def test_get_recipe_version_missing_cases():
+    db = _db(_recipe_doc(version=3), [{"version": 2, "changes": {"name": "Pasta v2"}}])
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        gap = await RecipeVersionService.get_recipe_version("rec-1", 1)
+        future = await RecipeVersionService.get_recipe_version("rec-1", 4)
+        zero = await RecipeVersionService.get_recipe_version("rec-1", 0)
+        db["recipes"].find_one.return_value = None
+        missing = await RecipeVersionService.get_recipe_version("rec-2", 1)
+
+    assert gap is None
+    assert future is None
+    assert zero is None
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_delete_versions():
+    db = _db(None)
+
+    with patch("src.services.recipe_version_service.get_database", return_value=db):
+        deleted = await RecipeVersionService.delete_versions("rec-1")
+
+    assert deleted == 2
+    db["recipe_versions"].delete_many.assert_awaited_once_with({"recipe_id": "rec-1"})
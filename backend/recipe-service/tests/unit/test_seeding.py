@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from common.seeding import bulk_upsert
+from src.init_ingredients import ALL_INGREDIENTS, build_ingredient_docs
+from src.init_recipes import RECIPES, build_recipe_docs
+
+
+def _collection():
+    collection = MagicMock()
+    collection.name = "ingredients"
+    collection.bulk_write = AsyncMock(
+        side_effect=lambda operations, ordered: SimpleNamespace(upserted_count=len(operations) - 1, matched_count=1)
+    )
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_writes_unordered_batches_of_set_on_insert_upserts():
+    collection = _collection()
+    docs = [{"_id": str(i), "name": f"item {i}"} for i in range(5)]
+
+    result = await bulk_upsert(collection, docs, ("name",), batch_size=2, concurrency=2)
+
+    assert collection.bulk_write.await_count == 3
+    operations, = collection.bulk_write.await_args_list[0].args
+    assert collection.bulk_write.await_args_list[0].kwargs == {"ordered": False}
+    assert operations[0]._filter == {"name": "item 0"}
+    assert operations[0]._doc == {"$setOnInsert": docs[0]}
+    assert operations[0]._upsert is True
+    assert (result.collection, result.inserted, result.existing, result.failed) == ("ingredients", 2, 3, 0)
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_counts_partial_batch_failures():
+    collection = _collection()
+    collection.bulk_write.side_effect = BulkWriteError({
+        "nUpserted": 3, "nMatched": 1, "writeErrors": [{"index": 4, "code": 11000}]
+    })
+
+    result = await bulk_upsert(collection, [{"_id": str(i)} for i in range(5)], ("_id",))
+
+    assert (result.inserted, result.existing, result.failed) == (3, 1, 1)
+    assert "1 failed" in result.summary()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_consumes_documents_lazily_with_bounded_writes():
+    consumed = []
+    in_flight = []
+    peak = []
+
+    def docs():
+        for i in range(20):
+            consumed.append(i)
+            yield {"_id": str(i)}
+
+    async def bulk_write(operations, ordered):
+        in_flight.append(1)
+        peak.append((len(in_flight), len(peak) + 1, len(consumed)))
+        await asyncio.sleep(0.001)
+        in_flight.pop()
+        return SimpleNamespace(upserted_count=len(operations), matched_count=0)
+
+    collection = _collection()
+    collection.bulk_write = AsyncMock(side_effect=bulk_write)
+
+    result = await bulk_upsert(collection, docs(), ("_id",), batch_size=2, concurrency=2)
+
+    assert result.inserted == 20
+    assert collection.bulk_write.await_count == 10
+    assert max(writes for writes, _, _ in peak) <= 2
+    # Batches are built at most one write slot ahead of the writes started so far
+    assert all(built <= (started + 2) * 2 for _, started, built in peak)
+    assert peak[0][2] < 20
+
+
+def test_seed_documents_are_deterministic_and_scaled():
+    ingredients = list(build_ingredient_docs(scale=2, seed=7))
+    recipes = list(build_recipe_docs(scale=1, seed=7))
+
+    assert len(ingredients) == 3 * len(ALL_INGREDIENTS)
+    assert len(recipes) == 2 * len(RECIPES)
+    assert [doc["_id"] for doc in recipes] == [doc["_id"] for doc in build_recipe_docs(scale=1, seed=7)]
+    assert len({doc["_id"] for doc in ingredients}) == len(ingredients)
+    assert len({(doc["name"], doc["author_id"]) for doc in recipes}) == len(recipes)
+    assert all(doc["nutrition"]["total"]["calories"] > 0 for doc in recipes)
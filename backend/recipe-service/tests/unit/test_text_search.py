@@ -0,0 +1,88 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from common.text_search import SEARCH_COLLATION, TEXT_SCORE_SORT, prefix_filter, ranked_search
+
+
+def _cursor(items):
+    cursor = MagicMock()
+    cursor.collation.return_value = cursor
+    cursor.sort.return_value = cursor
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=items)
+    return cursor
+
+
+def _collection(*cursors, text_match=None):
+    collection = MagicMock()
+    collection.find.side_effect = list(cursors)
+    collection.find_one = AsyncMock(return_value=text_match)
+    return collection
+
+
+def test_prefix_filter_covers_values_starting_with_query():
+    assert prefix_filter("name", "to") == {"name": {"$gte": "to", "$lt": "to\uffff"}}
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_uses_text_index_for_long_queries():
+    text_cursor = _cursor([{"_id": "r1"}])
+    collection = _collection(text_cursor)
+
+    result = await ranked_search(collection, "  tomato soup ", {"author_id": "a"}, {"name": 1}, skip=5, limit=10)
+
+    assert result == [{"_id": "r1"}]
+    collection.find.assert_called_once_with({"author_id": "a", "$text": {"$search": "tomato soup"}}, {"name": 1})
+    text_cursor.sort.assert_called_once_with(TEXT_SCORE_SORT)
+    text_cursor.skip.assert_called_once_with(5)
+    text_cursor.limit.assert_called_once_with(10)
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_short_query_uses_collated_prefix():
+    prefix_cursor = _cursor([{"_id": "i1"}])
+    collection = _collection(prefix_cursor)
+
+    result = await ranked_search(collection, "to", limit=5)
+
+    assert result == [{"_id": "i1"}]
+    collection.find.assert_called_once_with({"name": {"$gte": "to", "$lt": "to\uffff"}}, None)
+    prefix_cursor.collation.assert_called_once_with(SEARCH_COLLATION)
+    prefix_cursor.sort.assert_called_once_with("name", 1)
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_min_text_length_is_configurable():
+    collection = _collection(_cursor([{"_id": "i1"}]))
+
+    await ranked_search(collection, "tomato", min_text_length=10)
+
+    collection.find.assert_called_once_with({"name": {"$gte": "tomato", "$lt": "tomato\uffff"}}, None)
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_partial_word_falls_back_to_prefix():
+    collection = _collection(_cursor([]), _cursor([{"_id": "i1"}]))
+
+    result = await ranked_search(collection, "toma")
+
+    assert result == [{"_id": "i1"}]
+    assert collection.find.call_args_list[1].args == ({"name": {"$gte": "toma", "$lt": "toma\uffff"}}, None)
+    collection.find_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_no_fallback_for_phrases_or_later_text_pages():
+    phrase = _collection(_cursor([]))
+    assert await ranked_search(phrase, "tomato soup") == []
+    assert phrase.find.call_count == 1
+
+    past_end = _collection(_cursor([]), text_match={"_id": "r1"})
+    assert await ranked_search(past_end, "tomato", skip=20) == []
+    assert past_end.find.call_count == 1
+
+    prefix_page = _collection(_cursor([]), _cursor([{"_id": "i2"}]))
+    assert await ranked_search(prefix_page, "toma", skip=20) == [{"_id": "i2"}]
+    assert prefix_page.find.call_count == 2
@@ -0,0 +1,103 @@
+"""
+Seed synthetic users for load tests.
+
+Users are generated deterministically from ``--seed``: user ``n`` always gets
+the auth0 sub ``system-seed|load-{n}`` (the author IDs of the synthetic
+recipes and the user IDs of the synthetic meal entries), the same UID, email
+and profile. They are inserted in multi-row batches with
+``ON CONFLICT DO NOTHING``, so re-running only adds missing users.
+
+Run from the service root:
+    python -m src.init_users --users 100000
+"""
+import argparse
+import asyncio
+import logging
+import random
+import uuid
+from typing import Iterator, List
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.main import engine
+from src.models.model import BodyParams, User, UserSex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEED_BATCH_SIZE = 1000
+
+# Namespace of the deterministic synthetic user UIDs
+LOAD_USER_NS = uuid.UUID("0b6f2d8e-4c1a-4f3b-8e5d-7a9c1b2d3e4f")
+
+
+def load_user_sub(n: int) -> str:
+    """Auth0 sub of synthetic user n, shared with the other services' load-test seeders"""
+    return f"system-seed|load-{n}"
+
+
+def generate_users(count: int, seed: int = 42) -> Iterator[User]:
+    """Synthetic users with random but reproducible profiles"""
+    rng = random.Random(seed)
+    for n in range(count):
+        sex = rng.choice(list(UserSex))
+        yield User(
+            uid=uuid.uuid5(LOAD_USER_NS, load_user_sub(n)),
+            auth0_sub=load_user_sub(n),
+            email=f"load-{n}@loadtest.mealup.local",
+            username=f"load_{n}",
+            first_name="Load",
+            last_name=f"Tester{n:03d}",
+            sex=sex,
+            age=rng.randint(18, 70),
+            body_params=BodyParams(
+                weight=round(rng.gauss(82 if sex == UserSex.MALE else 66, 12), 1),
+                height=round(rng.gauss(178 if sex == UserSex.MALE else 165, 8), 1),
+            ).model_dump(mode="json"),
+        )
+
+
+async def seed_users(session: AsyncSession, users: Iterator[User], batch_size: int = SEED_BATCH_SIZE) -> int:
+    """Insert users in batches skipping existing ones, returns number of users sent"""
+    columns = [column.name for column in User.__table__.columns]
+    sent = 0
+    batch: List[User] = []
+
+    async def flush() -> None:
+        statement = insert(User).values([
+            {column: getattr(user, column) for column in columns} for user in batch
+        ]).on_conflict_do_nothing(index_elements=["auth0_sub"])
+        await session.exec(statement)
+        await session.commit()
+
+    for user in users:
+        batch.append(user)
+        if len(batch) >= batch_size:
+            await flush()
+            sent += len(batch)
+            batch = []
+            logger.info(f"Saved {sent} users...")
+    if batch:
+        await flush()
+        sent += len(batch)
+
+    logger.info(f"Successfully seeded {sent} users")
+    return sent
+
+
+async def init_users(args: argparse.Namespace) -> None:
+    async with AsyncSession(engine) as session:
+        await seed_users(session, generate_users(args.users, args.seed), args.batch_size)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed synthetic users for load tests")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the user generator")
+    parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(init_users(parse_args()))
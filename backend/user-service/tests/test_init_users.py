@@ -0,0 +1,47 @@
+from argparse import Namespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import src.init_users as seed
+
+
+def test_generate_users_is_deterministic():
+    first = list(seed.generate_users(5, seed=7))
+    second = list(seed.generate_users(5, seed=7))
+
+    assert [user.auth0_sub for user in first] == [f"system-seed|load-{n}" for n in range(5)]
+    assert [(user.uid, user.age, user.body_params) for user in first] == [
+        (user.uid, user.age, user.body_params) for user in second
+    ]
+    assert len({user.email for user in first}) == 5
+
+
+@pytest.mark.asyncio
+async def test_seed_users_inserts_in_batches(session_mock):
+    sent = await seed.seed_users(session_mock, seed.generate_users(5), batch_size=2)
+
+    assert sent == 5
+    assert session_mock.exec.await_count == 3
+    assert session_mock.commit.await_count == 3
+    sql = str(session_mock.exec.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO users" in sql
+    assert "ON CONFLICT (auth0_sub) DO NOTHING" in sql
+
+
+@pytest.mark.asyncio
+async def test_init_users_seeds_requested_count(monkeypatch: pytest.MonkeyPatch, session_mock):
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session_mock)
+    context.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr(seed, "AsyncSession", lambda _engine: context)
+    seed_mock = AsyncMock(return_value=3)
+    monkeypatch.setattr(seed, "seed_users", seed_mock)
+
+    await seed.init_users(Namespace(users=3, seed=42, batch_size=100))
+
+    session, users, batch_size = seed_mock.await_args.args
+    assert session is session_mock
+    assert len(list(users)) == 3
+    assert batch_size == 100
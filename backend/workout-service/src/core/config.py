@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     EXERCISES_COLLECTION: str = "exercises"
     TRAININGS_COLLECTION: str = "trainings"
     WORKOUT_PLANS_COLLECTION: str = "workout_plans"
+
+    # Shorter search queries use the name prefix instead of the $text index
+    TEXT_SEARCH_MIN_LENGTH: int = 3
     
     # Alias for consistency with mongodb.py
     @property
@@ -4,6 +4,7 @@ from typing import Optional
 import logging
 
 from src.core.config import settings
+from common.text_search import SEARCH_COLLATION
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,13 @@ async def _create_indexes():
         await exercises_collection.create_index("category")
         await exercises_collection.create_index("_created_at")
         await exercises_collection.create_index([("name", 1), ("body_part", 1)])
+        # Ranked search (name outweighs description) and its short prefix fallback
+        await exercises_collection.create_index(
+            [("name", "text"), ("description", "text")],
+            weights={"name": 10, "description": 2},
+            name="exercise_text"
+        )
+        await exercises_collection.create_index("name", collation=SEARCH_COLLATION, name="name_ci")
 
         trainings_collection = _database[settings.TRAININGS_COLLECTION]
         await trainings_collection.create_index("training_type")
@@ -4,21 +4,26 @@ Initialize MongoDB with 120+ real exercises for the workout service.
 Deterministic UUIDs are generated from exercise names so that other
 seed scripts can reference them reliably.
 
-Run from the src/ directory:
-    python init_exercises.py
+Exercises are upserted by ID in unordered batches, so re-running only adds
+missing exercises. ``--scale N`` adds N synthetic variants of every exercise
+for load tests.
+
+Run from the service root:
+    python -m src.init_exercises [--scale N]
 """
 
+import argparse
 import asyncio
-import sys
+import random
 import uuid
 from datetime import datetime
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent))
+from itertools import chain
+from typing import Iterator
 
-from db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
-from core.config import settings
-from models.model import Exercise, BodyPart, Advancement, ExerciseCategory
+from common.seeding import SeedResult, add_seed_arguments, bulk_upsert, print_results
+from src.db.mongodb import connect_to_mongodb, disconnect_from_mongodb, get_database
+from src.core.config import settings
+from src.models.model import Exercise, BodyPart, Advancement, ExerciseCategory
 
 # ---------------------------------------------------------------------------
 # Deterministic ID generation
@@ -512,28 +517,36 @@ def build_exercise(name, body_part, advancement, category, description, hints):
     )
 
 
-async def init_exercises():
-    """Seed the exercises collection (idempotent — skips if data exists)."""
-    try:
-        print("Connecting to MongoDB…")
-        await connect_to_mongodb()
+def generate_synthetic_exercises(scale: int, seed: int = 42) -> Iterator[Exercise]:
+    """``scale`` variants of every exercise ("Push Up #3") with a random advancement."""
+    rng = random.Random(seed)
+    advancements = list(Advancement)
+    for k in range(1, scale + 1):
+        for name, body_part, _, category, description, hints in ALL_EXERCISES:
+            yield build_exercise(f"{name} #{k}", body_part, rng.choice(advancements), category, description, hints)
+
 
-        db = get_database()
-        collection = db[settings.EXERCISES_COLLECTION]
+def build_exercise_docs(scale: int = 0, seed: int = 42) -> Iterator[dict]:
+    """Documents of the curated exercises followed by the synthetic ones, built lazily."""
+    curated = (build_exercise(*row) for row in ALL_EXERCISES)
+    for exercise in chain(curated, generate_synthetic_exercises(scale, seed)):
+        yield exercise.model_dump(by_alias=True)
 
-        existing_count = await collection.count_documents({})
-        if existing_count > 0:
-            print(f"⚠️  Collection already has {existing_count} exercises — skipping.")
-            return
 
-        docs = []
-        for row in ALL_EXERCISES:
-            exercise = build_exercise(*row)
-            docs.append(exercise.model_dump(by_alias=True))
+async def seed_exercises(args: argparse.Namespace) -> SeedResult:
+    """Upsert the exercise documents (idempotent — existing exercises are left untouched)."""
+    collection = get_database()[settings.EXERCISES_COLLECTION]
+    docs = build_exercise_docs(args.scale, args.seed)
+    return await bulk_upsert(collection, docs, ("_id",), args.batch_size, args.concurrency)
 
-        result = await collection.insert_many(docs)
 
-        print(f"✅ Inserted {len(result.inserted_ids)} exercises.")
+async def init_exercises(args: argparse.Namespace):
+    """Seed the exercises collection."""
+    try:
+        print("Connecting to MongoDB…")
+        await connect_to_mongodb()
+
+        print_results([await seed_exercises(args)])
         print(f"   Categories: Chest({len(CHEST_EXERCISES)}), Back({len(BACK_EXERCISES)}), "
               f"Shoulders({len(SHOULDER_EXERCISES)}), Biceps({len(BICEPS_EXERCISES)}), "
               f"Triceps({len(TRICEPS_EXERCISES)}), Forearms({len(FOREARM_EXERCISES)}), "
@@ -549,6 +562,10 @@ async def init_exercises():
         await disconnect_from_mongodb()
 
 
+def parse_args() -> argparse.Namespace:
+    return add_seed_arguments(argparse.ArgumentParser(description="Seed the exercise catalogue")).parse_args()
+
+
 if __name__ == "__main__":
     print(f"Total exercises to seed: {len(ALL_EXERCISES)}")
-    asyncio.run(init_exercises())
+    asyncio.run(init_exercises(parse_args()))
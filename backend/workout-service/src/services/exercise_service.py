@@ -8,6 +8,7 @@ from src.models.model import (
     BodyPart, Advancement, ExerciseCategory
 )
 from src.core.config import settings
+from common.text_search import ranked_search
 
 logger = logging.getLogger(__name__)
 
@@ -61,14 +62,12 @@ class ExerciseService:
         advancement: Optional[Advancement] = None,
         category: Optional[ExerciseCategory] = None
     ) -> List[Exercise]:
-        """Get list of exercises with pagination and filters"""
+        """Get list of exercises with pagination, filters and ranked search"""
         db = get_database()
         collection = db[settings.EXERCISES_COLLECTION]
         
         query: dict[str, Any] = {}
         
-        if search:
-            query["name"] = {"$regex": search, "$options": "i"}
         if body_part:
             query["body_part"] = body_part.value
         if advancement:
@@ -76,8 +75,13 @@ class ExerciseService:
         if category:
             query["category"] = category.value
         
-        cursor = collection.find(query).sort("name", 1).skip(skip).limit(limit)
-        exercises = await cursor.to_list(length=limit)
+        if search:
+            exercises = await ranked_search(
+                collection, search, query, skip=skip, limit=limit, min_text_length=settings.TEXT_SEARCH_MIN_LENGTH
+            )
+        else:
+            cursor = collection.find(query).sort("name", 1).skip(skip).limit(limit)
+            exercises = await cursor.to_list(length=limit)
 
         return [Exercise(**exercise) for exercise in exercises]
 
@@ -172,19 +176,12 @@ class ExerciseService:
         skip: int = 0,
         limit: int = 20
     ) -> List[Exercise]:
-        """Search exercises with MongoDB filters"""
+        """Search exercises with the weighted MongoDB text index and filters, best matches first"""
         db = get_database()
         collection = db[settings.EXERCISES_COLLECTION]
         
         filters: dict[str, Any] = {}
         
-        # Text search
-        if query:
-            filters["$or"] = [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}}
-            ]
-        
         # Filter by tags
         if tags:
             filters["tags"] = {"$in": tags}
@@ -201,8 +198,13 @@ class ExerciseService:
         if category:
             filters["category"] = category.value
         
-        cursor = collection.find(filters).sort("name", 1).skip(skip).limit(limit)
-        exercises = await cursor.to_list(length=limit)
+        if query:
+            exercises = await ranked_search(
+                collection, query, filters, skip=skip, limit=limit, min_text_length=settings.TEXT_SEARCH_MIN_LENGTH
+            )
+        else:
+            cursor = collection.find(filters).sort("name", 1).skip(skip).limit(limit)
+            exercises = await cursor.to_list(length=limit)
         
         logger.info(f"Found {len(exercises)} exercises for query '{query}'")
         return [Exercise(**exercise) for exercise in exercises]
@@ -152,44 +152,69 @@ class TrainingService:
         count = await collection.count_documents(query)
         return count
     
+    @staticmethod
+    async def _attach_exercises(trainings_data: List[dict]) -> List[TrainingWithExercises]:
+        """Join exercise details into raw training documents with a single $in query"""
+        db = get_database()
+        exercises_collection = db[settings.EXERCISES_COLLECTION]
+
+        exercise_ids = list(dict.fromkeys(
+            training_exercise.get("exercise_id")
+            for training_data in trainings_data
+            for training_exercise in training_data.get("exercises", [])
+        ))
+        exercises_by_id = {}
+        if exercise_ids:
+            cursor = exercises_collection.find({"_id": {"$in": exercise_ids}})
+            exercises_by_id = {
+                exercise["_id"]: exercise
+                for exercise in await cursor.to_list(length=len(exercise_ids))
+            }
+
+        result = []
+        for training_data in trainings_data:
+            enriched_exercises = []
+            for training_exercise in training_data.get("exercises", []):
+                exercise_data = exercises_by_id.get(training_exercise.get("exercise_id"))
+                if exercise_data:
+                    enriched_exercises.append({
+                        **training_exercise,
+                        "exercise_details": exercise_data
+                    })
+                else:
+                    enriched_exercises.append(training_exercise)
+            result.append(TrainingWithExercises(**{**training_data, "exercises": enriched_exercises}))
+
+        return result
+
     @staticmethod
     async def get_training_with_exercises(training_id: str) -> Optional[TrainingWithExercises]:
         """Get a training session with full exercise details"""
         db = get_database()
         trainings_collection = db[settings.TRAININGS_COLLECTION]
-        exercises_collection = db[settings.EXERCISES_COLLECTION]
         
         training_data = await trainings_collection.find_one({"_id": training_id})
         if not training_data:
             return None
         
-        enriched_exercises = []
-        for training_exercise in training_data.get("exercises", []):
-            exercise_id = training_exercise.get("exercise_id")
-            exercise_data = await exercises_collection.find_one({"_id": exercise_id})
-            
-            if exercise_data:
-                enriched_exercises.append({
-                    **training_exercise,
-                    "exercise_details": exercise_data
-                })
-            else:
-                enriched_exercises.append(training_exercise)
-        
-        training_data["exercises"] = enriched_exercises
-        return TrainingWithExercises(**training_data)
+        trainings = await TrainingService._attach_exercises([training_data])
+        return trainings[0]
     
     @staticmethod
     async def get_trainings_with_exercises(training_ids: List[str]) -> List[TrainingWithExercises]:
-        """Get multiple training sessions with full exercise details"""
+        """Get multiple training sessions with full exercise details, in the order of training_ids"""
+        if not training_ids:
+            return []
+
         db = get_database()
         trainings_collection = db[settings.TRAININGS_COLLECTION]
-        exercises_collection = db[settings.EXERCISES_COLLECTION]
         
-        result = []
-        for training_id in training_ids:
-            training_with_exercises = await TrainingService.get_training_with_exercises(training_id)
-            if training_with_exercises:
-                result.append(training_with_exercises)
+        cursor = trainings_collection.find({"_id": {"$in": list(dict.fromkeys(training_ids))}})
+        trainings_by_id = {
+            training["_id"]: training
+            for training in await cursor.to_list(length=len(training_ids))
+        }
         
-        return result
+        # Missing trainings are skipped, like deleted ones referenced by a plan
+        ordered = [trainings_by_id[training_id] for training_id in training_ids if training_id in trainings_by_id]
+        return await TrainingService._attach_exercises(ordered)
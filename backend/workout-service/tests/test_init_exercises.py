@@ -1,3 +1,5 @@
+from argparse import Namespace
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -23,35 +25,39 @@ def test_build_exercise():
     assert exercise.body_part == seed.BP.CHEST
 
 
-@pytest.mark.asyncio
-async def test_init_exercises_skip_when_exists(monkeypatch: pytest.MonkeyPatch):
-    collection = MagicMock()
-    collection.count_documents = AsyncMock(return_value=5)
+def _args(scale: int = 0) -> Namespace:
+    return Namespace(scale=scale, seed=42, batch_size=100, concurrency=2)
 
-    monkeypatch.setattr(seed, "connect_to_mongodb", AsyncMock())
-    monkeypatch.setattr(seed, "disconnect_from_mongodb", AsyncMock())
-    monkeypatch.setattr(seed, "get_database", lambda: {seed.settings.EXERCISES_COLLECTION: collection})
 
-    await seed.init_exercises()
+def test_build_exercise_docs_adds_deterministic_synthetic_variants():
+    docs = list(seed.build_exercise_docs(scale=2))
 
-    seed.disconnect_from_mongodb.assert_awaited_once()
+    assert len(docs) == 3 * len(seed.ALL_EXERCISES)
+    assert len({doc["_id"] for doc in docs}) == len(docs)
+    assert docs[len(seed.ALL_EXERCISES)]["name"] == f"{seed.ALL_EXERCISES[0][0]} #1"
+    assert [doc["advancement"] for doc in docs] == [doc["advancement"] for doc in seed.build_exercise_docs(scale=2)]
 
 
 @pytest.mark.asyncio
-async def test_init_exercises_insert(monkeypatch: pytest.MonkeyPatch):
+async def test_init_exercises_upserts_in_batches(monkeypatch: pytest.MonkeyPatch):
     collection = MagicMock()
-    collection.count_documents = AsyncMock(return_value=0)
-    insert_result = MagicMock()
-    insert_result.inserted_ids = [1, 2]
-    collection.insert_many = AsyncMock(return_value=insert_result)
+    collection.name = seed.settings.EXERCISES_COLLECTION
+    collection.bulk_write = AsyncMock(
+        side_effect=lambda operations, ordered: SimpleNamespace(upserted_count=len(operations), matched_count=0)
+    )
 
     monkeypatch.setattr(seed, "connect_to_mongodb", AsyncMock())
     monkeypatch.setattr(seed, "disconnect_from_mongodb", AsyncMock())
     monkeypatch.setattr(seed, "get_database", lambda: {seed.settings.EXERCISES_COLLECTION: collection})
 
-    await seed.init_exercises()
+    await seed.init_exercises(_args())
 
-    assert collection.insert_many.await_count == 1
+    assert collection.bulk_write.await_count == -(-len(seed.ALL_EXERCISES) // 100)
+    operations = collection.bulk_write.await_args_list[0].args[0]
+    assert operations[0]._filter == {"_id": seed.make_exercise_id(seed.ALL_EXERCISES[0][0])}
+    assert "$setOnInsert" in operations[0]._doc
+    assert collection.bulk_write.await_args_list[0].kwargs == {"ordered": False}
+    seed.disconnect_from_mongodb.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -60,6 +66,6 @@ async def test_init_exercises_exception_still_disconnects(monkeypatch: pytest.Mo
     monkeypatch.setattr(seed, "disconnect_from_mongodb", AsyncMock())
 
     with pytest.raises(RuntimeError):
-        await seed.init_exercises()
+        await seed.init_exercises(_args())
 
     seed.disconnect_from_mongodb.assert_awaited_once()
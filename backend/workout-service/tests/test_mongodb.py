@@ -66,6 +66,12 @@ async def test_create_indexes_paths(monkeypatch: pytest.MonkeyPatch):
     await mongodb._create_indexes()
 
     assert exercises.create_index.await_count > 0
+    exercises.create_index.assert_any_await(
+        [("name", "text"), ("description", "text")],
+        weights={"name": 10, "description": 2},
+        name="exercise_text",
+    )
+    exercises.create_index.assert_any_await("name", collation=mongodb.SEARCH_COLLATION, name="name_ci")
     assert trainings.create_index.await_count > 0
     assert plans.create_index.await_count > 0
 
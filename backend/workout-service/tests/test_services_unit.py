@@ -145,6 +145,14 @@ async def test_exercise_search(monkeypatch: pytest.MonkeyPatch):
 
     result = await ExerciseService.search_exercises("push", tags=["a"], body_part=BodyPart.CHEST)
     assert len(result) == 1
+    collection.find.assert_called_once_with(
+        {"tags": {"$in": ["a"]}, "body_part": "chest", "$text": {"$search": "push"}}, None
+    )
+
+    collection.find.reset_mock()
+    listed = await ExerciseService.search_exercises("", category=ExerciseCategory.STRENGTH)
+    assert len(listed) == 1
+    collection.find.assert_called_once_with({"category": "strength"})
 
 
 @pytest.mark.asyncio
@@ -170,7 +178,7 @@ async def test_training_service_paths(monkeypatch: pytest.MonkeyPatch):
     collection.count_documents = AsyncMock(return_value=2)
 
     exercises_collection = MagicMock()
-    exercises_collection.find_one = AsyncMock(return_value=_exercise_doc())
+    exercises_collection.find.return_value = _cursor([_exercise_doc()])
 
     monkeypatch.setattr(
         "src.services.training_service.get_database",
@@ -214,6 +222,8 @@ async def test_training_service_paths(monkeypatch: pytest.MonkeyPatch):
 
     detailed = await TrainingService.get_training_with_exercises("tr-1")
     assert detailed is not None
+    assert detailed.exercises[0]["exercise_details"]["name"] == "Push Up"
+    exercises_collection.find.assert_called_once_with({"_id": {"$in": ["ex-1"]}})
 
 
 @pytest.mark.asyncio
@@ -273,12 +283,34 @@ async def test_training_update_validation_and_with_exercises_list(monkeypatch: p
             ),
         )
 
+
+
+@pytest.mark.asyncio
+async def test_trainings_with_exercises_uses_two_queries(monkeypatch: pytest.MonkeyPatch):
+    second = _training_doc("tr-2")
+    second["exercises"].append({**second["exercises"][0], "exercise_id": "ex-missing"})
+    trainings = MagicMock()
+    trainings.find.return_value = _cursor([second, _training_doc("tr-1")])
+    trainings.find_one = AsyncMock()
+    exercises = MagicMock()
+    exercises.find.return_value = _cursor([_exercise_doc("ex-1")])
+    exercises.find_one = AsyncMock()
     monkeypatch.setattr(
-        "src.services.training_service.TrainingService.get_training_with_exercises",
-        AsyncMock(side_effect=[MagicMock(), None]),
+        "src.services.training_service.get_database",
+        lambda: {"trainings": trainings, "exercises": exercises},
     )
-    result = await TrainingService.get_trainings_with_exercises(["a", "b"])
-    assert len(result) == 1
+
+    result = await TrainingService.get_trainings_with_exercises(["tr-1", "gone", "tr-2", "tr-1"])
+
+    assert [training.id for training in result] == ["tr-1", "tr-2", "tr-1"]
+    assert result[1].exercises[0]["exercise_details"]["_id"] == "ex-1"
+    assert "exercise_details" not in result[1].exercises[1]
+    trainings.find.assert_called_once_with({"_id": {"$in": ["tr-1", "gone", "tr-2"]}})
+    exercises.find.assert_called_once_with({"_id": {"$in": ["ex-1", "ex-missing"]}})
+    trainings.find_one.assert_not_awaited()
+    exercises.find_one.assert_not_awaited()
+
+    assert await TrainingService.get_trainings_with_exercises([]) == []
 
 
 @pytest.mark.asyncio
@@ -874,7 +874,7 @@ function PostFormModal({ onClose, onSubmit, editPost, currentUserId, authorName
   // Resolve names for pre-linked items in edit mode
   useEffect(() => {
     if (linkedRecipes.length > 0 && Object.keys(recipeNames).length === 0) {
-      getRecipes({ limit: 100 }).then((data) => {
+      getRecipes({ limit: 100, view: 'summary' }).then((data) => {
         const list = Array.isArray(data) ? data : [];
         const names = {};
         list.forEach((r) => { names[r._id] = r.name; });
@@ -1114,8 +1114,8 @@ function PostFormModal({ onClose, onSubmit, editPost, currentUserId, authorName
                           }}
                           className="w-full text-left px-3 py-2 text-sm hover:bg-slate-50 dark:hover:bg-white/5 flex items-center gap-3 transition-colors"
                         >
-                          {r.image ? (
-                            <img src={r.image} alt="" className="w-8 h-8 rounded-lg object-cover" />
+                          {r.thumbnail_url || r.image ? (
+                            <img src={r.thumbnail_url || r.image} alt="" className="w-8 h-8 rounded-lg object-cover" />
                           ) : (
                             <div className="w-8 h-8 rounded-lg bg-orange-100 dark:bg-orange-900/30 flex items-center justify-center">
                               <ChefHat className="w-4 h-4 text-orange-500" />
@@ -1357,7 +1357,7 @@ export default function Community() {
     // Fetch recipe names
     if (recipeIds.length > 0) {
       try {
-        const all = await getRecipes({ limit: 100 });
+        const all = await getRecipes({ limit: 100, view: 'summary' });
         const list = Array.isArray(all) ? all : [];
         list.forEach((r) => {
           if (recipeIds.includes(r._id)) newRecipeNames[r._id] = r.name;
@@ -230,7 +230,8 @@ async function fetchFoodDatabaseDedup() {
 
     // Recipe API enforces limit <= 100, so fetch in pages.
     while (true) {
-      const page = await getRecipes({ skip, limit });
+      // Macros are computed from the ingredients and the tile shows the image
+      const page = await getRecipes({ skip, limit, view: 'full' });
       if (!page?.length) break;
       recipes.push(...page);
       if (page.length < limit) break;
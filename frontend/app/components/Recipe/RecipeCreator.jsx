@@ -3,6 +3,7 @@
 import { useState, useEffect, useRef } from "react";
 import axios from "axios";
 import { ENDPOINTS } from "../../config/network";
+import { autocompleteIngredients } from "../../services/recipeService";
 import { X, Plus, Minus, Trash2, Clock, ChefHat, Loader2, Save, Search, ChevronDown } from "lucide-react";
 import { motion, AnimatePresence } from "framer-motion";
 
@@ -37,6 +38,9 @@ export default function RecipeCreator({ onClose, onRecipeCreated }) {
   ]);
   const [availableIngredients, setAvailableIngredients] = useState([]);
   const [searchTerms, setSearchTerms] = useState({});
+  // Server-side autocomplete results per ingredient row, keyed by the term they answer
+  const [suggestions, setSuggestions] = useState({});
+  const [pickedNames, setPickedNames] = useState({});
   const [dropdownOpen, setDropdownOpen] = useState({});
   const [loading, setLoading] = useState(false);
   const [ingredientsLoading, setIngredientsLoading] = useState(true);
@@ -58,6 +62,21 @@ export default function RecipeCreator({ onClose, onRecipeCreated }) {
     fetchIngredients();
   }, []);
 
+  // Ask the ingredient index for suggestions once typing pauses
+  useEffect(() => {
+    const timers = Object.entries(searchTerms)
+      .filter(([index, term]) => term.trim() && suggestions[index]?.term !== term)
+      .map(([index, term]) => setTimeout(async () => {
+        try {
+          const items = await autocompleteIngredients(term, { limit: 20 });
+          setSuggestions(prev => ({ ...prev, [index]: { term, items } }));
+        } catch (err) {
+          console.warn("Ingredient autocomplete failed, filtering locally:", err);
+        }
+      }, 200));
+    return () => timers.forEach(clearTimeout);
+  }, [searchTerms]);
+
   // Close dropdown on outside click
   useEffect(() => {
     const handleClickOutside = (e) => {
@@ -78,6 +97,13 @@ export default function RecipeCreator({ onClose, onRecipeCreated }) {
   const getFilteredIngredients = (index) => {
     const searchTerm = searchTerms[index]?.toLowerCase() || "";
     if (!searchTerm) return availableIngredients;
+    const suggested = suggestions[index];
+    if (suggested && suggested.term.toLowerCase() === searchTerm) {
+      // Keep the catalogue entry when loaded so the calories badge still shows
+      return suggested.items.map((item) =>
+        availableIngredients.find((ing) => getIngredientId(ing) === getIngredientId(item)) || item
+      );
+    }
     return availableIngredients.filter((ing) =>
       ing.name.toLowerCase().includes(searchTerm)
     );
@@ -92,7 +118,9 @@ export default function RecipeCreator({ onClose, onRecipeCreated }) {
       setIngredients(ingredients.filter((_, i) => i !== index));
       const ns = { ...searchTerms }; delete ns[index];
       const nd = { ...dropdownOpen }; delete nd[index];
+      const nsg = { ...suggestions }; delete nsg[index];
       setSearchTerms(ns);
+      setSuggestions(nsg);
       setDropdownOpen(nd);
     }
   };
@@ -107,6 +135,7 @@ export default function RecipeCreator({ onClose, onRecipeCreated }) {
     const updated = [...ingredients];
     updated[index].ingredient_id = getIngredientId(ingredient);
     setIngredients(updated);
+    setPickedNames({ ...pickedNames, [updated[index].ingredient_id]: ingredient.name });
     setDropdownOpen({ ...dropdownOpen, [index]: false });
     setSearchTerms({ ...searchTerms, [index]: "" });
   };
@@ -159,7 +188,7 @@ export default function RecipeCreator({ onClose, onRecipeCreated }) {
     const id = ingredients[index]?.ingredient_id;
     if (!id) return null;
     const found = availableIngredients.find(i => getIngredientId(i) === id);
-    return found?.name || null;
+    return found?.name || pickedNames[id] || null;
   };
 
   return (
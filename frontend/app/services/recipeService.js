@@ -19,8 +19,10 @@ async function request(url, opts = {}) {
 
 // ======================== RECIPES ========================
 
-export async function getRecipes({ skip = 0, limit = 100 } = {}) {
-  const params = new URLSearchParams({ skip, limit });
+// `view` picks the fields returned per recipe: summary, card (list tiles),
+// ingredients (macro resolution) or full. Lists default to the light card view.
+export async function getRecipes({ skip = 0, limit = 100, view = 'card' } = {}) {
+  const params = new URLSearchParams({ skip, limit, view });
   return request(`${BASE}/?${params}`);
 }
 
@@ -33,4 +35,9 @@ export async function getIngredients({ skip = 0, limit = 500 } = {}) {
   return request(`${BASE}/ingredients?${params}`);
 }
 
-export default { getRecipes, getRecipeById, getIngredients };
+export async function autocompleteIngredients(query, { limit = 10 } = {}) {
+  const params = new URLSearchParams({ q: query, limit });
+  return request(`${BASE}/ingredients/autocomplete?${params}`);
+}
+
+export default { getRecipes, getRecipeById, getIngredients, autocompleteIngredients };